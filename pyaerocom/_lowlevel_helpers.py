@@ -11,6 +11,13 @@ from pathlib import Path
 import numpy as np
 import simplejson
 
+try:
+    import orjson
+
+    _ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None
+
 from pyaerocom._warnings import ignore_warnings
 
 logger = logging.getLogger(__name__)
@@ -22,9 +29,12 @@ def round_floats(in_data, precision=5):
     For nested structures, this method is called recursively to go through
     all levels
 
+    Lists (or tuples) that contain only floats and numpy arrays are rounded
+    in bulk (numpy arrays are converted to lists).
+
     Parameters
     ----------
-    in_data : float, dict, tuple, list
+    in_data : float, dict, tuple, list, ndarray
         data structure whose numbers should be limited in precision
 
     Returns
@@ -43,9 +53,18 @@ def round_floats(in_data, precision=5):
         # use numpy around for now
         return np.around(in_data, precision)
     elif isinstance(in_data, (list, tuple)):
+        if len(in_data) > 0 and all(isinstance(v, float) for v in in_data):
+            # same rounding as for the individual floats, but in one go
+            return np.around(np.array(in_data, dtype=float), precision).tolist()
         return [round_floats(v, precision=precision) for v in in_data]
     elif isinstance(in_data, dict):
         return {k: round_floats(v, precision=precision) for k, v in in_data.items()}
+    elif isinstance(in_data, np.ndarray):
+        if np.issubdtype(in_data.dtype, np.floating):
+            return np.around(in_data.astype(float), precision).tolist()
+        elif in_data.dtype.kind in "biu":
+            return in_data.tolist()
+        return round_floats(in_data.tolist(), precision=precision)
     return in_data
 
 
@@ -67,21 +86,36 @@ def read_json(file_path):
     return data
 
 
-def write_json(data_dict, file_path, **kwargs):
+def write_json(data_dict, file_path, use_orjson=False, **kwargs):
     """Save json file
 
+    Floats are rounded to 5 decimals (cf. :func:`round_floats`) and the data
+    is encoded with :mod:`simplejson` and streamed to the output file.
+
     Parameters
     ----------
     data_dict : dict
         dictionary that can be written to json file
     file_path : str
         output file path
+    use_orjson : bool
+        if True and :mod:`orjson` is installed, the data is encoded with
+        orjson, which is considerably faster than simplejson. Note that the
+        output is not identical to the one of simplejson (compact separators,
+        no exponent notation for small floats, e.g. 0.00005 instead of
+        5e-05). Only used if `ignore_nan=True` is the only additional
+        keyword argument.
     **kwargs
         additional keyword args passed to :func:`simplejson.dumps` (e.g.
         indent, )
     """
+    data = round_floats(data_dict)
+    if use_orjson and orjson is not None and kwargs == dict(ignore_nan=True):
+        with open(file_path, "wb") as f:
+            f.write(orjson.dumps(data, option=_ORJSON_OPTS))
+        return
     with open(file_path, "w") as f:
-        simplejson.dump(round_floats(data_dict), f, **kwargs)
+        simplejson.dump(data, f, **kwargs)
 
 
 def check_make_json(fp, indent=4):
@@ -72,8 +72,17 @@ class ProcessingEngine(HasConfig, abc.ABC):
 class HasColocator(HasConfig):
     """
     Config class that also has the ability to co-locate
+
+    Attributes
+    ----------
+    obs_data_cache : ObsDataCache, optional
+        in-memory cache for observation data that is assigned to all
+        colocation engines created via :func:`get_colocator`, so that
+        observation data is shared among them.
     """
 
+    obs_data_cache = None
+
     def _get_diurnal_only(self, obs_name):
         """
         Check if colocated data is flagged for only diurnal processing
@@ -123,6 +132,7 @@ class HasColocator(HasConfig):
             col.import_from(mod_cfg)
         outdir = self.cfg.path_manager.get_coldata_dir()
         col.basedir_coldata = outdir
+        col.obs_data_cache = self.obs_data_cache
         return col
 
 
@@ -24,6 +24,7 @@ from pyaerocom.aeroval.coldatatojson_helpers import (
     init_regions_web,
     update_regions_json,
 )
+from pyaerocom.aeroval.json_output import JSONOutputBuffer
 from pyaerocom.exceptions import AeroValConfigError, TemporalResolutionError
 
 logger = logging.getLogger(__name__)
@@ -34,6 +35,12 @@ class ColdataToJsonEngine(ProcessingEngine):
         """
         Convert colocated data files to json
 
+        Updates of json files that are shared between the colocated data
+        files (e.g. heatmap files) or with other entries of the experiment
+        (e.g. station time series files, which contain all models) are
+        buffered and each file is written once, after all files have been
+        processed (cf. :class:`JSONOutputBuffer`).
+
         Parameters
         ----------
         files : list
@@ -47,14 +54,16 @@ class ColdataToJsonEngine(ProcessingEngine):
 
         """
         converted = []
-        for file in files:
-            logger.info(f"Processing: {file}")
-            coldata = ColocatedData(file)
-            self.process_coldata(coldata)
-            converted.append(file)
+        with self._init_json_buffer() as json_buffer:
+            for file in files:
+                logger.info(f"Processing: {file}")
+                coldata = ColocatedData(file)
+                self.process_coldata(coldata, json_buffer)
+                converted.append(file)
+            logger.info(f"Writing {len(json_buffer)} buffered json files")
         return converted
 
-    def process_coldata(self, coldata: ColocatedData):
+    def process_coldata(self, coldata: ColocatedData, json_buffer: JSONOutputBuffer = None):
         """
         Creates all json files for one ColocatedData object
 
@@ -62,6 +71,10 @@ class ColdataToJsonEngine(ProcessingEngine):
         ----------
         coldata : ColocatedData
             colocated data to be processed.
+        json_buffer : JSONOutputBuffer, optional
+            buffer for updates of shared json files (station time series and
+            heatmap files). If None, these files are updated at the end of
+            this method.
 
         Raises
         ------
@@ -77,6 +90,9 @@ class ColdataToJsonEngine(ProcessingEngine):
         None.
 
         """
+        if json_buffer is None:
+            with self._init_json_buffer() as json_buffer:
+                return self.process_coldata(coldata, json_buffer)
         t00 = time()
         use_weights = self.cfg.statistics_opts.weighted_stats
         # redundant, but cheap and important to be correct
@@ -100,6 +116,7 @@ class ColdataToJsonEngine(ProcessingEngine):
         trends_min_yrs = self.cfg.statistics_opts.trends_min_yrs
 
         use_fairmode = self.cfg.statistics_opts.use_fairmode
+        use_orjson = self.cfg.processing_opts.use_orjson
 
         # ToDo: some of the checks below could be done automatically in
         # EvalSetup, and at an earlier stage
@@ -185,7 +202,14 @@ class ColdataToJsonEngine(ProcessingEngine):
                 fname = get_timeseries_file_name(regnames[reg], obs_name, var_name_web, vert_code)
                 ts_file = os.path.join(out_dirs["hm/ts"], fname)
                 _add_heatmap_entry_json(
-                    ts_file, stats_ts, obs_name, var_name_web, vert_code, model_name, model_var
+                    ts_file,
+                    stats_ts,
+                    obs_name,
+                    var_name_web,
+                    vert_code,
+                    model_name,
+                    model_var,
+                    json_buffer,
                 )
 
             logger.info("Processing heatmap data for all regions")
@@ -207,13 +231,20 @@ class ColdataToJsonEngine(ProcessingEngine):
                 hm_file = os.path.join(out_dirs["hm"], fname)
 
                 _add_heatmap_entry_json(
-                    hm_file, hm_data, obs_name, var_name_web, vert_code, model_name, model_var
+                    hm_file,
+                    hm_data,
+                    obs_name,
+                    var_name_web,
+                    vert_code,
+                    model_name,
+                    model_var,
+                    json_buffer,
                 )
 
             logger.info("Processing regional timeseries for all regions")
             ts_objs_regional = _process_regional_timeseries(data, regnames, regions_how, meta_glob)
 
-            _write_site_data(ts_objs_regional, out_dirs["ts"])
+            _write_site_data(ts_objs_regional, out_dirs["ts"], json_buffer)
             if coldata.has_latlon_dims:
                 for cd in data.values():
                     if cd is not None:
@@ -222,7 +253,7 @@ class ColdataToJsonEngine(ProcessingEngine):
             logger.info("Processing individual site timeseries data")
             (ts_objs, map_meta, site_indices) = _process_sites(data, regs, regions_how, meta_glob)
 
-            _write_site_data(ts_objs, out_dirs["ts"])
+            _write_site_data(ts_objs, out_dirs["ts"], json_buffer)
 
             map_data, scat_data = _process_map_and_scat(
                 data,
@@ -241,10 +272,10 @@ class ColdataToJsonEngine(ProcessingEngine):
             map_name = get_json_mapname(obs_name, var_name_web, model_name, model_var, vert_code)
 
             outfile_map = os.path.join(out_dirs["map"], map_name)
-            write_json(map_data, outfile_map, ignore_nan=True)
+            write_json(map_data, outfile_map, use_orjson=use_orjson, ignore_nan=True)
 
             outfile_scat = os.path.join(out_dirs["scat"], map_name)
-            write_json(scat_data, outfile_scat, ignore_nan=True)
+            write_json(scat_data, outfile_scat, use_orjson=use_orjson, ignore_nan=True)
 
         if coldata.ts_type == "hourly":
             logger.info("Processing diurnal profiles")
@@ -254,11 +285,11 @@ class ColdataToJsonEngine(ProcessingEngine):
             outdir = os.path.join(out_dirs["ts/diurnal"])
             for ts_data_weekly in ts_objs_weekly:
                 # writes json file
-                _write_stationdata_json(ts_data_weekly, outdir)
+                _write_stationdata_json(ts_data_weekly, outdir, json_buffer)
             if ts_objs_weekly_reg != None:
                 for ts_data_weekly_reg in ts_objs_weekly_reg:
                     # writes json file
-                    _write_stationdata_json(ts_data_weekly_reg, outdir)
+                    _write_stationdata_json(ts_data_weekly_reg, outdir, json_buffer)
 
         logger.info(
             f"Finished computing json files for {model_name} ({model_var}) vs. "
@@ -267,3 +298,12 @@ class ColdataToJsonEngine(ProcessingEngine):
 
         dt = time() - t00
         logger.info(f"Time expired (TOTAL): {dt:.2f} s")
+
+    def _init_json_buffer(self):
+        """Buffer for updates of shared json files (cf. :class:`JSONOutputBuffer`)"""
+        use_orjson = self.cfg.processing_opts.use_orjson
+        if not self.cfg.processing_opts.lock_json_files:
+            return JSONOutputBuffer(use_orjson=use_orjson)
+        # lock files are kept next to the colocated data, not in the json output
+        lock_dir = os.path.join(self.cfg.path_manager.get_coldata_dir(), "json_locks")
+        return JSONOutputBuffer(lock=True, lock_dir=lock_dir, use_orjson=use_orjson)
@@ -10,9 +10,10 @@ import pandas as pd
 import xarray as xr
 
 from pyaerocom._lowlevel_helpers import read_json, write_json
-from pyaerocom._warnings import ignore_warnings
 from pyaerocom.aeroval.fairmode_stats import fairmode_stats
+from pyaerocom.aeroval.grouped_stats import GroupedColdataStats
 from pyaerocom.aeroval.helpers import _get_min_max_year_periods, _period_str_to_timeslice
+from pyaerocom.aeroval.json_output import JSONOutputBuffer
 from pyaerocom.colocateddata import ColocatedData
 from pyaerocom.config import ALL_REGION_NAME
 from pyaerocom.exceptions import (
@@ -22,8 +23,8 @@ from pyaerocom.exceptions import (
     TemporalResolutionError,
 )
 from pyaerocom.helpers import start_stop
-from pyaerocom.mathutils import _init_stats_dummy, calc_statistics
-from pyaerocom.region import Region, find_closest_region_coord, get_all_default_region_ids
+from pyaerocom.mathutils import _init_stats_dummy, calc_statistics_batched, unstack_statistics
+from pyaerocom.region import Region, find_closest_region_coords, get_all_default_region_ids
 from pyaerocom.region_defs import HTAP_REGIONS_DEFAULT, OLD_AEROCOM_REGIONS
 from pyaerocom.trends_engine import TrendsEngine
 from pyaerocom.trends_helpers import _get_season_from_months
@@ -50,7 +51,29 @@ def get_json_mapname(obs_name, var_name_web, model_name, model_var, vert_code):
     return f"{obs_name}-{var_name_web}_{vert_code}_{model_name}-{model_var}.json"
 
 
-def _write_stationdata_json(ts_data, out_dir):
+def _add_json_entry(file_path, keys, value, json_buffer=None):
+    """Add entry to json file (or to buffer of pending json updates)
+
+    Parameters
+    ----------
+    file_path : str
+        json file to be updated
+    keys : list
+        keys of (nested) entry (cf. :func:`JSONOutputBuffer.add_entry`)
+    value
+        new value of entry
+    json_buffer : JSONOutputBuffer, optional
+        if provided, the entry is added to the buffer and written when the
+        buffer is flushed. Else, the file is updated right away.
+    """
+    if json_buffer is None:
+        with JSONOutputBuffer() as json_buffer:
+            json_buffer.add_entry(file_path, keys, value)
+    else:
+        json_buffer.add_entry(file_path, keys, value)
+
+
+def _write_stationdata_json(ts_data, out_dir, json_buffer=None):
     """
     This method writes time series data given in a dictionary to .json files
 
@@ -60,6 +83,9 @@ def _write_stationdata_json(ts_data, out_dir):
         A dictionary containing all processed time series data.
     out_dir : str or similar
         output directory
+    json_buffer : JSONOutputBuffer, optional
+        buffer of json updates. If provided, the data is written when the
+        buffer is flushed.
 
     Returns
     -------
@@ -71,22 +97,20 @@ def _write_stationdata_json(ts_data, out_dir):
     )
 
     fp = os.path.join(out_dir, filename)
-    if os.path.exists(fp):
-        current = read_json(fp)
-    else:
-        current = {}
-    current[ts_data["model_name"]] = ts_data
-    write_json(current, fp, ignore_nan=True)
+    _add_json_entry(fp, [ts_data["model_name"]], ts_data, json_buffer)
 
 
-def _write_site_data(ts_objs, dirloc):
+def _write_site_data(ts_objs, dirloc, json_buffer=None):
     """Write list of station timeseries files to json"""
+    if json_buffer is None:
+        with JSONOutputBuffer() as json_buffer:
+            _write_site_data(ts_objs, dirloc, json_buffer)
+        return
     for ts_data in ts_objs:
-        # writes json file
-        _write_stationdata_json(ts_data, dirloc)
+        _write_stationdata_json(ts_data, dirloc, json_buffer)
 
 
-def _write_diurnal_week_stationdata_json(ts_data, out_dirs):
+def _write_diurnal_week_stationdata_json(ts_data, out_dirs, json_buffer=None):
     """
     Minor modification of method _write_stationdata_json to allow a further
     level of sub-directories
@@ -97,6 +121,9 @@ def _write_diurnal_week_stationdata_json(ts_data, out_dirs):
         A dictionary containing all processed time series data.
     out_dirs : list
         list of file paths for writing data to
+    json_buffer : JSONOutputBuffer, optional
+        buffer of json updates. If provided, the data is written when the
+        buffer is flushed.
 
     Raises
     ------
@@ -113,35 +140,21 @@ def _write_diurnal_week_stationdata_json(ts_data, out_dirs):
     )
 
     fp = os.path.join(out_dirs["ts/diurnal"], filename)
-    if os.path.exists(fp):
-        current = read_json(fp)
-    else:
-        current = {}
-    current[ts_data["model_name"]] = ts_data
-    write_json(current, fp, ignore_nan=True)
+    _add_json_entry(fp, [ts_data["model_name"]], ts_data, json_buffer)
 
 
 def _add_heatmap_entry_json(
-    heatmap_file, result, obs_name, var_name_web, vert_code, model_name, model_var
+    heatmap_file,
+    result,
+    obs_name,
+    var_name_web,
+    vert_code,
+    model_name,
+    model_var,
+    json_buffer=None,
 ):
-    if os.path.exists(heatmap_file):
-        current = read_json(heatmap_file)
-    else:
-        current = {}
-    if not var_name_web in current:
-        current[var_name_web] = {}
-    ov = current[var_name_web]
-    if not obs_name in ov:
-        ov[obs_name] = {}
-    on = ov[obs_name]
-    if not vert_code in on:
-        on[vert_code] = {}
-    ovc = on[vert_code]
-    if not model_name in ovc:
-        ovc[model_name] = {}
-    mn = ovc[model_name]
-    mn[model_var] = result
-    write_json(current, heatmap_file, ignore_nan=True)
+    keys = [var_name_web, obs_name, vert_code, model_name, model_var]
+    _add_json_entry(heatmap_file, keys, result, json_buffer)
 
 
 def _prepare_regions_json_helper(region_ids):
@@ -632,11 +645,7 @@ def _init_site_coord_arrays(data):
 
 
 def _get_stat_regions(lats, lons, regions):
-    regs = []
-    for (lat, lon) in zip(lats, lons):
-        reg = find_closest_region_coord(lat, lon, regions=regions)
-        regs.append(reg)
-    return regs
+    return find_closest_region_coords(lats, lons, regions=regions)
 
 
 def _process_sites(data, regions, regions_how, meta_glob):
@@ -690,9 +699,10 @@ def _process_sites(data, regions, regions_how, meta_glob):
     return (ts_objs, map_meta, site_indices)
 
 
-def _get_statistics(obs_vals, mod_vals, min_num):
-    stats = calc_statistics(mod_vals, obs_vals, min_num_valid=min_num)
-    return _prep_stats_json(stats)
+def _get_statistics_sites(obs_vals, mod_vals, min_num):
+    """Statistics of each row of 2D (site, time) arrays"""
+    stats = calc_statistics_batched(mod_vals, obs_vals, min_num_valid=min_num)
+    return [_prep_stats_json(x) for x in unstack_statistics(stats, min_num)]
 
 
 def _make_trends_from_timeseries(obs, mod, freq, season, start, stop, min_yrs):
@@ -838,7 +848,14 @@ def _process_map_and_scat(
                         jsdate = subset.data.jsdate.values.tolist()
                     except (DataCoverageError, TemporalResolutionError):
                         use_dummy = True
-                for i, map_stat in zip(site_indices, map_data):
+                if not use_dummy:
+                    # statistics of all sites at once
+                    site_stats = _get_statistics_sites(
+                        subset.data.data[0][:, site_indices].T,
+                        subset.data.data[1][:, site_indices].T,
+                        min_num,
+                    )
+                for j, (i, map_stat) in enumerate(zip(site_indices, map_data)):
                     if not freq in map_stat:
                         map_stat[freq] = {}
 
@@ -847,7 +864,7 @@ def _process_map_and_scat(
                     else:
                         obs_vals = subset.data.data[0, :, i]
                         mod_vals = subset.data.data[1, :, i]
-                        stats = _get_statistics(obs_vals, mod_vals, min_num)
+                        stats = site_stats[j]
 
                         if use_fairmode and freq != "yearly" and not np.isnan(obs_vals).all():
                             stats["mb"] = np.nanmean(mod_vals - obs_vals)
@@ -1011,84 +1028,6 @@ def _prep_stats_json(stats):
     return stats
 
 
-def _get_extended_stats(coldata, use_weights):
-    stats = coldata.calc_statistics(use_area_weights=use_weights)
-
-    # Removes the spatial median and temporal mean (see mails between Hilde, Jonas, Augustin and Daniel from 27.09.21)
-    # (stats['R_spatial_mean'],
-    #  stats['R_spatial_median']) = _calc_spatial_corr(coldata, use_weights)
-
-    # (stats['R_temporal_mean'],
-    #  stats['R_temporal_median']) = _calc_temporal_corr(coldata)
-
-    (stats["R_spatial_mean"], _) = _calc_spatial_corr(coldata, use_weights)
-
-    (_, stats["R_temporal_median"]) = _calc_temporal_corr(coldata)
-
-    return _prep_stats_json(stats)
-
-
-def _calc_spatial_corr(coldata, use_weights):
-    """
-    Compute spatial correlation both for median and mean aggregation
-
-    Parameters
-    ----------
-    coldata : ColocatedData
-        Input data.
-    use_weights : bool
-        Apply area weights or not.
-
-    Returns
-    -------
-    float
-        mean spatial correlation
-    float
-        median spatial correlation
-
-    """
-    return (
-        coldata.calc_spatial_statistics(aggr="mean", use_area_weights=use_weights)["R"],
-        coldata.calc_spatial_statistics(aggr="median", use_area_weights=use_weights)["R"],
-    )
-
-
-def _calc_temporal_corr(coldata):
-    """
-    Compute temporal correlation both for median and mean aggregation
-
-    Parameters
-    ----------
-    coldata : ColocatedData
-        Input data.
-
-    Returns
-    -------
-    float
-        mean temporal correlation
-    float
-        median temporal correlation
-
-    """
-    if len(coldata.time) < 3:
-        return np.nan, np.nan
-    elif coldata.has_latlon_dims:
-        coldata = coldata.flatten_latlondim_station_name()
-
-    # Use only sites that contain at least 3 valid data points (otherwise
-    # correlation will be 1).
-    obs_ok = coldata.data[0].count(dim="time") > 2
-    arr = []
-    arr.append(coldata.data[0].where(obs_ok, drop=True))
-    arr.append(coldata.data[1].where(obs_ok, drop=True))
-
-    if np.prod(arr[0].shape) == 0 or np.prod(arr[1].shape) == 0:
-        return np.nan, np.nan
-    corr_time = xr.corr(arr[1], arr[0], dim="time")
-    with ignore_warnings(RuntimeWarning, "Mean of empty slice", "All-NaN slice encountered"):
-        return (np.nanmean(corr_time.data), np.nanmedian(corr_time.data))
-
-
 def _select_period_season_coldata(coldata, period, season):
     tslice = _period_str_to_timeslice(period)
     # expensive, try use solution with numpy indexing directly...
@@ -1122,61 +1061,49 @@ def _process_heatmap_data(
 ):
     output = {}
     stats_dummy = _init_stats_dummy()
+    keys = [(regid, per, season) for regid in region_ids for per in periods for season in seasons]
     for freq, coldata in data.items():
-        output[freq] = hm_freq = {}
-        for regid, regname in region_ids.items():
-            hm_freq[regname] = {}
-            for per in periods:
-                for season in seasons:
-                    use_dummy = coldata is None
-                    perstr = f"{per}-{season}"
-                    if use_dummy:
-                        stats = stats_dummy
-                    else:
-                        try:
-                            subset = _select_period_season_coldata(coldata, per, season)
-
-                            trends_successful = False
-                            if add_trends and freq != "daily":
-                                # Calculates the start and stop years. min_yrs have a test value of 7 years. Should be set in cfg
-                                (start, stop) = _get_min_max_year_periods([per])
-
-                                if stop - start >= trends_min_yrs:
-                                    try:
-                                        subset_time_series = subset.get_regional_timeseries(
-                                            regid, check_country_meta=use_country
-                                        )
-
-                                        (obs_trend, mod_trend) = _make_trends_from_timeseries(
-                                            subset_time_series["obs"],
-                                            subset_time_series["mod"],
-                                            freq,
-                                            season,
-                                            start,
-                                            stop,
-                                            trends_min_yrs,
-                                        )
-
-                                        trends_successful = True
-                                    except AeroValTrendsError as e:
-                                        msg = f"Failed to calculate trends, and will skip. This was due to {e}"
-                                        logger.warning(msg)
-
-                            subset = subset.filter_region(
-                                region_id=regid, check_country_meta=use_country
-                            )
-
-                            stats = _get_extended_stats(subset, use_weights)
-
-                            if add_trends and freq != "daily" and trends_successful:
-                                # The whole trends dicts are placed in the stats dict
-                                stats["obs_trend"] = obs_trend
-                                stats["mod_trend"] = mod_trend
-
-                        except (DataCoverageError, TemporalResolutionError) as e:
-                            stats = stats_dummy
-
-                    hm_freq[regname][perstr] = stats
+        output[freq] = hm_freq = {regname: {} for regname in region_ids.values()}
+        if coldata is None:
+            all_stats = [None] * len(keys)
+        else:
+            # time indices of periods / seasons and cells of regions are computed
+            # only once and the statistics of all (region, period, season)
+            # combinations are computed at once
+            groups = GroupedColdataStats(coldata, use_weights=use_weights, use_country=use_country)
+            all_stats = groups.calc_stats_many(keys)
+        for (regid, per, season), stats in zip(keys, all_stats):
+            regname = region_ids[regid]
+            perstr = f"{per}-{season}"
+            if stats is None:
+                hm_freq[regname][perstr] = stats_dummy
+                continue
+            stats = _prep_stats_json(stats)
+            if add_trends and freq != "daily":
+                # Calculates the start and stop years. min_yrs have a test value of 7 years. Should be set in cfg
+                (start, stop) = _get_min_max_year_periods([per])
+
+                if stop - start >= trends_min_yrs:
+                    try:
+                        subset_time_series = groups.regional_timeseries(regid, per, season)
+
+                        (obs_trend, mod_trend) = _make_trends_from_timeseries(
+                            subset_time_series["obs"],
+                            subset_time_series["mod"],
+                            freq,
+                            season,
+                            start,
+                            stop,
+                            trends_min_yrs,
+                        )
+                        # The whole trends dicts are placed in the stats dict
+                        stats["obs_trend"] = obs_trend
+                        stats["mod_trend"] = mod_trend
+                    except AeroValTrendsError as e:
+                        msg = f"Failed to calculate trends, and will skip. This was due to {e}"
+                        logger.warning(msg)
+
+            hm_freq[regname][perstr] = stats
 
     return output
 
@@ -1285,26 +1212,19 @@ def _process_statistics_timeseries(data, freq, region_ids, use_weights, use_coun
 
     # get time index of output frequency
     to_idx = data[freq].data.time.values
-    tstr = TsType(freq).to_numpy_freq()
-    # list of strings of output timestamps (used below to select the
-    # individual periods)
-    to_idx_str = [str(x) for x in to_idx.astype(f"datetime64[{tstr}]")]
     jsdate = _get_jsdate(to_idx)
 
+    # time stamps of base frequency are grouped by output period only once
+    groups = GroupedColdataStats(coldata, use_weights=use_weights, use_country=use_country)
     for regid, regname in region_ids.items():
         output[regname] = {}
         try:
-            subset = coldata.filter_region(region_id=regid, check_country_meta=use_country)
+            stats_ts = groups.calc_stats_timeseries(regid, to_idx, freq)
         except DataCoverageError:
             continue
-        for i, js in enumerate(jsdate):
-            per = to_idx_str[i]
-            try:
-                arr = ColocatedData(subset.data.sel(time=per))
-                stats = arr.calc_statistics(use_area_weights=use_weights)
+        for js, stats in zip(jsdate, stats_ts):
+            if stats is not None:
                 output[regname][str(js)] = _prep_stats_json(stats)
-            except DataCoverageError:
-                pass
 
     return output
 
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import copy
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from multiprocessing import dummy
 
 from pyaerocom.aeroval._processing_base import HasColocator, ProcessingEngine
@@ -9,9 +11,25 @@ from pyaerocom.aeroval.coldatatojson_engine import ColdataToJsonEngine
 from pyaerocom.aeroval.helpers import delete_dummy_model, make_dummy_model
 from pyaerocom.aeroval.modelmaps_engine import ModelMapsEngine
 from pyaerocom.aeroval.superobs_engine import SuperObsEngine
+from pyaerocom.io.obsdata_cache import ObsDataCache
 
 logger = logging.getLogger(__name__)
 
+#: ExperimentProcessor instance used in worker processes (cf.
+#: :func:`ExperimentProcessor._run_parallel`)
+_WORKER_PROCESSOR = None
+
+
+def _init_task_worker(processor):
+    global _WORKER_PROCESSOR
+    # each worker process uses its own obs data cache
+    processor.obs_data_cache = processor._make_obs_data_cache()
+    _WORKER_PROCESSOR = processor
+
+
+def _run_task_worker(task):
+    return _WORKER_PROCESSOR._run_task(*task)
+
 
 class ExperimentProcessor(ProcessingEngine, HasColocator):
     """Processing engine for AeroVal experiment
@@ -29,7 +47,24 @@ class ExperimentProcessor(ProcessingEngine, HasColocator):
 
     """
 
-    def _run_single_entry(self, model_name, obs_name, var_list):
+    def _run_single_entry(self, model_name, obs_name, var_list, colocated_files=None):
+        """Process one model / obs combination
+
+        Parameters
+        ----------
+        model_name : str
+            name of model
+        obs_name : str
+            name of observation
+        var_list : list, optional
+            variables to be processed
+        colocated_files : list or dict, optional
+            colocated data files that have already been computed for this
+            combination (cf. :func:`_run_parallel`). If provided, colocation
+            is not run again and these files are converted to json. For
+            superobs entries, this is a dict with the colocated data files of
+            each individual observation (keys are the obs names).
+        """
         if model_name == obs_name:
             msg = f"Cannot run same dataset against each other ({model_name} vs. {obs_name})"
             logger.info(msg)
@@ -38,11 +73,13 @@ class ExperimentProcessor(ProcessingEngine, HasColocator):
         if ocfg["is_superobs"]:
             try:
                 engine = SuperObsEngine(self.cfg)
+                engine.obs_data_cache = self.obs_data_cache
                 engine.run(
                     model_name=model_name,
                     obs_name=obs_name,
                     var_list=var_list,
                     try_colocate_if_missing=True,
+                    colocated_files=colocated_files,
                 )
             except Exception:
                 if self.raise_exceptions:
@@ -56,7 +93,9 @@ class ExperimentProcessor(ProcessingEngine, HasColocator):
             )
         else:
             col = self.get_colocator(model_name, obs_name)
-            if self.cfg.processing_opts.only_json:
+            if colocated_files is not None:
+                files_to_convert = colocated_files
+            elif self.cfg.processing_opts.only_json:
                 files_to_convert = col.get_available_coldata_files(var_list)
             else:
                 col.run(var_list)
@@ -72,6 +111,146 @@ class ExperimentProcessor(ProcessingEngine, HasColocator):
                 engine = ColdataToJsonEngine(self.cfg)
                 engine.run(files_to_convert)
 
+    def _run_task(self, what, model_name, obs_name, var_list):
+        """Run one task of :func:`_run_parallel` (executed in worker process)
+
+        Returns
+        -------
+        list
+            output files of the task (colocated data files or model maps
+            json files)
+        """
+        if what == "maps":
+            engine = ModelMapsEngine(self.cfg)
+            return engine.run(model_list=[model_name], var_list=var_list)
+        col = self.get_colocator(model_name, obs_name)
+        col.run(var_list)
+        return col.files_written
+
+    def _get_task_worker(self):
+        """Copy of this processor that is sent to the worker processes of :func:`_run_parallel`
+
+        The obs data cache is not shared with the workers (it cannot be
+        pickled, which is needed e.g. for the spawn start method of worker
+        processes), instead each worker creates its own cache (cf.
+        :func:`_init_task_worker`).
+        """
+        worker = copy.copy(self)
+        worker.obs_data_cache = None
+        return worker
+
+    def _make_obs_data_cache(self):
+        """Create experiment-scoped obs data cache (cf. :attr:`obs_data_cache`)
+
+        Returns
+        -------
+        ObsDataCache, optional
+            cache instance or None, if caching is deactivated (i.e. option
+            `obs_data_cache_max_gb` in :attr:`cfg.processing_opts` is 0).
+        """
+        max_gb = self.cfg.processing_opts.obs_data_cache_max_gb
+        if not max_gb:
+            return None
+        return ObsDataCache(max_size=max_gb * 1e9)
+
+    def _get_colocation_tasks(self, model_list, obs_list, var_list):
+        """Get colocation tasks that can be run independently of each other
+
+        Returns
+        -------
+        list
+            list of (model name, obs name, var_list) tuples. For superobs
+            entries, the tasks of the individual observations are included
+            (each model / obs combination is colocated only once).
+        """
+        tasks = {}
+        for obs_name in obs_list:
+            ocfg = self.cfg.get_obs_entry(obs_name)
+            if ocfg["is_superobs"]:
+                sobs_vars = var_list if var_list is not None else ocfg["obs_vars"]
+                if isinstance(sobs_vars, str):
+                    sobs_vars = [sobs_vars]
+                entries = [(oname, sobs_vars) for oname in ocfg["obs_id"]]
+            elif ocfg["only_superobs"]:
+                continue
+            else:
+                entries = [(obs_name, var_list)]
+            for oname, ovars in entries:
+                for model_name in model_list:
+                    if model_name == oname:
+                        continue
+                    key = (model_name, oname)
+                    if not key in tasks:
+                        tasks[key] = ovars
+                    elif tasks[key] is None or ovars is None:
+                        tasks[key] = None
+                    else:
+                        tasks[key] = tasks[key] + [x for x in ovars if not x in tasks[key]]
+        return [(*key, ovars) for key, ovars in tasks.items()]
+
+    def _run_parallel(self, model_list, obs_list, var_list, num_workers):
+        """Process experiment using multiple processes
+
+        Model maps and colocation of all model / obs combinations (including
+        the individual observations of superobs entries) are computed in
+        parallel. Afterwards, the colocated data is converted to json and
+        the superobs entries are processed, one after another, in the same
+        order as in serial processing, since these steps write to json files
+        that are shared between model / obs combinations.
+        """
+        tasks = []
+        if self.cfg.webdisp_opts.add_model_maps:
+            tasks.extend(("maps", model_name, None, var_list) for model_name in model_list)
+        do_colocation = not (
+            self.cfg.processing_opts.only_model_maps or self.cfg.processing_opts.only_json
+        )
+        if do_colocation:
+            tasks.extend(
+                ("colocation", *task)
+                for task in self._get_colocation_tasks(model_list, obs_list, var_list)
+            )
+
+        colocated_files = {}
+        with ProcessPoolExecutor(
+            max_workers=min(num_workers, max(len(tasks), 1)),
+            initializer=_init_task_worker,
+            initargs=(self._get_task_worker(),),
+        ) as executor:
+            futures = [executor.submit(_run_task_worker, task) for task in tasks]
+            try:
+                for (what, model_name, obs_name, _), future in zip(tasks, futures):
+                    try:
+                        files = future.result()
+                    except Exception:
+                        if self.raise_exceptions:
+                            raise
+                        logger.warning(
+                            f"Failed to run {what} task for {model_name} / {obs_name}",
+                            exc_info=True,
+                        )
+                        files = []
+                    if what == "colocation":
+                        colocated_files[(model_name, obs_name)] = files
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        if self.cfg.processing_opts.only_model_maps:
+            return
+        # single writer phase
+        for obs_name in obs_list:
+            for model_name in model_list:
+                if not do_colocation:
+                    files = None
+                elif self.cfg.get_obs_entry(obs_name)["is_superobs"]:
+                    files = {
+                        oname: colocated_files.get((model_name, oname), [])
+                        for oname in self.cfg.get_obs_entry(obs_name)["obs_id"]
+                    }
+                else:
+                    files = colocated_files.get((model_name, obs_name), [])
+                self._run_single_entry(model_name, obs_name, var_list, colocated_files=files)
+
     def run(self, model_name=None, obs_name=None, var_list=None, update_interface=True):
         """Create colocated data and json files for model / obs combination
 
@@ -123,16 +302,25 @@ class ExperimentProcessor(ProcessingEngine, HasColocator):
 
         logger.info("Start processing")
 
-        # compute model maps (completely independent of obs-eval
-        # processing below)
-        if self.cfg.webdisp_opts.add_model_maps:
-            engine = ModelMapsEngine(self.cfg)
-            engine.run(model_list=model_list, var_list=var_list)
+        # observation data is loaded once and shared by all models
+        self.obs_data_cache = self._make_obs_data_cache()
+        try:
+            num_workers = self.cfg.processing_opts.num_workers
+            if num_workers is not None and num_workers > 1:
+                self._run_parallel(model_list, obs_list, var_list, num_workers)
+            else:
+                # compute model maps (completely independent of obs-eval
+                # processing below)
+                if self.cfg.webdisp_opts.add_model_maps:
+                    engine = ModelMapsEngine(self.cfg)
+                    engine.run(model_list=model_list, var_list=var_list)
 
-        if not self.cfg.processing_opts.only_model_maps:
-            for obs_name in obs_list:
-                for model_name in model_list:
-                    self._run_single_entry(model_name, obs_name, var_list)
+                if not self.cfg.processing_opts.only_model_maps:
+                    for obs_name in obs_list:
+                        for model_name in model_list:
+                            self._run_single_entry(model_name, obs_name, var_list)
+        finally:
+            self.obs_data_cache = None
 
         if update_interface:
             self.update_interface()
@@ -0,0 +1,634 @@
+"""
+Statistics of colocated data for many (region, period, season) groups
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from pyaerocom import const
+from pyaerocom._warnings import ignore_warnings
+from pyaerocom.aeroval.helpers import _period_str_to_timeslice
+from pyaerocom.colocateddata import ColocatedData
+from pyaerocom.exceptions import (
+    DataCoverageError,
+    DataDimensionError,
+    TemporalResolutionError,
+    UnknownRegion,
+)
+from pyaerocom.helpers_landsea_masks import get_mask_values, load_region_mask_xr
+from pyaerocom.mathutils import calc_statistics_batched, corr, unstack_statistics
+from pyaerocom.region import Region
+from pyaerocom.region_defs import REGION_DEFS
+from pyaerocom.tstype import TsType
+
+logger = logging.getLogger(__name__)
+
+#: Maximum number of data values per array in a single call of
+#: :func:`calc_statistics_batched` (cf. :func:`GroupedColdataStats.calc_stats_many` and
+#: :func:`GroupedColdataStats.calc_stats_timeseries`)
+MAX_BATCH_SIZE = 2**22
+
+
+class _RegionSubset:
+    """Grid cells / stations of colocated data that belong to a region"""
+
+    def __init__(self, cells, grid_shape, outside=None, grid_sel=None):
+        #: indices of cells (in flattened spatial dimension(s)) in region
+        self.cells = cells
+        #: spatial shape of filtered data (lat, lon) or (station_name,)
+        self.grid_shape = grid_shape
+        #: boolean mask of selected cells that are set to NaN (or None)
+        self.outside = outside
+        #: index selection of latitude and longitude (4D data only)
+        self.grid_sel = grid_sel
+
+
+class GroupedColdataStats:
+    """Statistics of colocated data for many (region, period, season) groups
+
+    Computes the same statistics as filtering a :class:`ColocatedData` object
+    by period and season (cf.
+    :func:`pyaerocom.aeroval.coldatatojson_helpers._select_period_season_coldata`)
+    and by region (cf. :func:`ColocatedData.filter_region`) and calling
+    :func:`ColocatedData.calc_statistics` and
+    :func:`ColocatedData.calc_spatial_statistics` on the result, but without
+    creating a filtered copy of the data for each group. The data arrays are
+    extracted once and the time indices of each (period, season) and the grid
+    cells (or stations) of each region are computed once and reused for all
+    groups. The reductions are the same as in :class:`ColocatedData`, so the
+    results are the same (up to floating point rounding).
+
+    Note
+    ----
+    Only supports data with dimensions (data_source, time, station_name) or
+    (data_source, time, latitude, longitude).
+
+    Parameters
+    ----------
+    coldata : ColocatedData
+        colocated data
+    use_weights : bool
+        if True and data is 4D, area weights are applied
+    use_country : bool
+        if True, region IDs are first checked against countries available in
+        the data (cf. `check_country_meta` in :func:`ColocatedData.filter_region`)
+
+    Raises
+    ------
+    DataDimensionError
+        if data has unsupported dimensions
+    """
+
+    SUPPORTED_DIMS = (
+        ("data_source", "time", "station_name"),
+        ("data_source", "time", "latitude", "longitude"),
+    )
+
+    def __init__(self, coldata, use_weights=False, use_country=False):
+        dims = tuple(coldata.dims)
+        if not dims in self.SUPPORTED_DIMS:
+            raise DataDimensionError(f"Unsupported dimensions {dims} of ColocatedData")
+        self.coldata = coldata
+        self.use_weights = use_weights
+        self.use_country = use_country
+        self.is_4d = len(dims) == 4
+
+        values = coldata.data.values
+        numtime = values.shape[1]
+        self.grid_shape = values.shape[2:]
+        # (time, cells) arrays of obs and model data
+        self.obs = values[0].reshape(numtime, -1)
+        self.mod = values[1].reshape(numtime, -1)
+
+        self._time_idx = {}
+        self._regions = {}
+        self._weights = {}
+
+    def time_index(self, period, season):
+        """Indices of time stamps in period and season
+
+        Parameters
+        ----------
+        period : str
+            period, e.g. "2010-2015"
+        season : str
+            season (e.g. "all", "DJF")
+
+        Raises
+        ------
+        DataCoverageError
+            if no data is available in period or season
+        TemporalResolutionError
+            if season is selected for data with resolution lower than monthly
+
+        Returns
+        -------
+        ndarray
+            time indices
+        """
+        key = (period, season)
+        if not key in self._time_idx:
+            self._time_idx[key] = self._find_time_index(period, season)
+        result = self._time_idx[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _find_time_index(self, period, season):
+        tslice = _period_str_to_timeslice(period)
+        arr = self.coldata.data
+        sl = arr.indexes["time"].slice_indexer(tslice.start, tslice.stop)
+        idx = np.arange(len(arr.time))[sl]
+        if len(idx) == 0:
+            return DataCoverageError(f"No data available in period {period}")
+        if season != "all":
+            seasons = arr["season"].values[idx]
+            if not season in seasons:
+                return DataCoverageError(f"No data available in {season} in period {period}")
+            elif TsType(self.coldata.ts_type) < "monthly":
+                return TemporalResolutionError(
+                    "Season selection is only available for monthly or higher resolution data"
+                )
+            idx = idx[seasons == season]
+        return idx
+
+    def region_subset(self, region_id):
+        """Grid cells (or stations) that belong to a region
+
+        Parameters
+        ----------
+        region_id : str
+            ID of region (or country, if `use_country` is True)
+
+        Returns
+        -------
+        _RegionSubset
+            cells of region
+        """
+        if not region_id in self._regions:
+            try:
+                self._regions[region_id] = self._find_region_subset(region_id)
+            except Exception as e:
+                self._regions[region_id] = e
+        result = self._regions[region_id]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _find_region_subset(self, region_id):
+        coldata = self.coldata
+        if self.use_country:
+            if region_id in coldata.countries_available:
+                return self._country_subset(region_id, "country")
+            elif region_id in coldata.country_codes_available:
+                return self._country_subset(region_id, "country_code")
+        if region_id in const.HTAP_REGIONS:
+            return self._mask_subset(region_id)
+        elif region_id in REGION_DEFS:
+            return self._latlon_subset(region_id)
+        raise UnknownRegion(f"no such region defined {region_id}")
+
+    def _country_subset(self, country, what):
+        # cf. ColocatedData.apply_country_filter
+        if not self.coldata._check_latlon_coords():
+            raise NotImplementedError("Cannot yet filter country for 3D ColocatedData object")
+        mask = self.coldata.data[what].values == country
+        if mask.sum() == 0:
+            raise DataCoverageError(f"No data available in country {country} in ColocatedData")
+        cells = np.flatnonzero(mask)
+        return _RegionSubset(cells, (len(cells),))
+
+    def _mask_subset(self, region_id):
+        # cf. ColocatedData.apply_region_mask
+        arr = self.coldata.data
+        mask = load_region_mask_xr(region_id)
+        if self.is_4d:
+            # grid cells outside the mask are set to NaN (and not removed)
+            mask = mask.interp_like(arr)
+            inside = mask.transpose("latitude", "longitude").values.astype(bool)
+            cells = np.arange(inside.size)
+            return _RegionSubset(cells, self.grid_shape, outside=~inside.ravel())
+        mask_vals = get_mask_values(arr.latitude.values, arr.longitude.values, mask)
+        keep = ~(mask_vals < 1)
+        if not keep.any():
+            raise DataCoverageError(f"No data available in region {region_id}")
+        cells = np.flatnonzero(keep)
+        return _RegionSubset(cells, (len(cells),))
+
+    def _latlon_subset(self, region_id):
+        # cf. ColocatedData.apply_latlon_filter
+        reg = Region(region_id)
+        lon_range, lat_range = reg.lon_range, reg.lat_range
+        if all([x is None for x in (lat_range, lon_range)]):
+            raise ValueError(
+                "Please provide input, either for lat_range or lon_range or region_id"
+            )
+        if lon_range is None:
+            lon_range = [-180, 180]
+        if lat_range is None:
+            lat_range = [-90, 90]
+        if lat_range[0] > lat_range[1]:
+            raise ValueError(
+                f"Lower latitude bound {lat_range[0]} cannot exceed upper "
+                f"latitude bound {lat_range[1]}"
+            )
+        arr = self.coldata.data
+        if not self.is_4d:
+            self.coldata._check_latlon_coords()
+            lons, lats = arr.longitude.data, arr.latitude.data
+            latmask = np.logical_and(lats > lat_range[0], lats < lat_range[1])
+            if lon_range[0] > lon_range[1]:
+                _either = np.logical_and(lons >= -180, lons < lon_range[1])
+                _or = np.logical_and(lons > lon_range[0], lons <= 180)
+                lonmask = np.logical_or(_either, _or)
+            else:
+                lonmask = np.logical_and(lons > lon_range[0], lons < lon_range[1])
+            mask = latmask & lonmask
+            if mask.sum() == 0:
+                raise DataCoverageError(
+                    f"No data available in latrange={lat_range} and "
+                    f"lonrange={lon_range} in ColocatedData"
+                )
+            cells = np.flatnonzero(mask)
+            return _RegionSubset(cells, (len(cells),))
+
+        if lon_range[0] > lon_range[1]:
+            raise NotImplementedError(
+                "Filtering longitude over 180 deg edge is not yet possible in "
+                "3D ColocatedData..."
+            )
+        # same as label based slicing via DataArray.sel
+        lat_sl = arr.indexes["latitude"].slice_indexer(lat_range[0], lat_range[1])
+        lon_sl = arr.indexes["longitude"].slice_indexer(lon_range[0], lon_range[1])
+        lat_idx = np.arange(self.grid_shape[0])[lat_sl]
+        lon_idx = np.arange(self.grid_shape[1])[lon_sl]
+        cells = (lat_idx[:, np.newaxis] * self.grid_shape[1] + lon_idx).ravel()
+        return _RegionSubset(
+            cells, (len(lat_idx), len(lon_idx)), grid_sel=dict(latitude=lat_sl, longitude=lon_sl)
+        )
+
+    def get_data(self, region_id, period, season):
+        """Get obs and model data of a group
+
+        Parameters
+        ----------
+        region_id : str
+            ID of region
+        period : str
+            period, e.g. "2010-2015"
+        season : str
+            season (e.g. "all", "DJF")
+
+        Raises
+        ------
+        DataCoverageError
+            if no data is available in group
+        TemporalResolutionError
+            if season is selected for data with resolution lower than monthly
+
+        Returns
+        -------
+        ndarray
+            obs data with shape (time, cells)
+        ndarray
+            model data with shape (time, cells)
+        _RegionSubset
+            cells of region
+        """
+        tidx = self.time_index(period, season)
+        subset = self.region_subset(region_id)
+        obs, mod = self._select(tidx, subset)
+        if np.isnan(obs).all() and np.isnan(mod).all():
+            raise DataCoverageError(f"All data is NaN in {region_id}")
+        return obs, mod, subset
+
+    def _select(self, tidx, subset):
+        obs = self.obs[np.ix_(tidx, subset.cells)]
+        mod = self.mod[np.ix_(tidx, subset.cells)]
+        if subset.outside is not None:
+            obs[:, subset.outside] = np.nan
+            mod[:, subset.outside] = np.nan
+        return obs, mod
+
+    def period_bounds(self, periods, freq):
+        """Time indices of output periods (e.g. months) of a statistics time series
+
+        The time stamps of the data are grouped by output period via integer
+        period codes (e.g. months since 1970), which is equivalent to partial
+        string indexing of the time dimension (e.g. ``sel(time="2010-01")``)
+        for each period.
+
+        Parameters
+        ----------
+        periods : array-like
+            time stamps (datetime64) of output periods
+        freq : str
+            output frequency (e.g. monthly)
+
+        Returns
+        -------
+        ndarray
+            indices of time stamps sorted by period
+        ndarray
+            start and stop positions (in sorted indices) of each period,
+            shape (num_periods, 2). Periods without data have start == stop.
+        """
+        tstr = TsType(freq).to_numpy_freq()
+        codes = self.coldata.data.time.values.astype(f"datetime64[{tstr}]").astype(np.int64)
+        targets = np.asarray(periods).astype(f"datetime64[{tstr}]").astype(np.int64)
+        tidx = np.argsort(codes, kind="stable")
+        codes = codes[tidx]
+        start = np.searchsorted(codes, targets, side="left")
+        stop = np.searchsorted(codes, targets, side="right")
+        return tidx, np.stack([start, stop], axis=1)
+
+    def regional_timeseries(self, region_id, period, season):
+        """Regional mean timeseries of obs and model data of a group
+
+        Same as :func:`ColocatedData.get_regional_timeseries` of data subset.
+
+        Parameters
+        ----------
+        region_id : str
+            ID of region
+        period : str
+            period, e.g. "2010-2015"
+        season : str
+            season (e.g. "all", "DJF")
+
+        Returns
+        -------
+        dict
+            dictionary containing regional timeseries for model (key `mod`)
+            and obsdata (key `obs`) and name of region.
+        """
+        obs, mod, subset = self.get_data(region_id, period, season)
+        time = self.coldata.data.time.values[self.time_index(period, season)]
+        if self.is_4d:
+            dims = ("time", "latitude", "longitude")
+            shape = (len(time), *subset.grid_shape)
+            obs_ts = xr.DataArray(obs.reshape(shape), dims=dims).mean(dim=dims[1:])
+            mod_ts = xr.DataArray(mod.reshape(shape), dims=dims).mean(dim=dims[1:])
+        else:
+            dims = ("time", "station_name")
+            obs_ts = xr.DataArray(obs, dims=dims).mean(dim="station_name")
+            mod_ts = xr.DataArray(mod, dims=dims).mean(dim="station_name")
+        return {
+            "obs": pd.Series(obs_ts.data, time),
+            "mod": pd.Series(mod_ts.data, time),
+            "region": region_id,
+        }
+
+    def _get_weights(self, subset):
+        """Area weights (lat, lon) of region grid (cf. ColocatedData.area_weights)"""
+        key = id(subset)
+        if not key in self._weights:
+            sel = dict(time=[0])
+            if subset.grid_sel is not None:
+                sel.update(subset.grid_sel)
+            arr = self.coldata.data.isel(sel)
+            self._weights[key] = ColocatedData(arr).area_weights[0][0]
+        return self._weights[key]
+
+    def calc_stats(self, region_id, period, season):
+        """Compute statistics of a group
+
+        Parameters
+        ----------
+        region_id : str
+            ID of region
+        period : str
+            period, e.g. "2010-2015"
+        season : str
+            season (e.g. "all", "DJF")
+
+        Raises
+        ------
+        DataCoverageError
+            if no data is available in group
+        TemporalResolutionError
+            if season is selected for data with resolution lower than monthly
+
+        Returns
+        -------
+        dict
+            statistics (as returned by :func:`ColocatedData.calc_statistics`)
+            with additional spatial and temporal correlation (keys
+            `R_spatial_mean` and `R_temporal_median`)
+        """
+        return self._calc_stats_batched([self.get_data(region_id, period, season)])[0]
+
+    def calc_stats_many(self, groups):
+        """Compute statistics of many groups at once
+
+        Same as :func:`calc_stats` for each group, but the statistics of all
+        groups are computed at once (cf. :func:`_calc_stats_batched`).
+
+        Parameters
+        ----------
+        groups : list
+            (region_id, period, season) tuples
+
+        Raises
+        ------
+        UnknownRegion
+            if a region ID is invalid
+
+        Returns
+        -------
+        list
+            statistics of each group (cf. :func:`calc_stats`), None for
+            groups without data (i.e. where :func:`calc_stats` raises
+            :class:`DataCoverageError` or :class:`TemporalResolutionError`)
+        """
+        selections = []
+        for region_id, period, season in groups:
+            try:
+                selections.append(self.get_data(region_id, period, season))
+            except (DataCoverageError, TemporalResolutionError):
+                selections.append(None)
+        stats = iter(self._calc_stats_batched([sel for sel in selections if sel is not None]))
+        return [None if sel is None else next(stats) for sel in selections]
+
+    def _calc_stats_batched(self, selections):
+        """Statistics of many data selections (as returned by :func:`get_data`)
+
+        The data of each selection is one row of (NaN padded) arrays, which
+        are passed to :func:`calc_statistics_batched` in chunks of rows to
+        limit memory (cf. :attr:`MAX_BATCH_SIZE`). The spatial and temporal
+        correlations are computed for each selection.
+        """
+        weighted = self.use_weights and self.is_4d
+        all_stats = []
+        for batch in _batch_rows([obs.size for obs, _, _ in selections]):
+            rowsize = max(selections[i][0].size for i in batch)
+            obs_rows = np.full((len(batch), rowsize), np.nan)
+            mod_rows = np.full((len(batch), rowsize), np.nan)
+            weight_rows = np.full((len(batch), rowsize), np.nan) if weighted else None
+            for row, i in enumerate(batch):
+                obs, mod, subset = selections[i]
+                obs_rows[row, : obs.size] = obs.ravel()
+                mod_rows[row, : mod.size] = mod.ravel()
+                if weighted:
+                    weight_rows[row, : obs.size] = np.tile(
+                        self._get_cell_weights(subset), len(obs)
+                    )
+            stats = calc_statistics_batched(mod_rows, obs_rows, weights=weight_rows)
+            all_stats.extend(unstack_statistics(stats))
+
+        for stats, (obs, mod, subset) in zip(all_stats, selections):
+            stats["totnum"] = float(obs.size)
+            stats["num_coords_tot"] = obs.shape[1]
+            stats["num_coords_with_data"] = (np.count_nonzero(~np.isnan(obs), axis=0) > 0).sum()
+
+            # spatial correlation (cf. ColocatedData.calc_spatial_statistics)
+            weights = self._get_cell_weights(subset)
+            spatial_weights = None
+            if weights is not None:
+                spatial_weights = np.nanmean(np.broadcast_to(weights, obs.shape), axis=0)
+            obs_mean, mod_mean = _time_mean(obs, mod, time_contiguous=not self.is_4d)
+            stats["R_spatial_mean"] = _calc_corr(mod_mean, obs_mean, spatial_weights)
+
+            stats["R_temporal_median"] = _calc_temporal_corr_median(obs, mod)
+        return all_stats
+
+    def calc_stats_timeseries(self, region_id, periods, freq):
+        """Compute statistics of a region for each output period of a time series
+
+        Same as :func:`ColocatedData.calc_statistics` of the regional subset
+        for each output period (e.g. month), but the data is grouped by
+        output period only once (cf. :func:`period_bounds`) and the
+        statistics of many periods are computed at once (cf.
+        :func:`pyaerocom.mathutils.calc_statistics_batched` and
+        :attr:`MAX_BATCH_SIZE`).
+
+        Parameters
+        ----------
+        region_id : str
+            ID of region
+        periods : array-like
+            time stamps (datetime64) of output periods
+        freq : str
+            output frequency (e.g. monthly)
+
+        Raises
+        ------
+        DataCoverageError
+            if all data in region is NaN
+
+        Returns
+        -------
+        list
+            statistics of each output period (None for periods without
+            time stamps)
+        """
+        subset = self.region_subset(region_id)
+        tidx, bounds = self.period_bounds(periods, freq)
+        obs, mod = self._select(tidx, subset)
+        if np.isnan(obs).all() and np.isnan(mod).all():
+            raise DataCoverageError(f"All data is NaN in {region_id}")
+        weights = self._get_cell_weights(subset)
+
+        # number of valid obs of each cell in each period
+        numvalid = np.zeros((len(obs) + 1, obs.shape[1]), dtype=int)
+        np.cumsum(~np.isnan(obs), axis=0, out=numvalid[1:])
+        numvalid = numvalid[bounds[:, 1]] - numvalid[bounds[:, 0]]
+        num_coords_with_data = (numvalid > 0).sum(axis=1)
+
+        # statistics of many periods at once, data of each period is one row
+        # of (NaN padded) arrays, processed in chunks of rows to limit memory
+        numtime = bounds[:, 1] - bounds[:, 0]
+        numcells = obs.shape[1]
+        rowsize = numtime.max(initial=0) * numcells
+        if weights is not None:
+            weights = np.tile(weights, rowsize // numcells)
+        chunksize = max(MAX_BATCH_SIZE // max(rowsize, 1), 1)
+        all_stats = []
+        for first in range(0, len(bounds), chunksize):
+            chunk = bounds[first : first + chunksize]
+            obs_rows = np.full((len(chunk), rowsize), np.nan)
+            mod_rows = np.full((len(chunk), rowsize), np.nan)
+            for row, (start, stop) in enumerate(chunk):
+                obs_rows[row, : (stop - start) * numcells] = obs[start:stop].ravel()
+                mod_rows[row, : (stop - start) * numcells] = mod[start:stop].ravel()
+            stats = calc_statistics_batched(mod_rows, obs_rows, weights=weights)
+            all_stats.extend(unstack_statistics(stats))
+        result = []
+        for stats_per, ntime, ncd in zip(all_stats, numtime, num_coords_with_data):
+            if ntime == 0:
+                result.append(None)
+                continue
+            stats_per["totnum"] = float(ntime * numcells)
+            stats_per["num_coords_tot"] = numcells
+            stats_per["num_coords_with_data"] = ncd
+            result.append(stats_per)
+        return result
+
+    def _get_cell_weights(self, subset):
+        """Flattened area weights of region cells (None, if not applicable)"""
+        if self.use_weights and self.is_4d:
+            return self._get_weights(subset).ravel()
+        return None
+
+
+def _batch_rows(rowsizes):
+    """Split rows into batches of at most :attr:`MAX_BATCH_SIZE` (NaN padded) values
+
+    Yields lists of row indices (at least one row per batch).
+    """
+    batch, rowsize = [], 0
+    for i, size in enumerate(rowsizes):
+        if batch and max(rowsize, size) * (len(batch) + 1) > MAX_BATCH_SIZE:
+            yield batch
+            batch, rowsize = [], 0
+        batch.append(i)
+        rowsize = max(rowsize, size)
+    if batch:
+        yield batch
+
+
+def _time_mean(obs, mod, time_contiguous=False):
+    """Temporal mean of obs and model data (time, cells)
+
+    The memory layout matches the one of the filtered ColocatedData objects
+    (filtering of station data yields time as the fastest varying axis) so
+    that the summation order and hence the results are identical.
+    """
+    if time_contiguous:
+        # memory layout (cells, data_source, time)
+        data = np.ascontiguousarray(np.stack([obs.T, mod.T], axis=1)).transpose(1, 2, 0)
+    else:
+        data = np.stack([obs, mod])
+    return xr.DataArray(data, dims=("data_source", "time", "cells")).mean(dim="time").values
+
+
+def _calc_corr(data, ref_data, weights=None):
+    """Correlation coefficient as computed in :func:`pyaerocom.mathutils.calc_statistics`"""
+    mask = ~np.isnan(ref_data) * ~np.isnan(data)
+    if not mask.sum() > 1:
+        return np.nan
+    if weights is not None:
+        weights = weights[mask]
+        weights = weights / weights.max()
+    return corr(data[mask], ref_data[mask], weights)
+
+
+def _calc_temporal_corr_median(obs, mod):
+    """Median temporal correlation of sites with more than 2 valid obs values"""
+    if len(obs) < 3:
+        return np.nan
+    # Use only sites that contain at least 3 valid data points (otherwise
+    # correlation will be 1).
+    obs_ok = np.count_nonzero(~np.isnan(obs), axis=0) > 2
+    if not obs_ok.any():
+        return np.nan
+    dims = ("time", "station_name")
+    corr_time = xr.corr(
+        xr.DataArray(mod[:, obs_ok], dims=dims),
+        xr.DataArray(obs[:, obs_ok], dims=dims),
+        dim="time",
+    )
+    with ignore_warnings(RuntimeWarning, "Mean of empty slice", "All-NaN slice encountered"):
+        return np.nanmedian(corr_time.data)
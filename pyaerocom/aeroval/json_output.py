@@ -0,0 +1,135 @@
+"""
+Buffered output of AeroVal json files that are shared between several entries
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+
+from pyaerocom._lowlevel_helpers import read_json, write_json
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover (not available on Windows)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+#: default directory of lock files (cf. :class:`JSONOutputBuffer`)
+LOCK_DIR_DEFAULT = os.path.join(tempfile.gettempdir(), "pyaerocom_json_locks")
+
+
+@contextmanager
+def _locked(file_path, lock_dir):
+    """Exclusive lock of a json file (using a lock file in `lock_dir`)
+
+    The lock files are not removed, since other processes may be waiting
+    for the lock on the same file.
+    """
+    if fcntl is None:
+        logger.warning(f"File locking not supported on this platform, cannot lock {file_path}")
+        yield
+        return
+    os.makedirs(lock_dir, exist_ok=True)
+    name = hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()
+    with open(os.path.join(lock_dir, f"{name}.lock"), "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class JSONOutputBuffer:
+    """Buffer for updates of json files that are shared between entries
+
+    Many AeroVal json files (e.g. station time series or heatmap files)
+    contain the results of several models (or variables, observations), and
+    are updated once per entry. Instead of reading, updating and writing a
+    file for each update, the updates are collected in memory and each file
+    is written only once, in :func:`flush`. Existing content of the files is
+    kept (and updated) like for the individual updates.
+
+    Files are written to a temporary file first, which is then renamed to
+    the output file, so that the output file is never incomplete.
+
+    Parameters
+    ----------
+    lock : bool
+        if True, each file is locked (using a lock file in `lock_dir`) while
+        it is read, updated and written in :func:`flush`, so that several
+        processes may update the same files concurrently (only supported on
+        platforms with :mod:`fcntl`).
+    lock_dir : str, optional
+        directory of lock files (one per json file, named after the hash of
+        the json file path), which needs to be the same for all processes
+        that write to the same files. Defaults to :attr:`LOCK_DIR_DEFAULT`.
+    use_orjson : bool
+        if True, files are encoded with orjson, if it is installed (cf.
+        :func:`pyaerocom._lowlevel_helpers.write_json`)
+    """
+
+    def __init__(self, lock=False, lock_dir=None, use_orjson=False):
+        self.lock = lock
+        self.lock_dir = LOCK_DIR_DEFAULT if lock_dir is None else lock_dir
+        self.use_orjson = use_orjson
+        self._updates = {}
+
+    def __len__(self):
+        return len(self._updates)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    @property
+    def files(self):
+        """List of files with pending updates"""
+        return list(self._updates)
+
+    def add_entry(self, file_path, keys, value):
+        """Add (or replace) entry in (nested) json file
+
+        Parameters
+        ----------
+        file_path : str
+            json file to be updated
+        keys : list
+            keys of (nested) entry, e.g. `[var_name, obs_name]` updates
+            `content[var_name][obs_name]`. Missing levels are created.
+        value
+            new value of entry (needs to be json serialisable)
+        """
+        if len(keys) == 0:
+            raise ValueError("Need at least one key to add entry to json file")
+        self._updates.setdefault(os.fspath(file_path), {})[tuple(keys)] = value
+
+    def flush(self):
+        """Write all pending updates to their json files"""
+        for file_path, updates in self._updates.items():
+            if self.lock:
+                with _locked(file_path, self.lock_dir):
+                    self._update_file(file_path, updates, self.use_orjson)
+            else:
+                self._update_file(file_path, updates, self.use_orjson)
+        self._updates = {}
+
+    @staticmethod
+    def _update_file(file_path, updates, use_orjson=False):
+        current = read_json(file_path) if os.path.exists(file_path) else {}
+        for keys, value in updates.items():
+            entry = current
+            for key in keys[:-1]:
+                entry = entry.setdefault(key, {})
+            entry[keys[-1]] = value
+        tmp_file = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            write_json(current, tmp_file, use_orjson=use_orjson, ignore_nan=True)
+            os.replace(tmp_file, file_path)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
@@ -231,6 +231,21 @@ class EvalRunOptions(ConstrainedContainer):
         #: If True, process only maps (skip obs evaluation)
         self.only_model_maps = False
         self.obs_only = False
+        #: Number of processes used to run colocation and model maps jobs
+        #: of an experiment in parallel (1: serial processing)
+        self.num_workers = 1
+        #: Maximum size (in GB) of in-memory cache for observation data that
+        #: is shared by all models of an experiment (0: no caching)
+        self.obs_data_cache_max_gb = 0.0
+        #: If True, shared json output files (e.g. station time series) are
+        #: locked while they are updated, for experiments that are processed
+        #: by several processes at the same time
+        self.lock_json_files = False
+        #: If True, the json files of the colocated data (maps, station time
+        #: series, heatmaps) are encoded with orjson, if it is installed
+        #: (faster, but not byte-identical output, cf.
+        #: :func:`pyaerocom._lowlevel_helpers.write_json`)
+        self.use_orjson = False
         self.update(**kwargs)
 
 
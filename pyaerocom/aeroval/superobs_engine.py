@@ -17,16 +17,21 @@ class SuperObsEngine(ProcessingEngine, HasColocator):
     Class to handle the processing of combined obs datasets
     """
 
-    def run(self, model_name, obs_name, var_list, try_colocate_if_missing=True):
+    def run(
+        self, model_name, obs_name, var_list, try_colocate_if_missing=True, colocated_files=None
+    ):
 
         self._process_entry(
             model_name=model_name,
             obs_name=obs_name,
             var_list=var_list,
             try_colocate_if_missing=try_colocate_if_missing,
+            colocated_files=colocated_files,
         )
 
-    def _process_entry(self, model_name, obs_name, var_list, try_colocate_if_missing):
+    def _process_entry(
+        self, model_name, obs_name, var_list, try_colocate_if_missing, colocated_files=None
+    ):
 
         sobs_cfg = self.cfg.obs_cfg.get_entry(obs_name)
 
@@ -39,7 +44,9 @@ class SuperObsEngine(ProcessingEngine, HasColocator):
 
         for var_name in var_list:
             try:
-                self._run_var(model_name, obs_name, var_name, try_colocate_if_missing)
+                self._run_var(
+                    model_name, obs_name, var_name, try_colocate_if_missing, colocated_files
+                )
             except Exception:
                 if self.raise_exceptions:
                     raise
@@ -48,7 +55,9 @@ class SuperObsEngine(ProcessingEngine, HasColocator):
                     f"{model_name}, var {var_name}. Reason: {format_exc()}"
                 )
 
-    def _run_var(self, model_name, obs_name, var_name, try_colocate_if_missing):
+    def _run_var(
+        self, model_name, obs_name, var_name, try_colocate_if_missing, colocated_files=None
+    ):
         """
         Run evaluation of superobs entry
 
@@ -63,6 +72,13 @@ class SuperObsEngine(ProcessingEngine, HasColocator):
         try_colocate_if_missing : bool
             if True, then missing colocated data objects are computed on the
             fly.
+        colocated_files : dict, optional
+            colocated data files that have already been computed for the
+            individual observations (keys are obs names, values are lists of
+            files, cf. :func:`ExperimentProcessor._run_parallel`). If
+            provided, the colocated data file of each individual observation
+            is taken from these files (instead of searching the colocated
+            data directory or running the colocation).
 
         Raises
         ------
@@ -81,7 +97,11 @@ class SuperObsEngine(ProcessingEngine, HasColocator):
         vert_code = self.cfg.obs_cfg.get_entry(obs_name)["obs_vert_type"]
         for oname in obs_needed:
             fp, ts_type, vert_code = self._get_coldata_fileinfo(
-                model_name, oname, var_name, try_colocate_if_missing
+                model_name,
+                oname,
+                var_name,
+                try_colocate_if_missing,
+                None if colocated_files is None else colocated_files.get(oname, []),
             )
             coldata_files.append(fp)
             coldata_resolutions.append(ts_type)
@@ -123,10 +143,19 @@ class SuperObsEngine(ProcessingEngine, HasColocator):
         arr.attrs["obs_name"] = obs_name
         return arr
 
-    def _get_coldata_fileinfo(self, model_name, obs_name, var_name, try_colocate_if_missing):
+    def _get_coldata_fileinfo(
+        self, model_name, obs_name, var_name, try_colocate_if_missing, colocated_files=None
+    ):
         """Get fileinfo about existing colocated data object"""
         col = self.get_colocator(model_name, obs_name)
-        if self.reanalyse_existing:
+        if colocated_files is not None:
+            cdf = [fp for fp in colocated_files if self._file_has_var(fp, var_name)]
+            if len(cdf) == 0:
+                raise ValueError(
+                    f"Colocation of {model_name}, {obs_name}, {var_name} failed or did not "
+                    f"write any colocated data file"
+                )
+        elif self.reanalyse_existing:
             col.run(var_list=[var_name])
             cdf = col.files_written
         else:
@@ -145,3 +174,9 @@ class SuperObsEngine(ProcessingEngine, HasColocator):
         ts_type = meta["ts_type"]
         vert_code = self.cfg.obs_cfg.get_entry(obs_name)["obs_vert_type"]
         return (fp, ts_type, vert_code)
+
+    @staticmethod
+    def _file_has_var(fp, var_name):
+        """Check if colocated data file contains variable (based on filename)"""
+        meta = ColocatedData.get_meta_from_filename(fp)
+        return var_name in (meta["model_var"], meta["obs_var"])
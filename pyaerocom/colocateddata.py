@@ -21,7 +21,7 @@ from pyaerocom.exceptions import (
 )
 from pyaerocom.geodesy import get_country_info_coords
 from pyaerocom.helpers import to_datestring_YYYYMMDD
-from pyaerocom.helpers_landsea_masks import get_mask_value, load_region_mask_xr
+from pyaerocom.helpers_landsea_masks import get_mask_values, load_region_mask_xr
 from pyaerocom.mathutils import calc_statistics
 from pyaerocom.plot.plotscatter import plot_scatter
 from pyaerocom.region import Region
@@ -1713,17 +1713,13 @@ class ColocatedData:
         else:
             # data = data.flatten_latlondim_station_name()
 
-            drop_idx = []
-            nstats = len(arr.station_name)
-            for (lat, lon, stat) in data._iter_stats():
-                if get_mask_value(lat, lon, mask) < 1:
-                    drop_idx.append(stat)
+            drop = get_mask_values(arr.latitude.values, arr.longitude.values, mask) < 1
 
-            ndrop = len(drop_idx)
-            if ndrop == nstats:
+            ndrop = drop.sum()
+            if ndrop == len(drop):
                 raise DataCoverageError(f"No data available in region {region_id}")
             elif ndrop > 0:
-                arr = arr.drop_sel({"station_name": drop_idx})
+                arr = arr.isel(station_name=np.flatnonzero(~drop))
         data.data = arr
         return data
 
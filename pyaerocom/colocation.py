@@ -23,6 +23,8 @@ from pyaerocom.exceptions import (
 )
 from pyaerocom.filter import Filter
 from pyaerocom.helpers import (
+    _get_pandas_freq_and_loffset,
+    extract_latlon_dataarray,
     get_lowest_resolution,
     isnumeric,
     make_datetime_index,
@@ -30,6 +32,7 @@ from pyaerocom.helpers import (
 )
 from pyaerocom.time_resampler import TimeResampler
 from pyaerocom.tstype import TsType
+from pyaerocom.units_helpers import convert_unit
 from pyaerocom.variable import Variable
 
 logger = logging.getLogger(__name__)
@@ -573,6 +576,209 @@ def _colocate_site_data_helper_timecol(
     return pd.concat([obs_ts, grid_ts], axis=1, keys=["ref", "data"])
 
 
+def _get_aggregator(how):
+    """Get aggregator for pandas resampling (cf. :func:`resample_timeseries`)"""
+    if "percentile" in how:
+        p = int(how.split("percentile")[0])
+        return lambda x: np.nanpercentile(x, p)
+    return how
+
+
+def _resample_time_frame(df, ts_type, how, min_num_obs=None):
+    """Resample all columns of a DataFrame with DatetimeIndex at once
+
+    Same as :func:`pyaerocom.helpers.resample_timeseries` but applied to
+    all columns (stations) of the input DataFrame.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        data (index is time, columns are stations)
+    ts_type : str
+        output frequency
+    how : str
+        aggregator
+    min_num_obs : int, optional
+        minimum number of observations required per period
+
+    Returns
+    -------
+    pandas.DataFrame
+        resampled data
+    """
+    freq, loffset = _get_pandas_freq_and_loffset(TsType(ts_type).to_pandas_freq())
+    resampler = df.resample(freq)
+    out = resampler.agg(_get_aggregator(how))
+    if min_num_obs is not None:
+        out = out.where(resampler.count() >= min_num_obs)
+    if loffset is not None:
+        out.index = out.index + pd.Timedelta(loffset)
+    return out
+
+
+def _resample_time_long(values, times, columns, ts_type, how, min_num_obs=None):
+    """Resample data of many stations provided as flat arrays
+
+    Used for observations which may not be sampled on a regular time axis
+    (and may contain duplicate time stamps). All stations are binned onto
+    the output frequency in one groupby operation.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        data values
+    times : numpy.ndarray
+        time stamps corresponding to `values`
+    columns : numpy.ndarray
+        station (column) index corresponding to `values`
+    ts_type : str
+        output frequency
+    how : str
+        aggregator
+    min_num_obs : int, optional
+        minimum number of observations required per period
+
+    Returns
+    -------
+    pandas.DataFrame
+        resampled data (index is time, columns are stations)
+    """
+    freq, loffset = _get_pandas_freq_and_loffset(TsType(ts_type).to_pandas_freq())
+    df = pd.DataFrame({"station": columns, "value": values}, index=pd.DatetimeIndex(times))
+    grouped = df.groupby([pd.Grouper(freq=freq), "station"])["value"]
+    out = grouped.agg(_get_aggregator(how))
+    if min_num_obs is not None:
+        out = out.where(grouped.count() >= min_num_obs)
+    out = out.unstack("station")
+    if loffset is not None:
+        out.index = out.index + pd.Timedelta(loffset)
+    return out
+
+
+def _extract_site_data_nearest(data, lats, lons):
+    """
+    Nearest neighbour model data at site coordinates, circular in longitude
+
+    Site longitudes are wrapped into the longitude convention of the model
+    (e.g. 0 to 360 or -180 to 180) and, if the longitude coordinate of the
+    model is circular, the first longitude column is repeated shifted by
+    360 degrees, so that sites near the edges of the grid are assigned the
+    closest cell across the dateline, as done by the iris interpolation
+    in :func:`GriddedData.to_time_series`.
+
+    Parameters
+    ----------
+    data : GriddedData
+        model data (must contain latitude and longitude dimensions)
+    lats : array or similar
+        latitudes of sites
+    lons : array or similar
+        longitudes of sites
+
+    Returns
+    -------
+    DataArray
+        model data at site coordinates
+    """
+    arr = data.to_xarray()
+    lon_dim = arr.dims[data.cube.coord_dims("longitude")[0]]
+    lon0 = arr[lon_dim].values.min()
+    lons = (np.asarray(lons, dtype=float) - lon0) % 360 + lon0
+    if data.check_lon_circular():
+        first = arr.isel({lon_dim: [arr[lon_dim].values.argmin()]})
+        first = first.assign_coords({lon_dim: first[lon_dim] + 360})
+        arr = xr.concat([arr, first], dim=lon_dim)
+    return extract_latlon_dataarray(
+        arr, lats, lons, lon_dimname=lon_dim, method="nearest", check_domain=False
+    )
+
+
+def _colocate_site_data_arrays(
+    grid_data, grid_ts_type, obs_stat_data, var_ref, ts_type, resample_how, min_num_obs, time_idx
+):
+    """
+    Colocate model timeseries with observations of all stations at once
+
+    Array based alternative for the per-station colocation done via
+    :func:`_colocate_site_data_helper` in :func:`colocate_gridded_ungridded`.
+    The model data is resampled for all stations at once, the observations
+    are binned onto the output frequency in one operation per original
+    frequency of the observations.
+
+    Parameters
+    ----------
+    grid_data : pandas.DataFrame
+        model timeseries at all stations (index is time, columns are
+        stations, in the order of `obs_stat_data`)
+    grid_ts_type : str
+        frequency of model data
+    obs_stat_data : list
+        list of :class:`StationData` objects containing the observations
+    var_ref : str
+        variable to be used from `obs_stat_data`
+    ts_type : str
+        output frequency
+    resample_how : str or dict
+        aggregator(s) used for resampling (cf. :class:`TimeResampler`)
+    min_num_obs : int or dict, optional
+        minimum number of observations for resampling of time
+    time_idx : pandas.DatetimeIndex
+        output time index
+
+    Returns
+    -------
+    numpy.ndarray
+        colocated observations, shape (time, station)
+    numpy.ndarray
+        colocated model data, shape (time, station)
+    """
+    resampler = TimeResampler()
+    stat_num = len(obs_stat_data)
+    obs_arr = np.full((len(time_idx), stat_num), np.nan)
+
+    # group stations by original frequency of observations
+    groups = {}
+    for i, obs_stat in enumerate(obs_stat_data):
+        try:
+            obs_ts_type = TsType(obs_stat.get_var_ts_type(var_ref)).val
+        except (MetaDataError, TemporalResolutionError):
+            obs_ts_type = None
+        groups.setdefault(obs_ts_type, []).append(i)
+
+    valid = np.zeros(stat_num, dtype=bool)
+    for obs_ts_type, idx in groups.items():
+        try:
+            steps = resampler.get_resampling_steps(ts_type, obs_ts_type, resample_how, min_num_obs)
+        except TemporalResolutionError as e:
+            for i in idx:
+                logger.warning(
+                    f"{var_ref} data from site {obs_stat_data[i].station_name} will "
+                    f"not be added to ColocatedData. Reason: {e}"
+                )
+            continue
+        series = [obs_stat_data[i].to_timeseries(var_ref) for i in idx]
+        values = np.concatenate([x.values for x in series]).astype(float)
+        times = np.concatenate([x.index.values for x in series])
+        columns = np.repeat(idx, [len(x) for x in series])
+
+        to_ts_type, mno, rshow = steps[0]
+        obs = _resample_time_long(values, times, columns, to_ts_type, rshow, mno)
+        for to_ts_type, mno, rshow in steps[1:]:
+            obs = _resample_time_frame(obs, to_ts_type, rshow, mno)
+        obs = obs.reindex(index=time_idx, columns=idx)
+        obs_arr[:, idx] = obs.values
+        valid[idx] = True
+
+    grid = grid_data
+    for to_ts_type, mno, rshow in resampler.get_resampling_steps(
+        ts_type, grid_ts_type, resample_how, min_num_obs
+    ):
+        grid = _resample_time_frame(grid, to_ts_type, rshow, mno)
+    grid_arr = grid.reindex(time_idx).values
+    grid_arr[:, ~valid] = np.nan
+    return obs_arr, grid_arr
+
+
 def colocate_gridded_ungridded(
     data,
     data_ref,
@@ -589,6 +795,7 @@ def colocate_gridded_ungridded(
     colocate_time=False,
     use_climatology_ref=False,
     resample_how=None,
+    use_array_engine=False,
     **kwargs,
 ):
     """Colocate gridded with ungridded data (low level method)
@@ -656,6 +863,14 @@ def colocate_gridded_ungridded(
         Default is "mean". Can also be a nested dictionary, e.g.
         resample_how={'daily': {'hourly' : 'max'}} would use the maximum value
         to aggregate from hourly to daily, rather than the mean.
+    use_array_engine : bool
+        if True, the model data is sampled at all sites at once and model and
+        observations are resampled in time for all sites at once, rather
+        than site by site (see :func:`_colocate_site_data_arrays`). Much
+        faster for many sites and high temporal resolution. Not available
+        in combination with `colocate_time` or `use_climatology_ref`, in
+        which case the site by site colocation is used (same for model data
+        with vertical dimension).
     **kwargs
         additional keyword args (passed to
         :func:`UngriddedData.to_station_data_all`)
@@ -771,7 +986,12 @@ def colocate_gridded_ungridded(
             f"Variable {var_ref} is not available in specified time interval ({start}-{stop})"
         )
 
-    grid_stat_data = data.to_time_series(longitude=ungridded_lons, latitude=ungridded_lats)
+    if use_array_engine and (colocate_time or use_climatology_ref or data.ndim != 3):
+        logger.info(
+            "Array based colocation is not available with colocate_time, "
+            "use_climatology_ref or data with vertical dimension, colocating site by site"
+        )
+        use_array_engine = False
 
     pd_freq = col_tst.to_pandas_freq()
     time_idx = make_datetime_index(start, stop, pd_freq)
@@ -793,7 +1013,7 @@ def colocate_gridded_ungridded(
     else:
         data_unit = None
 
-    # loop over all stations and append to colocated data object
+    # loop over all stations and collect metadata
     for i, obs_stat in enumerate(obs_stat_data):
         # Add coordinates to arrays required for xarray.DataArray below
         lons[i] = obs_stat.longitude
@@ -826,71 +1046,103 @@ def colocate_gridded_ungridded(
                 f"Cannot perform colocation. "
                 f"Ungridded data object contains different units ({var_ref})"
             )
-        # get observations (Note: the index of the observation time series
-        # is already in the specified frequency format, and thus, does not
-        # need to be updated, for details (or if errors occur), cf.
-        # UngriddedData.to_station_data, where the conversion happens)
 
-        # get model station data
-        grid_stat = grid_stat_data[i]
+    if use_array_engine:
+        # sample model at all sites at once
+        subset = _extract_site_data_nearest(data, ungridded_lats, ungridded_lons)
+        grid_vals = np.array(subset.values, dtype=float)
         if harmonise_units:
-            grid_unit = grid_stat.get_unit(var)
-            obs_unit = obs_stat.get_unit(var_ref)
-            if not grid_unit == obs_unit:
-                grid_stat.convert_unit(var, obs_unit)
-            if data_unit is None:
-                data_unit = obs_unit
-
-        try:
-            if colocate_time:
-                _df = _colocate_site_data_helper_timecol(
-                    stat_data=grid_stat,
-                    stat_data_ref=obs_stat,
-                    var=var,
-                    var_ref=var_ref,
-                    ts_type=col_freq,
-                    resample_how=resample_how,
-                    min_num_obs=min_num_obs,
-                    use_climatology_ref=use_climatology_ref,
-                )
-            else:
-                _df = _colocate_site_data_helper(
-                    stat_data=grid_stat,
-                    stat_data_ref=obs_stat,
-                    var=var,
-                    var_ref=var_ref,
-                    ts_type=col_freq,
-                    resample_how=resample_how,
-                    min_num_obs=min_num_obs,
-                    use_climatology_ref=use_climatology_ref,
+            obs_unit = obs_stat_data[0].get_unit(var_ref)
+            if not str(data.units) == obs_unit:
+                grid_vals = convert_unit(
+                    grid_vals,
+                    from_unit=str(data.units),
+                    to_unit=obs_unit,
+                    var_name=var,
+                    ts_type=data.ts_type,
                 )
+            data_unit = obs_unit
+        grid_data = pd.DataFrame(grid_vals, index=pd.DatetimeIndex(data.time_stamps()))
+        arr[0], arr[1] = _colocate_site_data_arrays(
+            grid_data=grid_data,
+            grid_ts_type=data.ts_type,
+            obs_stat_data=obs_stat_data,
+            var_ref=var_ref,
+            ts_type=col_freq,
+            resample_how=resample_how,
+            min_num_obs=min_num_obs,
+            time_idx=time_idx,
+        )
+    else:
+        grid_stat_data = data.to_time_series(longitude=ungridded_lons, latitude=ungridded_lats)
+
+        # loop over all stations and append to colocated data object
+        for i, obs_stat in enumerate(obs_stat_data):
+            # get observations (Note: the index of the observation time series
+            # is already in the specified frequency format, and thus, does not
+            # need to be updated, for details (or if errors occur), cf.
+            # UngriddedData.to_station_data, where the conversion happens)
+
+            # get model station data
+            grid_stat = grid_stat_data[i]
+            if harmonise_units:
+                grid_unit = grid_stat.get_unit(var)
+                obs_unit = obs_stat.get_unit(var_ref)
+                if not grid_unit == obs_unit:
+                    grid_stat.convert_unit(var, obs_unit)
+                if data_unit is None:
+                    data_unit = obs_unit
 
-            # this try/except block was introduced on 23/2/2021 as temporary fix from
-            # v0.10.0 -> v0.10.1 as a result of multi-weekly obsdata (EBAS) that
-            # can end up resulting in incorrect number of timestamps after resampling
-            # (the error was discovered using EBASMC, concpm10, 2019 and colocation
-            # frequency monthly)
             try:
-                # assign the unified timeseries data to the colocated data array
-                arr[0, :, i] = _df["ref"].values
-                arr[1, :, i] = _df["data"].values
-            except ValueError:
+                if colocate_time:
+                    _df = _colocate_site_data_helper_timecol(
+                        stat_data=grid_stat,
+                        stat_data_ref=obs_stat,
+                        var=var,
+                        var_ref=var_ref,
+                        ts_type=col_freq,
+                        resample_how=resample_how,
+                        min_num_obs=min_num_obs,
+                        use_climatology_ref=use_climatology_ref,
+                    )
+                else:
+                    _df = _colocate_site_data_helper(
+                        stat_data=grid_stat,
+                        stat_data_ref=obs_stat,
+                        var=var,
+                        var_ref=var_ref,
+                        ts_type=col_freq,
+                        resample_how=resample_how,
+                        min_num_obs=min_num_obs,
+                        use_climatology_ref=use_climatology_ref,
+                    )
+
+                # this try/except block was introduced on 23/2/2021 as temporary fix from
+                # v0.10.0 -> v0.10.1 as a result of multi-weekly obsdata (EBAS) that
+                # can end up resulting in incorrect number of timestamps after resampling
+                # (the error was discovered using EBASMC, concpm10, 2019 and colocation
+                # frequency monthly)
                 try:
-                    mask = _df.index.intersection(time_idx)
-                    _df = _df.loc[mask]
+                    # assign the unified timeseries data to the colocated data array
                     arr[0, :, i] = _df["ref"].values
                     arr[1, :, i] = _df["data"].values
-                except ValueError as e:
-                    logger.warning(
-                        f"Failed to colocate time for station {obs_stat.station_name}. "
-                        f"This station will be skipped (error: {e})"
-                    )
-        except TemporalResolutionError as e:
-            # resolution of obsdata is too low
-            logger.warning(
-                f"{var_ref} data from site {obs_stat.station_name} will "
-                f"not be added to ColocatedData. Reason: {e}"
-            )
+                except ValueError:
+                    try:
+                        mask = _df.index.intersection(time_idx)
+                        _df = _df.loc[mask]
+                        arr[0, :, i] = _df["ref"].values
+                        arr[1, :, i] = _df["data"].values
+                    except ValueError as e:
+                        logger.warning(
+                            f"Failed to colocate time for station {obs_stat.station_name}. "
+                            f"This station will be skipped (error: {e})"
+                        )
+            except TemporalResolutionError as e:
+                # resolution of obsdata is too low
+                logger.warning(
+                    f"{var_ref} data from site {obs_stat.station_name} will "
+                    f"not be added to ColocatedData. Reason: {e}"
+                )
     try:
         revision = data_ref.data_revision[dataset_ref]
     except Exception:
@@ -1,11 +1,13 @@
 """
 Classes and methods to perform high-level colocation.
 """
+import copy
 import glob
 import logging
 import os
 import sys
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -34,9 +36,47 @@ from pyaerocom.helpers import (
 )
 from pyaerocom.io import ReadGridded, ReadUngridded
 from pyaerocom.io.helpers import get_all_supported_ids_ungridded
+from pyaerocom.io.obsdata_cache import ObsDataCache
 
 logger = logging.getLogger(__name__)
 
+#: Colocator instance used in worker processes (cf. :func:`Colocator.run`)
+_WORKER_COLOCATOR = None
+
+
+def _init_run_worker(colocator):
+    global _WORKER_COLOCATOR
+    _WORKER_COLOCATOR = colocator
+
+
+def _run_helper_worker(model_var, obs_var):
+    """Run colocation of one variable pair in a worker process
+
+    Returns
+    -------
+    tuple
+        colocated data object (None if failed), list of files written and
+        formatted traceback (None if successful)
+    """
+    col = _WORKER_COLOCATOR
+    col.files_written = []
+    try:
+        coldata = col._run_helper(model_var, obs_var)
+    except Exception:
+        return None, col.files_written, traceback.format_exc()
+    finally:
+        # make sure that model data of this job is not kept in the worker
+        col._loaded_model_data = {}
+    return coldata, col.files_written, None
+
+
+def _get_available_memory():
+    """Available physical memory in bytes (None if it cannot be accessed)"""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
 
 class ColocationSetup(BrowseDict):
     """
@@ -268,6 +308,19 @@ class ColocationSetup(BrowseDict):
         than output colocation frequency (e.g. monthly), then the datasets are
         first colocated in time (e.g. on a daily basis), before the monthly
         averages are calculated. Default is False.
+    num_workers : int
+        number of processes used to colocate the model / obs variable pairs
+        in parallel. Default is 1 (serial processing).
+    worker_memory_gb : float, optional
+        estimated memory (in GB) required by one colocation job. If
+        specified, the number of parallel workers is limited such that
+        the jobs fit into the available memory. Only relevant if
+        :attr:`num_workers` is larger than 1.
+    use_array_engine : bool
+        if True, gridded / ungridded co-location is done for all sites at
+        once using array operations rather than site by site (cf.
+        :func:`pyaerocom.colocation.colocate_gridded_ungridded`). Default is
+        False.
     reanalyse_existing : bool
         if True, always redo co-location, even if there is already an existing
         co-located NetCDF file (under the output location specified by
@@ -388,6 +441,10 @@ class ColocationSetup(BrowseDict):
         self.harmonise_units = False
         self.regrid_res_deg = None
         self.colocate_time = False
+        self.use_array_engine = False
+
+        self.num_workers = 1
+        self.worker_memory_gb = None
 
         self.reanalyse_existing = True
         self.raise_exceptions = False
@@ -529,6 +586,10 @@ class Colocator(ColocationSetup):
         self._model_reader = None
         self._obs_reader = None
 
+        #: Optional in-memory cache for ungridded obs data (cf.
+        #: :func:`_read_ungridded`), may be shared among colocator instances
+        self.obs_data_cache = None
+
     @property
     def model_vars(self):
         """
@@ -797,23 +858,28 @@ class Colocator(ColocationSetup):
                 raise
             vars_to_process = {}
         self._print_coloc_info(vars_to_process)
-        for mod_var, obs_var in vars_to_process.items():
-            try:
-                coldata = self._run_helper(mod_var, obs_var)
+        num_workers = self._get_num_workers(len(vars_to_process))
+        if num_workers > 1:
+            results = self._run_parallel(vars_to_process, num_workers)
+        else:
+            results = self._run_serial(vars_to_process)
+        for mod_var, obs_var, coldata, tb in results:
+            if tb is None:
                 if not mod_var in data_out:
                     data_out[mod_var] = {}
                 data_out[mod_var][obs_var] = coldata
                 self._processing_status.append([mod_var, obs_var, 1])
-            except Exception:
-                msg = f"Failed to perform analysis: {traceback.format_exc()}\n"
+            else:
+                msg = f"Failed to perform analysis: {tb}\n"
                 logger.warning(msg)
                 self._processing_status.append([mod_var, obs_var, 5])
                 self._write_log(msg)
                 if self.raise_exceptions:
+                    results.close()
                     self._print_processing_status()
                     self._write_log("ABORTED: raise_exceptions is True\n")
                     self._close_log()
-                    raise ColocationError(traceback.format_exc())
+                    raise ColocationError(tb)
         self._write_log("Colocation finished")
         self._close_log()
         self._print_processing_status()
@@ -821,6 +887,81 @@ class Colocator(ColocationSetup):
             self.data = data_out
         return data_out
 
+    def _get_num_workers(self, num_jobs):
+        """Number of worker processes to be used for colocation jobs
+
+        Limited by :attr:`num_workers`, the number of jobs, the number of CPUs
+        and, if :attr:`worker_memory_gb` is specified, the available memory.
+        """
+        num_workers = min(self.num_workers or 1, num_jobs, os.cpu_count() or 1)
+        if num_workers > 1 and self.worker_memory_gb:
+            mem = _get_available_memory()
+            if mem is not None:
+                max_workers = max(int(mem / (self.worker_memory_gb * 1024**3)), 1)
+                if max_workers < num_workers:
+                    logger.info(
+                        f"Reducing number of colocation workers from {num_workers} to "
+                        f"{max_workers} due to available memory ({mem / 1024**3:.1f} GB)"
+                    )
+                    num_workers = max_workers
+        return num_workers
+
+    def _run_serial(self, vars_to_process):
+        """Colocate variable pairs one after another
+
+        Yields
+        ------
+        tuple
+            model variable, obs variable, colocated data (None if failed) and
+            formatted traceback (None if successful)
+        """
+        for mod_var, obs_var in vars_to_process.items():
+            try:
+                coldata = self._run_helper(mod_var, obs_var)
+            except Exception:
+                yield mod_var, obs_var, None, traceback.format_exc()
+            else:
+                yield mod_var, obs_var, coldata, None
+
+    def _run_parallel(self, vars_to_process, num_workers):
+        """Colocate variable pairs in parallel using worker processes
+
+        Like :func:`_run_serial`, results are yielded in the order of the
+        input variable pairs. Files written by the workers are added to
+        :attr:`files_written` (and to the log) accordingly. Jobs that have
+        not yet been started are cancelled if the generator is closed.
+        """
+        logger.info(
+            f"Colocating {len(vars_to_process)} variable pairs using {num_workers} workers"
+        )
+        worker = copy.copy(self)
+        worker._log = None
+        worker.logging = False
+        worker.data = {}
+        worker._processing_status = []
+        worker.obs_data_cache = None
+        # model data is read in the workers
+        worker._loaded_model_data = {}
+        self._loaded_model_data = {}
+
+        with ProcessPoolExecutor(
+            max_workers=num_workers, initializer=_init_run_worker, initargs=(worker,)
+        ) as executor:
+            futures = [
+                executor.submit(_run_helper_worker, mod_var, obs_var)
+                for mod_var, obs_var in vars_to_process.items()
+            ]
+            try:
+                for (mod_var, obs_var), future in zip(vars_to_process.items(), futures):
+                    coldata, files_written, tb = future.result()
+                    for fp in files_written:
+                        self.files_written.append(fp)
+                        self._write_log(f"WRITE: {fp}\n")
+                    yield mod_var, obs_var, coldata, tb
+            finally:
+                for future in futures:
+                    future.cancel()
+
     def get_nc_files_in_coldatadir(self):
         """
         Get list of NetCDF files in colocated data directory
@@ -891,6 +1032,11 @@ class Colocator(ColocationSetup):
         definitions and because the colocation is done sequentially for each
         variable.
 
+        If :attr:`obs_data_cache` is set, the loaded (and filtered) data is
+        stored in the cache and reused by all colocators that share the
+        cache and use the same obs settings. Note that the returned object
+        is shared in that case and must not be modified in place.
+
         Parameters
         ----------
         vars_to_read : str or list, optional
@@ -902,16 +1048,30 @@ class Colocator(ColocationSetup):
             loaded data object
 
         """
-        obs_reader = self.obs_reader
         obs_filters_post = self._eval_obs_filters(var_name)
+        start, stop = self._get_obs_time_window()
+        cache = self.obs_data_cache
+        if cache is not None:
+            cache_key = self._get_obs_data_cache_key(var_name, obs_filters_post, start, stop)
+            obs_data = cache.get(cache_key)
+            if obs_data is not None:
+                logger.info(f"Using cached obs data for {self.obs_id} ({var_name})")
+                return obs_data
 
+        obs_reader = self.obs_reader
         obs_data = obs_reader.read(
             data_ids=[self.obs_id],
             vars_to_retrieve=var_name,
             only_cached=self._obs_cache_only,
             filter_post=obs_filters_post,
+            start=start,
+            stop=stop,
             **self.read_opts_ungridded,
         )
+        if obs_data.is_empty:
+            raise DataCoverageError(
+                f"No {var_name} data of {self.obs_id} available in time window {start} - {stop}"
+            )
 
         if self.obs_remove_outliers:
             oor = self.obs_outlier_ranges
@@ -923,8 +1083,50 @@ class Colocator(ColocationSetup):
             obs_data.remove_outliers(
                 var_name, low=low, high=high, inplace=True, move_to_trash=False
             )
+        if cache is not None:
+            cache.put(cache_key, obs_data)
         return obs_data
 
+    def _get_obs_time_window(self):
+        """Get time window of obs data needed for colocation
+
+        Returns
+        -------
+        tuple
+            start and stop (None, if :attr:`start` is not set), used to load
+            only the relevant part of cached ungridded obs data
+        """
+        if self.obs_use_climatology:
+            return const.CLIM_START, const.CLIM_STOP
+        if self.start is None:
+            return None, None
+        return self.start, self.stop
+
+    def _get_obs_data_cache_key(self, var_name, obs_filters_post, start=None, stop=None):
+        """Get key of ungridded obs data in :attr:`obs_data_cache`
+
+        The key comprises all settings that affect the data loaded in
+        :func:`_read_ungridded`.
+        """
+        outlier_range = None
+        if self.obs_remove_outliers:
+            if var_name in self.obs_outlier_ranges:
+                outlier_range = list(self.obs_outlier_ranges[var_name])
+            else:
+                var_info = const.VARS[var_name]
+                outlier_range = [var_info.minimum, var_info.maximum]
+        return ObsDataCache.make_key(
+            obs_id=self.obs_id,
+            obs_data_dir=self.obs_data_dir,
+            var_name=var_name,
+            filters=obs_filters_post,
+            only_cached=self._obs_cache_only,
+            read_opts=self.read_opts_ungridded,
+            outlier_range=outlier_range,
+            start=start,
+            stop=stop,
+        )
+
     def _check_obs_filters(self):
         obs_vars = self.obs_vars
         if any([x in self.obs_filters for x in obs_vars]):
@@ -1393,7 +1595,10 @@ class Colocator(ColocationSetup):
         if self.obs_is_ungridded:
             ts_type = self._get_colocation_ts_type(model_data.ts_type)
             args.update(
-                ts_type=ts_type, var_ref=obs_var, use_climatology_ref=self.obs_use_climatology
+                ts_type=ts_type,
+                var_ref=obs_var,
+                use_climatology_ref=self.obs_use_climatology,
+                use_array_engine=self.use_array_engine,
             )
         else:
             ts_type = self._get_colocation_ts_type(model_data.ts_type, obs_data.ts_type)
@@ -1465,7 +1670,7 @@ class Colocator(ColocationSetup):
         log.write("\n------------------ NEW ----------------\n")
         log.write(f"Timestamp: {datetimestr}\n\n")
         log.write("Analysis configuration\n")
-        ignore = ["_log", "logging", "data", "_model_reader", "_obs_reader"]
+        ignore = ["_log", "logging", "data", "_model_reader", "_obs_reader", "obs_data_cache"]
         for key, val in self.items():
             if key in ignore:
                 continue
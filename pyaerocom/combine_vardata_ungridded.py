@@ -1,8 +1,6 @@
-import numpy as np
-
 from pyaerocom._lowlevel_helpers import invalid_input_err_str
 from pyaerocom.colocation import _colocate_site_data_helper
-from pyaerocom.geodesy import find_coord_indices_within_distance
+from pyaerocom.geodesy import find_coords_within_radius
 from pyaerocom.helpers import sort_ts_types
 from pyaerocom.obs_io import ObsVarCombi
 from pyaerocom.stationdata import StationData
@@ -24,28 +22,34 @@ def _check_input_data_ids_and_vars(data_ids_and_vars):
 
 def _map_same_stations(stats_short, stats_long, match_stats_how, match_stats_tol_km):
 
-    long_coords = list(zip(stats_long["latitude"], stats_long["longitude"]))
-
     # index matches and corresponding station name matches
     _index_short = []
     _index_long = []
     _statnames_short = []
     _statnames_long = []
 
-    long_sitenames = np.asarray(stats_long["station_name"])
+    if match_stats_how == "station_name":
+        long_index = {}
+        for idx, name in enumerate(stats_long["station_name"]):
+            long_index.setdefault(name, []).append(idx)
+    else:
+        # search matches for all sites at once, for each site in short, the
+        # matches are sorted by distance
+        coord_matches = find_coords_within_radius(
+            stats_short["latitude"],
+            stats_short["longitude"],
+            stats_long["latitude"],
+            stats_long["longitude"],
+            radius=match_stats_tol_km,
+        )
 
     for i, stat in enumerate(stats_short["stats"]):
         statname = stat.station_name
-        lat0, lon0 = stats_short["latitude"][i], stats_short["longitude"][i]
 
         if match_stats_how == "station_name":
-            # np.where returns tuple, first index contains array with index
-            # matches
-            index_matches = np.where(long_sitenames == statname)[0]
+            index_matches = long_index.get(statname, [])
         else:
-            index_matches = find_coord_indices_within_distance(
-                latref=lat0, lonref=lon0, latlons=long_coords, radius=match_stats_tol_km
-            )
+            index_matches = coord_matches[i]
 
         # init which default index to use
         use_index = 0
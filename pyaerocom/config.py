@@ -145,6 +145,22 @@ class Config:
 
     RM_CACHE_OUTDATED = True
 
+    #: Format used for writing cache files of UngriddedData objects. Choose
+    #: from "pkl" (pickled object) or "npy" (data array stored as memory
+    #: mappable .npy file next to pickled metadata, cf.
+    #: :class:`CacheHandlerUngridded`)
+    UNGRIDDED_CACHE_FORMAT = "pkl"
+
+    #: If not None, a fingerprint of the data directory of an ungridded
+    #: dataset is stored and used when checking if cache files are outdated
+    #: (cf. :class:`CacheHandlerUngridded`). The fingerprint is used without
+    #: accessing the directory for this time in s. After that, the
+    #: modification time and number of files in the directory are compared
+    #: with the fingerprint and the directory is only scanned for the newest
+    #: file if they changed. Note that this does not detect files that are
+    #: changed in place. If None, the directory is scanned on every check.
+    UNGRIDDED_CACHE_SRC_DIR_TTL = None
+
     #: Name of the file containing the revision string of an obs data network
     REVISION_FILE = "Revision.txt"
 
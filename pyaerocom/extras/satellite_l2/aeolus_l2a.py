@@ -13,6 +13,7 @@ from pyaerocom import const
 from pyaerocom.ungriddeddata import UngriddedData
 
 from .base_reader import ReadL2DataBase
+from .spatial_index import PointCloudIndex
 
 
 class ReadL2Data(ReadL2DataBase):
@@ -364,6 +365,9 @@ class ReadL2Data(ReadL2DataBase):
         # minimal number of observations needed for gridding
         self.MIN_VAL_NO_FOR_GRIDDING = 1
 
+        # spatial index over the data points (cf. get_spatial_index)
+        self._spatial_index = None
+
         # association of EMEP variable names with aeolus variable names
         self.EMEP_VAR_NAME_DICT = {}
         self.EMEP_VAR_NAME_DICT[self._TIME_NAME] = "time"
@@ -1139,43 +1143,21 @@ class ReadL2Data(ReadL2DataBase):
         start = time.perf_counter()
 
         data = ungridded_data_obj._data
-        ret_data = np.empty([self._ROWNO, self._COLNO], dtype=np.float_)
-        index_counter = 0
-        cut_flag = True
-        matching_indexes = []
+        ret_data = np.empty([0, self._COLNO], dtype=np.float_)
         if location is not None:
             if isinstance(location, list):
                 # parameter is a list
-                # iterate
-                for idx_lat, loc in enumerate(location):
-                    # calculate distance
-                    self.calc_dist_in_data(ungridded_data_obj, loc)
-                    matching_indexes = np.where(
-                        ungridded_data_obj._data[:, self._DISTINDEX] < max_dist
-                    )
-                    matching_length = len(matching_indexes[0])
-                    if matching_length > 0:
-                        # check if the data fits into ret_data
-                        end_index = index_counter + matching_length
-                        if end_index > len(ret_data):
-                            # append the needed elements
-                            logging.info(
-                                f"adding {end_index - len(ret_data)} elements to ret_data"
-                            )
-                            ret_data = np.append(
-                                ret_data,
-                                np.zeros(
-                                    [end_index - len(ret_data), self._COLNO],
-                                    dtype=np.float_,
-                                    axis=0,
-                                ),
-                            )
-                            cut_flag = False
-
-                        ret_data[
-                            index_counter : index_counter + matching_length, :
-                        ] = ungridded_data_obj._data[matching_indexes, :]
-                        index_counter += matching_length
+                # find the points around all locations at once
+                index = self.get_spatial_index(ungridded_data_obj)
+                loc_lats = [loc[0] for loc in location]
+                loc_lons = [loc[1] for loc in location]
+                matches, distances = index.query_radius(
+                    loc_lats, loc_lons, max_dist, return_distance=True
+                )
+                if len(location) > 0:
+                    ret_data = data[np.concatenate(matches), :]
+                    # distance to the respective location
+                    ret_data[:, self._DISTINDEX] = np.concatenate(distances)
 
             elif isinstance(location, tuple):
                 logging.error("passing one location as tuple not supported at this point")
@@ -1183,17 +1165,12 @@ class ReadL2Data(ReadL2DataBase):
             else:
                 logging.error("locations have to be passed as a list of tuples with (lat, lon)")
                 pass
-            # return only the part of the array containing some values
-            if cut_flag:
-                ret_data = ret_data[:index_counter, :]
             end_time = time.perf_counter()
             elapsed_sec = end_time - start
-            temp = f"time for single station distance calc [s]: {elapsed_sec:.3f}"
+            temp = f"time for station distance calc [s]: {elapsed_sec:.3f}"
             self.logger.info(temp)
             # log the found times
-            unique_times = np.unique(
-                ungridded_data_obj._data[matching_indexes, self._TIMEINDEX]
-            ).astype("datetime64[s]")
+            unique_times = np.unique(ret_data[:, self._TIMEINDEX]).astype("datetime64[s]")
             self.logger.info("matching times:")
             self.logger.info(unique_times)
 
@@ -1205,7 +1182,7 @@ class ReadL2Data(ReadL2DataBase):
                 ret_data = {}
                 for idx, _bbox in enumerate(bbox):
                     ret_data[idx] = {}
-                    ret_data[idx]["data"] = self.select_bbox(_bbox)
+                    ret_data[idx]["data"] = self.select_bbox(ungridded_data_obj, _bbox)
                     ret_data[idx]["bbox"] = _bbox
             else:
                 pass
@@ -1247,7 +1224,7 @@ class ReadL2Data(ReadL2DataBase):
             for idx, _bbox in enumerate(bbox_temp):
                 # select the values
                 ret_data[idx] = {}
-                ret_data[idx]["data"] = self.select_bbox(_bbox)
+                ret_data[idx]["data"] = self.select_bbox(ungridded_data_obj, _bbox)
                 ret_data[idx]["bbox"] = _bbox
                 if idx > 0 and idx % 1000 == 0:
                     self.logger.warning(f"{idx} boxes co-located")
@@ -1263,17 +1240,48 @@ class ReadL2Data(ReadL2DataBase):
 
     ###################################################################################
 
+    def get_spatial_index(self, data=None):
+        """Get spatial index over the locations of the data points
+
+        The index is built on first access and reused as long as the same
+        data array is used.
+
+        Parameters
+        ----------
+        data : UngriddedData or ndarray, optional
+            data (default: :attr:`data`)
+
+        Returns
+        -------
+        PointCloudIndex
+            spatial index
+        """
+        if data is None:
+            data = self.data
+        data = getattr(data, "_data", data)
+        cached = self._spatial_index
+        if cached is None or cached[0] is not data or cached[1].num_points != len(data):
+            start = time.perf_counter()
+            index = PointCloudIndex(
+                data[:, self._LATINDEX], data[:, self._LONINDEX], earth_radius=self.EARTH_RADIUS
+            )
+            self._spatial_index = (data, index)
+            elapsed_sec = time.perf_counter() - start
+            self.logger.info(f"time for building spatial index [s]: {elapsed_sec:.3f}")
+        return self._spatial_index[1]
+
     def select_bbox(self, data=None, bbox=None):
         """method to return all points of self.data laying within a certain latitude and longitude range
 
         This method will likely never be used by a user, but serves as helper method for the colocate method
 
+        Points with invalid (NaN) latitude are not returned. Uses the spatial
+        index of the data (cf. :func:`get_spatial_index`).
+
         EXAMPLE
         =======
 
         """
-        start = time.perf_counter()
-
         lat_min = -90.0
         lat_max = 90.0
         lon_min = -180.0
@@ -1294,40 +1302,8 @@ class ReadL2Data(ReadL2DataBase):
             except AttributeError:
                 _data = data
 
-            # remove NaNs at this point
-            matching_indexes = np.where(np.isfinite(_data[:, self._LATINDEX]))
-            ret_data = _data[matching_indexes[0], :]
-
-            # np.where can unfortunately only work with a single criterion
-            matching_indexes = np.where(ret_data[:, self._LATINDEX] <= lat_max)
-            ret_data = ret_data[matching_indexes[0], :]
-            # logging.warning('len after lat_max: {}'.format(len(ret_data)))
-            matching_indexes = np.where(ret_data[:, self._LATINDEX] >= lat_min)
-            ret_data = ret_data[matching_indexes[0], :]
-            # logging.warning('len after lat_min: {}'.format(len(ret_data)))
-            matching_indexes = np.where(ret_data[:, self._LONINDEX] <= lon_max)
-            ret_data = ret_data[matching_indexes[0], :]
-            # logging.warning('len after lon_max: {}'.format(len(ret_data)))
-            matching_indexes = np.where(ret_data[:, self._LONINDEX] >= lon_min)
-            ret_data = ret_data[matching_indexes[0], :]
-            # logging.warning('len after lon_min: {}'.format(len(ret_data)))
-            # matching_length = len(matching_indexes[0])
-
-            # end_time = time.perf_counter()
-            # elapsed_sec = end_time - start
-            # temp = 'time for single station bbox calc [s]: {:.3f}'.format(elapsed_sec)
-            # self.logger.info(temp)
-            # log the found times
-            # unique_times = np.unique(self.data[matching_indexes,self._TIMEINDEX]).astype('datetime64[s]')
-            # self.logger.info('matching times:')
-            # self.logger.info(unique_times)
-            # if len(ret_data) == 0:
-            #     data_lat_min = np.nanmin(self.data[:,self._LATINDEX])
-            #     data_lat_max = np.nanmax(self.data[:,self._LATINDEX])
-            #     data_lon_min = np.nanmin(self.data[:,self._LONINDEX])
-            #     data_lon_max = np.nanmax(self.data[:,self._LONINDEX])
-            #     logging.info('[lat_min, lat_max, lon_min, lon_max in data]: '.format([data_lat_min, data_lat_max, data_lon_min, data_lon_max]))
-            return ret_data
+        index = self.get_spatial_index(_data)
+        return _data[index.query_bbox(lat_min, lat_max, lon_min, lon_max), :]
 
     ###################################################################################
 
@@ -2838,208 +2814,93 @@ class ReadL2Data(ReadL2DataBase):
         grid_heights_high=None,
         grid_field=None,
         levelno=20,
+        binner=None,
     ):
-        """3d gridding routine that uses the 2d gridding from the super class for level wise 2d gridding
+        """3d gridding routine (grid cells and height levels)
+
+        input data is a 2d numpy array. Only positive values are used for
+        gridding, grid cells with less than :attr:`MIN_VAL_NO_FOR_GRIDDING`
+        values are NaN. Height level i contains the data points with
+        grid_heights_low[i] < altitude <= grid_heights_low[i+1].
 
-        input data is a 2d numpy array
+        Returns
+        -------
+        dict
+            dictionary containing grid coordinates, time, height bounds and
+            mean, stddev and numobs (shape lat, lon, height) of each variable
         """
+        if isinstance(vars, str):
+            vars = [vars]
 
         if data is None:
             _data = self.data
         else:
             _data = data
 
-        if grid_heights is not None:
-            # user defined middle points
-            # pass this for now
-            pass
-        else:
-            if grid_heights_low is None:
-                grid_heights_low = np.arange(levelno + 1) * 1000.0
-            if grid_heights_high is None:
-                grid_heights_high = (np.arange(levelno + 1) + 1) * 1000.0
+        if grid_heights_low is None:
+            grid_heights_low = np.arange(levelno + 1) * 1000.0
+        if grid_heights_high is None:
+            grid_heights_high = (np.arange(levelno + 1) + 1) * 1000.0
 
         if gridtype not in self.SUPPORTED_GRIDS:
             temp = f"Error: Unknown grid: {gridtype}"
             self.logger.error(temp)
             return
-        lat_verbose_flag = False
-
-        if engine == "python":
-            grid_heights = (
-                grid_heights_low[:-1] + (grid_heights_low[1:] - grid_heights_low[:-1]) / 2
-            )
-            data_for_gridding, gridded_var_data = self._to_grid_grid_init(
-                gridtype=gridtype,
-                vars=vars,
-                levels=grid_heights,
-                init_time=np.mean(_data[:, self._TIMEINDEX]),
-            )
+        if engine != "python":
+            raise ValueError(f"Unsupported gridding engine: {engine}")
 
-            gridded_var_data[self._ALTBOUNDSNAME] = np.transpose(
-                np.array(
-                    [
-                        grid_heights_low[0 : len(grid_heights)],
-                        grid_heights_high[0 : len(grid_heights)],
-                    ]
-                )
+        start_time = time.perf_counter()
+        if binner is None:
+            binner = self.get_grid_binner(
+                gridtype,
+                level_bounds=grid_heights_low,
+                min_num_obs=self.MIN_VAL_NO_FOR_GRIDDING,
             )
-            grid_lats = self.SUPPORTED_GRIDS[gridtype]["grid_lats"]
-            grid_lons = self.SUPPORTED_GRIDS[gridtype]["grid_lons"]
-            grid_dist_lat = self.SUPPORTED_GRIDS[gridtype]["grid_dist_lat"]
-            grid_dist_lon = self.SUPPORTED_GRIDS[gridtype]["grid_dist_lon"]
-
-            start_time = time.perf_counter()
-            matching_points = 0
-            neg_points = 0
-            # predefine the output data dict
-            # data_for_gridding = {}
-            matched_heights = 0
-            matched_longitudes = 0
-            matched_latitudes = 0
-            match_lon_data = []
-            match_lat_data = []
-
-            for height_idx, grid_height in enumerate(grid_heights_low):
-                diff_height = _data[:, self._ALTITUDEINDEX] - grid_height
-                max_allowed_height_dist = grid_heights_high[height_idx] - grid_height
-                # height_match_indexes = np.squeeze(np.where(diff_height <= max_allowed_height_dist))
-                height_match_indexes = np.where(
-                    (diff_height <= max_allowed_height_dist) & (diff_height > 0.0)
-                )[0]
-                matched_heights += height_match_indexes.size
-                if height_match_indexes.size < self.MIN_VAL_NO_FOR_GRIDDING:
-                    continue
-                print(
-                    "height: {}, matched indexes: {}".format(
-                        grid_height, height_match_indexes.size
-                    )
-                )
-                # data_temp = _data[height_match_indexes,:]
-                for lat_idx, grid_lat in enumerate(grid_lats):
-                    diff_lat = np.absolute(_data[height_match_indexes, self._LATINDEX] - grid_lat)
-                    lat_match_indexes = np.where(diff_lat <= (grid_dist_lat / 2.0))[0]
-                    matched_latitudes += lat_match_indexes.size
-                    if lat_verbose_flag:
-                        print(f"lat: {grid_lat}, matched indexes: {lat_match_indexes.size}")
-                    if lat_match_indexes.size < self.MIN_VAL_NO_FOR_GRIDDING:
-                        continue
-                    # simplify code for readability
-                    match_indexes = height_match_indexes[lat_match_indexes]
-                    match_lat_data.extend(_data[match_indexes, self._LATINDEX])
-
-                    for lon_idx, grid_lon in enumerate(grid_lons):
-                        # diff_lon = np.absolute((_data[match_indexes, self._LONINDEX] - grid_lon))
-                        # lon_match_indexes = np.squeeze(np.where(diff_lon <= (grid_dist_lon/2.)))
-                        # lon_match_indexes = np.where(diff_lon <= (grid_dist_lon/2.))[0]
-
-                        lon_match_indexes = np.where(
-                            (
-                                _data[match_indexes, self._LONINDEX]
-                                > (grid_lon - grid_dist_lon / 2.0)
-                            )
-                            & (
-                                _data[match_indexes, self._LONINDEX]
-                                <= (grid_lon + grid_dist_lon / 2.0)
-                            )
-                        )[0]
-
-                        matched_longitudes += lon_match_indexes.size
-                        if lon_match_indexes.size < self.MIN_VAL_NO_FOR_GRIDDING:
-                            continue
-                        match_indexes = match_indexes[lon_match_indexes]
-                        # print('lon {}, matched {}'.format(grid_lon, _data[match_indexes, self._LONINDEX]))
-                        match_lon_data.extend(_data[match_indexes, self._LONINDEX])
-
-                        for var in vars:
-                            less_than_zero_indexes = np.where(
-                                _data[match_indexes, self.INDEX_DICT[var]] > 0.0
-                            )[0]
-                            neg_points += match_indexes.size - less_than_zero_indexes.size
-                            if less_than_zero_indexes.size < self.MIN_VAL_NO_FOR_GRIDDING:
-                                continue
-
-                            if return_data_for_gridding:
-                                data_for_gridding[var][grid_lat][grid_lon][height_idx] = np.array(
-                                    _data[self._LONGITUDENAME].data[
-                                        match_indexes[less_than_zero_indexes]
-                                    ]
-                                )
-
-                            if less_than_zero_indexes.size == 1:
-                                try:
-                                    gridded_var_data[var]["mean"][
-                                        lat_idx, lon_idx, height_idx
-                                    ] = _data[
-                                        match_indexes[less_than_zero_indexes], self.INDEX_DICT[var]
-                                    ]
-                                    gridded_var_data[var]["stddev"][
-                                        lat_idx, lon_idx, height_idx
-                                    ] = 0.0
-                                    gridded_var_data[var]["numobs"][
-                                        lat_idx, lon_idx, height_idx
-                                    ] = 1.0
-                                    matching_points += 1
-                                except ValueError:
-                                    pass
-                            else:
-                                try:
-                                    gridded_var_data[var]["mean"][
-                                        lat_idx, lon_idx, height_idx
-                                    ] = np.nanmean(
-                                        _data[
-                                            match_indexes[less_than_zero_indexes],
-                                            self.INDEX_DICT[var],
-                                        ]
-                                    )
-                                    gridded_var_data[var]["stddev"][
-                                        lat_idx, lon_idx, height_idx
-                                    ] = np.nanstd(
-                                        _data[
-                                            match_indexes[less_than_zero_indexes],
-                                            self.INDEX_DICT[var],
-                                        ]
-                                    )
-                                    gridded_var_data[var]["numobs"][
-                                        lat_idx, lon_idx, height_idx
-                                    ] = _data[
-                                        match_indexes[less_than_zero_indexes], self.INDEX_DICT[var]
-                                    ].size
-                                    matching_points = (
-                                        matching_points
-                                        + _data[
-                                            match_indexes[less_than_zero_indexes],
-                                            self.INDEX_DICT[var],
-                                        ].size
-                                    )
-                                except IndexError:
-                                    continue
+        cell_idx = binner.cell_indices(
+            _data[:, self._LATINDEX], _data[:, self._LONINDEX], _data[:, self._ALTITUDEINDEX]
+        )
+        vardata = {}
+        neg_points = 0
+        for var in vars:
+            values = np.array(_data[:, self.INDEX_DICT[var]], dtype=float)
+            with np.errstate(invalid="ignore"):
+                negative = ~(values > 0.0)
+            neg_points += np.sum(negative & (cell_idx >= 0))
+            values[negative] = np.nan
+            vardata[var] = values
+        binner.add(
+            None,
+            None,
+            vardata,
+            times=_data[:, self._TIMEINDEX].astype("datetime64[ms]"),
+            cell_idx=cell_idx,
+        )
 
-            end_time = time.perf_counter()
-            elapsed_sec = end_time - start_time
-            temp = "time for global {} gridding with python data types [s]: {:.3f}".format(
-                gridtype, elapsed_sec
-            )
-            self.logger.info(temp)
-            temp = "matched {} points out of {} existing points to grid".format(
-                matching_points, _data.shape[0]
-            )
-            self.logger.info(temp)
-            temp = f"{neg_points} points were negative"
+        elapsed_sec = time.perf_counter() - start_time
+        temp = f"time for global {gridtype} gridding [s]: {elapsed_sec:.3f}"
+        self.logger.info(temp)
+        temp = "matched {} points out of {} existing points to grid".format(
+            np.sum(cell_idx >= 0), _data.shape[0]
+        )
+        self.logger.info(temp)
+        temp = f"{neg_points} points were negative"
+        self.logger.info(temp)
 
-            self.logger.info(temp)
-            temp = "matched heights: {}; matched latitudes {}; matched longitude {}".format(
-                matched_heights, matched_latitudes, matched_longitudes
+        gridded_var_data = binner.to_dict(vars)
+        heights = binner.levels
+        gridded_var_data[self._ALTBOUNDSNAME] = np.transpose(
+            np.array(
+                [
+                    grid_heights_low[0 : len(heights)],
+                    grid_heights_high[0 : len(heights)],
+                ]
             )
-            self.logger.info(temp)
-            if return_data_for_gridding:
-                self.logger.info("returning also data_for_gridding...")
-                return gridded_var_data, data_for_gridding
-            else:
-                return gridded_var_data
-
-        else:
-            pass
+        )
+        if return_data_for_gridding:
+            self.logger.info("returning also data_for_gridding...")
+            data_for_gridding = self._data_for_gridding(binner, cell_idx, vardata)
+            return gridded_var_data, data_for_gridding
+        return gridded_var_data
 
     ###################################################################################
 
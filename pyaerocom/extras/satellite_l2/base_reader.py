@@ -7,6 +7,7 @@ import geopy
 import numpy as np
 
 from pyaerocom import const
+from pyaerocom.extras.satellite_l2.gridding import GridBinner
 from pyaerocom.io.readungriddedbase import ReadUngriddedBase
 from pyaerocom.ungriddeddata import UngriddedData
 
@@ -193,18 +194,25 @@ class ReadL2DataBase(ReadUngriddedBase):
         self.SUPPORTED_GRIDS["0.1x0.1"] = {}
         self.SUPPORTED_GRIDS["0.1x0.1"]["grid_dist_lon"] = 0.1
         self.SUPPORTED_GRIDS["0.1x0.1"]["grid_dist_lat"] = 0.1
+        # regional grids (EMEP domain)
+        self.SUPPORTED_GRIDS["1x1_emep"] = {}
+        self.SUPPORTED_GRIDS["1x1_emep"]["grid_dist_lon"] = 1.0
+        self.SUPPORTED_GRIDS["1x1_emep"]["grid_dist_lat"] = 1.0
+        self.SUPPORTED_GRIDS["1x1_emep"]["lat_range"] = (30.0, 82.0)
+        self.SUPPORTED_GRIDS["1x1_emep"]["lon_range"] = (-30.0, 90.0)
+        self.SUPPORTED_GRIDS["0.1x0.1_emep"] = {}
+        self.SUPPORTED_GRIDS["0.1x0.1_emep"]["grid_dist_lon"] = 0.1
+        self.SUPPORTED_GRIDS["0.1x0.1_emep"]["grid_dist_lat"] = 0.1
+        self.SUPPORTED_GRIDS["0.1x0.1_emep"]["lat_range"] = (30.0, 82.0)
+        self.SUPPORTED_GRIDS["0.1x0.1_emep"]["lon_range"] = (-30.0, 90.0)
 
         for grid_name in self.SUPPORTED_GRIDS:
-            self.SUPPORTED_GRIDS[grid_name]["grid_lats"] = np.arange(
-                self.MIN_LAT + self.SUPPORTED_GRIDS[grid_name]["grid_dist_lat"] / 2.0,
-                self.MAX_LAT + self.SUPPORTED_GRIDS[grid_name]["grid_dist_lat"] / 2.0,
-                self.SUPPORTED_GRIDS[grid_name]["grid_dist_lat"],
-            )
-            self.SUPPORTED_GRIDS[grid_name]["grid_lons"] = np.arange(
-                self.MIN_LON + self.SUPPORTED_GRIDS[grid_name]["grid_dist_lon"] / 2.0,
-                self.MAX_LON + self.SUPPORTED_GRIDS[grid_name]["grid_dist_lon"] / 2.0,
-                self.SUPPORTED_GRIDS[grid_name]["grid_dist_lon"],
-            )
+            grid = self.SUPPORTED_GRIDS[grid_name]
+            grid.setdefault("lat_range", (self.MIN_LAT, self.MAX_LAT))
+            grid.setdefault("lon_range", (self.MIN_LON, self.MAX_LON))
+            binner = self.get_grid_binner(grid_name)
+            grid["grid_lats"] = binner.lats
+            grid["grid_lons"] = binner.lons
 
         if loglevel is not None:
             # self.logger = logging.getLogger(__name__)
@@ -653,19 +661,107 @@ class ReadL2DataBase(ReadUngriddedBase):
         self.logger.info(temp)
 
     ###################################################################################
+    def get_grid_binner(self, gridtype="1x1", level_bounds=None, min_num_obs=1):
+        """Get gridding engine for one of the supported grids
+
+        Parameters
+        ----------
+        gridtype : str
+            name of grid (cf. :attr:`SUPPORTED_GRIDS`)
+        level_bounds : array-like, optional
+            bounds of vertical levels (for 3D gridding)
+        min_num_obs : int
+            minimum number of observations per grid cell
+
+        Returns
+        -------
+        GridBinner
+            gridding engine, data can be added (incrementally) via
+            :func:`GridBinner.add` or :func:`to_grid`
+        """
+        if gridtype not in self.SUPPORTED_GRIDS:
+            raise ValueError(f"Unknown grid: {gridtype}")
+        grid = self.SUPPORTED_GRIDS[gridtype]
+        return GridBinner(
+            lat_res=grid["grid_dist_lat"],
+            lon_res=grid["grid_dist_lon"],
+            lat_range=grid["lat_range"],
+            lon_range=grid["lon_range"],
+            level_bounds=level_bounds,
+            min_num_obs=min_num_obs,
+        )
+
+    def _data_for_gridding(self, binner, cell_idx, data):
+        """Organise data points per grid cell like dict[var][grid_lat][grid_lon]
+
+        For grids with vertical levels: dict[var][grid_lat][grid_lon][level_idx]
+        """
+        lats, lons = binner.lats, binner.lons
+        order = np.argsort(cell_idx, kind="stable")
+        order = order[cell_idx[order] >= 0]
+        cells, first = np.unique(cell_idx[order], return_index=True)
+        data_for_gridding = {}
+        for var, values in data.items():
+            data_for_gridding[var] = {}
+            for cell, idx in zip(cells, np.split(order, first[1:])):
+                lat_idx, lon_idx, *level_idx = np.unravel_index(cell, binner.shape)
+                cell_data = data_for_gridding[var].setdefault(lats[lat_idx], {})
+                if level_idx:
+                    cell_data = cell_data.setdefault(lons[lon_idx], {})
+                    cell_data[level_idx[0]] = values[idx]
+                else:
+                    cell_data[lons[lon_idx]] = values[idx]
+        return data_for_gridding
+
     def to_grid(
-        self, data=None, vars=None, gridtype="1x1", engine="python", return_data_for_gridding=False
+        self,
+        data=None,
+        vars=None,
+        gridtype="1x1",
+        engine="python",
+        return_data_for_gridding=False,
+        binner=None,
+        return_gridded_data=False,
     ):
         """simple gridding algorithm that only takes the pixel middle points into account
 
-        All the data points in data are considered!
+        All the data points in data are considered! Each data point is
+        assigned to the grid cell that contains it (cf. :class:`GridBinner`).
+
+        Parameters
+        ----------
+        data : UngriddedData, optional
+            data to be gridded (default: :attr:`data`)
+        vars : str or list
+            variables to be gridded
+        gridtype : str
+            name of grid (cf. :attr:`SUPPORTED_GRIDS`)
+        engine : str
+            gridding engine (only "python" is supported)
+        return_data_for_gridding : bool
+            if True, the data points of each grid cell are returned as well
+        binner : GridBinner, optional
+            gridding engine the data is added to, e.g. to accumulate data
+            over several files. If None, a new one is created for `gridtype`.
+        return_gridded_data : bool
+            if True, a dictionary with the mean of each variable as
+            :class:`GriddedData` is returned.
+
+        Raises
+        ------
+        ValueError
+            if `engine` is not supported
 
+        Returns
+        -------
+        dict
+            dictionary containing grid coordinates, time and mean, stddev
+            and numobs of each variable (or :class:`GriddedData` objects of
+            the mean of each variable if `return_gridded_data` is True)
         """
         import time
 
-        import numpy as np
-
-        _vars = vars.copy()
+        _vars = vars.copy() if isinstance(vars, list) else vars
         if isinstance(_vars, str):
             _vars = [_vars]
 
@@ -673,100 +769,34 @@ class ReadL2DataBase(ReadUngriddedBase):
             data = self.data
         else:
             data = data._data
-        # vars_to_retrieve = self.DEFAULT_VARS
-
-        if engine == "python":
-            start_time = time.perf_counter()
-            grid_data_prot = {}
-            # define ouput grid
-            if gridtype == "1x1":
-                # global 1x1 degree grid
-                # pass
-                temp = "starting simple gridding for 1x1 degree grid..."
-                self.logger.info(temp)
-                max_grid_dist_lon = 1.0
-                max_grid_dist_lat = 1.0
-                grid_lats = np.arange(-89.5, 90.5, max_grid_dist_lat)
-                grid_lons = np.arange(-179.5, 180.5, max_grid_dist_lon)
-
-                grid_array_prot = np.full((grid_lats.size, grid_lons.size), np.nan)
-                # organise the data in a nested python dict like dict_data[grid_lat][grid_lon]=np.ndarray
-                for grid_lat in grid_lats:
-                    grid_data_prot[grid_lat] = {}
-                    for grid_lon in grid_lons:
-                        grid_data_prot[grid_lat] = {}
-
-                end_time = time.perf_counter()
-                elapsed_sec = end_time - start_time
-                temp = f"time for global 1x1 gridding with python data types [s] init: {elapsed_sec:.3f}"
-                self.logger.info(temp)
 
-                # predefine the output data dict
-                data_for_gridding = {}
-                gridded_var_data = {}
-                for var in vars:
-                    data_for_gridding[var] = grid_data_prot.copy()
-                    gridded_var_data["latitude"] = grid_lats
-                    gridded_var_data["longitude"] = grid_lons
-                    gridded_var_data["time"] = np.mean(data[:, self._TIMEINDEX]).astype(
-                        "datetime64[ms]"
-                    )
-
-                    gridded_var_data[var] = {}
-                    gridded_var_data[var]["mean"] = grid_array_prot.copy()
-                    gridded_var_data[var]["stddev"] = grid_array_prot.copy()
-                    gridded_var_data[var]["numobs"] = grid_array_prot.copy()
-
-                # Loop through the output grid and collect data
-                # store that in data_for_gridding[var]
-                for lat_idx, grid_lat in enumerate(grid_lats):
-                    diff_lat = np.absolute(data[:, self._LATINDEX] - grid_lat)
-                    lat_match_indexes = np.squeeze(np.where(diff_lat <= max_grid_dist_lat))
-                    if lat_match_indexes.size == 0:
-                        continue
-
-                    for lon_idx, grid_lon in enumerate(grid_lons):
-                        diff_lon = np.absolute(data[lat_match_indexes, self._LONINDEX] - grid_lon)
-                        lon_match_indexes = np.squeeze(np.where(diff_lon <= max_grid_dist_lon))
-                        if lon_match_indexes.size == 0:
-                            continue
+        if engine != "python":
+            raise ValueError(f"Unsupported gridding engine: {engine}")
 
-                        for var in vars:
-                            data_for_gridding[var][grid_lat][grid_lon] = np.array(
-                                data[lat_match_indexes[lon_match_indexes], self.INDEX_DICT[var]]
-                            )
-                            gridded_var_data[var]["mean"][lat_idx, lon_idx] = np.nanmean(
-                                data[lat_match_indexes[lon_match_indexes], self.INDEX_DICT[var]]
-                            )
-                            gridded_var_data[var]["stddev"][lat_idx, lon_idx] = np.nanstd(
-                                data[lat_match_indexes[lon_match_indexes], self.INDEX_DICT[var]]
-                            )
-                            gridded_var_data[var]["numobs"][lat_idx, lon_idx] = data[
-                                lat_match_indexes[lon_match_indexes], self.INDEX_DICT[var]
-                            ].size
-
-                # now go through self.data and select the appropriate data points
-                # self.data_for_gridding = data_for_gridding
-                # self.gridded_data = gridded_var_data
-                end_time = time.perf_counter()
-                elapsed_sec = end_time - start_time
-                temp = (
-                    f"time for global 1x1 gridding with python data types [s]: {elapsed_sec:.3f}"
-                )
-                self.logger.info(temp)
-                if return_data_for_gridding:
-                    self.logger.info("returning also data_for_gridding...")
-                    return gridded_var_data, data_for_gridding
-                else:
-                    return gridded_var_data
-
-            elif gridtype == "1x1_emep":
-                # 1 by on degree grid on emep domain
-                pass
-
-            pass
+        start_time = time.perf_counter()
+        if binner is None:
+            binner = self.get_grid_binner(gridtype)
+        self.logger.info(f"starting simple gridding for {gridtype} grid...")
+
+        vardata = {var: data[:, self.INDEX_DICT[var]] for var in _vars}
+        cell_idx = binner.cell_indices(data[:, self._LATINDEX], data[:, self._LONINDEX])
+        binner.add(
+            None,
+            None,
+            vardata,
+            times=data[:, self._TIMEINDEX].astype("datetime64[ms]"),
+            cell_idx=cell_idx,
+        )
 
-        pass
+        elapsed_sec = time.perf_counter() - start_time
+        self.logger.info(f"time for {gridtype} gridding [s]: {elapsed_sec:.3f}")
+        if return_gridded_data:
+            return {var: binner.to_gridded_data(var) for var in _vars}
+        gridded_var_data = binner.to_dict(_vars)
+        if return_data_for_gridding:
+            self.logger.info("returning also data_for_gridding...")
+            return gridded_var_data, self._data_for_gridding(binner, cell_idx, vardata)
+        return gridded_var_data
 
     ###################################################################################
     def _to_grid_grid_init(self, gridtype="1x1", vars=None, init_time=None):
@@ -0,0 +1,368 @@
+"""
+Vectorised gridding of satellite level 2 data
+"""
+import logging
+
+import numpy as np
+import xarray as xr
+
+from pyaerocom.griddeddata import GriddedData
+
+logger = logging.getLogger(__name__)
+
+
+class GridBinner:
+    """Binned statistics of point data on a regular latitude / longitude grid
+
+    Each data point is assigned to the grid cell (and, optionally, the
+    vertical level) that contains it. The number of observations, mean and
+    standard deviation of all grid cells are computed at once using
+    :func:`numpy.bincount`. Data can be added incrementally (e.g. orbit file
+    by orbit file) via :func:`add` without keeping the data points in memory,
+    the statistics of the individual chunks are merged using the pairwise
+    algorithm of Chan et al. (1979).
+
+    Note
+    ----
+    Grid cells are left-closed, i.e. a data point on the boundary between two
+    cells is assigned to the cell with the higher coordinate values (points
+    on the upper boundary of the domain are assigned to the last cell).
+    Vertical levels are right-closed, i.e. a data point is assigned to level
+    `i` if `level_bounds[i] < altitude <= level_bounds[i+1]`. For global
+    grids (longitude range of 360 degrees), longitudes are wrapped into the
+    longitude range.
+
+    Parameters
+    ----------
+    lat_res : float
+        latitude resolution of grid in degrees
+    lon_res : float
+        longitude resolution of grid in degrees
+    lat_range : tuple
+        latitude range (domain) of grid
+    lon_range : tuple
+        longitude range (domain) of grid
+    level_bounds : array-like, optional
+        bounds of vertical levels (e.g. altitudes in m). If None, a 2D grid
+        is used.
+    min_num_obs : int
+        minimum number of observations in a grid cell. Mean and standard
+        deviation of grid cells with fewer observations are NaN.
+    """
+
+    def __init__(
+        self,
+        lat_res=1.0,
+        lon_res=1.0,
+        lat_range=(-90.0, 90.0),
+        lon_range=(-180.0, 180.0),
+        level_bounds=None,
+        min_num_obs=1,
+    ):
+        self.lat_res = lat_res
+        self.lon_res = lon_res
+        self.lat_range = tuple(lat_range)
+        self.lon_range = tuple(lon_range)
+        self.level_bounds = None if level_bounds is None else np.asarray(level_bounds, float)
+        self.min_num_obs = min_num_obs
+
+        self._numlat = int(round((self.lat_range[1] - self.lat_range[0]) / lat_res))
+        self._numlon = int(round((self.lon_range[1] - self.lon_range[0]) / lon_res))
+        if self._numlat < 1 or self._numlon < 1:
+            raise ValueError(
+                f"Invalid grid definition: lat_range={lat_range}, lon_range={lon_range}, "
+                f"lat_res={lat_res}, lon_res={lon_res}"
+            )
+        self._numlev = 1 if self.level_bounds is None else len(self.level_bounds) - 1
+
+        self._num = {}
+        self._mean = {}
+        self._m2 = {}
+        self._time_sum = 0.0
+        self._time_num = 0
+
+    @property
+    def lats(self):
+        """Latitudes of grid cell centres"""
+        return self.lat_range[0] + (np.arange(self._numlat) + 0.5) * self.lat_res
+
+    @property
+    def lons(self):
+        """Longitudes of grid cell centres"""
+        return self.lon_range[0] + (np.arange(self._numlon) + 0.5) * self.lon_res
+
+    @property
+    def levels(self):
+        """Vertical level midpoints (None for 2D grids)"""
+        if self.level_bounds is None:
+            return None
+        return (self.level_bounds[:-1] + self.level_bounds[1:]) / 2
+
+    @property
+    def shape(self):
+        """Shape of output arrays (lat, lon[, level])"""
+        if self.level_bounds is None:
+            return (self._numlat, self._numlon)
+        return (self._numlat, self._numlon, self._numlev)
+
+    @property
+    def size(self):
+        """Total number of grid cells"""
+        return self._numlat * self._numlon * self._numlev
+
+    @property
+    def var_names(self):
+        """Names of variables that have been added"""
+        return list(self._num)
+
+    @property
+    def is_global(self):
+        """Boolean specifying whether grid spans all longitudes"""
+        return np.isclose(self.lon_range[1] - self.lon_range[0], 360)
+
+    @property
+    def mean_time(self):
+        """Mean time of all data points added (None if no times were added)"""
+        if self._time_num == 0:
+            return None
+        return np.datetime64(int(round(self._time_sum / self._time_num)), "ms")
+
+    def cell_indices(self, lats, lons, altitudes=None):
+        """Compute (flat) grid cell index of each data point
+
+        Parameters
+        ----------
+        lats : array-like
+            latitudes of data points
+        lons : array-like
+            longitudes of data points
+        altitudes : array-like, optional
+            altitudes of data points (required for grids with vertical levels)
+
+        Returns
+        -------
+        ndarray
+            index of grid cell of each data point (-1 for data points outside
+            of the grid domain)
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        lat0, lat1 = self.lat_range
+        lon0, lon1 = self.lon_range
+        if self.is_global:
+            lons = (lons - lon0) % 360 + lon0
+        with np.errstate(invalid="ignore"):
+            valid = (lats >= lat0) & (lats <= lat1) & (lons >= lon0) & (lons <= lon1)
+        lat_idx = np.minimum(((lats[valid] - lat0) // self.lat_res).astype(int), self._numlat - 1)
+        lon_idx = np.minimum(((lons[valid] - lon0) // self.lon_res).astype(int), self._numlon - 1)
+        cell_idx = lat_idx * self._numlon + lon_idx
+        if self.level_bounds is not None:
+            if altitudes is None:
+                raise ValueError("Need altitudes for gridding onto vertical levels")
+            alts = np.asarray(altitudes, dtype=float)[valid]
+            lev_idx = np.searchsorted(self.level_bounds, alts, side="left") - 1
+            in_levels = (lev_idx >= 0) & (lev_idx < self._numlev)
+            cell_idx = np.where(in_levels, cell_idx * self._numlev + lev_idx, -1)
+        out = np.full(lats.shape, -1, dtype=int)
+        out[valid] = cell_idx
+        return out
+
+    def add(self, lats, lons, data, altitudes=None, times=None, cell_idx=None):
+        """Add data points
+
+        NaN values are ignored.
+
+        Parameters
+        ----------
+        lats : array-like
+            latitudes of data points
+        lons : array-like
+            longitudes of data points
+        data : dict
+            data values of each variable (keys are variable names, values are
+            arrays of the same length as `lats`)
+        altitudes : array-like, optional
+            altitudes of data points (required for grids with vertical levels)
+        times : array-like, optional
+            times of data points (datetime64 or float milliseconds since
+            1970), used to compute :attr:`mean_time`
+        cell_idx : ndarray, optional
+            precomputed grid cell indices (cf. :func:`cell_indices`)
+        """
+        if cell_idx is None:
+            cell_idx = self.cell_indices(lats, lons, altitudes)
+        if times is not None:
+            times = np.asarray(times)
+            if np.issubdtype(times.dtype, np.datetime64):
+                times = times.astype("datetime64[ms]").astype(float)
+            times = times[np.isfinite(times)]
+            self._time_sum += times.sum()
+            self._time_num += times.size
+        for var, values in data.items():
+            values = np.asarray(values, dtype=float)
+            use = (cell_idx >= 0) & ~np.isnan(values)
+            self._add_var(var, cell_idx[use], values[use])
+
+    def _add_var(self, var, idx, values):
+        num = np.bincount(idx, minlength=self.size).astype(float)
+        mean = np.zeros(self.size)
+        has_data = num > 0
+        mean[has_data] = np.bincount(idx, weights=values, minlength=self.size)[has_data]
+        mean[has_data] /= num[has_data]
+        # two-pass algorithm for numerical stability
+        m2 = np.bincount(idx, weights=(values - mean[idx]) ** 2, minlength=self.size)
+        self._merge_var(var, num, mean, m2)
+
+    def _merge_var(self, var, num, mean, m2):
+        if not var in self._num:
+            self._num[var], self._mean[var], self._m2[var] = num, mean, m2
+            return
+        num_a, mean_a, m2_a = self._num[var], self._mean[var], self._m2[var]
+        upd = num > 0
+        num_tot = num_a[upd] + num[upd]
+        delta = mean[upd] - mean_a[upd]
+        mean_a[upd] += delta * num[upd] / num_tot
+        m2_a[upd] += m2[upd] + delta**2 * num_a[upd] * num[upd] / num_tot
+        num_a[upd] = num_tot
+
+    def merge(self, other):
+        """Merge statistics of other binner (with the same grid) into this one
+
+        Parameters
+        ----------
+        other : GridBinner
+            other binner, e.g. used for a different set of files
+        """
+        if other.shape != self.shape or other.lat_range != self.lat_range:
+            raise ValueError("Cannot merge GridBinner objects with different grids")
+        if other.lon_range != self.lon_range:
+            raise ValueError("Cannot merge GridBinner objects with different grids")
+        for var in other.var_names:
+            num, mean, m2 = other._num[var], other._mean[var], other._m2[var]
+            self._merge_var(var, num.copy(), mean.copy(), m2.copy())
+        self._time_sum += other._time_sum
+        self._time_num += other._time_num
+
+    def numobs(self, var):
+        """Number of observations in each grid cell
+
+        Parameters
+        ----------
+        var : str
+            name of variable
+
+        Returns
+        -------
+        ndarray
+            number of observations (int) in each grid cell
+        """
+        return self._num[var].astype(int).reshape(self.shape)
+
+    def mean(self, var):
+        """Mean value of each grid cell (NaN where fewer than :attr:`min_num_obs`)
+
+        Parameters
+        ----------
+        var : str
+            name of variable
+
+        Returns
+        -------
+        ndarray
+            mean values
+        """
+        mean = np.where(self._valid(var), self._mean[var], np.nan)
+        return mean.reshape(self.shape)
+
+    def stddev(self, var):
+        """Standard deviation (ddof=0) of each grid cell
+
+        Parameters
+        ----------
+        var : str
+            name of variable
+
+        Returns
+        -------
+        ndarray
+            standard deviations (NaN where fewer than :attr:`min_num_obs`)
+        """
+        valid = self._valid(var)
+        var_ = np.full(self.size, np.nan)
+        var_[valid] = self._m2[var][valid] / self._num[var][valid]
+        return np.sqrt(np.maximum(var_, 0)).reshape(self.shape)
+
+    def _valid(self, var):
+        return self._num[var] >= max(self.min_num_obs, 1)
+
+    def to_dict(self, vars=None):
+        """Convert to dictionary (format returned by satellite L2 `to_grid` methods)
+
+        Parameters
+        ----------
+        vars : list, optional
+            variables to be included (default: all)
+
+        Returns
+        -------
+        dict
+            dictionary containing grid coordinates (`latitude`, `longitude`,
+            and `altitude` for grids with vertical levels), `time` and,
+            for each variable, a dictionary with arrays `mean`, `stddev` and
+            `numobs` (NaN where fewer than :attr:`min_num_obs`)
+        """
+        if vars is None:
+            vars = self.var_names
+        out = dict(latitude=self.lats, longitude=self.lons, time=self.mean_time)
+        if self.level_bounds is not None:
+            out["altitude"] = self.levels
+        for var in vars:
+            numobs = self.numobs(var).astype(float)
+            numobs[~self._valid(var).reshape(self.shape)] = np.nan
+            out[var] = dict(mean=self.mean(var), stddev=self.stddev(var), numobs=numobs)
+        return out
+
+    def to_gridded_data(self, var, what="mean", time=None, units="1", **meta):
+        """Convert statistics of one variable into :class:`GriddedData`
+
+        Parameters
+        ----------
+        var : str
+            name of variable
+        what : str
+            statistic to be converted (mean, stddev or numobs)
+        time : optional
+            time stamp of grid (default: :attr:`mean_time`)
+        units : str
+            unit of data
+        **meta
+            additional metadata (e.g. `ts_type`, `data_id`)
+
+        Returns
+        -------
+        GriddedData
+            gridded data with dimensions time, latitude, longitude (and
+            altitude, for grids with vertical levels)
+        """
+        if not what in ("mean", "stddev", "numobs"):
+            raise ValueError(f"Invalid input for what: {what}")
+        if time is None:
+            time = self.mean_time
+        if time is None:
+            raise ValueError("No time information available, please specify time")
+        data = getattr(self, what)(var).astype(float)
+        coords = dict(
+            time=("time", [np.datetime64(time, "ns")], dict(standard_name="time")),
+            lat=("lat", self.lats, dict(standard_name="latitude", units="degrees")),
+            lon=("lon", self.lons, dict(standard_name="longitude", units="degrees")),
+        )
+        if self.level_bounds is not None:
+            coords["alt"] = ("alt", self.levels, dict(standard_name="altitude", units="m"))
+        arr = xr.DataArray(
+            data[np.newaxis],
+            coords=coords,
+            dims=list(coords),
+            name=var,
+            attrs=dict(units=units if what != "numobs" else "1"),
+        )
+        return GriddedData(arr.to_iris(), var_name=var, check_unit=False, **meta)
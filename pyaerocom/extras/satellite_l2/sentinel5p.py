@@ -970,11 +970,17 @@ class ReadL2Data(ReadL2DataBase):
         engine="python",
         return_data_for_gridding=False,
         averaging_kernels=None,
+        binner=None,
+        return_gridded_data=False,
     ):
-        """to_grid method that takes a xarray.Dataset object as input"""
+        """to_grid method that takes a xarray.Dataset object as input
 
-        import numpy as np
-        import xarray as xr
+        Only positive values are used for gridding. See
+        :func:`ReadL2DataBase.to_grid` for a description of the input
+        parameters and output.
+        """
+        if isinstance(vars, str):
+            vars = [vars]
 
         if isinstance(data, dict):
             _data = self.to_xarray(data_to_write=data)
@@ -982,108 +988,41 @@ class ReadL2Data(ReadL2DataBase):
             _data = self.to_xarray(data_to_write=data._data)
 
         if gridtype not in self.SUPPORTED_GRIDS:
-            temp = f"Error: Unknown grid: {gridtype}"
+            self.logger.error(f"Error: Unknown grid: {gridtype}")
             return
-
-        if engine == "python":
-
-            data_for_gridding, gridded_var_data = self._to_grid_grid_init(
-                gridtype=gridtype, vars=vars, init_time=_data["time"].mean()
+        if engine != "python":
+            raise ValueError(f"Unsupported gridding engine: {engine}")
+
+        start_time = time.perf_counter()
+        if binner is None:
+            binner = self.get_grid_binner(gridtype)
+        cell_idx = binner.cell_indices(
+            _data[self._LATITUDENAME].data, _data[self._LONGITUDENAME].data
+        )
+        vardata = {}
+        for var in vars:
+            values = np.array(_data[var].data, dtype=float)
+            with np.errstate(invalid="ignore"):
+                values[~(values > 0.0)] = np.nan
+            vardata[var] = values
+        binner.add(None, None, vardata, times=_data["time"].data, cell_idx=cell_idx)
+
+        elapsed_sec = time.perf_counter() - start_time
+        self.logger.info(f"time for global {gridtype} gridding [s]: {elapsed_sec:.3f}")
+        for var in vars:
+            matching_points = np.sum((cell_idx >= 0) & np.isfinite(vardata[var]))
+            self.logger.info(
+                f"{var}: matched {matching_points} points out of {_data['time'].size} "
+                f"existing points to grid"
             )
 
-            grid_lats = self.SUPPORTED_GRIDS[gridtype]["grid_lats"]
-            grid_lons = self.SUPPORTED_GRIDS[gridtype]["grid_lons"]
-            grid_dist_lat = self.SUPPORTED_GRIDS[gridtype]["grid_dist_lat"]
-            grid_dist_lon = self.SUPPORTED_GRIDS[gridtype]["grid_dist_lon"]
-
-            start_time = time.perf_counter()
-            matching_points = 0
-            # predefine the output data dict
-            # data_for_gridding = {}
-
-            # Loop through the output grid and collect data
-            # store that in data_for_gridding[var]
-            for lat_idx, grid_lat in enumerate(grid_lats):
-                diff_lat = np.absolute(_data[self._LATITUDENAME].data - grid_lat)
-                lat_match_indexes = np.squeeze(np.where(diff_lat <= (grid_dist_lat / 2.0)))
-                print(f"lat: {grid_lat}, matched indexes: {lat_match_indexes.size}")
-                if lat_match_indexes.size == 0:
-                    continue
-
-                for lon_idx, grid_lon in enumerate(grid_lons):
-                    diff_lon = np.absolute(
-                        _data[self._LONGITUDENAME].data[lat_match_indexes] - grid_lon
-                    )
-                    lon_match_indexes = np.squeeze(np.where(diff_lon <= (grid_dist_lon / 2.0)))
-                    if lon_match_indexes.size == 0:
-                        continue
-
-                    for var in vars:
-                        if return_data_for_gridding:
-                            data_for_gridding[var][grid_lat][grid_lon] = np.array(
-                                _data[self._LONGITUDENAME].data[
-                                    lat_match_indexes[lon_match_indexes]
-                                ]
-                            )
-                            # np.array(data[lat_match_indexes[lon_match_indexes], self.INDEX_DICT[var]])
-
-                        less_than_zero_indexes = np.where(
-                            _data[var].data[lat_match_indexes[lon_match_indexes]] > 0.0
-                        )
-
-                        try:
-                            gridded_var_data[var]["mean"][lat_idx, lon_idx] = np.nanmean(
-                                _data[var].data[
-                                    lat_match_indexes[lon_match_indexes[less_than_zero_indexes]]
-                                ]
-                            )
-                            gridded_var_data[var]["stddev"][lat_idx, lon_idx] = np.nanstd(
-                                _data[var].data[
-                                    lat_match_indexes[lon_match_indexes[less_than_zero_indexes]]
-                                ]
-                            )
-                            gridded_var_data[var]["numobs"][lat_idx, lon_idx] = (
-                                _data[var].data[lat_match_indexes[lon_match_indexes]].size
-                            )
-                            matching_points = (
-                                matching_points
-                                + _data[var]
-                                .data[lat_match_indexes[lon_match_indexes[less_than_zero_indexes]]]
-                                .size
-                            )
-                        except IndexError:
-                            continue
-
-            end_time = time.perf_counter()
-            elapsed_sec = end_time - start_time
-            temp = f"time for global {gridtype} gridding with python data types [s]: {elapsed_sec:.3f}"
-            self.logger.info(temp)
-            temp = f"matched {matching_points} points out of {_data['time'].size} existing points to grid"
-            self.logger.info(temp)
-
-            if return_data_for_gridding:
-                self.logger.info("returning also data_for_gridding...")
-                return gridded_var_data, data_for_gridding
-            else:
-                return gridded_var_data
-
-        else:
-            # 1 by on degree grid on emep domain
-            pass
-
-        pass
-
-        if isinstance(data, xr.Dataset):
-
-            pass
-        else:
-            super().to_grid(
-                data=None,
-                vars=None,
-                gridtype=gridtype,
-                engine="python",
-                return_data_for_gridding=False,
-            )
+        if return_gridded_data:
+            return {var: binner.to_gridded_data(var) for var in vars}
+        gridded_var_data = binner.to_dict(vars)
+        if return_data_for_gridding:
+            self.logger.info("returning also data_for_gridding...")
+            return gridded_var_data, self._data_for_gridding(binner, cell_idx, vardata)
+        return gridded_var_data
 
     ###################################################################################
 
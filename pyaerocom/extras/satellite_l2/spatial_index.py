@@ -0,0 +1,100 @@
+"""
+Spatial index for satellite level 2 point clouds
+"""
+import logging
+
+import numpy as np
+
+from pyaerocom.geodesy import EARTH_RADIUS, CoordIndex
+
+logger = logging.getLogger(__name__)
+
+
+class PointCloudIndex(CoordIndex):
+    """Spatial index over the locations of a (satellite L2) point cloud
+
+    The index is built once and can then be used for many queries. Radius
+    queries (e.g. for the colocation with many stations at once) use the
+    KD-tree of :class:`pyaerocom.geodesy.CoordIndex`, bounding box queries
+    use the points sorted by latitude. Points with invalid (NaN) coordinates
+    are not indexed.
+
+    Parameters
+    ----------
+    lats : array-like
+        latitudes of points in degrees
+    lons : array-like
+        longitudes of points in degrees
+    earth_radius : float
+        earth radius in km used to convert distances
+    """
+
+    def __init__(self, lats, lons, earth_radius=EARTH_RADIUS):
+        super().__init__(lats, lons, earth_radius)
+        self._lat_order = np.argsort(self.lats, kind="stable")
+        self._lats_sorted = self.lats[self._lat_order]
+
+    @property
+    def num_points(self):
+        """Number of input points (including invalid ones)"""
+        return self.num_coords
+
+    @property
+    def point_idx(self):
+        """Indices of indexed (valid) points in input arrays"""
+        return self.coord_idx
+
+    def query_radius(self, lats, lons, max_dist, return_distance=False):
+        """Find all points within a distance around one or more locations
+
+        Parameters
+        ----------
+        lats : float or array-like
+            latitude(s) of location(s) in degrees
+        lons : float or array-like
+            longitude(s) of location(s) in degrees
+        max_dist : float
+            maximum (great circle) distance in km (exclusive)
+        return_distance : bool
+            if True, the distances of the matched points are returned as well
+
+        Returns
+        -------
+        list
+            for each location, sorted array of indices (in the input arrays
+            the index was built from) of points closer than `max_dist`.
+        list, optional
+            for each location, distances of matched points in km (only if
+            `return_distance` is True)
+        """
+        matches, distances = super().query_radius(lats, lons, max_dist, return_distance=True)
+        for i, (idx, dists) in enumerate(zip(matches, distances)):
+            # keep order of points (CoordIndex sorts matches by distance)
+            order = np.argsort(idx, kind="stable")
+            matches[i], distances[i] = idx[order], dists[order]
+        if return_distance:
+            return matches, distances
+        return matches
+
+    def query_bbox(self, lat_min=-90.0, lat_max=90.0, lon_min=-180.0, lon_max=360.0):
+        """Find all points within a latitude / longitude range (inclusive)
+
+        Parameters
+        ----------
+        lat_min, lat_max : float
+            latitude range in degrees
+        lon_min, lon_max : float
+            longitude range in degrees
+
+        Returns
+        -------
+        ndarray
+            sorted indices (in the input arrays the index was built from) of
+            points within the input range
+        """
+        first = np.searchsorted(self._lats_sorted, lat_min, side="left")
+        last = np.searchsorted(self._lats_sorted, lat_max, side="right")
+        idx = self._lat_order[first:last]
+        lons = self.lons[idx]
+        idx = idx[(lons >= lon_min) & (lons <= lon_max)]
+        return self.point_idx[np.sort(idx)]
@@ -10,12 +10,16 @@ import os
 import geonum
 import numpy as np
 import reverse_geocode as rg
+from scipy.spatial import cKDTree
 
 from pyaerocom import const
 from pyaerocom.helpers import isnumeric
 
 logger = logging.getLogger(__name__)
 
+#: average earth radius in km used for haversine distances
+EARTH_RADIUS = 6371.0
+
 
 def calc_latlon_dists(latref, lonref, latlons):
     """
@@ -38,7 +42,14 @@ def calc_latlon_dists(latref, lonref, latlons):
         for all (lat, lon) coords in `latlons`
 
     """
-    return [haversine(latref, lonref, c[0], c[1]) for c in latlons]
+    lats, lons = _split_latlons(latlons)
+    return list(haversine(latref, lonref, lats, lons))
+
+
+def _split_latlons(latlons):
+    """Convert list of (lat, lon) tuples into arrays of latitudes and longitudes"""
+    latlons = np.asarray(latlons, dtype=float).reshape(-1, 2)
+    return latlons[:, 0], latlons[:, 1]
 
 
 def find_coord_indices_within_distance(latref, lonref, latlons, radius=1):
@@ -66,13 +77,239 @@ def find_coord_indices_within_distance(latref, lonref, latlons, radius=1):
         closest
 
     """
-    dists = np.asarray(calc_latlon_dists(latref, lonref, latlons))
+    lats, lons = _split_latlons(latlons)
+    dists = haversine(latref, lonref, lats, lons)
     within_tol = np.where(dists < radius)[0]
     # the following statement sorts all indices in dists that are within
     # the tolerance radius, so the first entry in the returned aaray is the
     # index of the closest coordinate within the radius and the last is the
     # furthest
-    return within_tol[np.argsort(dists[within_tol])]
+    return within_tol[np.argsort(dists[within_tol], kind="stable")]
+
+
+def latlon_to_xyz(lats, lons):
+    """Convert latitudes and longitudes into cartesian coordinates on the unit sphere
+
+    Parameters
+    ----------
+    lats : array-like
+        latitudes in decimal degrees
+    lons : array-like
+        longitudes in decimal degrees
+
+    Returns
+    -------
+    ndarray
+        array of shape (N, 3) with cartesian coordinates
+    """
+    lats = np.deg2rad(np.asarray(lats, dtype=float))
+    lons = np.deg2rad(np.asarray(lons, dtype=float))
+    coslat = np.cos(lats)
+    return np.stack([coslat * np.cos(lons), coslat * np.sin(lons), np.sin(lats)], axis=-1)
+
+
+class CoordIndex:
+    """Spatial index for radius and nearest neighbour searches of coordinates
+
+    The coordinates are indexed using a KD-tree over their location on the
+    unit sphere, so that many reference coordinates can be matched at once.
+    Distances are great circle distances computed with :func:`haversine`.
+    Coordinates with invalid (NaN) latitude or longitude are not indexed.
+
+    Parameters
+    ----------
+    lats : array-like
+        latitudes of coordinates in decimal degrees
+    lons : array-like
+        longitudes of coordinates in decimal degrees
+    earth_radius : float
+        average earth radius in km, defaults to 6371.0
+    """
+
+    def __init__(self, lats, lons, earth_radius=EARTH_RADIUS):
+        lats = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons = np.atleast_1d(np.asarray(lons, dtype=float))
+        if lats.shape != lons.shape:
+            raise ValueError("lats and lons need to have the same shape")
+        self.earth_radius = earth_radius
+        self.num_coords = len(lats)
+        #: indices of indexed (valid) coordinates in input arrays
+        self.coord_idx = np.flatnonzero(np.isfinite(lats) & np.isfinite(lons))
+        self.lats = lats[self.coord_idx]
+        self.lons = lons[self.coord_idx]
+        self._tree = cKDTree(latlon_to_xyz(self.lats, self.lons))
+
+    def __len__(self):
+        return len(self.coord_idx)
+
+    @staticmethod
+    def _prep_refs(lats, lons):
+        lats = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons = np.atleast_1d(np.asarray(lons, dtype=float))
+        valid = np.isfinite(lats) & np.isfinite(lons)
+        return lats, lons, valid
+
+    def query_radius(self, lats, lons, radius, return_distance=False):
+        """Find indexed coordinates within a radius around reference coordinates
+
+        Parameters
+        ----------
+        lats : float or array-like
+            latitude(s) of reference coordinate(s)
+        lons : float or array-like
+            longitude(s) of reference coordinate(s)
+        radius : float
+            maximum (exclusive) distance in km
+        return_distance : bool
+            if True, the distances of the matches are returned as well
+
+        Returns
+        -------
+        list
+            for each reference coordinate, array of indices of the matched
+            coordinates, sorted by distance (starting with the closest)
+        list, optional
+            for each reference coordinate, distances of the matches in km
+            (only if `return_distance` is True)
+        """
+        lats, lons, valid = self._prep_refs(lats, lons)
+        angle = min(radius / self.earth_radius, np.pi)
+        # chord length with small tolerance, exact distances are checked below
+        chord = 2.0 * np.sin(angle / 2.0) * (1 + 1e-9) + 1e-12
+        candidates = [[] for _ in range(len(lats))]
+        if valid.any() and len(self) > 0:
+            xyz = latlon_to_xyz(lats[valid], lons[valid])
+            for i, idx in zip(np.flatnonzero(valid), self._tree.query_ball_point(xyz, chord)):
+                candidates[i] = idx
+        matches, distances = [], []
+        for lat, lon, idx in zip(lats, lons, candidates):
+            idx = np.sort(np.asarray(idx, dtype=int))
+            dists = haversine(lat, lon, self.lats[idx], self.lons[idx], self.earth_radius)
+            order = np.argsort(dists, kind="stable")
+            order = order[dists[order] < radius]
+            matches.append(self.coord_idx[idx[order]])
+            distances.append(dists[order])
+        if return_distance:
+            return matches, distances
+        return matches
+
+    def query_nearest(self, lats, lons, k=1, max_dist=None):
+        """Find the k nearest indexed coordinates of reference coordinates
+
+        Parameters
+        ----------
+        lats : float or array-like
+            latitude(s) of reference coordinate(s)
+        lons : float or array-like
+            longitude(s) of reference coordinate(s)
+        k : int
+            number of nearest neighbours
+        max_dist : float, optional
+            maximum (inclusive) distance of neighbours in km
+
+        Returns
+        -------
+        ndarray
+            array of shape (N, k) with indices of the nearest coordinates,
+            sorted by distance (-1 where fewer than `k` neighbours exist)
+        ndarray
+            array of shape (N, k) with corresponding distances in km (inf
+            where fewer than `k` neighbours exist)
+        """
+        lats, lons, valid = self._prep_refs(lats, lons)
+        idx = np.full((len(lats), k), -1, dtype=int)
+        dists = np.full((len(lats), k), np.inf)
+        if not valid.any() or len(self) == 0:
+            return idx, dists
+        chord_max = np.inf
+        if max_dist is not None:
+            angle = min(max_dist / self.earth_radius, np.pi)
+            chord_max = 2.0 * np.sin(angle / 2.0) * (1 + 1e-9) + 1e-12
+        _, nn = self._tree.query(
+            latlon_to_xyz(lats[valid], lons[valid]), k=k, distance_upper_bound=chord_max
+        )
+        nn = nn.reshape(-1, k)
+        found = nn < len(self)
+        nn_safe = np.where(found, nn, 0)
+        # chord and great circle distances are monotonically related, so the
+        # order of the neighbours is the same for both
+        nn_dists = haversine(
+            lats[valid][:, np.newaxis],
+            lons[valid][:, np.newaxis],
+            self.lats[nn_safe],
+            self.lons[nn_safe],
+            self.earth_radius,
+        )
+        if max_dist is not None:
+            found &= nn_dists <= max_dist
+        idx[valid] = np.where(found, self.coord_idx[nn_safe], -1)
+        dists[valid] = np.where(found, nn_dists, np.inf)
+        return idx, dists
+
+
+def find_coords_within_radius(latrefs, lonrefs, lats, lons, radius=1, return_distance=False):
+    """Find coordinates within a radius around each of several reference coordinates
+
+    Many-to-many version of :func:`find_coord_indices_within_distance`.
+
+    Parameters
+    ----------
+    latrefs : float or array-like
+        latitude(s) of reference coordinate(s)
+    lonrefs : float or array-like
+        longitude(s) of reference coordinate(s)
+    lats : array-like
+        latitudes of coordinates to be searched
+    lons : array-like
+        longitudes of coordinates to be searched
+    radius : float or int, optional
+        Maximum allowed (exclusive) distance in km. The default is 1.
+    return_distance : bool
+        if True, the distances of the matches are returned as well
+
+    Returns
+    -------
+    list
+        for each reference coordinate, array of indices of coordinates in
+        (`lats`, `lons`) that are within the radius, sorted by distance
+        (starting with the closest)
+    list, optional
+        corresponding distances in km (only if `return_distance` is True)
+    """
+    return CoordIndex(lats, lons).query_radius(
+        latrefs, lonrefs, radius, return_distance=return_distance
+    )
+
+
+def find_nearest_coords(latrefs, lonrefs, lats, lons, k=1, max_dist=None):
+    """Find the k nearest coordinates of each of several reference coordinates
+
+    Parameters
+    ----------
+    latrefs : float or array-like
+        latitude(s) of reference coordinate(s)
+    lonrefs : float or array-like
+        longitude(s) of reference coordinate(s)
+    lats : array-like
+        latitudes of coordinates to be searched
+    lons : array-like
+        longitudes of coordinates to be searched
+    k : int
+        number of nearest neighbours
+    max_dist : float, optional
+        maximum (inclusive) distance of neighbours in km
+
+    Returns
+    -------
+    ndarray
+        array of shape (N, k) with indices of the nearest coordinates in
+        (`lats`, `lons`), sorted by distance (-1 where fewer than `k`
+        neighbours exist)
+    ndarray
+        array of shape (N, k) with corresponding distances in km (inf where
+        fewer than `k` neighbours exist)
+    """
+    return CoordIndex(lats, lons).query_nearest(latrefs, lonrefs, k=k, max_dist=max_dist)
 
 
 def get_country_info_coords(coords):
@@ -283,11 +520,12 @@ def is_within_radius_km(lat0, lon0, lat1, lon1, maxdist_km, alt0=0, alt1=0, **kw
     return False
 
 
-def haversine(lat0, lon0, lat1, lon1, earth_radius=6371.0):
+def haversine(lat0, lon0, lat1, lon1, earth_radius=EARTH_RADIUS):
     """Haversine formula
 
     Approximate horizontal distance between 2 points assuming a spherical
-    earth using haversine formula.
+    earth using haversine formula. Input coordinates may also be arrays, which
+    are broadcast against each other.
 
     Note
     ----
@@ -308,7 +546,7 @@ def haversine(lat0, lon0, lat1, lon1, earth_radius=6371.0):
 
     Returns
     --------
-    float
+    float or ndarray
         horizontal distance between input coordinates in km
     """
     hav = lambda d_theta: np.sin(d_theta / 2.0) ** 2
@@ -319,6 +557,7 @@ def haversine(lat0, lon0, lat1, lon1, earth_radius=6371.0):
     lat1 = np.radians(lat1)
 
     a = hav(d_lat) + np.cos(lat0) * np.cos(lat1) * hav(d_lon)
-    c = 2 * np.arcsin(np.sqrt(a))
+    # a may exceed 1 slightly due to rounding errors for antipodal points
+    c = 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
 
     return earth_radius * c
@@ -39,7 +39,7 @@ from pyaerocom.helpers import (
     str_to_iris,
     to_pandas_timestamp,
 )
-from pyaerocom.helpers_landsea_masks import load_region_mask_iris
+from pyaerocom.helpers_landsea_masks import load_region_mask_regridded
 from pyaerocom.mathutils import estimate_value_range, exponent
 from pyaerocom.region import Region
 from pyaerocom.stationdata import StationData
@@ -1798,22 +1798,11 @@ class GriddedData:
                 f"Invalid input for region_id: {region_id}, choose from: {const.HTAP_REGIONS}"
             )
 
-        # get Iris mask
-        mask_iris = load_region_mask_iris(region_id)
+        # mask regridded to grid of this object (cached)
+        npm = load_region_mask_regridded(region_id, self)
 
-        # Reads mask to griddedata
-        mask = GriddedData(mask_iris, check_unit=False, convert_unit_on_init=False)
-        mask = mask.regrid(self.cube)
-
-        # mask.quickplot_map(vmin=0, vmax=1)
-        npm = mask.cube.data
-
-        if isinstance(npm, np.ma.core.MaskedArray):
-            npm = npm.filled(np.nan)
-
-        thresh_mask = npm > thresh_coast
-        npm[thresh_mask] = 0
-        npm[~thresh_mask] = 1
+        # grid points outside region
+        exclude = ~(npm > thresh_coast)
 
         # griddeddata = self.copy()
 
@@ -1824,7 +1813,7 @@ class GriddedData:
                 griddeddata = self.copy()
 
             # UPDATE MASK WITH REGIONAL MASK.
-            griddeddata.cube.data[:, npm.astype(bool)] = np.nan
+            griddeddata.cube.data[:, exclude] = np.nan
             griddeddata.metadata["region"] = region_id
 
         except MemoryError:
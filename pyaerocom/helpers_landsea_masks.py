@@ -10,9 +10,11 @@ data classes (i.e. :class:`GriddedData`, :class:`UngriddedData`,
 """
 
 import glob
+import hashlib
 import logging
 import os
 
+import iris
 import numpy as np
 import requests
 import xarray as xr
@@ -21,9 +23,39 @@ from iris import load_cube
 from pyaerocom import const
 from pyaerocom.exceptions import DataRetrievalError
 from pyaerocom.helpers import numpy_to_cube
+from pyaerocom.lru_cache import SizeBoundedLRUCache
 
 logger = logging.getLogger(__name__)
 
+#: maximum total size (in bytes) of region masks kept in memory
+MAX_MASK_CACHE_SIZE = 2e9
+
+
+class RegionMaskCache(SizeBoundedLRUCache):
+    """Size bounded, thread-safe in-memory cache for loaded region masks
+
+    Used by :func:`load_region_mask_xr`, :func:`load_region_mask_iris` and
+    :func:`load_region_mask_regridded`, so that the mask files of each
+    region are read (and regridded to a certain grid) only once per process.
+    """
+
+    NAME = "region mask cache"
+
+    @staticmethod
+    def get_size(data):
+        if isinstance(data, iris.cube.Cube):
+            return data.core_data().nbytes
+        return SizeBoundedLRUCache.get_size(data)
+
+
+#: in-memory cache of loaded region masks
+REGION_MASK_CACHE = RegionMaskCache(max_size=MAX_MASK_CACHE_SIZE)
+
+
+def _set_readonly(arr):
+    arr.flags.writeable = False
+    return arr
+
 
 def available_htap_masks():
     """
@@ -134,6 +166,12 @@ def get_htap_mask_files(*region_ids):
 def load_region_mask_xr(*regions):
     """Load boolean mask for input regions (as xarray.DataArray)
 
+    Note
+    ----
+    Loaded masks are cached in memory (cf. :attr:`REGION_MASK_CACHE`) and the
+    returned object is shared among all callers, its data is thus read-only.
+    Use :func:`xarray.DataArray.copy` for modifications.
+
     Parameters
     -----------
     *regions
@@ -145,6 +183,16 @@ def load_region_mask_xr(*regions):
     xarray.DataArray
         boolean mask for input region(s)
     """
+    key = REGION_MASK_CACHE.make_key(kind="xr", regions=regions)
+    mask = REGION_MASK_CACHE.get(key)
+    if mask is None:
+        mask = _load_region_mask_xr(*regions)
+        _set_readonly(mask.values)
+        REGION_MASK_CACHE.put(key, mask)
+    return mask
+
+
+def _load_region_mask_xr(*regions):
     masks = None
     for i, fil in enumerate(get_htap_mask_files(*regions)):
         r = regions[i]
@@ -159,12 +207,17 @@ def load_region_mask_xr(*regions):
     mask["name"] = name
     mask.attrs["long_name"] = name
     mask = mask.rename({"lat": "latitude", "long": "longitude"})
-    return mask
+    return mask.load()
 
 
 def load_region_mask_iris(*regions):
     """Loads regional mask to iris.
 
+    Note
+    ----
+    Loaded masks are cached in memory (cf. :attr:`REGION_MASK_CACHE`), the
+    returned cube is a copy of the cached one.
+
     Parameters
     -----------
     region_id : str
@@ -175,6 +228,15 @@ def load_region_mask_iris(*regions):
     iris.cube.Cube
         cube representing merged mask from input regions
     """
+    key = REGION_MASK_CACHE.make_key(kind="iris", regions=regions)
+    mask = REGION_MASK_CACHE.get(key)
+    if mask is None:
+        mask = _load_region_mask_iris(*regions)
+        REGION_MASK_CACHE.put(key, mask)
+    return mask.copy()
+
+
+def _load_region_mask_iris(*regions):
     cubes = []
     names = []
     for i, fil in enumerate(get_htap_mask_files(*regions)):
@@ -189,9 +251,62 @@ def load_region_mask_iris(*regions):
     name = "-".join(names)
     out.var_name = name
     # out.attributes['long_name'] = name
+    # realise data, so that cached masks do not need to be read again
+    out.data
     return out
 
 
+def _grid_key(data):
+    """Hash of the horizontal grid (coordinates and bounds) of a GriddedData object"""
+    h = hashlib.sha1()
+    for coord in (data.latitude, data.longitude):
+        h.update(np.ascontiguousarray(coord.points, dtype=float).tobytes())
+        if coord.bounds is not None:
+            h.update(np.ascontiguousarray(coord.bounds, dtype=float).tobytes())
+        h.update(str(getattr(coord, "circular", False)).encode())
+    return h.hexdigest()
+
+
+def load_region_mask_regridded(region_id, data):
+    """Load mask of a region regridded to the horizontal grid of a data object
+
+    Regridded masks are cached in memory (cf. :attr:`REGION_MASK_CACHE`) for
+    each region and grid, so that masks are regridded only once for each
+    model grid.
+
+    Parameters
+    ----------
+    region_id : str
+        ID of HTAP region
+    data : GriddedData
+        data object with latitude and longitude dimension, onto the grid of
+        which the mask is regridded (using :func:`GriddedData.regrid`)
+
+    Returns
+    -------
+    ndarray
+        read-only 2D array of regridded mask values (shape of latitude and
+        longitude dimension of `data`, NaN where undefined)
+    """
+    from pyaerocom.griddeddata import GriddedData
+
+    # make sure the grid used to compute the key is the one used for regridding
+    data._check_lonlat_bounds()
+    data.check_lon_circular()
+    key = REGION_MASK_CACHE.make_key(kind="regridded", regions=region_id, grid=_grid_key(data))
+    npm = REGION_MASK_CACHE.get(key)
+    if npm is None:
+        mask = GriddedData(
+            load_region_mask_iris(region_id), check_unit=False, convert_unit_on_init=False
+        )
+        npm = mask.regrid(data.cube).cube.data
+        if isinstance(npm, np.ma.core.MaskedArray):
+            npm = npm.astype(float).filled(np.nan)
+        npm = _set_readonly(np.asarray(npm))
+        REGION_MASK_CACHE.put(key, npm)
+    return npm
+
+
 def get_mask_value(lat, lon, mask):
     """Get value of mask at input lat / lon position
 
@@ -214,6 +329,43 @@ def get_mask_value(lat, lon, mask):
     return float(mask.sel(latitude=lat, longitude=lon, method="nearest"))
 
 
+def get_mask_values(lats, lons, mask):
+    """Get values of mask at multiple lat / lon positions
+
+    Vectorised version of :func:`get_mask_value`, all positions are looked up
+    at once.
+
+    Parameters
+    ----------
+    lats : array-like
+        latitudes
+    lons : array-like
+        longitudes
+    mask : xarray.DataArray
+        data array
+
+    Returns
+    -------
+    ndarray
+        nearest neighbour mask values for input coordinates (NaN for invalid
+        coordinates)
+    """
+    if not isinstance(mask, xr.DataArray):
+        raise ValueError(f"Invalid input for mask: need DataArray, got {type(mask)}")
+    lats = np.atleast_1d(np.asarray(lats, dtype=float))
+    lons = np.atleast_1d(np.asarray(lons, dtype=float))
+    valid = np.isfinite(lats) & np.isfinite(lons)
+    values = np.full(lats.shape, np.nan)
+    if valid.any():
+        vals = mask.sel(
+            latitude=xr.DataArray(lats[valid], dims="points"),
+            longitude=xr.DataArray(lons[valid], dims="points"),
+            method="nearest",
+        )
+        values[valid] = vals.values
+    return values
+
+
 def check_all_htap_available():
     """
     Check for missing HTAP masks on local computer and download
@@ -1,13 +1,19 @@
 """
 Caching class for reading and writing of ungridded data Cache objects
 """
+import copy
 import glob
 import logging
 import os
 import pickle
+import time
+from fnmatch import fnmatch
+
+import numpy as np
 
 from pyaerocom import const
 from pyaerocom.exceptions import CacheReadError, CacheWriteError
+from pyaerocom.helpers import start_stop, to_datetime64
 from pyaerocom.ungriddeddata import UngriddedData
 
 logger = logging.getLogger(__name__)
@@ -23,6 +29,31 @@ class CacheHandlerUngridded:
 
     e.g. EBASMC_scatc550aer.pkl
 
+    Two cache formats are supported (cf. :attr:`CACHE_FORMATS`). For format
+    "pkl", the whole :class:`UngriddedData` object is pickled. For format
+    "npy", the data array is stored in a separate file (same name, but
+    ending .npy) which is memory mapped when the cache is loaded, so that
+    loading is fast and only the pages of the array that are accessed are
+    read from disk (and can be shared among processes). The .pkl file then
+    only contains the metadata, and a time index (first and last time stamp
+    of each station and variable). Both formats can be loaded, independent of
+    the format chosen for writing.
+
+    To check whether a cache file is outdated, the newest file in the data
+    source directory is compared with the one stored in the cache header.
+    Since scanning large directories is slow, a fingerprint of the source
+    directory (modification time, number of files and newest file) can be
+    stored in the cache directory (:attr:`FINGERPRINT_FILE`), so that the
+    directory is only rescanned if the fingerprint changed. This is
+    activated by setting :attr:`pyaerocom.const.UNGRIDDED_CACHE_SRC_DIR_TTL`
+    (cf. :func:`rescan_src_data_dir`). Note that this does not detect changes
+    of existing files that do not change the directory itself.
+
+    Subsets of cached data (time window and / or stations) can be loaded via
+    :func:`check_and_load`. For format "npy", only the rows of the matching
+    stations are read from disk and the time index is used to skip stations
+    without data in the requested time window.
+
     Attributes
     ----------
     reader : ReadUngriddedBase
@@ -30,6 +61,12 @@ class CacheHandlerUngridded:
     loaded_data : dict
         dictionary containing successfully loaded instances of single variable
         :class:`UngriddedData` objects (keys are variable names)
+    loaded_subsets : dict
+        like :attr:`loaded_data`, but for data objects that were loaded with
+        time window and / or station constraints (cf. :func:`check_and_load`)
+    cache_format : str
+        format used for writing cache files. Defaults to
+        :attr:`pyaerocom.const.UNGRIDDED_CACHE_FORMAT`.
     """
 
     __version__ = "1.12"
@@ -45,14 +82,30 @@ class CacheHandlerUngridded:
         "cacher_version",
     ]
 
-    def __init__(self, reader=None, cache_dir=None, **kwargs):
+    #: Supported formats for writing cache files
+    CACHE_FORMATS = ["pkl", "npy"]
+
+    #: Name of file in cache directory containing fingerprints of data source
+    #: directories
+    FINGERPRINT_FILE = "src_dir_fingerprints.pkl"
+
+    def __init__(self, reader=None, cache_dir=None, cache_format=None, **kwargs):
         self._reader = None
         if reader is not None:
             self.reader = reader
 
         self.loaded_data = {}
+        self.loaded_subsets = {}
         self._cache_dir = cache_dir
 
+        if cache_format is None:
+            cache_format = const.UNGRIDDED_CACHE_FORMAT
+        if not cache_format in self.CACHE_FORMATS:
+            raise ValueError(
+                f"Invalid cache format {cache_format}. Choose from {self.CACHE_FORMATS}"
+            )
+        self.cache_format = cache_format
+
     @property
     def reader(self):
         """Instance of reader class"""
@@ -68,6 +121,7 @@ class CacheHandlerUngridded:
             raise TypeError("Invalid input for reader")
         self._reader = val
         self.loaded_data = {}
+        self.loaded_subsets = {}
 
     @property
     def cache_dir(self):
@@ -139,6 +193,296 @@ class CacheHandlerUngridded:
             raise FileNotFoundError(f"Specified output directory does not exist:{cache_dir}")
         return os.path.join(cache_dir, var_or_file_name)
 
+    @staticmethod
+    def array_file_path(file_path):
+        """File path of data array file (format npy) for input cache file path"""
+        return f"{os.path.splitext(file_path)[0]}.npy"
+
+    def _remove_cache_file(self, file_path):
+        """Remove cache file and associated data array file (if it exists)"""
+        for fp in (file_path, self.array_file_path(file_path)):
+            if os.path.exists(fp):
+                os.remove(fp)
+
+    @staticmethod
+    def _compress_meta_idx(meta_idx):
+        """Convert index arrays in meta_idx to (start, stop) where possible
+
+        Parameters
+        ----------
+        meta_idx : dict
+            :attr:`UngriddedData.meta_idx`
+
+        Returns
+        -------
+        dict
+            like input, but index arrays that correspond to a contiguous
+            block of rows are replaced with tuple (start, stop)
+        """
+        compressed = {}
+        for meta_key, var_idx in meta_idx.items():
+            compressed[meta_key] = {}
+            for var, idx in var_idx.items():
+                idx = np.asarray(idx)
+                if (
+                    len(idx) > 0
+                    and np.issubdtype(idx.dtype, np.integer)
+                    and (np.diff(idx) == 1).all()
+                ):
+                    compressed[meta_key][var] = (int(idx[0]), int(idx[-1]) + 1)
+                else:
+                    compressed[meta_key][var] = idx
+        return compressed
+
+    @staticmethod
+    def _expand_meta_idx(compressed):
+        """Inverse of :func:`_compress_meta_idx`"""
+        meta_idx = {}
+        for meta_key, var_idx in compressed.items():
+            meta_idx[meta_key] = {}
+            for var, idx in var_idx.items():
+                if isinstance(idx, tuple):
+                    idx = np.arange(*idx)
+                meta_idx[meta_key][var] = idx
+        return meta_idx
+
+    def _dump_npy(self, data, file_path, out_handle):
+        """Write data array to .npy file and pickle metadata index
+
+        Parameters
+        ----------
+        data : UngriddedData
+            data to be cached
+        file_path : str
+            path of cache file (.pkl) that contains the metadata
+        out_handle
+            file handle of cache file (header is already written)
+        """
+        array_file = self.array_file_path(file_path)
+        np.save(array_file, data._data, allow_pickle=False)
+
+        # object without data array and with compressed meta_idx
+        meta_obj = copy.copy(data)
+        meta_obj._data = None
+        meta_obj.meta_idx = None
+        index = dict(
+            data_obj=meta_obj,
+            array_file=os.path.basename(array_file),
+            shape=data._data.shape,
+            meta_idx=self._compress_meta_idx(data.meta_idx),
+            time_index=self._make_time_index(data),
+        )
+        pickle.dump(index, out_handle, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _make_time_index(data):
+        """Compute first and last time stamp of each station and variable
+
+        Parameters
+        ----------
+        data : UngriddedData
+            data object
+
+        Returns
+        -------
+        dict
+            nested dict (like :attr:`UngriddedData.meta_idx`) containing tuples
+            (tmin, tmax) of the numerical time stamps in the data array
+        """
+        time_index = {}
+        for meta_key, var_idx in data.meta_idx.items():
+            time_index[meta_key] = {}
+            for var, idx in var_idx.items():
+                times = data._data[idx, data._TIMEINDEX]
+                if len(times) == 0 or np.isnan(times).all():
+                    time_index[meta_key][var] = (np.nan, np.nan)
+                else:
+                    time_index[meta_key][var] = (np.nanmin(times), np.nanmax(times))
+        return time_index
+
+    @staticmethod
+    def _find_station_meta_keys(metadata, station_name=None, latitude=None, longitude=None):
+        """Find metadata blocks that match input station constraints
+
+        Parameters
+        ----------
+        metadata : dict
+            :attr:`UngriddedData.metadata`
+        station_name : str or list, optional
+            station name(s) or wildcard pattern(s)
+        latitude : list, optional
+            latitude range (lower, upper)
+        longitude : list, optional
+            longitude range (lower, upper)
+
+        Returns
+        -------
+        list
+            metadata keys matching all input constraints
+        """
+        if isinstance(station_name, str):
+            station_name = [station_name]
+        keys = []
+        for meta_key, meta in metadata.items():
+            if station_name is not None:
+                name = meta.get("station_name")
+                if name is None:
+                    continue
+                if not name in station_name and not any(
+                    fnmatch(name, pattern) for pattern in station_name
+                ):
+                    continue
+            if latitude is not None:
+                lat = meta.get("latitude")
+                if lat is None or not latitude[0] <= lat <= latitude[1]:
+                    continue
+            if longitude is not None:
+                lon = meta.get("longitude")
+                if lon is None or not longitude[0] <= lon <= longitude[1]:
+                    continue
+            keys.append(meta_key)
+        return keys
+
+    def _extract_subset(
+        self,
+        data,
+        meta_idx,
+        start=None,
+        stop=None,
+        station_name=None,
+        latitude=None,
+        longitude=None,
+        time_index=None,
+    ):
+        """Extract time window and / or station subset from data object
+
+        Parameters
+        ----------
+        data : UngriddedData
+            data object (data array may be memory mapped)
+        meta_idx : dict
+            row indices of each station and variable (may be compressed, cf.
+            :func:`_compress_meta_idx`)
+        start, stop, optional
+            time window (any format that can be handled by
+            :func:`pyaerocom.helpers.start_stop`)
+        station_name : str or list, optional
+            station name(s) or wildcard pattern(s)
+        latitude : list, optional
+            latitude range (lower, upper)
+        longitude : list, optional
+            longitude range (lower, upper)
+        time_index : dict, optional
+            output from :func:`_make_time_index`, used to skip stations
+            without data in time window
+
+        Returns
+        -------
+        UngriddedData
+            new data object containing the subset (may be empty)
+        """
+        filter_time = start is not None or stop is not None
+        tstart, tstop = -np.inf, np.inf
+        if start is not None:
+            start, stop = start_stop(start, stop)
+            tstart = np.float64(start.to_datetime64().astype("datetime64[s]"))
+            tstop = np.float64(stop.to_datetime64().astype("datetime64[s]"))
+        elif stop is not None:
+            tstop = np.float64(to_datetime64(stop).astype("datetime64[s]"))
+
+        meta_keys = self._find_station_meta_keys(
+            data.metadata, station_name=station_name, latitude=latitude, longitude=longitude
+        )
+        tcol = data._TIMEINDEX
+        blocks = {}
+        totnum = 0
+        for meta_key in meta_keys:
+            for var, idx in meta_idx[meta_key].items():
+                if not filter_time:
+                    within = True
+                elif time_index is not None:
+                    tmin, tmax = time_index[meta_key][var]
+                    if not (tmin <= tstop and tmax >= tstart):
+                        continue
+                    within = tstart <= tmin and tmax <= tstop
+                else:
+                    within = False
+                if isinstance(idx, tuple):
+                    idx = slice(*idx)
+                rows = np.asarray(data._data[idx])
+                if not within:
+                    rows = rows[(rows[:, tcol] >= tstart) & (rows[:, tcol] <= tstop)]
+                if len(rows) == 0:
+                    continue
+                blocks.setdefault(meta_key, {})[var] = rows
+                totnum += len(rows)
+
+        new = UngriddedData(num_points=totnum)
+        meta_key_new = 0.0
+        data_idx_new = 0
+        for meta_key, var_rows in blocks.items():
+            # variables without data in subset are removed from metadata
+            meta = dict(data.metadata[meta_key])
+            if "variables" in meta:
+                meta["variables"] = [var for var in meta["variables"] if var in var_rows]
+            if "var_info" in meta:
+                meta["var_info"] = {
+                    var: info for var, info in meta["var_info"].items() if var in var_rows
+                }
+            new.metadata[meta_key_new] = meta
+            new.meta_idx[meta_key_new] = {}
+            for var, rows in var_rows.items():
+                stop_idx = data_idx_new + len(rows)
+                new._data[data_idx_new:stop_idx] = rows
+                new.meta_idx[meta_key_new][var] = np.arange(data_idx_new, stop_idx)
+                new.var_idx[var] = data.var_idx[var]
+                data_idx_new = stop_idx
+            meta_key_new += 1
+
+        new.filter_hist.update(data.filter_hist)
+        new.data_revision.update(data.data_revision)
+        return new
+
+    def _load_npy(self, index, file_path, **subset):
+        """Load cached data stored in format npy
+
+        Parameters
+        ----------
+        index : dict
+            metadata index (second object in cache file)
+        file_path : str
+            path of cache file (.pkl) that contains the metadata
+        **subset
+            time window and / or station constraints, cf.
+            :func:`_extract_subset`.
+
+        Raises
+        ------
+        CacheReadError
+            if data array file does not exist or does not match the index
+
+        Returns
+        -------
+        UngriddedData
+            loaded data, the data array is memory mapped (copy on write),
+            unless a subset is requested.
+        """
+        array_file = os.path.join(os.path.dirname(file_path), index["array_file"])
+        if not os.path.isfile(array_file):
+            raise CacheReadError(f"Data array file {array_file} of cache file does not exist")
+        arr = np.load(array_file, mmap_mode="c", allow_pickle=False)
+        if not arr.shape == index["shape"]:
+            raise CacheReadError(f"Data array file {array_file} does not match cache file")
+
+        data = index["data_obj"]
+        data._data = arr
+        if subset:
+            return self._extract_subset(
+                data, index["meta_idx"], time_index=index.get("time_index"), **subset
+            )
+        data.meta_idx = self._expand_meta_idx(index["meta_idx"])
+        return data
+
     def _check_pkl_head_vs_database(self, in_handle):
 
         current = self.cache_meta_info()
@@ -154,13 +498,126 @@ class CacheHandlerUngridded:
                 return False
         return True
 
-    def cache_meta_info(self):
-        """Dictionary containing relevant caching meta-info"""
+    @property
+    def fingerprint_file(self):
+        """File path of fingerprints of data source directories"""
+        return os.path.join(self.cache_dir, self.FINGERPRINT_FILE)
+
+    def _scan_src_data_dir(self):
+        """Find newest file in data source directory
+
+        Returns
+        -------
+        str
+            name of newest file
+        float
+            creation time of newest file
+        """
+        newestp = max(glob.iglob(os.path.join(self.src_data_dir, "*")), key=os.path.getctime)
+        return os.path.basename(newestp), os.path.getctime(newestp)
+
+    def _read_fingerprints(self):
         try:
-            newestp = max(glob.iglob(os.path.join(self.src_data_dir, "*")), key=os.path.getctime)
-            newest_date = os.path.getctime(newestp)
-            newest = os.path.basename(newestp)
+            with open(self.fingerprint_file, "rb") as f:
+                return pickle.load(f)
+        except Exception:
+            return {}
+
+    def _write_fingerprint(self, fingerprint):
+        """Add fingerprint of data source directory to :attr:`fingerprint_file`"""
+        fingerprints = self._read_fingerprints()
+        fingerprints[self.src_data_dir] = fingerprint
+        # write to temporary file first, to not corrupt the file if several
+        # processes write at the same time
+        tmp_file = f"{self.fingerprint_file}.{os.getpid()}"
+        try:
+            with open(tmp_file, "wb") as f:
+                pickle.dump(fingerprints, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.fingerprint_file)
+        except Exception as e:
+            logger.warning(f"Failed to write fingerprint of {self.src_data_dir}: {repr(e)}")
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def src_dir_fingerprint(self, rescan=False):
+        """Fingerprint of data source directory
+
+        The stored fingerprint is used if it was checked within the last
+        :attr:`pyaerocom.const.UNGRIDDED_CACHE_SRC_DIR_TTL` seconds. Otherwise,
+        the modification time and number of files of the directory are
+        compared with the stored fingerprint, and the directory is only
+        scanned for the newest file if any of them changed.
 
+        Parameters
+        ----------
+        rescan : bool
+            if True, the directory is scanned for the newest file in any case.
+
+        Returns
+        -------
+        dict
+            fingerprint containing modification time (dir_mtime) and number
+            of files (num_files) of directory, name (newest_file) and creation
+            time (newest_file_date) of newest file in the directory and time
+            when the fingerprint was checked last (checked).
+        """
+        ttl = const.UNGRIDDED_CACHE_SRC_DIR_TTL
+        if ttl is None:
+            rescan = True
+        now = time.time()
+        last = None if rescan else self._read_fingerprints().get(self.src_data_dir)
+        if last is not None and now - last["checked"] < ttl:
+            return last
+
+        src_dir = self.src_data_dir
+        fingerprint = dict(
+            dir_mtime=os.stat(src_dir).st_mtime,
+            num_files=sum(1 for _ in os.scandir(src_dir)),
+            checked=now,
+        )
+        if (
+            last is not None
+            and last["dir_mtime"] == fingerprint["dir_mtime"]
+            and last["num_files"] == fingerprint["num_files"]
+        ):
+            fingerprint["newest_file"] = last["newest_file"]
+            fingerprint["newest_file_date"] = last["newest_file_date"]
+        else:
+            logger.info(f"Scanning data source directory {src_dir}")
+            newest, newest_date = self._scan_src_data_dir()
+            fingerprint["newest_file"] = newest
+            fingerprint["newest_file_date"] = newest_date
+        self._write_fingerprint(fingerprint)
+        return fingerprint
+
+    def rescan_src_data_dir(self):
+        """Scan data source directory and update stored fingerprint
+
+        Returns
+        -------
+        dict
+            updated fingerprint, cf. :func:`src_dir_fingerprint`
+        """
+        return self.src_dir_fingerprint(rescan=True)
+
+    def cache_meta_info(self, rescan=False):
+        """Dictionary containing relevant caching meta-info
+
+        Parameters
+        ----------
+        rescan : bool
+            if True, the data source directory is scanned for the newest file,
+            else the stored fingerprint of the directory may be used, if
+            :attr:`pyaerocom.const.UNGRIDDED_CACHE_SRC_DIR_TTL` is set, cf.
+            :func:`src_dir_fingerprint`.
+        """
+        try:
+            if const.UNGRIDDED_CACHE_SRC_DIR_TTL is None:
+                newest, newest_date = self._scan_src_data_dir()
+            else:
+                fingerprint = self.src_dir_fingerprint(rescan=rescan)
+                newest = fingerprint["newest_file"]
+                newest_date = fingerprint["newest_file_date"]
         except Exception:
             newest = None
             newest_date = None
@@ -183,7 +640,17 @@ class CacheHandlerUngridded:
         current["cacher_version"] = self.__version__
         return current
 
-    def check_and_load(self, var_or_file_name, force_use_outdated=False, cache_dir=None):
+    def check_and_load(
+        self,
+        var_or_file_name,
+        force_use_outdated=False,
+        cache_dir=None,
+        start=None,
+        stop=None,
+        station_name=None,
+        latitude=None,
+        longitude=None,
+    ):
         """Check if cache file exists and load
 
         Note
@@ -205,6 +672,17 @@ class CacheHandlerUngridded:
         cache_dir : str, optional
             output directory (default is pyaerocom cache dir accessed via
             :func:`cache_dir`).
+        start, stop, optional
+            if provided, only data within this time window is loaded (any
+            format that can be handled by :func:`pyaerocom.helpers.start_stop`,
+            e.g. start=2010 loads the year 2010).
+        station_name : str or list, optional
+            if provided, only data from these stations is loaded (wildcards
+            are supported).
+        latitude : list, optional
+            if provided, only stations within this latitude range are loaded
+        longitude : list, optional
+            if provided, only stations within this longitude range are loaded
 
         Returns
         -------
@@ -212,7 +690,9 @@ class CacheHandlerUngridded:
             True, if cache file exists and could be successfully loaded, else
             False. Note: if import is successful, the corresponding data object
             (instance of :class:`pyaerocom.UngriddedData` can be accessed via
-            :attr:`loaded_data'
+            :attr:`loaded_data', or via :attr:`loaded_subsets`, if any subset
+            constraints are provided (the subset may be empty, if the cache
+            file contains no data matching the constraints).
 
         Raises
         ------
@@ -256,18 +736,37 @@ class CacheHandlerUngridded:
             in_handle.close()
             if delete_existing:  # something was wrong
                 logger.info(f"Deleting outdated cache file: {fp}")
-                os.remove(fp)
+                self._remove_cache_file(fp)
             return False
 
         # everything is okay
+        subset = dict(
+            start=start,
+            stop=stop,
+            station_name=station_name,
+            latitude=latitude,
+            longitude=longitude,
+        )
+        subset = {key: val for key, val in subset.items() if val is not None}
+
         data = pickle.load(in_handle)
-        if not isinstance(data, UngriddedData):
+        in_handle.close()
+        if isinstance(data, dict):  # format npy (subset is extracted on load)
+            data = self._load_npy(data, fp, **subset)
+        elif not isinstance(data, UngriddedData):
             raise TypeError(
                 f"Unexpected data type stored in cache file, need instance of UngriddedData, "
                 f"got {type(data)}"
             )
+        elif subset:
+            data = self._extract_subset(data, data.meta_idx, **subset)
 
-        self.loaded_data[var_or_file_name] = data
+        if subset:
+            if data.is_empty:
+                logger.info(f"No data in cache file {fp} for requested subset {subset}")
+            self.loaded_subsets[var_or_file_name] = data
+        else:
+            self.loaded_data[var_or_file_name] = data
         logger.info(f"Successfully loaded cache file {fp}")
         return True
 
@@ -280,7 +779,7 @@ class CacheHandlerUngridded:
 
         """
         for fp in glob.glob(f"{self.cache_dir}/*.pkl"):
-            os.remove(fp)
+            self._remove_cache_file(fp)
             logger.info(f"Deleted {fp}")
 
     def write(self, data, var_or_file_name=None, cache_dir=None):
@@ -337,6 +836,8 @@ class CacheHandlerUngridded:
         fp = self.file_path(var_or_file_name, cache_dir=cache_dir)
         logger.info(f"Writing cache file: {fp}")
         success = True
+        # remove existing files (e.g. array file of previous cache in format npy)
+        self._remove_cache_file(fp)
         # OutHandle = gzip.open(c__cache_file, 'wb') # takes too much time
         out_handle = open(fp, "wb")
 
@@ -344,7 +845,10 @@ class CacheHandlerUngridded:
             # write cache header
             pickle.dump(meta, out_handle, pickle.HIGHEST_PROTOCOL)
             # write data
-            pickle.dump(data, out_handle, pickle.HIGHEST_PROTOCOL)
+            if self.cache_format == "npy":
+                self._dump_npy(data, fp, out_handle)
+            else:
+                pickle.dump(data, out_handle, pickle.HIGHEST_PROTOCOL)
 
         except Exception as e:
             logger.exception(f"Failed to write cache: {repr(e)}")
@@ -352,7 +856,7 @@ class CacheHandlerUngridded:
         finally:
             out_handle.close()
             if not success:
-                os.remove(fp)
+                self._remove_cache_file(fp)
         logger.info(f"Wrote: {fp}")
         return fp
 
@@ -250,6 +250,10 @@ class EbasFlagCol:
 
     """
 
+    #: boolean lookup array (index is flag) specifying invalid flags (cf.
+    #: :func:`_invalid_flags_lookup`)
+    _INVALID_FLAGS = None
+
     def __init__(self, raw_data, interpret_on_init=True):
         self.raw_data = raw_data
 
@@ -287,30 +291,35 @@ class EbasFlagCol:
         valid = np.ones_like(self.raw_data).astype(bool)
         not_ok = self.raw_data[mask]
         if len(not_ok) > 0:
-            _decoded = []
-            _valid = []
-            for flag in not_ok:
-                item = f"{flag:.9f}".split(".")[1]
-                vals = [int(item[:3]), int(item[3:6]), int(item[6:9])]
-                _invalid = False
-                for val in vals:
-                    if val == 100:
-                        _invalid = False
-                        break  # since all other flags are irrelevant if 100 is flagged
-                    elif (
-                        val in self.FLAG_INFO["valid"] and not self.FLAG_INFO["valid"][val]
-                    ):  # is invalid
-                        _invalid = True
-
-                _decoded.append(vals)
-                _valid.append(not _invalid)
-
-            flags[mask] = np.asarray(_decoded)
-            valid[mask] = _valid
+            # the 9 decimals of each flag value contain up to 3 flags, e.g.
+            # 0.111222333 -> 111 222 333
+            codes = np.round(not_ok * 1e9).astype(np.int64) % 1000000000
+            _decoded = np.stack([codes // 1000000, codes // 1000 % 1000, codes % 1000], axis=1)
+            # a measurement is invalid if any of its flags is invalid, unless
+            # flag 100 is set, since then all other flags are irrelevant
+            _invalid = self._invalid_flags_lookup()[_decoded].any(axis=1)
+            _invalid[(_decoded == 100).any(axis=1)] = False
+
+            flags[mask] = _decoded
+            valid[mask] = ~_invalid
 
         self._valid = valid
         self._decoded = flags
 
+    @classmethod
+    def _invalid_flags_lookup(cls):
+        """Boolean lookup array (index is flag) specifying invalid flags
+
+        The array is created on first use and shared by all instances.
+        """
+        if cls._INVALID_FLAGS is None:
+            lookup = np.zeros(1000, dtype=bool)
+            for flag, is_valid in const.ebas_flag_info["valid"].items():
+                if 0 <= flag < 1000 and not is_valid:
+                    lookup[flag] = True
+            cls._INVALID_FLAGS = lookup
+        return cls._INVALID_FLAGS
+
 
 class EbasNasaAmesFile(NasaAmesHeader):
     """EBAS NASA Ames file interface
@@ -622,89 +631,88 @@ class EbasNasaAmesFile(NasaAmesHeader):
         """
         logger.info(f"Reading NASA Ames file:\n{nasa_ames_file}")
         lc = 0  # line counter
-        dc = 0  # data block line counter
         mc = 0  # meta block counter
         END_VAR_DEF = np.nan  # will be set (info stored in header)
         IN_DATA = False
-        data = []
+        data_lines = []
         self.file = nasa_ames_file
-        for line in open(nasa_ames_file):
-            if IN_DATA:  # in data block (end of file)
-                try:
-                    data.append(tuple(float(x.strip()) for x in line.strip().split()))
-                    # data.append([float(x.strip()) for x in line.strip().split()])
-                except Exception as e:
-                    logger.warning(f"EbasNasaAmesFile: Failed to read data row {dc}. Reason: {e}")
-                dc += 1
-            elif lc < self._NUM_FIXLINES:  # in header section (before column definitions)
-                try:
-                    val = self._H_FIXLINES_CONV[lc](line)
-                    attr = self._H_FIXLINES_YIELD[lc]
-                    if isinstance(attr, list):
-                        for i, attr_id in enumerate(attr):
-                            self[attr_id] = val[i]
-                    else:
-                        self[attr] = val
-                except Exception as e:
-                    msg = f"Failed to read header row {lc}.\n{line}\nError msg: {repr(e)}"
-                    if lc in self._HEAD_ROWS_MANDATORY:
-                        raise NasaAmesReadError(f"Fatal: {msg}")
-                    else:
-                        logger.warning(msg)
-            else:  # behind header section and before data definition (contains column defs and meta info)
-                if mc == 0:  # still in column definition
-                    END_VAR_DEF = self._NUM_FIXLINES + self.num_cols_dependent - 1
-                    NUM_HEAD_LINES = self.num_head_lines
+        with open(nasa_ames_file) as f:
+            for line in f:
+                if lc < self._NUM_FIXLINES:  # in header section (before column definitions)
                     try:
-                        self.var_defs.append(self._read_vardef_line(line))
+                        val = self._H_FIXLINES_CONV[lc](line)
+                        attr = self._H_FIXLINES_YIELD[lc]
+                        if isinstance(attr, list):
+                            for i, attr_id in enumerate(attr):
+                                self[attr_id] = val[i]
+                        else:
+                            self[attr] = val
                     except Exception as e:
-                        logger.warning(repr(e))
-
-                elif lc < END_VAR_DEF:
-                    self.var_defs.append(self._read_vardef_line(line))
-
-                elif lc == NUM_HEAD_LINES - 1:
-                    IN_DATA = True
-                    self._data_header = h = [x.strip() for x in line.split()]
-                    # append information of first two columns to variable
-                    # definition array.
-                    self._var_defs.insert(
-                        0, EbasColDef(name=h[0], is_flag=False, is_var=False, unit=self.time_unit)
-                    )
-                    self._var_defs.insert(
-                        1, EbasColDef(name=h[1], is_flag=False, is_var=False, unit=self.time_unit)
-                    )
-                    if only_head:
-                        return
-                    logger.debug("REACHED DATA BLOCK")
-                elif lc >= END_VAR_DEF + 2:
-                    try:
-                        name, val = line.split(":")
-                        key = name.strip().lower().replace(" ", "_")
-                        self.meta[key] = val.strip()
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to read line no. {lc}.\n{line}\nError msg: {repr(e)}\n"
+                        msg = f"Failed to read header row {lc}.\n{line}\nError msg: {repr(e)}"
+                        if lc in self._HEAD_ROWS_MANDATORY:
+                            raise NasaAmesReadError(f"Fatal: {msg}")
+                        else:
+                            logger.warning(msg)
+                else:  # behind header section and before data definition (contains column defs and meta info)
+                    if mc == 0:  # still in column definition
+                        END_VAR_DEF = self._NUM_FIXLINES + self.num_cols_dependent - 1
+                        NUM_HEAD_LINES = self.num_head_lines
+                        try:
+                            self.var_defs.append(self._read_vardef_line(line))
+                        except Exception as e:
+                            logger.warning(repr(e))
+
+                    elif lc < END_VAR_DEF:
+                        self.var_defs.append(self._read_vardef_line(line))
+
+                    elif lc == NUM_HEAD_LINES - 1:
+                        IN_DATA = True
+                        self._data_header = h = [x.strip() for x in line.split()]
+                        # append information of first two columns to variable
+                        # definition array.
+                        self._var_defs.insert(
+                            0,
+                            EbasColDef(
+                                name=h[0], is_flag=False, is_var=False, unit=self.time_unit
+                            ),
                         )
-                else:
-                    logger.debug(f"Ignoring line no. {lc}: {line}")
-                mc += 1
-            lc += 1
+                        self._var_defs.insert(
+                            1,
+                            EbasColDef(
+                                name=h[1], is_flag=False, is_var=False, unit=self.time_unit
+                            ),
+                        )
+                        if only_head:
+                            return
+                        logger.debug("REACHED DATA BLOCK")
+                    elif lc >= END_VAR_DEF + 2:
+                        try:
+                            name, val = line.split(":")
+                            key = name.strip().lower().replace(" ", "_")
+                            self.meta[key] = val.strip()
+                        except Exception as e:
+                            logger.warning(
+                                f"Failed to read line no. {lc}.\n{line}\nError msg: {repr(e)}\n"
+                            )
+                    else:
+                        logger.debug(f"Ignoring line no. {lc}: {line}")
+                    mc += 1
+                lc += 1
+                if IN_DATA:
+                    # the remainder of the file is the data block
+                    data_lines = f.readlines()
+                    break
 
-        data = np.asarray(data)
+        data = self._parse_data_block(data_lines)
 
         data[:, 1:] = data[:, 1:] * np.asarray(self.mul_factors)
 
         self._data = data
         if replace_invalid_nan:
-            dep_dat = data[:, 1:]
-            for i, val in enumerate(np.floor(self.vals_invalid)):
-                col = dep_dat[:, i]
-                cond = np.floor(col) == val
-                col[cond] = np.nan
-                dep_dat[:, i] = col
-
-            data[:, 1:] = dep_dat
+            vals_invalid = np.floor(self.vals_invalid)
+            num = len(vals_invalid)
+            dep_dat = data[:, 1 : num + 1]
+            dep_dat[np.floor(dep_dat) == vals_invalid] = np.nan
         self._data = data
 
         if convert_timestamps:
@@ -716,6 +724,61 @@ class EbasNasaAmesFile(NasaAmesHeader):
         if quality_check:
             self._quality_check()
 
+    def _parse_data_block(self, lines):
+        """Parse lines of data block into 2D numpy array
+
+        All rows are converted at once, which is much faster than converting
+        the data row by row. If the data block contains rows that cannot be
+        converted or rows with a different number of values than the other
+        rows, the tolerant row-by-row parser :func:`_parse_data_lines` is used
+        instead.
+
+        Parameters
+        ----------
+        lines : list
+            lines of data block (without the data header line)
+
+        Returns
+        -------
+        ndarray
+            2D array containing data table (rows x columns)
+        """
+        if len(lines) == 0:
+            return np.asarray([])
+        # rows with different numbers of values would be misaligned in the
+        # reshaped array, even if the total number of values matches
+        row_lengths = set(map(len, map(str.split, lines)))
+        if len(row_lengths) > 1:
+            return self._parse_data_lines(lines)
+        try:
+            vals = np.array(" ".join(lines).split(), dtype=np.float64)
+        except ValueError:
+            return self._parse_data_lines(lines)
+        return vals.reshape(len(lines), row_lengths.pop())
+
+    def _parse_data_lines(self, lines):
+        """Parse lines of data block row by row
+
+        Rows that cannot be converted to float are skipped.
+
+        Parameters
+        ----------
+        lines : list
+            lines of data block (without the data header line)
+
+        Returns
+        -------
+        ndarray
+            2D array containing data table (rows x columns)
+        """
+        data = []
+        for dc, line in enumerate(lines):
+            try:
+                data.append(tuple(float(x.strip()) for x in line.strip().split()))
+            except Exception as e:
+                logger.warning(f"EbasNasaAmesFile: Failed to read data row {dc}. Reason: {e}")
+        return np.asarray(data)
+
     def _read_vardef_line(self, line_from_file):
         """Import variable definition line from NASA Ames file"""
         spl = [x.strip() for x in line_from_file.split(",")]
@@ -6,12 +6,14 @@ from __future__ import annotations
 import logging
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from importlib import resources
 from pathlib import Path
 from time import time
 
 import simplejson as json
+from tqdm import tqdm
 
 from pyaerocom import const
 from pyaerocom.exceptions import VariableDefinitionError, VarNotAvailableError
@@ -24,6 +26,83 @@ logger = logging.getLogger(__name__)
 #: will be prepended with the path later on
 COUNTRY_CODE_FILE = "country_codes.json"
 
+#: reader instance used in worker processes that read files in parallel (cf.
+#: :func:`init_read_worker`)
+_WORKER_READER = None
+
+
+def init_read_worker(reader):
+    """Initializer of worker processes that read files in parallel
+
+    Stores the reader instance in the worker process, so that it is
+    transferred only once per worker, and not for every file.
+
+    Parameters
+    ----------
+    reader : ReadUngriddedBase
+        reader instance used to read files in the worker process (cf.
+        :func:`get_worker_reader`)
+    """
+    global _WORKER_READER
+    _WORKER_READER = reader
+
+
+def get_worker_reader():
+    """Reader instance of the current worker process (cf. :func:`init_read_worker`)"""
+    return _WORKER_READER
+
+
+def _call_worker_reader(method, *args):
+    """Call method of the reader instance of the current worker process"""
+    return getattr(get_worker_reader(), method)(*args)
+
+
+def iter_read_files(reader, method, files, *args, max_files_per_task=50):
+    """Call a file reading method of a reader for all files
+
+    If ``reader.num_workers`` is larger than 1, the files are read in a
+    process pool, where the reader instance is transferred only once per
+    worker process (cf. :func:`init_read_worker`) and the files are
+    distributed in chunks of at most `max_files_per_task` files.
+
+    Parameters
+    ----------
+    reader : ReadUngriddedBase
+        reader instance with attribute `num_workers`
+    method : str
+        name of reader method, which is called as ``method(file, *args)``
+        for each file. Must not raise exceptions that are supposed to be
+        handled per file.
+    files : list
+        list of files
+    *args
+        further arguments of `method`, one iterable per argument (with one
+        entry per file, as for :func:`map`)
+    max_files_per_task : int
+        maximum number of files sent to a worker process at once
+
+    Yields
+    ------
+    object
+        output of `method` for each file, in the order of the input files
+    """
+    num_files = len(files)
+    num_workers = min(reader.num_workers, num_files)
+    if num_workers <= 1:
+        yield from tqdm(map(getattr(reader, method), files, *args), total=num_files)
+        return
+
+    logger.info(f"Reading {num_files} files using {num_workers} processes")
+    chunksize = max(1, min(max_files_per_task, num_files // (4 * num_workers)))
+    with ProcessPoolExecutor(
+        max_workers=num_workers, initializer=init_read_worker, initargs=(reader,)
+    ) as executor:
+        # executor.map preserves the order of the input files
+        results = executor.map(
+            _call_worker_reader, [method] * num_files, files, *args, chunksize=chunksize
+        )
+        yield from tqdm(results, total=num_files)
+
 
 def _check_ebas_db_local_vs_remote(loc_remote, loc_local):
     """
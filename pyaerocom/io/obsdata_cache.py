@@ -0,0 +1,43 @@
+"""
+In-memory cache for loaded observation data
+"""
+from pyaerocom.lru_cache import SizeBoundedLRUCache
+
+
+class ObsDataCache(SizeBoundedLRUCache):
+    """Size bounded in-memory cache for loaded (and filtered) observation data
+
+    Used to share observation data that has been loaded (e.g. by
+    :class:`pyaerocom.colocation_auto.Colocator`) among several consumers,
+    e.g. all model evaluations of an AeroVal experiment, so that each
+    observation dataset is read and filtered only once. Entries are
+    identified via a key that is computed from all settings that affect the
+    loaded data, e.g. data ID, variable, filters and reading options (cf.
+    :func:`make_key`). If the total size of the cached data exceeds
+    :attr:`max_size`, the least recently used entries are evicted.
+
+    Parameters
+    ----------
+    max_size : float
+        maximum size of cached data in bytes. Data objects that are larger
+        than that are not cached.
+    """
+
+    NAME = "obs data cache"
+
+    @staticmethod
+    def get_size(data):
+        """Estimate memory size of a data object in bytes
+
+        Parameters
+        ----------
+        data
+            data object (e.g. :class:`UngriddedData`). The size is estimated
+            based on the data array (attribute `_data`), if available.
+
+        Returns
+        -------
+        int
+            size in bytes
+        """
+        return SizeBoundedLRUCache.get_size(getattr(data, "_data", data))
@@ -4,10 +4,11 @@ from glob import glob
 
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
+from pandas.api.types import union_categoricals
 
 from pyaerocom.exceptions import DataRetrievalError
 from pyaerocom.io import ReadUngriddedBase
+from pyaerocom.io.helpers import iter_read_files
 from pyaerocom.stationdata import StationData
 from pyaerocom.ungriddeddata import UngriddedData
 
@@ -44,6 +45,21 @@ class ReadAirNow(ReadUngriddedBase):
         "institute",
     ]
 
+    #: Data types of columns that are imported in :func:`_read_files`
+    FILE_COL_DTYPES = {
+        "date": "category",
+        "time": "category",
+        "station_id": "category",
+        "time_zone": float,
+        "variable": "category",
+        "unit": "category",
+        "value": float,
+    }
+
+    #: Maximum number of files that are sent to a worker process at once when
+    #: reading in parallel (cf. :attr:`num_workers`)
+    MAX_FILES_PER_TASK = 100
+
     #: Mapping of columns in station metadata file to pyaerocom standard
     STATION_META_MAP = {
         "aqsid": "station_id",
@@ -130,8 +146,10 @@ class ReadAirNow(ReadUngriddedBase):
 
     def __init__(self, data_id=None, data_dir=None):
         super().__init__(data_id=data_id, data_dir=data_dir)
-        self.make_datetime64_array = np.vectorize(self._date_time_str_to_datetime64)
         self._station_metadata = None
+        #: number of processes used to read the files in :func:`read`. If 1,
+        #: files are read sequentially
+        self.num_workers = 1
 
     @property
     def station_metadata(self):
@@ -265,28 +283,41 @@ class ReadAirNow(ReadUngriddedBase):
         files = sorted(glob(pattern))
         return files
 
-    def _read_file(self, file):
+    def _read_file_typed(self, file, vars_in_file):
         """
-        Read one datafile using :func:`pandas.read_csv`
+        Read data of input variables from one datafile
+
+        Only the columns in :attr:`FILE_COL_DTYPES` are imported, using the
+        data types specified therein.
 
         Parameters
         ----------
         file : str
             file path
+        vars_in_file : list
+            names of variables in data file (cf. :attr:`VAR_MAP`) that are
+            supposed to be retrieved.
 
         Returns
         -------
-        df : pandas.DataFrame
-            DataFrame containing the file data
-
+        pandas.DataFrame
+            DataFrame containing the rows of the input variables
         """
-        df = pd.read_csv(file, sep=self.FILE_COL_DELIM, names=self.FILE_COL_NAMES)
-        return df
+        df = pd.read_csv(
+            file,
+            sep=self.FILE_COL_DELIM,
+            names=self.FILE_COL_NAMES,
+            usecols=list(self.FILE_COL_DTYPES),
+            dtype=self.FILE_COL_DTYPES,
+        )
+        return df[df["variable"].isin(vars_in_file)]
 
     def _read_files(self, files, vars_to_retrieve):
         """
         Read input variables from list of files
 
+        Files are read in parallel if :attr:`num_workers` is larger than 1.
+
         Parameters
         ----------
         files : list
@@ -308,36 +339,88 @@ class ReadAirNow(ReadUngriddedBase):
 
         """
         logger.info("Read AirNow data file(s)")
-        # initialize empty dataframe
-        varcol = self.FILE_COL_NAMES.index("variable")
-        arrs = []
-        for i in tqdm(range(len(files))):
-            fp = files[i]
-            filedata = self._read_file(fp)
-            arr = filedata.values
-
-            for i, var in enumerate(vars_to_retrieve):
-                cond = arr[:, varcol] == self.VAR_MAP[var]
-                if i == 0:
-                    mask = cond
-                else:
-                    mask = np.logical_or(mask, cond)
-            matches = mask.sum()
-            if matches:
-                vardata = arr[mask]
-                arrs.append(vardata)
-        if len(arrs) == 0:
+        vars_in_file = [self.VAR_MAP[var] for var in vars_to_retrieve]
+        results = iter_read_files(
+            self,
+            "_read_file_typed",
+            files,
+            [vars_in_file] * len(files),
+            max_files_per_task=self.MAX_FILES_PER_TASK,
+        )
+        filedata = [df for df in results if len(df)]
+        if len(filedata) == 0:
             raise DataRetrievalError("None of the input variables could be found in input list")
-        return self._filedata_to_statlist(arrs, vars_to_retrieve)
+        return self._filedata_to_statlist(filedata, vars_to_retrieve)
+
+    @staticmethod
+    def _concat_filedata(filedata):
+        """
+        Concatenate data of several files
+
+        Parameters
+        ----------
+        filedata : list
+            list of DataFrames (output of :func:`_read_file_typed`)
+
+        Returns
+        -------
+        dict
+            concatenated columns (categorical columns are combined into
+            one categorical with sorted categories)
+        """
+        data = {}
+        for col in filedata[0].columns:
+            if isinstance(filedata[0][col].dtype, pd.CategoricalDtype):
+                data[col] = union_categoricals([df[col] for df in filedata], sort_categories=True)
+            else:
+                data[col] = np.concatenate([df[col].values for df in filedata])
+        return data
 
-    def _filedata_to_statlist(self, arrs, vars_to_retrieve):
+    def _make_dtime_array(self, dates, times):
+        """
+        Convert arrays of date and time strings into datetime64 array
+
+        Each unique date and time string is converted only once (cf.
+        :func:`_date_time_str_to_datetime64`), which is much faster than
+        converting each pair of strings for large arrays.
+
+        Parameters
+        ----------
+        dates : ndarray
+            date strings as mm/dd/yy as in data files
+        times : ndarray
+            times of the day as HH:MM
+
+        Returns
+        -------
+        ndarray
+            datetime64[s] array
+        """
+        date_codes, date_strs = pd.factorize(dates)
+        time_codes, time_strs = pd.factorize(times)
+        days = np.array(
+            [self._date_time_str_to_datetime64(date, "00:00") for date in date_strs],
+            dtype="datetime64[s]",
+        )
+        offs = np.array(
+            [int(HH) * 3600 + int(MM) * 60 for HH, MM in (t.split(":") for t in time_strs)],
+            dtype="timedelta64[s]",
+        )
+        return days[date_codes] + offs[time_codes]
+
+    def _filedata_to_statlist(self, filedata, vars_to_retrieve):
         """
         Convert loaded filedata into list of StationData objects
 
+        The rows of all files are sorted by variable and station (stable, so
+        that the order of the timestamps of each station is maintained) and
+        the StationData objects are created from the resulting contiguous
+        blocks.
+
         Parameters
         ----------
-        arrs : list
-            list of numpy arrays extracted from each file
+        filedata : list
+            list of DataFrames containing the data of each file
             (see :func:`_read_files`).
         vars_to_retrieve : list
             list of variables to be retrieved from input data.
@@ -348,52 +431,54 @@ class ReadAirNow(ReadUngriddedBase):
             list of :class:`StationData` objects, one for each var and station.
 
         """
-        data = np.concatenate(arrs)
+        data = self._concat_filedata(filedata)
 
         logger.info("Converting filedata to list os StationData")
         stat_meta = self.station_metadata
-        stat_ids = list(stat_meta)
-        varcol = self.FILE_COL_NAMES.index("variable")
-        statcol = self.FILE_COL_NAMES.index("station_id")
-        tzonecol = self.FILE_COL_NAMES.index("time_zone")
-        unitcol = self.FILE_COL_NAMES.index("unit")
-        valcol = self.FILE_COL_NAMES.index("value")
-
-        dtime = self.make_datetime64_array(data[:, 0], data[:, 1])
+
+        # index of variable in vars_to_retrieve for each row (-1: not requested)
+        var_idx = {self.VAR_MAP[var]: i for i, var in enumerate(vars_to_retrieve)}
+        var_cats = data["variable"]
+        var_codes = np.array([var_idx.get(x, -1) for x in var_cats.categories] + [-1])
+        var_codes = var_codes[var_cats.codes]
+        # categories are sorted
+        stat_codes = data["station_id"].codes
+        stat_ids = data["station_id"].categories
+
+        order = np.lexsort((stat_codes, var_codes))
+        order = order[(var_codes[order] >= 0) & (stat_codes[order] >= 0)]
+        var_codes, stat_codes = var_codes[order], stat_codes[order]
+        unit_codes = data["unit"].codes[order]
+        units = data["unit"].categories
+        values = data["value"][order]
+
+        # timestamps including timezone offsets
+        dtime = self._make_dtime_array(data["date"][order], data["time"][order])
+        dtime += data["time_zone"][order].astype(int).astype("timedelta64[h]")
+
+        # start indices of (var, station) blocks
+        is_start = np.ones(len(order), dtype=bool)
+        is_start[1:] = (var_codes[1:] != var_codes[:-1]) | (stat_codes[1:] != stat_codes[:-1])
+        bounds = np.append(np.flatnonzero(is_start), len(order))
+
         stats = []
-        for var in vars_to_retrieve:
-
-            # extract only variable data (should speed things up)
-            var_in_file = self.VAR_MAP[var]
-            mask = data[:, varcol] == var_in_file
-            subset = data[mask]
-            dtime_subset = dtime[mask]
-            statlist = np.unique(subset[:, statcol])
-            for stat_id in tqdm(statlist, desc=var):
-                if not stat_id in stat_ids:
-                    continue
-                statmask = subset[:, statcol] == stat_id
-                if statmask.sum() == 0:
-                    continue
-                statdata = subset[statmask]
-                timestamps = dtime_subset[statmask]
-                # timezone offsets
-                toffs = statdata[:, tzonecol].astype(int)
-                stat = StationData(**stat_meta[stat_id])
-
-                vals = statdata[:, valcol]
-                units = np.unique(statdata[:, unitcol])
-                # errors that did not occur in v0 but that may occur
-                assert len(units) == 1
-                assert units[0] in self.UNIT_MAP
-                toffs = toffs.astype("timedelta64[h]")
-                timestamps += toffs
-                stat["dtime"] = timestamps
-                stat["timezone"] = "UTC"
-                stat[var] = vals
-                unit = self.UNIT_MAP[units[0]]
-                stat["var_info"][var] = dict(units=unit)
-                stats.append(stat)
+        for i0, i1 in zip(bounds[:-1], bounds[1:]):
+            stat_id = stat_ids[stat_codes[i0]]
+            if not stat_id in stat_meta:
+                continue
+            var = vars_to_retrieve[var_codes[i0]]
+            stat = StationData(**stat_meta[stat_id])
+
+            unit_code = unit_codes[i0]
+            # errors that did not occur in v0 but that may occur
+            assert (unit_codes[i0:i1] == unit_code).all()
+            assert unit_code >= 0 and units[unit_code] in self.UNIT_MAP
+            stat["dtime"] = dtime[i0:i1]
+            stat["timezone"] = "UTC"
+            stat[var] = values[i0:i1]
+            unit = self.UNIT_MAP[units[unit_code]]
+            stat["var_info"][var] = dict(units=unit)
+            stats.append(stat)
         return stats
 
     def read_file(self):
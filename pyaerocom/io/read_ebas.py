@@ -5,7 +5,6 @@ import re
 
 import numpy as np
 from geonum.atmosphere import T0_STD, p0
-from tqdm import tqdm
 
 from pyaerocom import const
 from pyaerocom._lowlevel_helpers import BrowseDict
@@ -33,7 +32,7 @@ from pyaerocom.exceptions import (
 from pyaerocom.io.ebas_file_index import EbasFileIndex, EbasSQLRequest
 from pyaerocom.io.ebas_nasa_ames import EbasNasaAmesFile
 from pyaerocom.io.ebas_varinfo import EbasVarInfo
-from pyaerocom.io.helpers import _check_ebas_db_local_vs_remote
+from pyaerocom.io.helpers import _check_ebas_db_local_vs_remote, iter_read_files
 from pyaerocom.io.readungriddedbase import ReadUngriddedBase
 from pyaerocom.molmasses import get_molmass
 from pyaerocom.stationdata import StationData
@@ -267,6 +266,10 @@ class ReadEbas(ReadUngriddedBase):
     ASSUME_AAE_SHIFT_WVL = 1.0
     ASSUME_AE_SHIFT_WVL = 1  # .5
 
+    #: Maximum number of files that are sent to a worker process at once when
+    #: reading in parallel (cf. :attr:`num_workers`)
+    MAX_FILES_PER_TASK = 50
+
     #: list of EBAS data files that are flagged invalid and will not be imported
     IGNORE_FILES = [
         "CA0420G.20100101000000.20190125102503.filter_absorption_photometer.aerosol_absorption_coefficient.aerosol.1y.1h.CA01L_Magee_AE31_ALT.CA01L_aethalometer.lev2.nas",
@@ -306,6 +309,10 @@ class ReadEbas(ReadUngriddedBase):
         self.files_failed = []
         self._read_stats_log = BrowseDict()
 
+        #: number of processes used to read the files in :func:`read`. If 1,
+        #: files are read sequentially
+        self.num_workers = 1
+
         #: SQL database interface class used to retrieve file paths for vars
         self._file_index = None
         self.sql_requests = []
@@ -1693,134 +1700,193 @@ class ReadEbas(ReadUngriddedBase):
 
         return data
 
-    def _read_files(self, files, vars_to_retrieve, files_contain, constraints):
-        """Helper that reads list of files into UngriddedData
+    def _read_file_block(self, filename, vars_to_retrieve, contains):
+        """Read one file and convert it into a compact column block
 
-        Note
-        ----
-        This method is not supposed to be called directly but is used in
-        :func:`read` and serves the purpose of parallel loading of data
-        """
-        self.files_failed = []
-        data_obj = UngriddedData(num_points=1000000)
+        Parameters
+        ----------
+        filename : str
+            file to be read
+        vars_to_retrieve : list
+            variables requested in :func:`read`
+        contains : list
+            variables supposed to be read from this file
 
-        # Add reading options to filter "history of UngriddedDataObject"
-        filters = self.readopts_default.filter_dict
-        filters.update(constraints)
-        data_obj._add_to_filter_history(filters)
+        Returns
+        -------
+        dict
+            column block containing station location, metadata, time stamps
+            and, for each variable, data values, flags and errors. Can be
+            added to an :class:`UngriddedData` object via
+            :func:`_add_file_block`.
+        """
+        station_data = self.read_file(filename, vars_to_retrieve=contains)
 
-        meta_key = 0.0
-        idx = 0
+        meta = station_data.get_meta(add_none_vals=True)
+        if "station_name_orig" in station_data:
+            meta["station_name_orig"] = station_data["station_name_orig"]
 
-        # assign metadata object
-        metadata = data_obj.metadata
-        meta_idx = data_obj.meta_idx
+        append_vars = [x for x in np.intersect1d(vars_to_retrieve, list(station_data.var_info))]
 
-        # counter that is updated whenever a new variable appears during read
-        # (is used for attr. var_idx in UngriddedData object)
-        var_count_glob = -1
-        logger.info(f"Reading EBAS data from {self.file_dir}")
-        num_files = len(files)
-        for i in tqdm(range(num_files)):
-            _file = files[i]
-            contains = files_contain[i]
-            try:
-                station_data = self.read_file(_file, vars_to_retrieve=contains)
-
-            except (
-                NotInFileError,
-                EbasFileError,
-                TemporalResolutionError,
-                TemporalSamplingError,
-            ) as e:
-                self.files_failed.append(_file)
-                self.logger.warning(
-                    f"Skipping reading of EBAS NASA Ames file: {_file}. Reason: {repr(e)}"
-                )
-                continue
-            except Exception as e:
-                self.files_failed.append(_file)
-                logger.warning(
-                    f"Skipping reading of EBAS NASA Ames file: {_file}. Reason: {repr(e)}"
-                )
-                continue
+        block = dict(
+            meta=meta,
+            latitude=station_data["latitude"],
+            longitude=station_data["longitude"],
+            altitude=station_data["altitude"],
+            # TODO: check using index instead (even though not a problem here
+            # since all Aerocom data files are of type timeseries)
+            times=np.float64(station_data["dtime"]),
+            variables=append_vars,
+            var_info={},
+            values={},
+            flags={},
+            errs={},
+        )
+        for var in append_vars:
+            block["values"][var] = np.asarray(station_data[var])
+            block["var_info"][var] = dict(station_data["var_info"][var])
+            if var in station_data.data_flagged:
+                block["flags"][var] = station_data.data_flagged[var]
+            if var in station_data.data_err:
+                block["errs"][var] = station_data.data_err[var]
+        return block
+
+    def _read_file_block_checked(self, filename, vars_to_retrieve, contains):
+        """Read file block and return errors that lead to skipping of the file
 
-            # Fill the metatdata dict
-            # the location in the data set is time step dependent!
-            # use the lat location here since we have to choose one location
-            # in the time series plot
-            metadata[meta_key] = {}
-            metadata[meta_key].update(station_data.get_meta(add_none_vals=True))
+        Returns
+        -------
+        tuple
+            output of :func:`_read_file_block` (or None) and representation
+            of the exception that was raised while reading the file (or None)
+        """
+        try:
+            return self._read_file_block(filename, vars_to_retrieve, contains), None
+        except Exception as e:
+            return None, repr(e)
 
-            if "station_name_orig" in station_data:
-                metadata[meta_key]["station_name_orig"] = station_data["station_name_orig"]
+    def _add_file_block(self, data_obj, block, meta_key, idx):
+        """Add column block of one file to :class:`UngriddedData` object
 
-            metadata[meta_key]["data_revision"] = self.data_revision
-            metadata[meta_key]["var_info"] = {}
-            # this is a list with indices of this station for each variable
-            # not sure yet, if we really need that or if it speeds up things
-            meta_idx[meta_key] = {}
+        Parameters
+        ----------
+        data_obj : UngriddedData
+            data object to which the block is added (is modified in place)
+        block : dict
+            output from :func:`_read_file_block`
+        meta_key : float
+            metadata key assigned to this block
+        idx : int
+            first row index in data array where the block is written
 
-            num_times = len(station_data["dtime"])
+        Returns
+        -------
+        int
+            number of rows written
+        """
+        metadata = data_obj.metadata
+        meta_idx = data_obj.meta_idx
 
-            contains_vars = list(station_data.var_info)
-            # access array containing time stamps
-            # TODO: check using index instead (even though not a problem here
-            # since all Aerocom data files are of type timeseries)
-            times = np.float64(station_data["dtime"])
+        # Fill the metatdata dict
+        # the location in the data set is time step dependent!
+        # use the lat location here since we have to choose one location
+        # in the time series plot
+        metadata[meta_key] = {}
+        metadata[meta_key].update(block["meta"])
+        metadata[meta_key]["data_revision"] = self.data_revision
+        metadata[meta_key]["var_info"] = {}
+        # this is a list with indices of this station for each variable
+        # not sure yet, if we really need that or if it speeds up things
+        meta_idx[meta_key] = {}
+
+        times = block["times"]
+        num_times = len(times)
+        append_vars = block["variables"]
+        totnum = num_times * len(append_vars)
+
+        # check if size of data object needs to be extended
+        if (idx + totnum) >= data_obj._ROWNO:
+            # if totnum < data_obj._CHUNKSIZE, then the latter is used
+            data_obj.add_chunk(totnum)
+
+        for var_count, var in enumerate(append_vars):
+            # get start / stop index for this data vector
+            start = idx + var_count * num_times
+            stop = start + num_times
+
+            if not var in data_obj.var_idx:
+                # new variables get the next free index (i.e. in the order in
+                # which they appear during reading)
+                var_idx = len(data_obj.var_idx)
+                data_obj.var_idx[var] = var_idx
+            else:
+                var_idx = data_obj.var_idx[var]
 
-            append_vars = [x for x in np.intersect1d(vars_to_retrieve, contains_vars)]
+            # write common meta info for this station (data lon, lat and
+            # altitude are set to station locations)
+            data_obj._data[start:stop, data_obj._LATINDEX] = block["latitude"]
+            data_obj._data[start:stop, data_obj._LONINDEX] = block["longitude"]
+            data_obj._data[start:stop, data_obj._ALTITUDEINDEX] = block["altitude"]
+            data_obj._data[start:stop, data_obj._METADATAKEYINDEX] = meta_key
 
-            totnum = num_times * len(append_vars)
+            # write data to data object
+            data_obj._data[start:stop, data_obj._TIMEINDEX] = times
 
-            # check if size of data object needs to be extended
-            if (idx + totnum) >= data_obj._ROWNO:
-                # if totnum < data_obj._CHUNKSIZE, then the latter is used
-                data_obj.add_chunk(totnum)
+            data_obj._data[start:stop, data_obj._DATAINDEX] = block["values"][var]
 
-            for var_count, var in enumerate(append_vars):
-                # data values
-                values = station_data[var]
+            data_obj._data[start:stop, data_obj._VARINDEX] = var_idx
 
-                # get start / stop index for this data vector
-                start = idx + var_count * num_times
-                stop = start + num_times
+            if var in block["flags"]:
+                data_obj._data[start:stop, data_obj._DATAFLAGINDEX] = block["flags"][var]
+            if var in block["errs"]:
+                data_obj._data[start:stop, data_obj._DATAERRINDEX] = block["errs"][var]
 
-                if not var in data_obj.var_idx:
-                    var_count_glob += 1
-                    var_idx = var_count_glob
-                    data_obj.var_idx[var] = var_idx
-                else:
-                    var_idx = data_obj.var_idx[var]
+            metadata[meta_key]["var_info"][var] = {}
+            metadata[meta_key]["var_info"][var].update(block["var_info"][var])
+            meta_idx[meta_key][var] = np.arange(start, stop)
 
-                # write common meta info for this station (data lon, lat and
-                # altitude are set to station locations)
-                data_obj._data[start:stop, data_obj._LATINDEX] = station_data["latitude"]
-                data_obj._data[start:stop, data_obj._LONINDEX] = station_data["longitude"]
-                data_obj._data[start:stop, data_obj._ALTITUDEINDEX] = station_data["altitude"]
-                data_obj._data[start:stop, data_obj._METADATAKEYINDEX] = meta_key
+        metadata[meta_key]["variables"] = append_vars
+        return totnum
 
-                # write data to data object
-                data_obj._data[start:stop, data_obj._TIMEINDEX] = times
+    def _read_files(self, files, vars_to_retrieve, files_contain, constraints):
+        """Helper that reads list of files into UngriddedData
 
-                data_obj._data[start:stop, data_obj._DATAINDEX] = values
+        Note
+        ----
+        This method is not supposed to be called directly but is used in
+        :func:`read`. Files are read in parallel if :attr:`num_workers` is
+        larger than 1. The merge into the output object is done in the order
+        of the input file list, so that the result does not depend on the
+        number of workers.
+        """
+        self.files_failed = []
+        data_obj = UngriddedData(num_points=1000000)
 
-                data_obj._data[start:stop, data_obj._VARINDEX] = var_idx
+        # Add reading options to filter "history of UngriddedDataObject"
+        filters = self.readopts_default.filter_dict
+        filters.update(constraints)
+        data_obj._add_to_filter_history(filters)
 
-                if var in station_data.data_flagged:
-                    invalid = station_data.data_flagged[var]
-                    data_obj._data[start:stop, data_obj._DATAFLAGINDEX] = invalid
-                if var in station_data.data_err:
-                    errs = station_data.data_err[var]
-                    data_obj._data[start:stop, data_obj._DATAERRINDEX] = errs
+        meta_key = 0.0
+        idx = 0
 
-                var_info = station_data["var_info"][var]
-                metadata[meta_key]["var_info"][var] = {}
-                metadata[meta_key]["var_info"][var].update(var_info)
-                meta_idx[meta_key][var] = np.arange(start, stop)
+        logger.info(f"Reading EBAS data from {self.file_dir}")
+        num_files = len(files)
+        results = iter_read_files(
+            self,
+            "_read_file_block_checked",
+            files,
+            [vars_to_retrieve] * num_files,
+            files_contain,
+            max_files_per_task=self.MAX_FILES_PER_TASK,
+        )
+        for _file, (block, err) in zip(files, results):
+            if err is not None:
+                self.files_failed.append(_file)
+                logger.warning(f"Skipping reading of EBAS NASA Ames file: {_file}. Reason: {err}")
+                continue
 
-            metadata[meta_key]["variables"] = append_vars
-            idx += totnum
+            idx += self._add_file_block(data_obj, block, meta_key, idx)
             meta_key += 1
 
         # shorten data_obj._data to the right number of points
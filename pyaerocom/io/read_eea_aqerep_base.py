@@ -5,16 +5,13 @@ import gzip
 import logging
 import os
 import pathlib
-import shutil
-import tempfile
 
 import cf_units
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 
 from pyaerocom.exceptions import EEAv2FileError, TemporalResolutionError
-from pyaerocom.io.helpers import get_country_name_from_iso
+from pyaerocom.io.helpers import get_country_name_from_iso, iter_read_files
 from pyaerocom.io.readungriddedbase import ReadUngriddedBase
 from pyaerocom.stationdata import StationData
 from pyaerocom.ungriddeddata import UngriddedData
@@ -38,7 +35,7 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
     _FILEMASK = "*.csv"
 
     #: Version log of this class (for caching)
-    __version__ = "0.08"
+    __version__ = "0.09"
 
     #: Column delimiter
     FILE_COL_DELIM = ","
@@ -139,10 +136,6 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
     #: there's no general instrument name in the data
     INSTRUMENT_NAME = "unknown"
 
-    #: max time steps to read per file (hourly data)
-    # to make numpy array allocation size static
-    MAX_LINES_TO_READ = 24 * 366
-
     #: file name of the metadata file
     #: this will be prepended with a data path later on
     # this file is in principe updated once a day.
@@ -179,9 +172,16 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
         "vmrno2": NotImplementedError(),
     }
 
+    #: Maximum number of files that are sent to a worker process at once when
+    #: reading in parallel (cf. :attr:`num_workers`)
+    MAX_FILES_PER_TASK = 50
+
     def __init__(self, data_id=None, data_dir=None):
         super().__init__(data_id=data_id, data_dir=data_dir)
         self._metadata = None
+        #: number of processes used to read the files in :func:`read`. If 1,
+        #: files are read sequentially
+        self.num_workers = 1
 
     @property
     def DEFAULT_VARS(self):
@@ -193,6 +193,91 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
         """Name of the dataset"""
         return self.data_id
 
+    @staticmethod
+    def _detect_encoding(head):
+        """Detect encoding of data file from its first bytes
+
+        Parameters
+        ----------
+        head : bytes
+            first bytes of file
+
+        Returns
+        -------
+        str
+            encoding of file (UTF-16 if there is a UTF-16 byte order mark or
+            if the first bytes contain null bytes, else UTF-8)
+        """
+        if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+            return "UTF-16"
+        elif head.startswith(b"\xef\xbb\xbf"):
+            return "utf-8-sig"
+        elif b"\x00" in head[:64]:
+            return "UTF-16-LE" if head[1:2] == b"\x00" else "UTF-16-BE"
+        return "UTF-8"
+
+    def _read_lines(self, filename):
+        """Read lines of (optionally gzipped) data file into memory
+
+        Gzipped files are decompressed in memory. Input files can be either
+        UTF-8 or UTF-16 encoded (cf. :func:`_detect_encoding`).
+
+        Parameters
+        ----------
+        filename : str
+            Absolute path to file to read.
+
+        Raises
+        ------
+        EEAv2FileError
+            if the file cannot be read or decoded
+
+        Returns
+        -------
+        list
+            lines of file
+        """
+        suffix = pathlib.Path(filename).suffix
+        _open = gzip.open if suffix == ".gz" else open
+        # files are max 3MB in size, so no big deal terms of RAM usage
+        try:
+            with _open(filename, "rb") as f:
+                content = f.read()
+        except (OSError, EOFError):
+            raise EEAv2FileError(f"Found corrupt file {filename}. consider deleteing it")
+        encoding = self._detect_encoding(content[:64])
+        try:
+            text = content.decode(encoding)
+        except UnicodeDecodeError:
+            try:
+                text = content.decode("UTF-16")
+            except UnicodeDecodeError:
+                raise EEAv2FileError(f"Found corrupt file {filename}. consider deleteing it")
+        return text.splitlines()
+
+    @staticmethod
+    def _str_to_float_array(values):
+        """Convert list of strings to float array (invalid values are NaN)"""
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").values.astype(
+            np.float_
+        )
+
+    @staticmethod
+    def _str_to_utc_array(values):
+        """Convert list of time strings with timezone offset to UTC datetime64 array
+
+        Time strings are like 2020-01-04 00:00:00 +01:00
+        """
+        # make the time strings ISO compliant so that numpy can directly read
+        # them. This is not very time string forgiving but fast
+        times = np.array([x[0:10] + "T" + x[11:19] for x in values], dtype="datetime64[s]")
+        # due to the deprecation of the timezone interpretation after numpy 0.11
+        # we have to substract the offset manually to get to UTC.
+        # Although there are time zones with a 30 minutes offset, these don't
+        # exist in Europe, so just consider integer hours here for speed
+        tz_offset = np.array([x[20:23] for x in values]).astype(np.int64)
+        return times - tz_offset.astype("timedelta64[h]")
+
     def read_file(self, filename, var_name, vars_as_series=False):
         """Read a single EEA file
 
@@ -220,7 +305,6 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
         # there's only one variable in the file
         aerocom_var_name = var_name
 
-        # Iterate over the lines of the file
         self.logger.info(f"Reading file {filename}")
         file_delimiter = self.FILE_COL_DELIM
         # this lists the data to keep from the original read string
@@ -240,92 +324,41 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
         # These are the indexes with a time and are stored as np.datetime64
         time_indexes = [13, 14]
 
-        # read the file
-        # enable alternative reading of .gz files here to save space on the file system
-        suffix = pathlib.Path(filename).suffix
-        if suffix == ".gz":
-            f_out = tempfile.NamedTemporaryFile(delete=False)
-            with gzip.open(filename, "r") as f_in:
-                shutil.copyfileobj(f_in, f_out)
-            read_filename = f_out.name
-            f_out.close()
-        else:
-            read_filename = filename
-
-        # input files can be either UTF-8 or UTF-16 encoded
-        # try both
-        # files are max 3MB in size, so no big deal terms of RAM usage
-        try:
-            with open(read_filename) as f:
-                lines = f.readlines()
-        except UnicodeDecodeError:
-            with open(read_filename, encoding="UTF-16") as f:
-                lines = f.readlines()
-        except:
-            if suffix == ".gz":
-                os.remove(f_out.name)
-            raise EEAv2FileError(f"Found corrupt file {filename}. consider deleteing it")
-
-        # remove the temp file in case the input file was a gz file
-        if suffix == ".gz":
-            os.remove(f_out.name)
+        # read the file (.gz files are decompressed in memory)
+        lines = self._read_lines(filename)
 
         header = lines[0].lower().rstrip().split(file_delimiter)
-        # create output dict
         if len(header) < max_file_index_to_keep:
             raise EEAv2FileError(f"Found corrupt file {filename}. consider deleting it")
 
+        # read the data...
+        # DE,http://gdi.uba.de/arcgis/rest/services/inspire/DE.UBA.AQD,NET.DE_BB,STA.DE_DEBB054,DEBB054,SPO.DE_DEBB054_PM2_dataGroup1,SPP.DE_DEBB054_PM2_automatic_light-scat_Duration-30minute,SAM.DE_DEBB054_2,PM2.5,http://dd.eionet.europa.eu/vocabulary/aq/pollutant/6001,hour,3.2000000000,µg/m3,2020-01-04 00:00:00 +01:00,2020-01-04 01:00:00 +01:00,1,2
+        rows = [line.rstrip().split(file_delimiter) for line in lines[1:]]
+        # Unfortunately there's a lot of corrupt files
+        # skip data line if the # rows is not sufficient
+        rows = [row for row in rows if len(row) >= max_file_index_to_keep]
+        lineidx = len(rows)
+
+        # create output dict
         data_dict = {}
         for idx in header_indexes_to_keep:
             data_dict[header[idx]] = ""
+            if lineidx == 0:
+                continue
+            elif header[idx] != self.VAR_CODE_NAME:
+                data_dict[header[idx]] = rows[0][idx]
+            else:
+                # extract the EEA var code from the URL noted in the data file
+                data_dict[header[idx]] = rows[0][idx].split("/")[-1]
 
         for idx in file_indexes_to_keep:
+            # the last column may be missing
+            col = [row[idx] if idx < len(row) else "" for row in rows]
             if idx in time_indexes:
-                data_dict[header[idx]] = np.zeros(self.MAX_LINES_TO_READ, dtype="datetime64[s]")
+                data_dict[header[idx]] = self._str_to_utc_array(col)
             else:
-                data_dict[header[idx]] = np.empty(self.MAX_LINES_TO_READ, dtype=np.float_)
-
-        # read the data...
-        # DE,http://gdi.uba.de/arcgis/rest/services/inspire/DE.UBA.AQD,NET.DE_BB,STA.DE_DEBB054,DEBB054,SPO.DE_DEBB054_PM2_dataGroup1,SPP.DE_DEBB054_PM2_automatic_light-scat_Duration-30minute,SAM.DE_DEBB054_2,PM2.5,http://dd.eionet.europa.eu/vocabulary/aq/pollutant/6001,hour,3.2000000000,µg/m3,2020-01-04 00:00:00 +01:00,2020-01-04 01:00:00 +01:00,1,2
-        lineidx = 0
-        for line in lines[1:]:
-            rows = line.rstrip().split(file_delimiter)
-            # Unfortunately there's a lot of corrupt files
-            # skip data line if the # rows is not sufficient
-            if len(rows) < max_file_index_to_keep:
-                continue
-            if lineidx == 0:
-                for idx in header_indexes_to_keep:
-                    if header[idx] != self.VAR_CODE_NAME:
-                        data_dict[header[idx]] = rows[idx]
-                    else:
-                        # extract the EEA var code from the URL noted in the data file
-                        data_dict[header[idx]] = rows[idx].split("/")[-1]
-
-            for idx in file_indexes_to_keep:
-                # if the data is a time
-                if idx in time_indexes:
-                    # make the time string ISO compliant so that numpy can directly read it
-                    # this is not very time string forgiving but fast
-                    data_dict[header[idx]][lineidx] = np.datetime64(
-                        rows[idx][0:10] + "T" + rows[idx][11:19]
-                    )
-                    # due to the deprecation of the timezone interpretation after numpy 0.11
-                    # we have to substract the offset manually to get to UTC.
-                    # np.timedelta64 does not accept a float as parameter, only an integer.
-                    # Although there are time zones with a 30 minutes offset, these don't
-                    # exist in Europe, so just consider integer hours here for speed
-                    tz_offset = np.timedelta64(np.int64(rows[idx][20:23]), "h")
-                    data_dict[header[idx]][lineidx] = data_dict[header[idx]][lineidx] - tz_offset
-                else:
-                    # data is not a time
-                    # sometimes there's no value in the file. Set that to nan
-                    try:
-                        data_dict[header[idx]][lineidx] = np.float_(rows[idx])
-                    except (ValueError, IndexError):
-                        data_dict[header[idx]][lineidx] = np.nan
-
-            lineidx += 1
+                # sometimes there's no value in the file. Set that to nan
+                data_dict[header[idx]] = self._str_to_float_array(col)
 
         unit_in_file = data_dict["unitofmeasurement"]
         # adjust the unit and apply conversion factor in case we read a variable noted in self.AUX_REQUIRES
@@ -369,34 +402,22 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
 
         # Sometimes the times in the data files are not ordered in time which causes problems when doing
         # time interpolations later on. Make sure that the data is ordered in time
-        diff_unsorted = np.diff(data_dict[self.START_TIME_NAME])
-        sort_flag = False
+        start_times = data_dict[self.START_TIME_NAME]
+        ordered_idx = None
+        if np.any(start_times[1:] < start_times[:-1]):
+            ordered_idx = np.argsort(start_times, kind="stable")
+
         # just assume hourly data for now
         time_diff = np.timedelta64(30, "m")
-        # np.min needs an array and fails with ValueError when a scalar is supplied
-        # this is the case for a single line file
-        try:
-            min_diff = np.min(diff_unsorted)
-        except ValueError:
-            min_diff = 0
-
-        if min_diff < 0:
-            # data needs to be sorted
-            ordered_idx = np.argsort(data_dict[self.START_TIME_NAME][:lineidx])
-            data_out["dtime"] = data_dict[self.START_TIME_NAME][ordered_idx] + time_diff
-            sort_flag = True
-        else:
-            data_out["dtime"] = data_dict[self.START_TIME_NAME][:lineidx] + time_diff
-
         for key, value in data_dict.items():
+            if isinstance(value, np.ndarray) and ordered_idx is not None:
+                value = value[ordered_idx]
             # adjust the variable name to aerocom standard
             if key != self.VAR_NAMES_FILE[aerocom_var_name]:
-                data_out[key] = value[:lineidx]
+                data_out[key] = value
             else:
-                if sort_flag:
-                    data_out[aerocom_var_name] = value[:lineidx][ordered_idx]
-                else:
-                    data_out[aerocom_var_name] = value[:lineidx]
+                data_out[aerocom_var_name] = value
+        data_out["dtime"] = data_out[self.START_TIME_NAME] + time_diff
 
         # convert data vectors to pandas.Series (if attribute
         # vars_as_series=True)
@@ -432,14 +453,9 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
 
         struct_data = {}
         suffix = pathlib.Path(filename).suffix
-        if suffix == ".gz":
-            f_out = tempfile.NamedTemporaryFile(delete=False)
-            with gzip.open(filename, "r") as f_in:
-                shutil.copyfileobj(f_in, f_out)
-            filename = f_out.name
-            f_in.close()
-
-        with open(filename) as f:
+        _open = gzip.open if suffix == ".gz" else open
+
+        with _open(filename, "rt") as f:
             # read header...
             # Countrycode Timezone Namespace   AirQualityNetwork AirQualityStation AirQualityStationEoICode   AirQualityStationNatCode   SamplingPoint  SamplingProces Sample   AirPollutantCode  ObservationDateBegin ObservationDateEnd   Projection  Longitude   Latitude Altitude MeasurementType   AirQualityStationType   AirQualityStationArea   EquivalenceDemonstrated MeasurementEquipment InletHeight BuildingDistance  KerbDistance
             header = f.readline().lower().rstrip().split()
@@ -477,11 +493,6 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
                 lineidx += 1
 
         self.logger.info(f"Reading file {filename} done")
-        # remove the temp file in case the input file was a gz file
-        if suffix == ".gz":
-            f_out.close()
-            os.remove(f_out.name)
-
         return struct_data
 
     def get_file_list(self, pattern=None):
@@ -541,6 +552,20 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
         ret_data["altitude"] = float(self._metadata[meta_key][self.ALTITUDENAME])
         return ret_data
 
+    def _read_file_checked(self, filename, var_name):
+        """Read file and return errors that lead to skipping of the file
+
+        Returns
+        -------
+        tuple
+            output of :func:`read_file` (or None) and exception that was
+            raised while reading the file (or None)
+        """
+        try:
+            return self.read_file(filename, var_name=var_name), None
+        except (EEAv2FileError, TemporalResolutionError) as e:
+            return None, e
+
     def read(
         self, vars_to_retrieve=None, files=None, first_file=None, last_file=None, metadatafile=None
     ):
@@ -609,16 +634,20 @@ class ReadEEAAQEREPBase(ReadUngriddedBase):
         _country_dict = get_country_name_from_iso()
         logger.info("Reading files...")
 
-        for i in tqdm(range(len(files))):
-            _file = files[i]
-            try:
-                station_data = self.read_file(_file, var_name=var_name)
-            except EEAv2FileError:
+        results = iter_read_files(
+            self,
+            "_read_file_checked",
+            files,
+            [var_name] * len(files),
+            max_files_per_task=self.MAX_FILES_PER_TASK,
+        )
+        for _file, (station_data, err) in zip(files, results):
+            if isinstance(err, EEAv2FileError):
                 self.logger.warning(f"file {_file} is corrupt! consider deleting it")
                 continue
-            except TemporalResolutionError as e:
+            elif isinstance(err, TemporalResolutionError):
                 self.logger.warning(f"{_file} has TemporalResolutionError")
-                logger.warning(f"{repr(e)}. Skipping file...")
+                logger.warning(f"{repr(err)}. Skipping file...")
                 continue
 
             # readfile might fail outside of the error captured by the try statement above
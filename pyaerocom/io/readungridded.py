@@ -12,7 +12,7 @@ else:  # pragma: no cover
 from pyaerocom import const
 from pyaerocom.combine_vardata_ungridded import combine_vardata_ungridded
 from pyaerocom.exceptions import DataRetrievalError, NetworkNotImplemented, NetworkNotSupported
-from pyaerocom.helpers import varlist_aerocom
+from pyaerocom.helpers import isnumeric, varlist_aerocom
 from pyaerocom.io.cachehandler_ungridded import CacheHandlerUngridded
 from pyaerocom.io.read_aasetal import ReadAasEtal
 from pyaerocom.io.read_aeronet_invv2 import ReadAeronetInvV2
@@ -45,6 +45,12 @@ class ReadUngridded:
     ----------
     COMING SOON
 
+    num_workers : int, optional
+        number of processes used for reading of data files. Only applies to
+        low-level readers that support parallel reading (i.e. that have an
+        attribute ``num_workers``, e.g. :class:`ReadEbas`). If None, the
+        default setting of the low-level reader is used.
+
     """
 
     SUPPORTED_READERS = [
@@ -68,7 +74,7 @@ class ReadUngridded:
 
     DONOTCACHE_NAME = "DONOTCACHE"
 
-    def __init__(self, data_ids=None, ignore_cache=False, data_dirs=None):
+    def __init__(self, data_ids=None, ignore_cache=False, data_dirs=None, num_workers=None):
 
         # will be assigned in setter method of data_ids
         self._data_ids = []
@@ -78,6 +84,10 @@ class ReadUngridded:
         #: be accessed via get_reader)
         self._readers = {}
 
+        #: number of processes used by low-level readers that support
+        #: parallel reading
+        self.num_workers = num_workers
+
         if data_ids is not None:
             self.data_ids = data_ids
 
@@ -322,10 +332,23 @@ class ReadUngridded:
             logger.info(f"Reading {data_id} from specified data loaction: {ddir}")
         else:
             ddir = None
-        return reader(data_id=data_id, data_dir=ddir)
+        reader = reader(data_id=data_id, data_dir=ddir)
+        if self.num_workers is not None:
+            if hasattr(reader, "num_workers"):
+                reader.num_workers = self.num_workers
+            else:
+                logger.info(f"{type(reader).__name__} does not support parallel reading")
+        return reader
 
     def read_dataset(
-        self, data_id, vars_to_retrieve=None, only_cached=False, filter_post=None, **kwargs
+        self,
+        data_id,
+        vars_to_retrieve=None,
+        only_cached=False,
+        filter_post=None,
+        start=None,
+        stop=None,
+        **kwargs,
     ):
         """Read dataset into an instance of :class:`ReadUngridded`
 
@@ -353,6 +376,14 @@ class ReadUngridded:
             for each variable and corresponding set of filters and then
             merge the individual filtered `UngriddedData` objects afterwards,
             e.g. using `data_var1 & data_var2`.
+        start, stop, optional
+            time window of interest (any format that can be handled by
+            :func:`pyaerocom.helpers.start_stop`). If provided, only data
+            within this time window is loaded from cache files (together with
+            station name, latitude and longitude constraints in `filter_post`),
+            which is faster than loading the complete cached data. Note that
+            the output may still contain data outside the time window, if the
+            data is read from the data source.
         **kwargs
             Additional input options for reading of data, which are applied
             WHILE the data is read. If any such additional options are
@@ -392,12 +423,20 @@ class ReadUngridded:
                 f"None of the input variables ({vars_to_retrieve}) is "
                 f"supported by {data_id} interface"
             )
+        filters = {}
+        if filter_post:
+            filters = self._eval_filter_post(filter_post, data_id, vars_available)
+
         cache = CacheHandlerUngridded(reader)
+        cache_subset = self._get_cache_subset(filters, start, stop)
+        # data loaded from cache (may be empty, if no cached data matches the
+        # subset constraints, which is not read again from the data source)
+        loaded = cache.loaded_subsets if cache_subset else cache.loaded_data
         if not self.ignore_cache:
             # initate cache handler
             for var in vars_available:
                 try:
-                    cache.check_and_load(var, force_use_outdated=only_cached)
+                    cache.check_and_load(var, force_use_outdated=only_cached, **cache_subset)
                 except Exception:
                     logger.exception(
                         "Fatal: compatibility error between old cache file "
@@ -405,7 +444,7 @@ class ReadUngridded:
                     )
 
         if not only_cached:
-            vars_to_read = [v for v in vars_available if not v in cache.loaded_data]
+            vars_to_read = [v for v in vars_available if not v in loaded]
         else:
             vars_to_read = []
 
@@ -435,19 +474,60 @@ class ReadUngridded:
         else:
             data_out = UngriddedData()
             for var in vars_available:
-                if var in cache.loaded_data:
-                    data_out.append(cache.loaded_data[var])
+                if var in loaded:
+                    data_out.append(loaded[var])
             if data_read is not None:
                 data_out.append(data_read)
 
         if _caching is not None:
             const.CACHING = _caching
 
-        if filter_post:
-            filters = self._eval_filter_post(filter_post, data_id, vars_available)
+        if filter_post and not data_out.is_empty:
             data_out = data_out.apply_filters(**filters)
         return data_out
 
+    @staticmethod
+    def _get_cache_subset(filters, start=None, stop=None):
+        """Get constraints for loading a subset of cached data
+
+        Parameters
+        ----------
+        filters : dict
+            post filters of dataset (output from :func:`_eval_filter_post`).
+            Filters of station name, latitude and longitude are used, unless
+            they are negated.
+        start, stop, optional
+            time window
+
+        Returns
+        -------
+        dict
+            keyword arguments for :func:`CacheHandlerUngridded.check_and_load`
+        """
+        subset = {}
+        if start is not None:
+            subset["start"] = start
+        if stop is not None:
+            subset["stop"] = stop
+        negate = filters.get("negate")
+        if negate is None:
+            negate = []
+        elif isinstance(negate, str):
+            negate = [negate]
+        name = filters.get("station_name")
+        if not "station_name" in negate:
+            if isinstance(name, str):
+                subset["station_name"] = name
+            elif isinstance(name, (list, tuple)) and all(isinstance(x, str) for x in name):
+                subset["station_name"] = list(name)
+        for key in ("latitude", "longitude"):
+            val = filters.get(key)
+            if key in negate or not isinstance(val, (list, tuple)) or not len(val) == 2:
+                continue
+            if all(isnumeric(x) for x in val):
+                subset[key] = [float(val[0]), float(val[1])]
+        return subset
+
     def _eval_filter_post(self, filter_post, data_id, vars_available):
         filters = {}
         if not isinstance(filter_post, dict):
@@ -494,7 +574,14 @@ class ReadUngridded:
         return filters
 
     def read_dataset_post(
-        self, data_id, vars_to_retrieve, only_cached=False, filter_post=None, **kwargs
+        self,
+        data_id,
+        vars_to_retrieve,
+        only_cached=False,
+        filter_post=None,
+        start=None,
+        stop=None,
+        **kwargs,
     ):
         """Read dataset into an instance of :class:`ReadUngridded`
 
@@ -522,6 +609,14 @@ class ReadUngridded:
             for each variable and corresponding set of filters and then
             merge the individual filtered `UngriddedData` objects afterwards,
             e.g. using `data_var1 & data_var2`.
+        start, stop, optional
+            time window of interest (any format that can be handled by
+            :func:`pyaerocom.helpers.start_stop`). If provided, only data
+            within this time window is loaded from cache files (together with
+            station name, latitude and longitude constraints in `filter_post`),
+            which is faster than loading the complete cached data. Note that
+            the output may still contain data outside the time window, if the
+            data is read from the data source.
         **kwargs
             Additional input options for reading of data, which are applied
             WHILE the data is read. If any such additional options are
@@ -548,6 +643,8 @@ class ReadUngridded:
                         data_id=aux_id,
                         vars_to_retrieve=aux_vars,
                         only_cached=only_cached,
+                        start=start,
+                        stop=stop,
                         **kwargs,
                     )
                     for aux_var in aux_vars:
@@ -563,6 +660,8 @@ class ReadUngridded:
                             aux_var,
                             only_cached=only_cached,
                             filter_post=filter_post,
+                            start=start,
+                            stop=stop,
                             **kwargs,
                         )
                         input_data_ids_vars.append((_data, aux_id, aux_var))
@@ -597,7 +696,14 @@ class ReadUngridded:
         return first
 
     def read(
-        self, data_ids=None, vars_to_retrieve=None, only_cached=False, filter_post=None, **kwargs
+        self,
+        data_ids=None,
+        vars_to_retrieve=None,
+        only_cached=False,
+        filter_post=None,
+        start=None,
+        stop=None,
+        **kwargs,
     ):
         """Read observations
 
@@ -628,6 +734,14 @@ class ReadUngridded:
             for each variable and corresponding set of filters and then
             merge the individual filtered `UngriddedData` objects afterwards,
             e.g. using `data_var1 & data_var2`.
+        start, stop, optional
+            time window of interest (any format that can be handled by
+            :func:`pyaerocom.helpers.start_stop`). If provided, only data
+            within this time window is loaded from cache files (together with
+            station name, latitude and longitude constraints in `filter_post`),
+            which is faster than loading the complete cached data. Note that
+            the output may still contain data outside the time window, if the
+            data is read from the data source.
         **kwargs
             Additional input options for reading of data, which are applied
             WHILE the data is read. If any such additional options are
@@ -665,6 +779,8 @@ class ReadUngridded:
                         vars_to_retrieve,
                         only_cached=only_cached,
                         filter_post=filter_post,
+                        start=start,
+                        stop=stop,
                         **kwargs,
                     )
                 )
@@ -675,6 +791,8 @@ class ReadUngridded:
                         vars_to_retrieve,
                         only_cached=only_cached,
                         filter_post=filter_post,
+                        start=start,
+                        stop=stop,
                         **kwargs,
                     )
                 )
@@ -0,0 +1,154 @@
+"""
+Size bounded in-memory cache with least recently used eviction
+"""
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class SizeBoundedLRUCache:
+    """Size bounded, thread-safe in-memory cache of data objects
+
+    Entries are identified via a key (cf. :func:`make_key`). If the total
+    size of the cached data (cf. :func:`get_size`) exceeds :attr:`max_size`,
+    the least recently used entries are evicted.
+
+    Note
+    ----
+    Cached data objects are shared, that is, the object returned by
+    :func:`get` is the one that was stored via :func:`put` and must not be
+    modified in place.
+
+    Parameters
+    ----------
+    max_size : float
+        maximum size of cached data in bytes. Data objects that are larger
+        than that are not cached.
+    """
+
+    #: name of cache used in log messages
+    NAME = "cache"
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self):
+        """Total size of cached data in bytes"""
+        return sum(self._sizes.values())
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    @staticmethod
+    def make_key(**settings):
+        """Make cache key from settings that determine cached data
+
+        Parameters
+        ----------
+        **settings
+            settings that affect the cached data. Values must be JSON
+            serialisable (other objects are converted using their string
+            representation).
+
+        Returns
+        -------
+        str
+            cache key (independent of the order of the input settings)
+        """
+        return json.dumps(settings, sort_keys=True, default=str)
+
+    @staticmethod
+    def get_size(data):
+        """Estimate memory size of a data object in bytes
+
+        Parameters
+        ----------
+        data
+            data object, the size is given by its attribute `nbytes` (e.g.
+            :class:`numpy.ndarray`), if available.
+
+        Returns
+        -------
+        int
+            size in bytes
+        """
+        return getattr(data, "nbytes", 0)
+
+    def get(self, key):
+        """Get cached data for input key
+
+        Parameters
+        ----------
+        key : str
+            cache key (cf. :func:`make_key`)
+
+        Returns
+        -------
+        object, optional
+            cached data object or None, if no data is cached for input key
+        """
+        with self._lock:
+            if not key in self._data:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, data):
+        """Add data to cache
+
+        If needed, the least recently used entries are evicted, so that the
+        total size of the cache does not exceed :attr:`max_size`.
+
+        Parameters
+        ----------
+        key : str
+            cache key (cf. :func:`make_key`)
+        data
+            data object to be cached
+
+        Returns
+        -------
+        bool
+            True if data was added to cache, else False (i.e. data is larger
+            than :attr:`max_size`)
+        """
+        size = self.get_size(data)
+        with self._lock:
+            self._pop(key)
+            if size > self.max_size:
+                logger.info(
+                    f"Data object is too large for {self.NAME} "
+                    f"({size / 1e9:.2f} GB > {self.max_size / 1e9:.2f} GB) and is not cached"
+                )
+                return False
+            while self._data and sum(self._sizes.values()) + size > self.max_size:
+                evicted, _ = self._data.popitem(last=False)
+                self._sizes.pop(evicted)
+                logger.info(f"Evicted data from {self.NAME}: {evicted}")
+            self._data[key] = data
+            self._sizes[key] = size
+        return True
+
+    def clear(self):
+        """Remove all data from cache"""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+
+    def _pop(self, key):
+        self._data.pop(key, None)
+        self._sizes.pop(key, None)
@@ -345,6 +345,275 @@ def calc_statistics(data, ref_data, lowlim=None, highlim=None, min_num_valid=1,
     return result
 
 
+#: maximum number of samples per series for which Kendall's tau is computed
+#: from all pairs at once in :func:`calc_statistics_batched` (longer series
+#: are processed one by one using :func:`scipy.stats.kendalltau`)
+KENDALL_MAX_PAIRWISE = 300
+
+
+def calc_statistics_batched(
+    data, ref_data, lowlim=None, highlim=None, min_num_valid=1, weights=None
+):
+    """Calc statistical properties of many pairs of data series at once
+
+    Batched version of :func:`calc_statistics`: each row of the 2D input
+    arrays is one pair of series and all statistics are computed for all
+    rows at once. Rows may contain NaNs (e.g. padding of series of
+    different lengths), which are removed as in :func:`calc_statistics`.
+    Results are the same as calling :func:`calc_statistics` for each row
+    (up to floating point rounding), cf. :func:`unstack_statistics` to
+    convert the output into one dictionary per row.
+
+    Note
+    ----
+    Unlike :func:`calc_statistics`, the metrics of rows with fewer than
+    `min_num_valid` valid points are included as NaN (including
+    `R_kendall`) and `totnum` is the number of columns of the input arrays.
+
+    Parameters
+    ----------
+    data : ndarray
+        2D array (series x samples) containing data, that is supposed to be
+        compared with reference data
+    ref_data : ndarray
+        2D array (series x samples) containing data, that is used to compare
+        `data` array with
+    lowlim : float
+        lower end of considered value range (e.g. if set 0, then all datapoints
+        where either ``data`` or ``ref_data`` is smaller than 0 are removed)
+    highlim : float
+        upper end of considered value range
+    min_num_valid : int
+        minimum number of valid measurements required to compute statistical
+        parameters.
+    weights : ndarray, optional
+        weights of samples, either 1D (same weights for all series) or of the
+        same shape as the data arrays.
+
+    Returns
+    -------
+    dict
+        dictionary containing computed statistics (same keys as
+        :func:`calc_statistics`), values are arrays with one entry per
+        series (except for `weighted`, which is a bool).
+
+    Raises
+    ------
+    ValueError
+        if either of the input arrays is not 2 dimensional or if the shapes of
+        the input arrays do not match
+    """
+    data = np.asarray(data, dtype=float)
+    ref_data = np.asarray(ref_data, dtype=float)
+
+    if not data.ndim == 2 or not data.shape == ref_data.shape:
+        raise ValueError("Invalid input. Data arrays must be two dimensional and of same shape")
+
+    nseries, nsamples = data.shape
+    mask = ~np.isnan(ref_data) & ~np.isnan(data)
+    num_points = mask.sum(axis=1)
+    weighted = False if weights is None else True
+
+    result = {}
+    result["totnum"] = np.full(nseries, float(nsamples))
+    result["num_valid"] = num_points.astype(float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ref_mean, ref_std = _masked_mean_and_std(ref_data, mask, num_points)
+        data_mean, data_std = _masked_mean_and_std(data, mask, num_points)
+        result["refdata_mean"] = ref_mean
+        result["refdata_std"] = ref_std
+        result["data_mean"] = data_mean
+        result["data_std"] = data_std
+        result["weighted"] = weighted
+
+        if weights is not None:
+            weights = np.broadcast_to(np.asarray(weights, dtype=float), data.shape)
+            wmax = np.where(mask, weights, -np.inf).max(axis=1, initial=-np.inf)
+            weights = weights / wmax[:, np.newaxis]
+            result[
+                "NOTE"
+            ] = "Weights were not applied to FGE and kendall and spearman corr (not implemented)"
+
+        valid = mask.copy()
+        if lowlim is not None:
+            valid &= (data > lowlim) & (ref_data > lowlim)
+        if highlim is not None:
+            valid &= (data < highlim) & (ref_data < highlim)
+
+        difference = data - ref_data
+        diffsquare = difference**2
+        sumweights = valid.sum(axis=1) if weights is None else _masked_sum(weights, valid)
+        result["rms"] = np.sqrt(_masked_sum(diffsquare, valid, weights) / sumweights)
+
+        corr_ok = (num_points > 1) & (valid.sum(axis=1) > 1)
+        if weights is None:
+            result["R"] = np.where(corr_ok, _pearson_batched(data, ref_data, valid), np.nan)
+        else:
+            r = _weighted_corr_batched(ref_data, data, weights, valid)
+            result["R"] = np.where(corr_ok, r, np.nan)
+        result["R_spearman"] = np.where(corr_ok, _spearman_batched(data, ref_data, valid), np.nan)
+        result["R_kendall"] = np.where(corr_ok, _kendall_batched(data, ref_data, valid), np.nan)
+
+        sum_diff = _masked_sum(difference, valid, weights)
+        sum_refdata = _masked_sum(ref_data, valid, weights)
+        nmb = sum_diff / sum_refdata
+        nmb[(sum_refdata == 0) & (sum_diff == 0)] = 0
+        nmb[(sum_refdata == 0) & (sum_diff != 0)] = np.nan
+        result["nmb"] = nmb
+
+        sum_data_refdata = data + ref_data
+        valid &= ~np.isnan(sum_data_refdata)
+        num_points_sum = valid.sum(axis=1)
+        tmp = difference / sum_data_refdata
+        mnmb = 2.0 / num_points_sum * _masked_sum(tmp, valid, weights)
+        fge = 2.0 / num_points_sum * _masked_sum(np.abs(tmp), valid, weights)
+        result["mnmb"] = np.where(num_points_sum > 0, mnmb, np.nan)
+        result["fge"] = np.where(num_points_sum > 0, fge, np.nan)
+
+    insufficient = num_points < min_num_valid
+    for key in ("rms", "R", "R_spearman", "R_kendall", "nmb", "mnmb", "fge"):
+        result[key][insufficient] = np.nan
+    return result
+
+
+def unstack_statistics(stats, min_num_valid=1):
+    """Convert output of :func:`calc_statistics_batched` into one dict per series
+
+    Parameters
+    ----------
+    stats : dict
+        output of :func:`calc_statistics_batched`
+    min_num_valid : int
+        minimum number of valid measurements used to compute `stats`
+
+    Returns
+    -------
+    list
+        one dictionary per series, with the same keys (and order) as the
+        output of :func:`calc_statistics`
+    """
+    head = ["totnum", "num_valid", "refdata_mean", "refdata_std", "data_mean", "data_std"]
+    metrics = ["rms", "R", "R_spearman", "R_kendall", "nmb", "mnmb", "fge"]
+    insufficient = ["rms", "nmb", "mnmb", "fge", "R", "R_spearman"]
+    if "NOTE" in stats:
+        metrics.insert(0, "NOTE")
+    columns = {key: stats[key].tolist() for key in head + metrics if key != "NOTE"}
+    result = []
+    for i, num_valid in enumerate(columns["num_valid"]):
+        item = {key: columns[key][i] for key in head}
+        item["weighted"] = stats["weighted"]
+        if not num_valid >= min_num_valid:
+            item.update({key: np.nan for key in insufficient})
+        else:
+            for key in metrics:
+                item[key] = stats[key] if key == "NOTE" else columns[key][i]
+        result.append(item)
+    return result
+
+
+def _masked_sum(values, mask, weights=None):
+    """Row sums of (weighted) values where mask is True"""
+    if weights is not None:
+        values = values * weights
+    return np.where(mask, values, 0).sum(axis=1)
+
+
+def _masked_mean_and_std(values, mask, num):
+    """Row means and standard deviations of values where mask is True"""
+    mean = _masked_sum(values, mask) / num
+    std = np.sqrt(_masked_sum((values - mean[:, np.newaxis]) ** 2, mask) / num)
+    return mean, std
+
+
+def _is_constant(values, mask):
+    """Check for each row whether all values where mask is True are the same"""
+    vmax = np.where(mask, values, -np.inf).max(axis=1, initial=-np.inf)
+    vmin = np.where(mask, values, np.inf).min(axis=1, initial=np.inf)
+    return vmax == vmin
+
+
+def _pearson_batched(x, y, mask):
+    """Pearson correlation coefficient of each row (cf. :func:`scipy.stats.pearsonr`)"""
+    num = mask.sum(axis=1)
+    xm = np.where(mask, x - (_masked_sum(x, mask) / num)[:, np.newaxis], 0)
+    ym = np.where(mask, y - (_masked_sum(y, mask) / num)[:, np.newaxis], 0)
+    normxm = np.sqrt((xm**2).sum(axis=1))[:, np.newaxis]
+    normym = np.sqrt((ym**2).sum(axis=1))[:, np.newaxis]
+    r = np.clip(((xm / normxm) * (ym / normym)).sum(axis=1), -1.0, 1.0)
+    r[_is_constant(x, mask) | _is_constant(y, mask)] = np.nan
+    return r
+
+
+def _weighted_corr_batched(ref_data, data, weights, mask):
+    """Weighted correlation of each row (cf. :func:`weighted_corr`)"""
+    sumw = _masked_sum(weights, mask)
+
+    def wcov(a, b):
+        avga = (_masked_sum(a, mask, weights) / sumw)[:, np.newaxis]
+        avgb = (_masked_sum(b, mask, weights) / sumw)[:, np.newaxis]
+        return _masked_sum((a - avga) * (b - avgb), mask, weights) / sumw
+
+    return wcov(ref_data, data) / np.sqrt(wcov(ref_data, ref_data) * wcov(data, data))
+
+
+def _spearman_batched(x, y, mask):
+    """Spearman rank correlation of each row (cf. :func:`scipy.stats.spearmanr`)"""
+    # invalid values are ranked last and hence do not affect the ranks of
+    # valid values
+    xrank = _rank_rows(np.where(mask, x, np.inf))
+    yrank = _rank_rows(np.where(mask, y, np.inf))
+    return _pearson_batched(xrank, yrank, mask)
+
+
+def _rank_rows(values):
+    """Ranks of values in each row, ties get average rank (cf. :func:`scipy.stats.rankdata`)"""
+    nrows, ncols = values.shape
+    order = np.argsort(values, axis=1, kind="mergesort")
+    sorted_vals = np.take_along_axis(values, order, axis=1)
+    # unique ID of each group of tied values
+    new_group = np.ones(values.shape, dtype=bool)
+    new_group[:, 1:] = sorted_vals[:, 1:] != sorted_vals[:, :-1]
+    group = np.cumsum(new_group.ravel()) - 1
+    # average of ranks (1-based positions in sorted rows) of each group
+    positions = np.tile(np.arange(1, ncols + 1, dtype=float), nrows)
+    avg_rank = np.bincount(group, weights=positions) / np.bincount(group)
+    ranks = np.empty(values.shape)
+    np.put_along_axis(ranks, order, avg_rank[group].reshape(values.shape), axis=1)
+    return ranks
+
+
+def _kendall_batched(x, y, mask):
+    """Kendall's tau-b of each row (cf. :func:`scipy.stats.kendalltau`)"""
+    nseries, nsamples = x.shape
+    tau = np.full(nseries, np.nan)
+    if nsamples > KENDALL_MAX_PAIRWISE:
+        for i in range(nseries):
+            if mask[i].sum() > 1:
+                tau[i] = kendalltau(x[i][mask[i]], y[i][mask[i]])[0]
+        return tau
+
+    # invalid values are NaN in both arrays and compare neither larger nor
+    # smaller, i.e. pairs with invalid values are neither counted as
+    # concordant / discordant nor as untied in x or y
+    x = np.where(mask, x, np.nan)
+    y = np.where(mask, y, np.nan)
+    con_minus_dis = np.zeros(nseries, dtype=np.int64)
+    xpairs = np.zeros(nseries, dtype=np.int64)
+    ypairs = np.zeros(nseries, dtype=np.int64)
+    # loop over distance between samples of pairs (all rows at once)
+    for offs in range(1, nsamples):
+        xa, xb, ya, yb = x[:, offs:], x[:, :-offs], y[:, offs:], y[:, :-offs]
+        dx = (xa > xb).view(np.int8) - (xa < xb).view(np.int8)
+        dy = (ya > yb).view(np.int8) - (ya < yb).view(np.int8)
+        con_minus_dis += (dx * dy).sum(axis=1, dtype=np.int64)
+        xpairs += np.count_nonzero(dx, axis=1)
+        ypairs += np.count_nonzero(dy, axis=1)
+    tau = con_minus_dis / np.sqrt(xpairs) / np.sqrt(ypairs)
+    tau[(xpairs == 0) | (ypairs == 0)] = np.nan
+    return np.clip(tau, -1.0, 1.0)
+
+
 def closest_index(num_array, value):
     """Returns index in number array that is closest to input value"""
     return np.argmin(np.abs(np.asarray(num_array) - value))
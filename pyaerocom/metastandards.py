@@ -1,5 +1,6 @@
 import logging
 from configparser import ConfigParser
+from functools import lru_cache
 from importlib import resources
 
 import numpy as np
@@ -9,6 +10,24 @@ from pyaerocom._lowlevel_helpers import BrowseDict
 logger = logging.getLogger(__name__)
 
 
+@lru_cache()
+def _read_source_info_ini(file_name):
+    """Read data source ini file of pyaerocom (only once, the file is static)
+
+    Returns
+    -------
+    dict
+        source info for each data ID in ini file
+    """
+    if not resources.is_resource("pyaerocom.data", file_name):
+        raise OSError(f"File {file_name} does not exist")
+
+    parser = ConfigParser()
+    with resources.path("pyaerocom.data", file_name) as path:
+        parser.read(path)
+    return {data_id: dict(parser[data_id]) for data_id in parser.sections()}
+
+
 class DataSource(BrowseDict):
     """Dict-like object defining a data source
 
@@ -112,15 +131,9 @@ class DataSource(BrowseDict):
 
     def _parse_source_info_from_ini(self):
         """Parse source info from ini file"""
-
-        if not resources.is_resource("pyaerocom.data", self._ini_file_name):
-            raise OSError(f"File {self._ini_file_name} does not exist")
-
-        parser = ConfigParser()
-        with resources.path("pyaerocom.data", self._ini_file_name) as path:
-            parser.read(path)
-        if self.data_id in parser:
-            for k, v in parser[self.data_id].items():
+        source_info = _read_source_info_ini(self._ini_file_name)
+        if self.data_id in source_info:
+            for k, v in source_info[self.data_id].items():
                 if k in self._types:
                     self[k] = self._types[k](v)
                 else:
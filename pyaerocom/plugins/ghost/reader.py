@@ -9,7 +9,7 @@ import pandas as pd
 import xarray as xr
 
 from pyaerocom.exceptions import DataSourceError
-from pyaerocom.helpers import varlist_aerocom
+from pyaerocom.helpers import to_datetime64, varlist_aerocom
 from pyaerocom.io.readungriddedbase import ReadUngriddedBase
 from pyaerocom.metastandards import StationMetaData
 from pyaerocom.tstype import TsType
@@ -170,6 +170,14 @@ class ReadGhost(ReadUngriddedBase):
         "flag": None,
     }
 
+    #: Maximum range of (integer) flag codes for which a lookup table is used
+    #: in :func:`_eval_flags_array` (otherwise :func:`numpy.isin` is used)
+    MAX_FLAG_LOOKUP_SIZE = 2**16
+
+    #: Maximum number of contiguous blocks of selected stations that are read
+    #: individually from a file (cf. :func:`_subset_dataset`)
+    MAX_STATION_BLOCKS = 100
+
     @property
     def PROVIDES_VARIABLES(self):
         """
@@ -275,6 +283,11 @@ class ReadGhost(ReadUngriddedBase):
         """
         Compare a flag slice of a data point with input flags marking invalid
 
+        Note
+        ----
+        Not used in :func:`_eval_flags` which uses the (much faster)
+        vectorised version :func:`_eval_flags_array`.
+
         Returns
         -------
         bool
@@ -284,6 +297,42 @@ class ReadGhost(ReadUngriddedBase):
             return True
         return False
 
+    @classmethod
+    def _eval_flags_array(cls, flags, invalid_flags, axis):
+        """
+        Find data points that are flagged invalid
+
+        Parameters
+        ----------
+        flags : ndarray
+            array of flag codes, containing all flag codes of each data point
+            along input axis
+        invalid_flags : array-like
+            flag codes that mark invalid data points
+        axis : int
+            flag code dimension in input array
+
+        Returns
+        -------
+        ndarray
+            boolean array (flag dimension removed) that is True for data
+            points that are flagged with any of the input invalid flags
+        """
+        invalid_flags = np.asarray(invalid_flags).ravel()
+        if flags.size == 0 or invalid_flags.size == 0:
+            return np.zeros(np.delete(flags.shape, axis), dtype=bool)
+        if np.issubdtype(flags.dtype, np.integer):
+            low, high = int(flags.min()), int(flags.max())
+            if high - low < cls.MAX_FLAG_LOOKUP_SIZE:
+                # lookup table over all flag codes in input array
+                lookup = np.zeros(high - low + 1, dtype=bool)
+                codes = invalid_flags[(invalid_flags >= low) & (invalid_flags <= high)]
+                lookup[codes.astype(np.int64) - low] = True
+                if low != 0:
+                    flags = flags.astype(np.int64) - low
+                return lookup[flags].any(axis=axis)
+        return np.isin(flags, invalid_flags).any(axis=axis)
+
     def _ts_type_from_data_dir(self):
         try:
             freq = str(TsType(os.path.basename(self.data_dir)))
@@ -293,7 +342,7 @@ class ReadGhost(ReadUngriddedBase):
         return freq
 
     def _eval_flags(self, vardata, invalidate_flags, ds):
-        valid = np.ones_like(vardata).astype(bool)
+        invalid = np.zeros(vardata.shape, dtype=bool)
         for flagvar in self.FLAG_VARS:
             # check if this flag variable is in input dictionary
             if flagvar in invalidate_flags:
@@ -303,21 +352,163 @@ class ReadGhost(ReadUngriddedBase):
                 flags = ds[flagvar]
                 slice_dim = flags.dims.index(self.FLAG_DIMNAMES[flagvar])
 
-                valid *= np.apply_along_axis(
-                    self._eval_flags_slice, slice_dim, flags.values, invalidate
-                )
-        invalid = ~valid
+                invalid |= self._eval_flags_array(flags.values, invalidate, slice_dim)
         return invalid
 
-    def read_file(self, filename, var_to_read=None, invalidate_flags=None, var_to_write=None):
+    def _find_station_indices(
+        self, ds, station_names=None, lat_range=None, lon_range=None, altitude_range=None
+    ):
+        """Find indices of stations matching input constraints
+
+        Only the metadata variables required for the input constraints are
+        read from the input dataset.
+
+        Parameters
+        ----------
+        ds : xarray.Dataset
+            (lazily loaded) GHOST dataset
+        station_names : str or list, optional
+            name(s) of stations to be selected
+        lat_range, lon_range, altitude_range : tuple, optional
+            (inclusive) ranges of station coordinates to be selected. A
+            longitude range with lower bound larger than upper bound (e.g.
+            (170, -170)) crosses the dateline (cf.
+            :func:`Region.contains_coordinate`).
+
+        Returns
+        -------
+        ndarray, optional
+            indices of matching stations or None, if no constraints are
+            provided
+        """
+        mask = None
+        if station_names is not None:
+            if isinstance(station_names, str):
+                station_names = [station_names]
+            names = ds["station_name"].values.astype(str)
+            # station names are stored with "-" instead of "/" in read
+            mask = np.isin(names, station_names) | np.isin(
+                np.char.replace(names, "/", "-"), station_names
+            )
+        ranges = dict(latitude=lat_range, longitude=lon_range, altitude=altitude_range)
+        for meta_key, val_range in ranges.items():
+            if val_range is None:
+                continue
+            low, high = val_range
+            vals = ds[meta_key].values
+            if meta_key == "longitude" and low > high:
+                # longitude range crosses the dateline
+                in_range = (vals >= low) | (vals <= high)
+            else:
+                in_range = (vals >= low) & (vals <= high)
+            mask = in_range if mask is None else mask & in_range
+        if mask is None:
+            return None
+        return np.flatnonzero(mask)
+
+    @staticmethod
+    def _find_time_slice(tvals, start=None, stop=None):
+        """Find slice of (sorted) time values within input (inclusive) range
+
+        Parameters
+        ----------
+        tvals : ndarray
+            sorted datetime64 array
+        start, stop : optional
+            start and stop time (any format that can be converted to
+            :class:`numpy.datetime64`)
+
+        Returns
+        -------
+        slice
+            index slice of time values that are within input range
+        """
+        first, last = 0, len(tvals)
+        if start is not None:
+            first = np.searchsorted(tvals, to_datetime64(start), side="left")
+        if stop is not None:
+            last = np.searchsorted(tvals, to_datetime64(stop), side="right")
+        return slice(first, max(first, last))
+
+    def _subset_dataset(self, ds, stat_idx, time_slice):
+        """Subset (lazily loaded) GHOST dataset
+
+        Only the selected stations and time steps are read from the file.
+        Since netCDF does not support arbitrary index lists for all variable
+        types (e.g. strings), contiguous blocks of stations are read
+        individually (or, if the selected stations are scattered over more
+        than :attr:`MAX_STATION_BLOCKS` blocks, the enclosing block is read
+        and subset in memory).
+
+        Parameters
+        ----------
+        ds : xarray.Dataset
+            (lazily loaded) GHOST dataset
+        stat_idx : ndarray, optional
+            sorted indices of stations to be selected (None: all stations)
+        time_slice : slice
+            time steps to be selected
+
+        Returns
+        -------
+        xarray.Dataset
+            subset
+        """
+        if stat_idx is None:
+            if time_slice == slice(0, ds.dims["time"]):
+                return ds
+            return ds.isel(time=time_slice)
+        blocks = np.split(stat_idx, np.flatnonzero(np.diff(stat_idx) > 1) + 1)
+        if len(blocks) > self.MAX_STATION_BLOCKS:
+            first = stat_idx[0]
+            subset = ds.isel(station=slice(first, stat_idx[-1] + 1), time=time_slice).load()
+            return subset.isel(station=stat_idx - first)
+        subsets = [
+            ds.isel(station=slice(block[0], block[-1] + 1), time=time_slice) for block in blocks
+        ]
+        if len(subsets) == 1:
+            return subsets[0]
+        return xr.concat(
+            subsets, dim="station", data_vars="minimal", coords="minimal", compat="override"
+        )
+
+    def read_file(
+        self,
+        filename,
+        var_to_read=None,
+        invalidate_flags=None,
+        var_to_write=None,
+        station_names=None,
+        lat_range=None,
+        lon_range=None,
+        altitude_range=None,
+        start=None,
+        stop=None,
+    ):
         """Read GHOST NetCDF data file
 
+        Station and time constraints are evaluated based on the station
+        metadata and time arrays first, so that only the data (and flags)
+        of the selected stations and time steps are read from the file.
+
         Parameters
         ----------
         filename : str
             absolute path to filename to read
         var_name : str, optional
             name of variable to be read, if None, it is inferred from filename
+        station_names : str or list, optional
+            name(s) of stations to be read. If None, all stations are read.
+        lat_range : tuple, optional
+            (inclusive) latitude range of stations to be read
+        lon_range : tuple, optional
+            (inclusive) longitude range of stations to be read
+        altitude_range : tuple, optional
+            (inclusive) altitude range of stations to be read
+        start : optional
+            start time of data to be read (inclusive)
+        stop : optional
+            stop time of data to be read (inclusive)
 
         Returns
         -------
@@ -346,7 +537,14 @@ class ReadGhost(ReadUngriddedBase):
         if not "station_name" in ds:  # pragma: no cover
             raise AttributeError("No variable station_name found")
 
+        stat_idx = self._find_station_indices(
+            ds, station_names, lat_range, lon_range, altitude_range
+        )
+        time_slice = self._find_time_slice(ds["time"].values, start, stop)
         stats = []
+        if (stat_idx is not None and len(stat_idx) == 0) or time_slice.start == time_slice.stop:
+            return stats
+        ds = self._subset_dataset(ds, stat_idx, time_slice)
 
         # get all station metadata values as numpy arrays, since xarray isel,
         # __getitem__, __getattr__ are slow... this can probably be solved
@@ -379,7 +577,7 @@ class ReadGhost(ReadUngriddedBase):
         # evaluate flags
         invalid = self._eval_flags(vardata, invalidate_flags, ds)
 
-        for idx in ds.station.values:
+        for idx in range(len(data_np)):
 
             stat = {}
             meta = StationMetaData()
@@ -405,6 +603,33 @@ class ReadGhost(ReadUngriddedBase):
 
         return stats
 
+    def _filter_files_time(self, files, start=None, stop=None):
+        """Remove files that do not contain data within input time range
+
+        Parameters
+        ----------
+        files : list
+            list of GHOST data files (one file per month)
+        start, stop : optional
+            start and stop time (inclusive)
+
+        Returns
+        -------
+        list
+            files that overlap with input time range
+        """
+        start = None if start is None else to_datetime64(start)
+        stop = None if stop is None else to_datetime64(stop)
+        files_ok = []
+        for file in files:
+            meta = self.get_meta_filename(file)
+            if start is not None and meta["stop"].to_datetime64() < start:
+                continue
+            if stop is not None and meta["start"].to_datetime64() > stop:
+                continue
+            files_ok.append(file)
+        return files_ok
+
     def _add_flags_var_to_compute(self, statlist_from_file, var_to_compute):
         for stat in statlist_from_file:
             for i, req in enumerate(self.AUX_REQUIRES[var_to_compute]):
@@ -473,10 +698,21 @@ class ReadGhost(ReadUngriddedBase):
         last_file=None,
         pattern=None,
         check_time=True,
+        station_names=None,
+        lat_range=None,
+        lon_range=None,
+        altitude_range=None,
+        start=None,
+        stop=None,
         **kwargs,
     ):
         """Read data files into :class:`UngriddedData` object
 
+        Station and time constraints are applied while reading, that is,
+        files outside the input time range are skipped and only the data of
+        the selected stations and time steps is read from each file (cf.
+        :func:`read_file`).
+
         Parameters
         ----------
         vars_to_retrieve : list, optional
@@ -493,6 +729,21 @@ class ReadGhost(ReadUngriddedBase):
             in the list is used
          file_pattern : str, optional
             string pattern for file search (cf :func:`get_file_list`)
+        station_names : str or list, optional
+            name(s) of stations to be read. If None, all stations are read.
+        lat_range : tuple, optional
+            (inclusive) latitude range of stations to be read
+        lon_range : tuple, optional
+            (inclusive) longitude range of stations to be read
+        altitude_range : tuple, optional
+            (inclusive) altitude range of stations to be read
+        start : optional
+            start time of data to be read (inclusive)
+        stop : optional
+            stop time of data to be read (inclusive)
+        **kwargs
+            additional keyword args passed to :func:`read_file` (e.g.
+            `invalidate_flags`)
 
         Returns
         -------
@@ -521,6 +772,9 @@ class ReadGhost(ReadUngriddedBase):
 
         files = files[first_file:last_file]
 
+        if start is not None or stop is not None:
+            files = self._filter_files_time(files, start, stop)
+
         data_obj = UngriddedData(num_points=1000000)
 
         meta_key = -1.0
@@ -541,13 +795,23 @@ class ReadGhost(ReadUngriddedBase):
             end = metafile["stop"]
 
             var_read = rename[var_to_read]
-            stats = self.read_file(_file, var_to_read=var_to_read, var_to_write=var_read, **kwargs)
+            stats = self.read_file(
+                _file,
+                var_to_read=var_to_read,
+                var_to_write=var_read,
+                station_names=station_names,
+                lat_range=lat_range,
+                lon_range=lon_range,
+                altitude_range=altitude_range,
+                start=start,
+                stop=stop,
+                **kwargs,
+            )
+            if len(stats) == 0:
+                logger.info(f"No data matching input constraints in file {_file}")
+                continue
 
             stats, added = self.compute_additional_vars(stats, vars_to_compute)
-            if len(stats) == 0:
-                logger.info(
-                    f"File {_file} does not contain any of the input variables {vars_to_retrieve}"
-                )
             vars_avail = [var_read] + added
             vars_to_add = list(np.intersect1d(vars_to_retrieve, vars_avail))
             if len(vars_to_add) == 0:
@@ -590,8 +854,8 @@ class ReadGhost(ReadUngriddedBase):
                 for j, var_to_write in enumerate(vars_to_add):
                     values = stat[var_to_write]
 
-                    start = idx + j * num_times
-                    stop = start + num_times
+                    row_start = idx + j * num_times
+                    row_stop = row_start + num_times
 
                     if not var_to_write in data_obj.var_idx:
                         var_count_glob += 1
@@ -603,23 +867,23 @@ class ReadGhost(ReadUngriddedBase):
                     meta["var_info"][var_to_write] = vi[var_to_write]
                     # write common meta info for this station (data lon, lat and
                     # altitude are set to station locations)
-                    data_obj._data[start:stop, data_obj._LATINDEX] = meta["latitude"]
-                    data_obj._data[start:stop, data_obj._LONINDEX] = meta["longitude"]
-                    data_obj._data[start:stop, data_obj._ALTITUDEINDEX] = meta["altitude"]
-                    data_obj._data[start:stop, data_obj._METADATAKEYINDEX] = meta_key
+                    data_obj._data[row_start:row_stop, data_obj._LATINDEX] = meta["latitude"]
+                    data_obj._data[row_start:row_stop, data_obj._LONINDEX] = meta["longitude"]
+                    data_obj._data[row_start:row_stop, data_obj._ALTITUDEINDEX] = meta["altitude"]
+                    data_obj._data[row_start:row_stop, data_obj._METADATAKEYINDEX] = meta_key
 
                     # write data to data object
-                    data_obj._data[start:stop, data_obj._TIMEINDEX] = timenums
+                    data_obj._data[row_start:row_stop, data_obj._TIMEINDEX] = timenums
 
-                    data_obj._data[start:stop, data_obj._DATAINDEX] = values
+                    data_obj._data[row_start:row_stop, data_obj._DATAINDEX] = values
 
                     # add invalid measurements
                     invalid = stat["data_flagged"][var_to_write]
-                    data_obj._data[start:stop, data_obj._DATAFLAGINDEX] = invalid
+                    data_obj._data[row_start:row_stop, data_obj._DATAFLAGINDEX] = invalid
 
-                    data_obj._data[start:stop, data_obj._VARINDEX] = var_idx
+                    data_obj._data[row_start:row_stop, data_obj._VARINDEX] = var_idx
 
-                    meta_idx[meta_key][var_to_write] = np.arange(start, stop)
+                    meta_idx[meta_key][var_to_write] = np.arange(row_start, row_stop)
 
                 idx += totnum
 
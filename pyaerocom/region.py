@@ -7,7 +7,7 @@ import numpy as np
 
 from pyaerocom._lowlevel_helpers import BrowseDict
 from pyaerocom.config import ALL_REGION_NAME
-from pyaerocom.helpers_landsea_masks import get_mask_value, load_region_mask_xr
+from pyaerocom.helpers_landsea_masks import get_mask_values, load_region_mask_xr
 from pyaerocom.region_defs import HTAP_REGIONS  # list of HTAP regions
 from pyaerocom.region_defs import REGION_DEFS  # all region definitions
 from pyaerocom.region_defs import OLD_AEROCOM_REGIONS, REGION_NAMES  # custom names (dict)
@@ -161,6 +161,37 @@ class Region(BrowseDict):
             lon_ok = False  # safeguard
         return lat_ok * lon_ok
 
+    def contains_coordinates(self, lats, lons):
+        """Check which of multiple lat/lon coordinates are contained in region
+
+        Vectorised version of :func:`contains_coordinate`.
+
+        Parameters
+        ----------
+        lats : array-like
+            latitudes of coordinates
+        lons : array-like
+            longitudes of coordinates
+
+        Returns
+        -------
+        ndarray
+            boolean array, True for coordinates that are contained in this
+            region
+        """
+        lats = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons = np.atleast_1d(np.asarray(lons, dtype=float))
+        lat_lb, lat_ub = self.lat_range
+        lon_lb, lon_ub = self.lon_range
+        lat_ok = (lats >= lat_lb) & (lats <= lat_ub)
+        if lon_lb < lon_ub:
+            lon_ok = (lons >= lon_lb) & (lons <= lon_ub)
+        elif lon_ub < lon_lb:  # longitude range crosses the dateline
+            lon_ok = (lons < lon_ub) | (lons > lon_lb)
+        else:
+            lon_ok = np.zeros(lons.shape, dtype=bool)
+        return lat_ok & lon_ok
+
     def mask_available(self):
         if not self.is_htap():
             return False
@@ -176,10 +207,7 @@ class Region(BrowseDict):
     def plot_mask(self, ax, color, alpha=0.2):
 
         mask = self.get_mask_data()
-        # import numpy as np
-        data = mask.data
-        data[data == 0] = np.nan
-        mask.data = data
+        mask = mask.where(mask != 0)
 
         mask.plot(ax=ax)
         return ax
@@ -347,21 +375,51 @@ def get_regions_coord(lat, lon, regions=None):
     list
         list of regions that contain this coordinate
     """
-    matches = []
+    return get_regions_coords([lat], [lon], regions)[0]
+
+
+def get_regions_coords(lats, lons, regions=None):
+    """Get the regions that contain each of multiple input coordinates
+
+    Vectorised version of :func:`get_regions_coord`: the ocean mask is loaded
+    only once and sampled for all coordinates at once and the region bounding
+    boxes are checked for all coordinates at once.
+
+    Parameters
+    ----------
+    lats : array-like
+        latitudes of coordinates
+    lons : array-like
+        longitudes of coordinates
+    regions : dict, optional
+        dictionary containing instances of :class:`Region` as values, which
+        are considered. If None, then all default regions are used.
+
+    Returns
+    -------
+    list
+        for each input coordinate, list of regions that contain the coordinate
+    """
+    lats = np.atleast_1d(np.asarray(lats, dtype=float))
+    lons = np.atleast_1d(np.asarray(lons, dtype=float))
     if regions is None:
         regions = get_all_default_regions()
     ocean_mask = load_region_mask_xr("OCN")
-    on_ocean = get_mask_value(lat, lon, ocean_mask)
+    on_ocean = get_mask_values(lats, lons, ocean_mask)
+    on_ocean = np.where(np.isnan(on_ocean), False, on_ocean.astype(bool))
+    matches = [[] for _ in range(len(lats))]
     for rname, reg in regions.items():
         if rname == ALL_REGION_NAME:  # always True for ALL_REGION_NAME
             continue
         # OCN needs special handling determined by the rname, not hardcoded to return OCN b/c of HTAP issues
-        if reg.contains_coordinate(lat, lon) and not on_ocean:
-            matches.append(rname)
-        if rname == "OCN" and on_ocean:
-            matches.append(rname)
-    if len(matches) == 0:
-        matches.append(ALL_REGION_NAME)
+        contained = reg.contains_coordinates(lats, lons) & ~on_ocean
+        if rname == "OCN":
+            contained |= on_ocean
+        for idx in np.flatnonzero(contained):
+            matches[idx].append(rname)
+    for match in matches:
+        if len(match) == 0:
+            match.append(ALL_REGION_NAME)
     return matches
 
 
@@ -393,3 +451,33 @@ def find_closest_region_coord(
     matches.sort(key=lambda id: regions[id].distance_to_center(lat, lon))
 
     return matches
+
+
+def find_closest_region_coords(lats, lons, regions=None):
+    """Finds regions sorted by their center closest to each of multiple coordinates
+
+    Vectorised version of :func:`find_closest_region_coord`.
+
+    Parameters
+    ----------
+    lats : array-like
+        latitudes of coordinates
+    lons : array-like
+        longitudes of coordinates
+    regions : dict, optional
+        dictionary containing instances of :class:`Region` as values, which
+        are considered. If None, then all default regions are used.
+
+    Returns
+    -------
+    list[list[str]]
+        for each input coordinate, sorted list of region IDs of identified
+        regions
+    """
+    if regions is None:
+        regions = get_all_default_regions()
+    all_matches = get_regions_coords(lats, lons, regions)
+    for lat, lon, matches in zip(lats, lons, all_matches):
+        if len(matches) > 1:
+            matches.sort(key=lambda id: regions[id].distance_to_center(lat, lon))
+    return all_matches
@@ -177,11 +177,6 @@ class TimeResampler:
         if how is None:
             how = "mean"
 
-        if how in self.AGGRS_UNIT_PRESERVE:
-            self._last_units_preserved = True
-        else:
-            self._last_units_preserved = False
-
         if not isinstance(to_ts_type, TsType):
             to_ts_type = TsType(to_ts_type)
 
@@ -202,44 +197,82 @@ class TimeResampler:
 
         self.last_setup = dict(min_num_obs=min_num_obs, how=how)
 
-        if from_ts_type is None:  # native == unknown
-            freq = to_ts_type.to_pandas_freq()
-            data_out = self.fun(self.input_data, freq=freq, how=how, **kwargs)
-        elif to_ts_type > from_ts_type:
-            raise TemporalResolutionError(
-                f"Cannot resample time-series from {from_ts_type} to {to_ts_type}"
-            )
-        elif to_ts_type == from_ts_type:
+        if from_ts_type is not None and to_ts_type == from_ts_type:
             logger.info(
                 f"Input time frequency {to_ts_type.val} equals current frequency of data. "
                 f"Resampling will be applied anyways which will introduce NaN values "
                 f"at missing time stamps"
             )
 
-            freq = to_ts_type.to_pandas_freq()
+        data_out = self.input_data
+        aggrs = []
+        for to_ts_type, mno, rshow in self.get_resampling_steps(
+            to_ts_type, from_ts_type, how, min_num_obs
+        ):
+            freq = TsType(to_ts_type).to_pandas_freq()
+            if mno is None:
+                data_out = self.fun(data_out, freq=freq, how=rshow, **kwargs)
+            else:
+                data_out = self.fun(data_out, freq=freq, how=rshow, min_num_obs=mno, **kwargs)
+            aggrs.append(rshow)
+
+        if all([x in self.AGGRS_UNIT_PRESERVE for x in aggrs]):
             self._last_units_preserved = True
-            data_out = self.fun(self.input_data, freq=freq, how="mean", **kwargs)
+        else:
+            self._last_units_preserved = False
+        return data_out
+
+    def get_resampling_steps(self, to_ts_type, from_ts_type=None, how=None, min_num_obs=None):
+        """Get the resampling steps applied in :func:`resample`
+
+        Parameters
+        ----------
+        to_ts_type : str or TsType
+            output resolution
+        from_ts_type : str or TsType, optional
+            current temporal resolution of data (None if unknown)
+        how : str or dict
+            aggregator(s) to be used, default is mean
+        min_num_obs : dict or int, optinal
+            resampling constraints (see :func:`resample`)
+
+        Raises
+        ------
+        TemporalResolutionError
+            if `to_ts_type` is higher resolution than `from_ts_type`
+        ValueError
+            if the input resampling constraints are invalid
+
+        Returns
+        -------
+        list
+            list of 3-element tuples for each resampling step, containing
+            the frequency to which the current is converted, the minimum
+            number of not-NaN values required for that step (None if no
+            constraint is applied) and the aggregator to be used.
+        """
+        if how is None:
+            how = self.DEFAULT_HOW
+        if not isinstance(to_ts_type, TsType):
+            to_ts_type = TsType(to_ts_type)
+        if str(from_ts_type) == "native":
+            from_ts_type = None
+        elif isinstance(from_ts_type, str):
+            from_ts_type = TsType(from_ts_type)
 
+        if from_ts_type is None:  # native == unknown
+            return [(to_ts_type.val, None, how)]
+        elif to_ts_type > from_ts_type:
+            raise TemporalResolutionError(
+                f"Cannot resample time-series from {from_ts_type} to {to_ts_type}"
+            )
+        elif to_ts_type == from_ts_type:
+            return [(to_ts_type.val, None, "mean")]
         elif min_num_obs is None:
-            freq = to_ts_type.to_pandas_freq()
             if not isinstance(how, str):
                 raise ValueError(
                     f"Temporal resampling without constraints can only use string type "
                     f"argument how (e.g. how=mean). Got {how}"
                 )
-
-            data_out = self.fun(self.input_data, freq=freq, how=how, **kwargs)
-        else:
-            _idx = self._gen_idx(from_ts_type, to_ts_type, min_num_obs, how)
-            data_out = self.input_data
-            aggrs = []
-            for to_ts_type, mno, rshow in _idx:
-                freq = TsType(to_ts_type).to_pandas_freq()
-                data_out = self.fun(data_out, freq=freq, how=rshow, min_num_obs=mno, **kwargs)
-                aggrs.append(rshow)
-
-            if all([x in self.AGGRS_UNIT_PRESERVE for x in aggrs]):
-                self._last_units_preserved = True
-            else:
-                self._last_units_preserved = False
-        return data_out
+            return [(to_ts_type.val, None, how)]
+        return self._gen_idx(from_ts_type, to_ts_type, min_num_obs, how)
@@ -20,7 +20,7 @@ from pyaerocom.exceptions import (
     TimeMatchError,
     VarNotAvailableError,
 )
-from pyaerocom.geodesy import get_country_info_coords
+from pyaerocom.geodesy import get_country_info_coords, haversine
 from pyaerocom.helpers import (
     isnumeric,
     merge_station_data,
@@ -875,6 +875,48 @@ class UngriddedData:
             else single instance of StationData. All variable time series are
             inserted as pandas Series
         """
+        return self._to_station_data(
+            meta_idx,
+            vars_to_convert,
+            start,
+            stop,
+            freq=freq,
+            ts_type_preferred=ts_type_preferred,
+            merge_if_multi=merge_if_multi,
+            merge_pref_attr=merge_pref_attr,
+            merge_sort_by_largest=merge_sort_by_largest,
+            insert_nans=insert_nans,
+            allow_wildcards_station_name=allow_wildcards_station_name,
+            add_meta_keys=add_meta_keys,
+            resample_how=resample_how,
+            min_num_obs=min_num_obs,
+        )
+
+    def _to_station_data(
+        self,
+        meta_idx,
+        vars_to_convert=None,
+        start=None,
+        stop=None,
+        freq=None,
+        ts_type_preferred=None,
+        merge_if_multi=True,
+        merge_pref_attr=None,
+        merge_sort_by_largest=True,
+        insert_nans=False,
+        allow_wildcards_station_name=True,
+        add_meta_keys=None,
+        resample_how=None,
+        min_num_obs=None,
+        var_blocks=None,
+    ):
+        """Convert data from one station to :class:`StationData` (helper method)
+
+        See :func:`to_station_data` for input parameters. If `var_blocks` is
+        provided (output from :func:`_get_var_blocks`), then the data rows of
+        the metadata blocks are taken from these (cf.
+        :func:`_metablock_to_stationdata`).
+        """
         if isinstance(vars_to_convert, str):
             vars_to_convert = [vars_to_convert]
         elif vars_to_convert is None:
@@ -902,7 +944,12 @@ class UngriddedData:
         for idx in meta_idx:
             try:
                 stat = self._metablock_to_stationdata(
-                    idx, vars_to_convert, start, stop, add_meta_keys
+                    idx,
+                    vars_to_convert,
+                    start,
+                    stop,
+                    add_meta_keys,
+                    var_blocks=None if var_blocks is None else var_blocks.get(idx, {}),
                 )
                 if ts_type_preferred is not None:
                     if "ts_type" in stat["var_info"][vars_to_convert[0]].keys():
@@ -999,11 +1046,15 @@ class UngriddedData:
     ### TODO: check if both `variables` and `var_info` attrs are required in
     ### metdatda blocks
     def _metablock_to_stationdata(
-        self, meta_idx, vars_to_convert, start=None, stop=None, add_meta_keys=None
+        self, meta_idx, vars_to_convert, start=None, stop=None, add_meta_keys=None, var_blocks=None
     ):
         """Convert one metadata index to StationData (helper method)
 
-        See :func:`to_station_data` for input parameters
+        See :func:`to_station_data` for input parameters. If `var_blocks` is
+        provided (dict with data rows of this metadata block for each variable,
+        already filtered by start / stop and sorted by time, cf.
+        :func:`_get_var_blocks`), then these are used instead of extracting
+        the rows from the data array.
         """
         if add_meta_keys is None:
             add_meta_keys = []
@@ -1068,23 +1119,28 @@ class UngriddedData:
         FOUND_ONE = False
         for var in vars_avail:
 
-            # get indices of this variable
-            var_idx = self.meta_idx[meta_idx][var]
+            if var_blocks is None:
+                # get indices of this variable
+                var_idx = self.meta_idx[meta_idx][var]
 
-            # vector of timestamps corresponding to this variable
-            dtime = self._data[var_idx, self._TIMEINDEX].astype("datetime64[s]")
+                # vector of timestamps corresponding to this variable
+                dtime = self._data[var_idx, self._TIMEINDEX].astype("datetime64[s]")
 
-            # get subset
-            subset = self._data[var_idx]
+                # get subset
+                subset = self._data[var_idx]
 
-            # make sure to extract only valid timestamps
-            if start is None:
-                start = dtime.min()
-            if stop is None:
-                stop = dtime.max()
+                # make sure to extract only valid timestamps
+                if start is None:
+                    start = dtime.min()
+                if stop is None:
+                    stop = dtime.max()
 
-            # create access mask for valid time stamps
-            tmask = np.logical_and(dtime >= start, dtime <= stop)
+                # create access mask for valid time stamps
+                tmask = np.logical_and(dtime >= start, dtime <= stop)
+            else:
+                subset = var_blocks.get(var, self._data[:0])
+                dtime = subset[:, self._TIMEINDEX].astype("datetime64[s]")
+                tmask = np.ones(len(subset), dtype=bool)
 
             # make sure there is some valid data
             if tmask.sum() == 0:
@@ -1226,12 +1282,31 @@ class UngriddedData:
         """
         out_data = {"stats": [], "station_name": [], "latitude": [], "failed": [], "longitude": []}
 
+        # the data rows of all stations are extracted and sorted at once
+        # (rather than for each station individually in to_station_data)
+        if isinstance(vars_to_convert, str):
+            vars_to_convert = [vars_to_convert]
+        elif vars_to_convert is None:
+            vars_to_convert = self.contains_vars
+        if start is None and stop is None:
+            _start, _stop = pd.Timestamp("1970"), pd.Timestamp("2200")
+        else:
+            _start, _stop = start_stop(start, stop)
+        var_blocks = self._get_var_blocks(
+            vars_to_convert, np.datetime64(_start), np.datetime64(_stop)
+        )
+
+        if by_station_name:
+            station_meta_indices = {}
+            for meta_key, meta in self.metadata.items():
+                station_meta_indices.setdefault(meta.get("station_name"), []).append(meta_key)
+
         _iter = self._generate_station_index(by_station_name, ignore_index)
         for idx in _iter:
 
             try:
-                data = self.to_station_data(
-                    idx,
+                data = self._to_station_data(
+                    station_meta_indices[idx] if by_station_name else idx,
                     vars_to_convert,
                     start,
                     stop,
@@ -1239,6 +1314,7 @@ class UngriddedData:
                     merge_if_multi=True,
                     allow_wildcards_station_name=False,
                     ts_type_preferred=ts_type_preferred,
+                    var_blocks=var_blocks,
                     **kwargs,
                 )
 
@@ -1258,6 +1334,57 @@ class UngriddedData:
                 out_data["failed"].append([idx, repr(e)])
         return out_data
 
+    def _get_var_blocks(self, vars_to_convert, start, stop):
+        """Extract time sorted data rows of all metadata blocks and variables
+
+        The rows of all metadata blocks and input variables within start /
+        stop are extracted and sorted by (metadata block, variable, time) at
+        once, the returned blocks are views of the sorted array.
+
+        Parameters
+        ----------
+        vars_to_convert : list
+            variables to be extracted
+        start : numpy.datetime64
+            start time
+        stop : numpy.datetime64
+            stop time
+
+        Returns
+        -------
+        dict
+            nested dictionary (like :attr:`meta_idx`) containing the time
+            sorted data rows (2D array) for each metadata key and variable.
+            Blocks without data in the time interval are not included.
+        """
+        rows, block_ids, block_keys = [], [], []
+        for meta_key, var_idx in self.meta_idx.items():
+            for var in vars_to_convert:
+                if var in var_idx:
+                    idx = var_idx[var]
+                    rows.append(idx)
+                    block_ids.append(np.full(len(idx), len(block_keys)))
+                    block_keys.append((meta_key, var))
+        if len(rows) == 0:
+            return {}
+        rows = np.concatenate(rows).astype(int)
+        block_ids = np.concatenate(block_ids)
+
+        dtime = self._data[rows, self._TIMEINDEX].astype("datetime64[s]")
+        tmask = np.logical_and(dtime >= start, dtime <= stop)
+        rows, block_ids, dtime = rows[tmask], block_ids[tmask], dtime[tmask]
+
+        # lexsort is stable, i.e. rows with same time stamp keep their order
+        order = np.lexsort((dtime, block_ids))
+        data = self._data[rows[order]]
+        bounds = np.searchsorted(block_ids[order], np.arange(len(block_keys) + 1))
+
+        var_blocks = {}
+        for i, (meta_key, var) in enumerate(block_keys):
+            if bounds[i + 1] > bounds[i]:
+                var_blocks.setdefault(meta_key, {})[var] = data[bounds[i] : bounds[i + 1]]
+        return var_blocks
+
     # TODO: check more general cases (i.e. no need to convert to StationData
     # if no time conversion is required)
     def get_variable_data(
@@ -2543,7 +2670,8 @@ class UngriddedData:
         dict
             dictionary where keys are meta_indices of the common station in
             this object and corresponding values are meta indices of the
-            station in the other object
+            station in the other object (the first match, if the station
+            occurs more than once in the other object)
 
         """
         if len(self.contains_datasets) > 1:
@@ -2576,53 +2704,70 @@ class UngriddedData:
                     f"Invalid input for check_vars_available. "
                     f"Need str or list-like, got: {check_vars_available}"
                 )
-        lat_len = 111.0  # approximate length of latitude degree in km
-        station_map = {}
-        stations_other = other.station_name
-        for meta_idx, meta in self.metadata.items():
-            name = meta["station_name"]
-            # bool that is used to accelerate things
+
+        def _has_vars(meta):
+            if not _check_vars:
+                return True
             ok = True
-            if _check_vars:
-                for var in check_vars_available:
-                    try:
-                        if not var in meta["variables"]:
-                            logger.debug(f"No {var} in data of station {name} ({meta['data_id']})")
-                            ok = False
-                    except Exception:  # attribute does not exist or is not iterable
+            for var in check_vars_available:
+                try:
+                    if not var in meta["variables"]:
+                        logger.debug(
+                            f"No {var} in data of station {meta['station_name']} "
+                            f"({meta['data_id']})"
+                        )
                         ok = False
-            if ok and name in stations_other:
-                for meta_idx_other, meta_other in other.metadata.items():
-                    if meta_other["station_name"] == name:
-                        if _check_vars:
-                            for var in check_vars_available:
-                                try:
-                                    if not var in meta_other["variables"]:
-                                        logger.debug(
-                                            f"No {var} in data of station {name} ({meta_other['data_id']})"
-                                        )
-                                        ok = False
-                                except Exception:  # attribute does not exist or is not iterable
-                                    ok = False
-                        if ok and check_coordinates:
-                            dlat = abs(meta["latitude"] - meta_other["latitude"])
-                            dlon = abs(meta["longitude"] - meta_other["longitude"])
-                            lon_fac = np.cos(np.deg2rad(meta["latitude"]))
-                            # compute distance between both station coords
-                            dist = np.linalg.norm((dlat * lat_len, dlon * lat_len * lon_fac))
-                            if dist > max_diff_coords_km:
-                                logger.warning(
-                                    f"Coordinate of station {name} "
-                                    f"varies more than {max_diff_coords_km} km "
-                                    f"between {meta['data_id']} and {meta_other['data_id']} data. "
-                                    f"Retrieved distance: {dist:.2f} km "
-                                )
-                                ok = False
-                        if ok:  # match found
-                            station_map[meta_idx] = meta_idx_other
-                            logger.debug(f"Found station match {name}")
-                            # no need to further iterate over the rest
-                            continue
+                except Exception:  # attribute does not exist or is not iterable
+                    ok = False
+            return ok
+
+        # candidates in other object for each station name
+        candidates_other = {}
+        for meta_idx_other, meta_other in other.metadata.items():
+            if _has_vars(meta_other):
+                name = meta_other["station_name"]
+                candidates_other.setdefault(name, []).append(meta_idx_other)
+
+        pairs = []
+        for meta_idx, meta in self.metadata.items():
+            name = meta["station_name"]
+            if name in candidates_other and _has_vars(meta):
+                pairs.extend((meta_idx, idx_other) for idx_other in candidates_other[name])
+
+        if check_coordinates and len(pairs) > 0:
+            # compute distances between all candidate pairs at once
+            coords = np.asarray(
+                [
+                    (
+                        self.metadata[i]["latitude"],
+                        self.metadata[i]["longitude"],
+                        other.metadata[j]["latitude"],
+                        other.metadata[j]["longitude"],
+                    )
+                    for i, j in pairs
+                ],
+                dtype=float,
+            )
+            dists = haversine(*coords.T)
+        else:
+            dists = np.zeros(len(pairs))
+
+        station_map = {}
+        for (meta_idx, meta_idx_other), dist in zip(pairs, dists):
+            if meta_idx in station_map:
+                # use first match
+                continue
+            if dist > max_diff_coords_km:
+                meta, meta_other = self.metadata[meta_idx], other.metadata[meta_idx_other]
+                logger.warning(
+                    f"Coordinate of station {meta['station_name']} "
+                    f"varies more than {max_diff_coords_km} km "
+                    f"between {meta['data_id']} and {meta_other['data_id']} data. "
+                    f"Retrieved distance: {dist:.2f} km "
+                )
+                continue
+            station_map[meta_idx] = meta_idx_other
+            logger.debug(f"Found station match {self.metadata[meta_idx]['station_name']}")
 
         return station_map
 
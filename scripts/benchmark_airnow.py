@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+benchmark of reading AirNow data files and conversion into StationData objects
+
+Writes a synthetic year (by default) of hourly AirNow data files and compares
+the previous implementation (object arrays read file by file and converted
+station by station, cf. :func:`read_files_object` and
+:func:`filedata_to_statlist_loop` below) with the typed (and parallel) file
+reading in ReadAirNow._read_files and the group-by based conversion in
+ReadAirNow._filedata_to_statlist.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from pyaerocom.io.helpers import iter_read_files
+from pyaerocom.io.read_airnow import ReadAirNow
+
+VARS = ["vmro3", "concpm25"]
+
+
+def write_synthetic_data(data_dir, num_stations, num_days, vars_to_write=VARS, seed=42):
+    """Write station metadata file and one data file per hour"""
+    rng = np.random.default_rng(seed)
+    stat_ids = [f"US{i:07d}" for i in range(num_stations)]
+    timezones = rng.integers(-10, -4, num_stations)
+    meta = pd.DataFrame(
+        {
+            "aqsid": stat_ids,
+            "name": [f"Station {i}" for i in range(num_stations)],
+            "lat": rng.uniform(25, 50, num_stations),
+            "lon": rng.uniform(-125, -65, num_stations),
+            "elevation": rng.uniform(0, 2000, num_stations),
+            "city": "City",
+            "address": "Address",
+            "timezone": "America/New_York",
+            "environment": "URBAN",
+            "populationclass": "URBAN",
+            "modificationdate": "20191224",
+            "comment": "",
+        }
+    )
+    meta.to_csv(os.path.join(data_dir, ReadAirNow.STAT_METADATA_FILENAME), index=False)
+
+    units = {"vmro3": "PPB", "concpm25": "UG/M3"}
+    file_dir = os.path.join(data_dir, "2020")
+    os.makedirs(file_dir, exist_ok=True)
+    times = pd.date_range("2020-01-01", periods=num_days * 24, freq="H")
+    for tstamp in times:
+        lines = []
+        date, hour = tstamp.strftime("%m/%d/%y"), tstamp.strftime("%H:%M")
+        for var in vars_to_write:
+            vals = rng.uniform(0, 100, num_stations).round(1)
+            var_in_file = ReadAirNow.VAR_MAP[var]
+            for stat_id, tz, val in zip(stat_ids, timezones, vals):
+                lines.append(
+                    f"{date}|{hour}|{stat_id}|Station|{tz}|{var_in_file}|{units[var]}|{val}|Agency"
+                )
+        fname = os.path.join(file_dir, f"{tstamp.strftime('%Y%m%d%H')}.dat")
+        with open(fname, "w") as f:
+            f.write("\n".join(lines))
+
+
+def read_files_object(reader, files, vars_to_retrieve):
+    """Read data files into object arrays (reference implementation)"""
+    varcol = reader.FILE_COL_NAMES.index("variable")
+    vars_in_file = [reader.VAR_MAP[var] for var in vars_to_retrieve]
+    arrs = []
+    for file in files:
+        arr = pd.read_csv(file, sep=reader.FILE_COL_DELIM, names=reader.FILE_COL_NAMES).values
+        arrs.append(arr[np.isin(arr[:, varcol], vars_in_file)])
+    return arrs
+
+
+def read_files_typed(reader, files, vars_in_file):
+    """Read data files into typed DataFrames (as in ReadAirNow._read_files)"""
+    return iter_read_files(
+        reader,
+        "_read_file_typed",
+        files,
+        [vars_in_file] * len(files),
+        max_files_per_task=reader.MAX_FILES_PER_TASK,
+    )
+
+
+def filedata_to_statlist_loop(reader, arrs, vars_to_retrieve):
+    """Station by station conversion of file data (reference implementation)"""
+    data = np.concatenate(arrs)
+    stat_meta = reader.station_metadata
+    cols = reader.FILE_COL_NAMES
+    varcol, statcol = cols.index("variable"), cols.index("station_id")
+    tzonecol, unitcol, valcol = cols.index("time_zone"), cols.index("unit"), cols.index("value")
+
+    dtime = np.vectorize(reader._date_time_str_to_datetime64)(data[:, 0], data[:, 1])
+    stats = []
+    for var in vars_to_retrieve:
+        mask = data[:, varcol] == reader.VAR_MAP[var]
+        subset = data[mask]
+        dtime_subset = dtime[mask]
+        for stat_id in np.unique(subset[:, statcol]):
+            if not stat_id in stat_meta:
+                continue
+            statmask = subset[:, statcol] == stat_id
+            statdata = subset[statmask]
+            timestamps = dtime_subset[statmask]
+            toffs = statdata[:, tzonecol].astype(int).astype("timedelta64[h]")
+            stat = reader.station_metadata[stat_id].copy()
+            stat["dtime"] = timestamps + toffs
+            stat[var] = statdata[:, valcol]
+            stat["unit"] = reader.UNIT_MAP[statdata[0, unitcol]]
+            stats.append(stat)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark of AirNow file reading and conversion")
+    parser.add_argument("--data-dir", help="directory with (synthetic) AirNow data")
+    parser.add_argument("--stations", help="number of synthetic stations", type=int, default=300)
+    parser.add_argument("--days", help="number of days of synthetic data", type=int, default=365)
+    parser.add_argument("--num-workers", help="number of processes", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_dir = args.data_dir
+        if data_dir is None:
+            data_dir = tmp_dir
+            print(f"Writing {args.days * 24} synthetic hourly files for {args.stations} stations")
+            write_synthetic_data(data_dir, args.stations, args.days)
+
+        reader = ReadAirNow(data_dir=data_dir)
+        # load station metadata up front so that it is not included in the timings
+        reader._init_station_metadata()
+        files = reader.get_file_list()
+        vars_in_file = [reader.VAR_MAP[var] for var in VARS]
+
+        start = time.perf_counter()
+        arrs = read_files_object(reader, files, VARS)
+        t_object = time.perf_counter() - start
+        nbytes_object = sum(
+            arr.nbytes + sum(sys.getsizeof(x) for x in arr[0]) * len(arr) for arr in arrs
+        )
+
+        start = time.perf_counter()
+        filedata = list(read_files_typed(reader, files, vars_in_file))
+        t_typed = time.perf_counter() - start
+        nbytes_typed = sum(df.memory_usage(deep=True).sum() for df in filedata)
+
+        reader.num_workers = args.num_workers
+        start = time.perf_counter()
+        list(read_files_typed(reader, files, vars_in_file))
+        t_parallel = time.perf_counter() - start
+
+        print(
+            f"Reading {len(files)} files ({sum(len(x) for x in arrs)} rows): "
+            f"object arrays: {t_object:.2f} s (~{nbytes_object / 1e6:.0f} MB), "
+            f"typed: {t_typed:.2f} s ({nbytes_typed / 1e6:.0f} MB), "
+            f"typed ({args.num_workers} processes): {t_parallel:.2f} s"
+        )
+
+        start = time.perf_counter()
+        stats_loop = filedata_to_statlist_loop(reader, arrs, VARS)
+        t_loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stats = reader._filedata_to_statlist(filedata, VARS)
+        t_group = time.perf_counter() - start
+
+        assert len(stats) == len(stats_loop)
+        for stat, ref in zip(stats, stats_loop):
+            var = list(stat.var_info)[0]
+            assert stat.station_id == ref["station_id"]
+            np.testing.assert_array_equal(stat.dtime, ref["dtime"])
+            np.testing.assert_array_equal(stat[var], ref[var].astype(float))
+            assert stat.var_info[var]["units"] == ref["unit"]
+        print(
+            f"Conversion into {len(stats)} StationData objects: per station: {t_loop:.2f} s, "
+            f"group-by: {t_group:.2f} s, speedup: {t_loop / t_group:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+benchmark of the data block parsers of EbasNasaAmesFile
+
+Compares the row by row parser (EbasNasaAmesFile._parse_data_lines) with the
+bulk parser (EbasNasaAmesFile._parse_data_block) that is used by default in
+EbasNasaAmesFile.read_file. By default, the EBAS files of the pyaerocom
+test dataset (testdata-minimal) are used.
+"""
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+
+from pyaerocom import const
+from pyaerocom.io.ebas_nasa_ames import EbasNasaAmesFile
+
+default_filedir = os.path.join(const.OUTPUTDIR, "testdata-minimal/obsdata/EBASMultiColumn/data")
+
+
+def read_data_lines(file):
+    """Read header of file and return lines of data block"""
+    head = EbasNasaAmesFile(file, only_head=True)
+    with open(file) as f:
+        lines = f.readlines()
+    return head, lines[head.num_head_lines :]
+
+
+def time_parser(parser, lines, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        data = parser(lines)
+    return (time.perf_counter() - start) / repeat, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark of EBAS NASA Ames data parsers")
+    parser.add_argument("files", help="NASA Ames file(s) to read", nargs="*")
+    parser.add_argument("--repeat", help="number of repetitions per file", type=int, default=5)
+    args = parser.parse_args()
+
+    files = args.files
+    if not files:
+        files = sorted(glob.glob(os.path.join(default_filedir, "*.nas")))
+    if not files:
+        raise SystemExit(f"No NASA Ames files found in {default_filedir}")
+
+    tot_lines, tot_block = 0.0, 0.0
+    for file in files:
+        head, lines = read_data_lines(file)
+        t_lines, data_lines = time_parser(head._parse_data_lines, lines, args.repeat)
+        t_block, data_block = time_parser(head._parse_data_block, lines, args.repeat)
+        np.testing.assert_array_equal(data_lines, data_block)
+        tot_lines += t_lines
+        tot_block += t_block
+        print(
+            f"{os.path.basename(file)}: {data_block.shape}, "
+            f"per line: {t_lines * 1e3:.2f} ms, bulk: {t_block * 1e3:.2f} ms, "
+            f"speedup: {t_lines / t_block:.1f}"
+        )
+    print(
+        f"\nTotal ({len(files)} files): per line: {tot_lines:.3f} s, bulk: {tot_block:.3f} s, "
+        f"speedup: {tot_lines / tot_block:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+benchmark of the evaluation of GHOST data flags
+
+Writes a synthetic GHOST NetCDF file (hourly data of one month) and compares
+the evaluation of invalid data points via :func:`numpy.apply_along_axis` and
+ReadGhost._eval_flags_slice (previous implementation) with the vectorised
+evaluation in ReadGhost._eval_flags.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from pyaerocom.plugins.ghost.reader import ReadGhost
+
+
+def write_synthetic_file(path, num_stations, num_qa_codes=10, num_flag_codes=10, seed=42):
+    """Write GHOST-like NetCDF file with random flags"""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range("2018-10-01", "2018-10-31T23:00", freq="H")
+    shape = (num_stations, len(times))
+    # GHOST flags are stored as uint8, unused flag slots are filled with 255
+    qa = rng.choice(np.arange(140, dtype=np.uint8), size=(*shape, num_qa_codes))
+    qa[rng.random(qa.shape) < 0.7] = 255
+    flag = rng.choice(np.arange(100, dtype=np.uint8), size=(*shape, num_flag_codes))
+    flag[rng.random(flag.shape) < 0.7] = 255
+    ds = xr.Dataset(
+        {
+            "sconco3": (("station", "time"), rng.uniform(0, 100, shape)),
+            "qa": (("station", "time", "N_qa_codes"), qa),
+            "flag": (("station", "time", "N_flag_codes"), flag),
+        },
+        coords={"station": np.arange(num_stations), "time": times},
+    )
+    ds.to_netcdf(path)
+
+
+def eval_flags_apply_along_axis(reader, vardata, invalidate_flags, ds):
+    """Flag evaluation point by point (reference implementation)"""
+    valid = np.ones(vardata.shape, dtype=bool)
+    for flagvar in reader.FLAG_VARS:
+        invalidate = invalidate_flags.get(flagvar)
+        if invalidate is None:
+            continue
+        flags = ds[flagvar]
+        slice_dim = flags.dims.index(reader.FLAG_DIMNAMES[flagvar])
+        valid *= np.apply_along_axis(reader._eval_flags_slice, slice_dim, flags.values, invalidate)
+    return ~valid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark of GHOST flag evaluation")
+    parser.add_argument("--stations", help="number of synthetic stations", type=int, default=100)
+    args = parser.parse_args()
+
+    reader = ReadGhost.__new__(ReadGhost)
+    invalidate_flags = dict(
+        qa=ReadGhost.DEFAULT_FLAGS_INVALID["qa"], flag=np.arange(10, dtype=np.uint8)
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "sconco3_201810.nc")
+        write_synthetic_file(path, args.stations)
+        with xr.open_dataset(path) as ds:
+            vardata = ds["sconco3"]
+            print(f"Synthetic GHOST file: {dict(ds.dims)}")
+
+            start = time.perf_counter()
+            invalid_ref = eval_flags_apply_along_axis(reader, vardata, invalidate_flags, ds)
+            t_ref = time.perf_counter() - start
+
+            start = time.perf_counter()
+            invalid = reader._eval_flags(vardata, invalidate_flags, ds)
+            t_new = time.perf_counter() - start
+
+    np.testing.assert_array_equal(invalid, invalid_ref)
+    print(
+        f"{invalid.sum()} of {invalid.size} data points invalid, "
+        f"apply_along_axis: {t_ref:.2f} s, vectorised: {t_new * 1e3:.1f} ms, "
+        f"speedup: {t_ref / t_new:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+benchmark of the computation of AeroVal statistics time series
+
+Creates synthetic colocated station data (by default, 20 years of monthly
+data at 2000 stations) and compares the previous implementation of
+_process_statistics_timeseries (one filtered ColocatedData object per output
+period and region, cf. :func:`process_statistics_timeseries_loop` below) with
+the grouped computation in
+:func:`pyaerocom.aeroval.coldatatojson_helpers._process_statistics_timeseries`.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from pyaerocom import ColocatedData, TsType
+from pyaerocom.aeroval.coldatatojson_helpers import (
+    _get_jsdate,
+    _init_data_default_frequencies,
+    _prep_stats_json,
+    _process_statistics_timeseries,
+)
+from pyaerocom.exceptions import DataCoverageError
+from pyaerocom.region_defs import OLD_AEROCOM_REGIONS
+
+
+def make_coldata(num_stations, num_years, seed=42):
+    """Synthetic monthly colocated station data with gaps"""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range("2000-01-01", periods=num_years * 12, freq="MS") + pd.Timedelta(14, "D")
+    obs = rng.lognormal(size=(len(times), num_stations))
+    mod = obs * rng.lognormal(0.1, 0.3, size=obs.shape)
+    obs[rng.random(obs.shape) < 0.2] = np.nan
+    arr = xr.DataArray(
+        np.stack([obs, mod]),
+        dims=("data_source", "time", "station_name"),
+        coords=dict(
+            data_source=["obs", "mod"],
+            time=times,
+            station_name=[f"station{i}" for i in range(num_stations)],
+            latitude=("station_name", rng.uniform(-80, 80, num_stations)),
+            longitude=("station_name", rng.uniform(-180, 180, num_stations)),
+        ),
+        attrs=dict(ts_type="monthly", resample_how=None, min_num_obs=None, colocate_time=False),
+    )
+    return ColocatedData(arr)
+
+
+def process_statistics_timeseries_loop(data, freq, region_ids, data_freq):
+    """One ColocatedData object per period and region (reference implementation)"""
+    coldata = data[data_freq]
+    to_idx = data[freq].data.time.values
+    tstr = TsType(freq).to_numpy_freq()
+    to_idx_str = [str(x) for x in to_idx.astype(f"datetime64[{tstr}]")]
+    jsdate = _get_jsdate(to_idx)
+    output = {}
+    for regid, regname in region_ids.items():
+        output[regname] = {}
+        try:
+            subset = coldata.filter_region(region_id=regid)
+        except DataCoverageError:
+            continue
+        for per, js in zip(to_idx_str, jsdate):
+            arr = ColocatedData(subset.data.sel(time=per))
+            output[regname][str(js)] = _prep_stats_json(arr.calc_statistics())
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark of statistics time series")
+    parser.add_argument("--stations", help="number of synthetic stations", type=int, default=2000)
+    parser.add_argument("--years", help="number of years of monthly data", type=int, default=20)
+    parser.add_argument("--freq", help="output frequency", default="monthly")
+    args = parser.parse_args()
+
+    coldata = make_coldata(args.stations, args.years)
+    data = _init_data_default_frequencies(coldata, ["monthly", "yearly"])
+    region_ids = {reg: reg for reg in OLD_AEROCOM_REGIONS}
+    print(f"Synthetic colocated data: {dict(coldata.data.sizes)}, {len(region_ids)} regions")
+
+    start = time.perf_counter()
+    ref = process_statistics_timeseries_loop(data, args.freq, region_ids, "monthly")
+    t_loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = _process_statistics_timeseries(data, args.freq, region_ids, False, False, "monthly")
+    t_grouped = time.perf_counter() - start
+
+    assert result.keys() == ref.keys()
+    for regname, stats_ts in ref.items():
+        assert result[regname].keys() == stats_ts.keys()
+        for js, stats in stats_ts.items():
+            assert result[regname][js] == pytest.approx(stats, rel=1e-10, nan_ok=True)
+    num = sum(len(x) for x in result.values())
+    print(
+        f"{num} {args.freq} statistics: per period: {t_loop:.2f} s, "
+        f"grouped: {t_grouped:.2f} s, speedup: {t_loop / t_grouped:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
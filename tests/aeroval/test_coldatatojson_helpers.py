@@ -19,6 +19,7 @@ from pyaerocom.aeroval.coldatatojson_helpers import (
     _write_stationdata_json,
     get_stationfile_name,
 )
+from pyaerocom.aeroval.json_output import JSONOutputBuffer
 from pyaerocom.region import get_all_default_region_ids
 from pyaerocom.region_defs import (
     HTAP_REGIONS,
@@ -65,6 +66,27 @@ def test__write_site_data(tmp_path: Path):
     assert len(list(tmp_path.glob("*.json"))) == len(data)
 
 
+def test__write_site_data_buffered(tmp_path: Path):
+    data = [
+        dict(
+            model_name=f"model{n}",
+            station_name="stat1",
+            obs_name="obs1",
+            var_name_web="var1",
+            vert_code="Column",
+        )
+        for n in range(3)
+    ]
+    buffer = JSONOutputBuffer()
+    _write_site_data(data, str(tmp_path), buffer)
+    assert not list(tmp_path.glob("*.json"))
+    assert len(buffer) == 1
+
+    buffer.flush()
+    path = tmp_path / get_stationfile_name("stat1", "obs1", "var1", "Column")
+    assert json.loads(path.read_text()) == {x["model_name"]: x for x in data}
+
+
 def test__write_diurnal_week_stationdata_json(tmp_path: Path):
     data = dict(station_name="stat1", obs_name="obs1", var_name_web="var1", vert_code="Column")
     dirs = {"ts/diurnal": tmp_path}
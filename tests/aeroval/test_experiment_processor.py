@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import pickle
+
 import pytest
 
 from pyaerocom.aeroval.experiment_output import ExperimentOutput
 from pyaerocom.aeroval.experiment_processor import ExperimentProcessor
 from pyaerocom.aeroval.setupclasses import EvalSetup
+from pyaerocom.io.obsdata_cache import ObsDataCache
 from tests.conftest import geojson_unavail
 
 
@@ -43,3 +46,78 @@ def test_ExperimentProcessor_run_error(processor: ExperimentProcessor, kwargs: d
     with pytest.raises(KeyError) as e:
         processor.run(**kwargs)
     assert str(e.value) == error
+
+
+@pytest.mark.parametrize("cfg", ["cfgexp4"])
+def test_ExperimentProcessor__get_colocation_tasks(processor: ExperimentProcessor):
+    tasks = processor._get_colocation_tasks(
+        processor.cfg.model_cfg.keylist(), processor.cfg.obs_cfg.keylist(), None
+    )
+    assert tasks == [
+        ("TM5-AP3-CTRL", "AERONET-Sun", ["od550aer"]),
+        ("TM5-AP3-CTRL", "AERONET-SDA", ["od550aer"]),
+    ]
+
+
+def _fake_run_task(self, what, model_name, obs_name, var_list):
+    return [f"{model_name}_{obs_name}.nc"]
+
+
+@pytest.mark.parametrize("cfg", ["cfgexp4"])
+def test_ExperimentProcessor_run_parallel(processor: ExperimentProcessor, monkeypatch):
+    entries = []
+
+    def run_single_entry(self, model_name, obs_name, var_list, colocated_files=None):
+        entries.append((model_name, obs_name, colocated_files))
+
+    monkeypatch.setattr(ExperimentProcessor, "_run_task", _fake_run_task)
+    monkeypatch.setattr(ExperimentProcessor, "_run_single_entry", run_single_entry)
+    processor.cfg.processing_opts.num_workers = 2
+    processor.run(update_interface=False)
+    assert entries == [
+        ("TM5-AP3-CTRL", "AERONET-Sun", ["TM5-AP3-CTRL_AERONET-Sun.nc"]),
+        ("TM5-AP3-CTRL", "AERONET-SDA", ["TM5-AP3-CTRL_AERONET-SDA.nc"]),
+        (
+            "TM5-AP3-CTRL",
+            "SDA-and-Sun",
+            {
+                "AERONET-Sun": ["TM5-AP3-CTRL_AERONET-Sun.nc"],
+                "AERONET-SDA": ["TM5-AP3-CTRL_AERONET-SDA.nc"],
+            },
+        ),
+    ]
+
+
+@pytest.mark.parametrize("cfg", ["cfgexp4"])
+def test_ExperimentProcessor_run_obs_data_cache(processor: ExperimentProcessor, monkeypatch):
+    caches = []
+
+    def run_single_entry(self, model_name, obs_name, var_list, colocated_files=None):
+        col = self.get_colocator(model_name, obs_name)
+        caches.append(col.obs_data_cache)
+
+    monkeypatch.setattr(ExperimentProcessor, "_run_single_entry", run_single_entry)
+    processor.cfg.processing_opts.obs_data_cache_max_gb = 2.0
+    processor.run(update_interface=False)
+    assert len(caches) == 3
+    assert isinstance(caches[0], ObsDataCache)
+    assert caches[0].max_size == 2e9
+    assert all(cache is caches[0] for cache in caches)
+    assert processor.obs_data_cache is None
+
+
+@pytest.mark.parametrize("cfg", ["cfgexp4"])
+def test_ExperimentProcessor__get_task_worker(processor: ExperimentProcessor):
+    processor.cfg.processing_opts.obs_data_cache_max_gb = 1.0
+    processor.obs_data_cache = processor._make_obs_data_cache()
+    worker = pickle.loads(pickle.dumps(processor._get_task_worker()))
+    assert worker.obs_data_cache is None
+    assert isinstance(processor.obs_data_cache, ObsDataCache)
+
+
+@pytest.mark.parametrize("cfg", ["cfgexp4"])
+def test_ExperimentProcessor__make_obs_data_cache(processor: ExperimentProcessor):
+    assert processor.cfg.processing_opts.obs_data_cache_max_gb == 0
+    assert processor._make_obs_data_cache() is None
+    processor.cfg.processing_opts.obs_data_cache_max_gb = 1.0
+    assert processor._make_obs_data_cache().max_size == 1e9
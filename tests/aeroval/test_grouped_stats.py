@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import xarray as xr
+
+from pyaerocom import ColocatedData, TsType
+from pyaerocom._warnings import ignore_warnings
+from pyaerocom.aeroval import grouped_stats
+from pyaerocom.aeroval.coldatatojson_helpers import (
+    _init_data_default_frequencies,
+    _prep_stats_json,
+    _select_period_season_coldata,
+)
+from pyaerocom.aeroval.grouped_stats import GroupedColdataStats
+from pyaerocom.exceptions import DataCoverageError, DataDimensionError, UnknownRegion
+from tests.fixtures.collocated_data import COLDATA
+
+
+@pytest.fixture(scope="module")
+def coldata_3d() -> ColocatedData:
+    return _init_data_default_frequencies(COLDATA["fake_3d"](), ["monthly"])["monthly"]
+
+
+@pytest.fixture(scope="module")
+def coldata_4d() -> ColocatedData:
+    return _init_data_default_frequencies(COLDATA["fake_4d"](), ["monthly"])["monthly"]
+
+
+def _calc_temporal_corr_median(coldata: ColocatedData) -> float:
+    """Reference implementation of median temporal correlation"""
+    if len(coldata.time) < 3:
+        return np.nan
+    elif coldata.has_latlon_dims:
+        coldata = coldata.flatten_latlondim_station_name()
+    obs_ok = coldata.data[0].count(dim="time") > 2
+    obs = coldata.data[0].where(obs_ok, drop=True)
+    mod = coldata.data[1].where(obs_ok, drop=True)
+    if obs.size == 0 or mod.size == 0:
+        return np.nan
+    corr_time = xr.corr(mod, obs, dim="time")
+    with ignore_warnings(RuntimeWarning, "Mean of empty slice", "All-NaN slice encountered"):
+        return np.nanmedian(corr_time.data)
+
+
+def _get_extended_stats(coldata: ColocatedData, use_weights: bool) -> dict:
+    """Reference implementation of group statistics based on filtered ColocatedData"""
+    stats = coldata.calc_statistics(use_area_weights=use_weights)
+    stats["R_spatial_mean"] = coldata.calc_spatial_statistics(
+        aggr="mean", use_area_weights=use_weights
+    )["R"]
+    stats["R_temporal_median"] = _calc_temporal_corr_median(coldata)
+    return _prep_stats_json(stats)
+
+
+def _check_stats(stats: dict, coldata: ColocatedData, region_id, period, season, use_weights):
+    subset = _select_period_season_coldata(coldata, period, season)
+    subset = subset.filter_region(region_id)
+    expected = _get_extended_stats(subset, use_weights)
+    assert stats.keys() == expected.keys()
+    for key, val in expected.items():
+        assert stats[key] == pytest.approx(val, rel=1e-12, nan_ok=True), key
+
+
+@pytest.mark.parametrize("region_id", ["ALL", "NHEMISPHERE", "SHEMISPHERE"])
+@pytest.mark.parametrize("period", ["2000-2019", "2010", "2005-2012"])
+@pytest.mark.parametrize("season", ["all", "DJF", "JJA"])
+def test_calc_stats_3d(coldata_3d: ColocatedData, region_id: str, period: str, season: str):
+    groups = GroupedColdataStats(coldata_3d)
+    stats = groups.calc_stats(region_id, period, season)
+    _check_stats(_prep_stats_json(stats), coldata_3d, region_id, period, season, False)
+
+
+@pytest.mark.parametrize("use_weights", [False, True])
+@pytest.mark.parametrize("region_id", ["ALL", "EUROPE"])
+@pytest.mark.parametrize("season", ["all", "DJF"])
+def test_calc_stats_4d(coldata_4d: ColocatedData, use_weights: bool, region_id: str, season: str):
+    groups = GroupedColdataStats(coldata_4d, use_weights=use_weights)
+    stats = groups.calc_stats(region_id, "2010", season)
+    _check_stats(_prep_stats_json(stats), coldata_4d, region_id, "2010", season, use_weights)
+
+
+@pytest.mark.parametrize(
+    "region_id,period,season,exception",
+    [
+        pytest.param("ALL", "1990", "all", DataCoverageError, id="no data in period"),
+        pytest.param("ALL", "2010", "bla", DataCoverageError, id="no data in season"),
+        pytest.param("EUROPE", "2010", "all", DataCoverageError, id="no data in region"),
+        pytest.param("bla", "2010", "all", UnknownRegion, id="unknown region"),
+    ],
+)
+def test_calc_stats_error(
+    coldata_3d: ColocatedData, region_id: str, period: str, season: str, exception
+):
+    groups = GroupedColdataStats(coldata_3d)
+    with pytest.raises(exception):
+        groups.calc_stats(region_id, period, season)
+    # errors are cached and raised again
+    with pytest.raises(exception):
+        groups.calc_stats(region_id, period, season)
+
+
+@pytest.mark.parametrize("max_batch_size", [2**22, 1, 500])
+@pytest.mark.parametrize("use_weights", [False, True])
+def test_calc_stats_many(
+    coldata_4d: ColocatedData, use_weights: bool, max_batch_size: int, monkeypatch
+):
+    monkeypatch.setattr(grouped_stats, "MAX_BATCH_SIZE", max_batch_size)
+    groups = GroupedColdataStats(coldata_4d, use_weights=use_weights)
+    keys = [
+        ("ALL", "2010", "all"),
+        ("EUROPE", "2010", "DJF"),
+        ("ALL", "1990", "all"),
+        ("ALL", "2010", "JJA"),
+    ]
+    result = groups.calc_stats_many(keys)
+    assert len(result) == len(keys)
+    assert result[2] is None
+    for (region_id, period, season), stats in zip(keys, result):
+        if stats is not None:
+            _check_stats(
+                _prep_stats_json(stats), coldata_4d, region_id, period, season, use_weights
+            )
+
+
+def test_calc_stats_many_unknown_region(coldata_3d: ColocatedData):
+    groups = GroupedColdataStats(coldata_3d)
+    with pytest.raises(UnknownRegion):
+        groups.calc_stats_many([("ALL", "2010", "all"), ("bla", "2010", "all")])
+
+
+def test_regional_timeseries(coldata_3d: ColocatedData):
+    groups = GroupedColdataStats(coldata_3d)
+    result = groups.regional_timeseries("NHEMISPHERE", "2000-2019", "all")
+    subset = _select_period_season_coldata(coldata_3d, "2000-2019", "all")
+    subset = subset.filter_region("NHEMISPHERE")
+    expected = subset.data.mean(dim="station_name")
+    np.testing.assert_allclose(result["obs"].values, expected[0].values)
+    np.testing.assert_allclose(result["mod"].values, expected[1].values)
+
+
+def test_unsupported_dims():
+    with pytest.raises(DataDimensionError):
+        GroupedColdataStats(COLDATA["fake_5d"]())
+
+
+def test_period_bounds(coldata_3d: ColocatedData):
+    groups = GroupedColdataStats(coldata_3d)
+    periods = np.array(["2009-12", "2010-01", "2030-01"], dtype="datetime64[M]")
+    tidx, bounds = groups.period_bounds(periods, "monthly")
+    assert len(tidx) == len(coldata_3d.time)
+    assert bounds.tolist() == [[119, 120], [120, 121], [240, 240]]
+    tidx, bounds = groups.period_bounds(np.array(["2010"], dtype="datetime64[Y]"), "yearly")
+    assert bounds.tolist() == [[120, 132]]
+
+
+@pytest.mark.parametrize("max_batch_size", [2**22, 1, 50])
+@pytest.mark.parametrize("region_id", ["ALL", "NHEMISPHERE"])
+@pytest.mark.parametrize("freq", ["monthly", "yearly"])
+def test_calc_stats_timeseries(
+    coldata_3d: ColocatedData, region_id: str, freq: str, max_batch_size: int, monkeypatch
+):
+    monkeypatch.setattr(grouped_stats, "MAX_BATCH_SIZE", max_batch_size)
+    groups = GroupedColdataStats(coldata_3d)
+    periods = coldata_3d.resample_time(freq, inplace=False).data.time.values
+    result = groups.calc_stats_timeseries(region_id, periods, freq)
+    assert len(result) == len(periods)
+
+    subset = coldata_3d.filter_region(region_id)
+    tstr = TsType(freq).to_numpy_freq()
+    for per, stats in zip(periods.astype(f"datetime64[{tstr}]"), result):
+        expected = ColocatedData(subset.data.sel(time=str(per))).calc_statistics()
+        assert stats.keys() == expected.keys()
+        for key, val in expected.items():
+            assert stats[key] == pytest.approx(val, rel=1e-12, nan_ok=True), key
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pyaerocom.aeroval.json_output import JSONOutputBuffer
+
+
+def test_JSONOutputBuffer(tmp_path: Path):
+    path = tmp_path / "test.json"
+    buffer = JSONOutputBuffer()
+    buffer.add_entry(path, ["model1"], dict(value=1.0))
+    buffer.add_entry(path, ["model2"], dict(value=2.0))
+    buffer.add_entry(path, ["model1"], dict(value=3.0))
+    assert len(buffer) == 1
+    assert buffer.files == [str(path)]
+    assert not path.exists()
+
+    buffer.flush()
+    assert len(buffer) == 0
+    assert json.loads(path.read_text()) == dict(model1=dict(value=3.0), model2=dict(value=2.0))
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize("lock", [False, True])
+def test_JSONOutputBuffer_update_existing(tmp_path: Path, lock: bool):
+    lock_dir = tmp_path / "locks"
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    path = out_dir / "test.json"
+    path.write_text(json.dumps(dict(var=dict(obs=dict(model1=dict(a=1.0), model2=dict(a=2.0))))))
+
+    with JSONOutputBuffer(lock=lock, lock_dir=str(lock_dir)) as buffer:
+        buffer.add_entry(path, ["var", "obs", "model2"], dict(b=float("nan")))
+        buffer.add_entry(path, ["var", "obs2", "model3"], dict(a=3.0))
+        buffer.add_entry(out_dir / "new.json", ["var"], [1, 2])
+
+    assert json.loads(path.read_text()) == dict(
+        var=dict(obs=dict(model1=dict(a=1.0), model2=dict(b=None)), obs2=dict(model3=dict(a=3.0)))
+    )
+    assert json.loads((out_dir / "new.json").read_text()) == dict(var=[1, 2])
+    assert sorted(p.name for p in out_dir.iterdir()) == ["new.json", "test.json"]
+    assert len(list(lock_dir.glob("*.lock"))) == (2 if lock else 0)
+
+
+def test_JSONOutputBuffer_error(tmp_path: Path):
+    with pytest.raises(ValueError, match="Need at least one key"):
+        JSONOutputBuffer().add_entry(tmp_path / "test.json", [], 42)
+
+
+def test_JSONOutputBuffer_use_orjson(tmp_path: Path):
+    pytest.importorskip("orjson")
+    path = tmp_path / "test.json"
+    with JSONOutputBuffer(use_orjson=True) as buffer:
+        buffer.add_entry(path, ["model1"], dict(value=[1e-5, float("nan")]))
+    assert path.read_text() == '{"model1":{"value":[0.00001,null]}}'
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+from pyaerocom import Colocator
+from pyaerocom.aeroval import EvalSetup
+from pyaerocom.aeroval.superobs_engine import SuperObsEngine
+
+
+@pytest.fixture
+def engine(tmp_path) -> SuperObsEngine:
+    """SuperObsEngine instance"""
+    model_cfg = dict(mod=dict(model_id="mod"))
+    obs_cfg = dict(obs1=dict(obs_id="obs1", obs_vars=["od550aer"], obs_vert_type="Column"))
+    setup = EvalSetup("bla", "blub", model_cfg=model_cfg, obs_cfg=obs_cfg)
+    setup.path_manager.coldata_basedir = str(tmp_path)
+    return SuperObsEngine(setup)
+
+
+def test_SuperObsEngine__get_coldata_fileinfo_colocated_files(engine: SuperObsEngine, monkeypatch):
+    def get_available_coldata_files(self, var_list=None):
+        raise AssertionError("colocated data directory must not be searched")
+
+    monkeypatch.setattr(Colocator, "get_available_coldata_files", get_available_coldata_files)
+    files = [
+        "od550aer_od550aer_MOD-mod_REF-obs1_20100101_20101231_monthly_WORLD-noMOUNTAINS.nc",
+        "ec550aer_ec550aer_MOD-mod_REF-obs1_20100101_20101231_daily_WORLD-noMOUNTAINS.nc",
+    ]
+    fp, ts_type, vert_code = engine._get_coldata_fileinfo(
+        "mod", "obs1", "od550aer", True, colocated_files=files
+    )
+    assert fp == files[0]
+    assert ts_type == "monthly"
+    assert vert_code == "Column"
+
+
+def test_SuperObsEngine__get_coldata_fileinfo_colocated_files_missing(engine: SuperObsEngine):
+    with pytest.raises(ValueError, match="failed or did not write any colocated data file"):
+        engine._get_coldata_fileinfo("mod", "obs1", "od550aer", True, colocated_files=[])
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pyaerocom.extras.satellite_l2.gridding import GridBinner
+from pyaerocom.griddeddata import GriddedData
+
+
+@pytest.fixture(scope="module")
+def points() -> dict:
+    rng = np.random.default_rng(42)
+    num = 10000
+    values = rng.normal(10, 2, num)
+    values[::7] = np.nan
+    return dict(
+        lats=rng.uniform(-90, 90, num),
+        lons=rng.uniform(-180, 180, num),
+        altitudes=rng.uniform(0, 3000, num),
+        values=values,
+        times=np.datetime64("2021-06-01") + rng.integers(0, 86400, num).astype("timedelta64[s]"),
+    )
+
+
+def loop_stats(binner: GridBinner, lats, lons, values) -> tuple[np.ndarray, ...]:
+    """reference implementation, looping over all grid cells"""
+    mean, std = np.full(binner.shape, np.nan), np.full(binner.shape, np.nan)
+    num = np.zeros(binner.shape, dtype=int)
+    for i, lat in enumerate(binner.lats):
+        for j, lon in enumerate(binner.lons):
+            mask = (
+                (lats >= lat - binner.lat_res / 2)
+                & (lats < lat + binner.lat_res / 2)
+                & (lons >= lon - binner.lon_res / 2)
+                & (lons < lon + binner.lon_res / 2)
+                & np.isfinite(values)
+            )
+            num[i, j] = mask.sum()
+            if num[i, j]:
+                mean[i, j], std[i, j] = np.mean(values[mask]), np.std(values[mask])
+    return num, mean, std
+
+
+@pytest.mark.parametrize(
+    "lat_range,lon_range,res", [((-90, 90), (-180, 180), 30), ((30, 82), (-30, 90), 4)]
+)
+def test_GridBinner(points: dict, lat_range, lon_range, res):
+    binner = GridBinner(res, res, lat_range, lon_range)
+    binner.add(points["lats"], points["lons"], dict(od550aer=points["values"]))
+    num, mean, std = loop_stats(binner, points["lats"], points["lons"], points["values"])
+    np.testing.assert_array_equal(binner.numobs("od550aer"), num)
+    np.testing.assert_allclose(binner.mean("od550aer"), mean)
+    np.testing.assert_allclose(binner.stddev("od550aer"), std, atol=1e-12)
+
+
+def test_GridBinner_incremental(points: dict):
+    binner = GridBinner(10, 10)
+    binner.add(points["lats"], points["lons"], dict(od550aer=points["values"]))
+    chunks = [GridBinner(10, 10), GridBinner(10, 10)]
+    for i, chunk in enumerate(np.array_split(np.arange(len(points["lats"])), 5)):
+        chunks[i % 2].add(
+            points["lats"][chunk],
+            points["lons"][chunk],
+            dict(od550aer=points["values"][chunk]),
+            times=points["times"][chunk],
+        )
+    chunks[0].merge(chunks[1])
+    np.testing.assert_array_equal(chunks[0].numobs("od550aer"), binner.numobs("od550aer"))
+    np.testing.assert_allclose(chunks[0].mean("od550aer"), binner.mean("od550aer"))
+    np.testing.assert_allclose(chunks[0].stddev("od550aer"), binner.stddev("od550aer"))
+    mean_time = points["times"].astype("datetime64[ms]").astype(float).mean()
+    assert chunks[0].mean_time == np.datetime64(int(round(mean_time)), "ms")
+
+
+@pytest.mark.parametrize(
+    "lats,lons,alts,cell_idx",
+    [
+        pytest.param([-90, 90, 0, 91, np.nan], [-180, 0, 180, 0, 0], None, [0, 6, 4, -1, -1]),
+        pytest.param(
+            [0, 0, 0, 0], [0, 0, 0, 0], [0, 1, 1000, 1001], [-1, 12, 12, 13], id="levels"
+        ),
+    ],
+)
+def test_GridBinner_cell_indices(lats, lons, alts, cell_idx):
+    level_bounds = None if alts is None else [0, 1000, 2000]
+    binner = GridBinner(90, 90, level_bounds=level_bounds)
+    np.testing.assert_array_equal(binner.cell_indices(lats, lons, alts), cell_idx)
+
+
+def test_GridBinner_min_num_obs():
+    binner = GridBinner(90, 90, min_num_obs=2)
+    binner.add([10, 10, -10], [10, 10, 10], dict(od550aer=[1, 3, 5]))
+    assert binner.mean("od550aer")[1, 2] == 2
+    assert np.isnan(binner.mean("od550aer")[0, 2])
+    assert binner.numobs("od550aer")[0, 2] == 1
+    out = binner.to_dict()
+    assert np.isnan(out["od550aer"]["numobs"][0, 2])
+
+
+def test_GridBinner_to_gridded_data(points: dict):
+    binner = GridBinner(10, 10, level_bounds=[0, 1000, 3000])
+    binner.add(
+        points["lats"],
+        points["lons"],
+        dict(ec532aer=points["values"]),
+        altitudes=points["altitudes"],
+        times=points["times"],
+    )
+    data = binner.to_gridded_data("ec532aer", units="1/Mm", ts_type="daily")
+    assert isinstance(data, GriddedData)
+    assert data.shape == (1, 18, 36, 2)
+    assert data.ts_type == "daily"
+    assert str(data.units) == "1/Mm"
+    np.testing.assert_allclose(data.cube.data[0], binner.mean("ec532aer"))
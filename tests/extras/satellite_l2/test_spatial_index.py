@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pyaerocom.extras.satellite_l2.spatial_index import PointCloudIndex
+from pyaerocom.geodesy import haversine
+
+
+@pytest.fixture(scope="module")
+def points() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(42)
+    lats, lons = rng.uniform(-90, 90, 20000), rng.uniform(-180, 180, 20000)
+    lats[::50] = np.nan
+    return lats, lons
+
+
+@pytest.mark.parametrize("max_dist", [1.0, 300.0, 5000.0])
+def test_PointCloudIndex_query_radius(points: tuple, max_dist: float):
+    lats, lons = points
+    index = PointCloudIndex(lats, lons)
+    assert len(index) == np.isfinite(lats).sum()
+    stat_lats, stat_lons = [49.093, -89.9, 0, lats[1]], [8.428, 0, 179.9, lons[1]]
+    matches, dists = index.query_radius(stat_lats, stat_lons, max_dist, return_distance=True)
+    assert len(matches) == len(dists) == 4
+    for lat, lon, idx, dist in zip(stat_lats, stat_lons, matches, dists):
+        all_dists = haversine(lat, lon, lats, lons)
+        np.testing.assert_array_equal(idx, np.flatnonzero(all_dists < max_dist))
+        np.testing.assert_allclose(dist, all_dists[idx])
+
+
+def test_PointCloudIndex_query_bbox(points: tuple):
+    lats, lons = points
+    index = PointCloudIndex(lats, lons)
+    idx = index.query_bbox(30, 80, -20, 70)
+    mask = (lats >= 30) & (lats <= 80) & (lons >= -20) & (lons <= 70)
+    np.testing.assert_array_equal(idx, np.flatnonzero(mask))
+    assert len(index.query_bbox()) == len(index)
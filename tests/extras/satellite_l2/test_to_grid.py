@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+pytest.importorskip("geopy")
+
+from pyaerocom.extras.satellite_l2 import aeolus_l2a, sentinel5p
+from pyaerocom.extras.satellite_l2.base_reader import ReadL2DataBase
+from pyaerocom.griddeddata import GriddedData
+from pyaerocom.ungriddeddata import UngriddedData
+
+
+class L2Reader(ReadL2DataBase):
+    """minimal satellite L2 reader with one variable"""
+
+    DEFAULT_VARS = ["od550aer"]
+    PROVIDES_VARIABLES = ["od550aer"]
+
+    def __init__(self):
+        super().__init__()
+        self.INDEX_DICT["od550aer"] = self._DATAINDEX01
+
+    def read_file(self, filename, vars_to_retrieve=None):
+        raise NotImplementedError
+
+
+# two points in grid cell (10.5, 20.5), one NaN and one in cell (-45.5, 100.5)
+LATS = [10.2, 10.7, 10.4, -45.5]
+LONS = [20.1, 20.9, 20.5, 100.5]
+TIMES = np.array(["2021-06-01T00", "2021-06-01T02", "2021-06-01T04", "2021-06-01T06"], "M8[ms]")
+
+
+def _cell(gridded: dict, lat: float, lon: float) -> tuple[int, int]:
+    return (
+        int(np.argmin(np.abs(gridded["latitude"] - lat))),
+        int(np.argmin(np.abs(gridded["longitude"] - lon))),
+    )
+
+
+@pytest.fixture
+def l2_data() -> UngriddedData:
+    data = UngriddedData(num_points=4)
+    reader = L2Reader()
+    data._data[:, reader._LATINDEX] = LATS
+    data._data[:, reader._LONINDEX] = LONS
+    data._data[:, reader._TIMEINDEX] = TIMES.astype(float)
+    data._data[:, reader._DATAINDEX01] = [1.0, 3.0, np.nan, 5.0]
+    return data
+
+
+def test_ReadL2DataBase_to_grid(l2_data: UngriddedData):
+    reader = L2Reader()
+    gridded, data_for_gridding = reader.to_grid(
+        l2_data, vars="od550aer", return_data_for_gridding=True
+    )
+    stats = gridded["od550aer"]
+    idx = _cell(gridded, 10.5, 20.5)
+    assert stats["mean"][idx] == 2
+    assert stats["numobs"][idx] == 2
+    assert stats["mean"][_cell(gridded, -45.5, 100.5)] == 5
+    assert np.nansum(stats["numobs"]) == 3
+    assert gridded["time"] == np.datetime64("2021-06-01T03", "ms")
+    np.testing.assert_array_equal(data_for_gridding["od550aer"][10.5][20.5], [1, 3, np.nan])
+
+    gridded_data = reader.to_grid(l2_data, vars="od550aer", return_gridded_data=True)
+    assert isinstance(gridded_data["od550aer"], GriddedData)
+    np.testing.assert_allclose(gridded_data["od550aer"].cube.data[0], stats["mean"])
+
+
+def test_ReadL2DataBase_to_grid_invalid_engine(l2_data: UngriddedData):
+    with pytest.raises(ValueError, match="Unsupported gridding engine"):
+        L2Reader().to_grid(l2_data, vars="od550aer", engine="fortran")
+
+
+@pytest.fixture
+def s5p_data() -> dict:
+    """2 scanlines x 2 ground pixels of Sentinel-5P data"""
+    delta_time = TIMES[::2].astype(float)
+    return dict(
+        scanline=np.arange(2),
+        ground_pixel=np.arange(2),
+        delta_time=delta_time,
+        latitude=np.array(LATS).reshape(2, 2),
+        longitude=np.array(LONS).reshape(2, 2),
+        tcolno2=np.array([[1.0, 3.0], [-2.0, 5.0]]),
+    )
+
+
+def test_sentinel5p_to_grid(s5p_data: dict):
+    reader = sentinel5p.ReadL2Data()
+    gridded, data_for_gridding = reader.to_grid(
+        s5p_data, vars="tcolno2", return_data_for_gridding=True
+    )
+    stats = gridded["tcolno2"]
+    # negative value is not used for gridding
+    assert stats["mean"][_cell(gridded, 10.5, 20.5)] == 2
+    assert stats["numobs"][_cell(gridded, 10.5, 20.5)] == 2
+    assert stats["mean"][_cell(gridded, -45.5, 100.5)] == 5
+    assert np.nansum(stats["numobs"]) == 3
+    np.testing.assert_array_equal(data_for_gridding["tcolno2"][10.5][20.5], [1, 3, np.nan])
+
+    gridded_data = reader.to_grid(s5p_data, vars="tcolno2", return_gridded_data=True)
+    np.testing.assert_allclose(gridded_data["tcolno2"].cube.data[0], stats["mean"])
+
+    with pytest.raises(ValueError, match="Unsupported gridding engine"):
+        reader.to_grid(s5p_data, vars="tcolno2", engine="fortran")
+
+
+def test_aeolus_to_grid():
+    reader = aeolus_l2a.ReadL2Data()
+    data = np.full((5, reader._COLNO), np.nan)
+    data[:, reader._LATINDEX] = [*LATS, 10.5]
+    data[:, reader._LONINDEX] = [*LONS, 20.5]
+    data[:, reader._ALTITUDEINDEX] = [500, 800, 1500, 2500, 1200]
+    data[:, reader._TIMEINDEX] = [*TIMES.astype(float), TIMES[0].astype(float)]
+    data[:, reader.INDEX_DICT["ec355aer"]] = [1.0, 3.0, -2.0, 5.0, 4.0]
+    grid_heights_low = np.array([0.0, 1000.0, 2000.0, 3000.0])
+    gridded, data_for_gridding = reader.to_grid(
+        data,
+        vars="ec355aer",
+        grid_heights_low=grid_heights_low,
+        grid_heights_high=grid_heights_low + 1000,
+        return_data_for_gridding=True,
+    )
+    stats = gridded["ec355aer"]
+    assert stats["mean"].shape == (180, 360, 3)
+    lat_idx, lon_idx = _cell(gridded, 10.5, 20.5)
+    # negative value in 2nd level is not used for gridding
+    np.testing.assert_array_equal(stats["mean"][lat_idx, lon_idx], [2, 4, np.nan])
+    np.testing.assert_array_equal(stats["numobs"][lat_idx, lon_idx], [2, 1, np.nan])
+    assert stats["mean"][(*_cell(gridded, -45.5, 100.5), 2)] == 5
+    np.testing.assert_array_equal(
+        gridded[reader._ALTBOUNDSNAME], [[0, 1000], [1000, 2000], [2000, 3000]]
+    )
+    np.testing.assert_array_equal(data_for_gridding["ec355aer"][10.5][20.5][1], [np.nan, 4])
+
+    with pytest.raises(ValueError, match="Unsupported gridding engine"):
+        reader.to_grid(data, vars="ec355aer", engine="fortran")
@@ -1,10 +1,14 @@
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from pyaerocom import UngriddedData
+from pyaerocom import UngriddedData, const
+from pyaerocom.exceptions import CacheReadError
 from pyaerocom.io import ReadAeronetSunV3
 from pyaerocom.io.cachehandler_ungridded import CacheHandlerUngridded
+from tests.fixtures.stations import create_fake_station_data
 
 
 @pytest.fixture(scope="module")
@@ -46,3 +50,196 @@ def test_reload(
     reloaded = cache_handler.loaded_data["od550aer"]
     assert isinstance(reloaded, UngriddedData)
     assert reloaded.shape == subset.shape
+
+
+def test_reload_npy(aeronetsunv3lev2_subset: UngriddedData, tmp_path: Path):
+    cache_handler = CacheHandlerUngridded(cache_format="npy")
+    path = tmp_path / "test_manual_caching.pkl"
+    cache_handler.write(aeronetsunv3lev2_subset, var_or_file_name=path.name, cache_dir=path.parent)
+    assert path.exists()
+    assert path.with_suffix(".npy").exists()
+
+    assert cache_handler.check_and_load(var_or_file_name=path.name, cache_dir=path.parent)
+    reloaded = cache_handler.loaded_data[path.name]
+    assert isinstance(reloaded._data, np.memmap)
+    np.testing.assert_array_equal(reloaded._data, aeronetsunv3lev2_subset._data)
+    assert reloaded.unique_station_names == aeronetsunv3lev2_subset.unique_station_names
+    assert reloaded.meta_idx.keys() == aeronetsunv3lev2_subset.meta_idx.keys()
+    for meta_key, idx in aeronetsunv3lev2_subset.meta_idx.items():
+        for var, var_idx in idx.items():
+            np.testing.assert_array_equal(reloaded.meta_idx[meta_key][var], var_idx)
+
+
+def test_reload_npy_missing_array_file(aeronetsunv3lev2_subset: UngriddedData, tmp_path: Path):
+    cache_handler = CacheHandlerUngridded(cache_format="npy")
+    path = tmp_path / "test_manual_caching.pkl"
+    cache_handler.write(aeronetsunv3lev2_subset, var_or_file_name=path.name, cache_dir=path.parent)
+    path.with_suffix(".npy").unlink()
+    with pytest.raises(CacheReadError):
+        cache_handler.check_and_load(var_or_file_name=path.name, cache_dir=path.parent)
+
+
+def test_invalid_cache_format():
+    with pytest.raises(ValueError):
+        CacheHandlerUngridded(cache_format="blub")
+
+
+@pytest.mark.parametrize("cache_format", ["pkl", "npy"])
+def test_reload_subset_station(
+    aeronetsunv3lev2_subset: UngriddedData, tmp_path: Path, cache_format: str
+):
+    cache_handler = CacheHandlerUngridded(cache_format=cache_format)
+    path = tmp_path / "test_manual_caching.pkl"
+    cache_handler.write(aeronetsunv3lev2_subset, var_or_file_name=path.name, cache_dir=path.parent)
+
+    station_name = aeronetsunv3lev2_subset.unique_station_names[0]
+    assert cache_handler.check_and_load(
+        var_or_file_name=path.name, cache_dir=path.parent, station_name=station_name
+    )
+    reloaded = cache_handler.loaded_subsets[path.name]
+    subset = aeronetsunv3lev2_subset.filter_by_meta(station_name=station_name)
+    assert reloaded.unique_station_names == [station_name]
+    assert reloaded.shape == subset.shape
+
+
+@pytest.mark.parametrize("cache_format", ["pkl", "npy"])
+def test_reload_subset_time(
+    aeronetsunv3lev2_subset: UngriddedData, tmp_path: Path, cache_format: str
+):
+    cache_handler = CacheHandlerUngridded(cache_format=cache_format)
+    path = tmp_path / "test_manual_caching.pkl"
+    cache_handler.write(aeronetsunv3lev2_subset, var_or_file_name=path.name, cache_dir=path.parent)
+
+    times = aeronetsunv3lev2_subset._data[:, UngriddedData._TIMEINDEX]
+    start, stop = np.percentile(times, [25, 75]).astype("datetime64[s]")
+    assert cache_handler.check_and_load(
+        var_or_file_name=path.name, cache_dir=path.parent, start=start, stop=stop
+    )
+    reloaded = cache_handler.loaded_subsets[path.name]
+    reloaded_times = reloaded._data[:, UngriddedData._TIMEINDEX].astype("datetime64[s]")
+    assert reloaded_times.min() >= start
+    assert reloaded_times.max() <= stop
+    assert reloaded.shape[0] == ((times >= np.float64(start)) & (times <= np.float64(stop))).sum()
+
+
+@pytest.fixture
+def two_var_data() -> UngriddedData:
+    """Single station with concpm10 (2010) and concpm25 (Jan-Mar 2010)"""
+    stat = create_fake_station_data(
+        "concpm10",
+        {"concpm10": {"units": "ug m-3"}},
+        10,
+        "2010-01-01",
+        "2010-12-31",
+        "d",
+        {"ts_type": "daily", "latitude": 42, "longitude": 20, "station_name": "FakeSite"},
+    )
+    stat.var_info["concpm25"] = {"units": "ug m-3"}
+    stat["concpm25"] = pd.Series(5.0, index=pd.date_range("2010-01-01", "2010-03-31", freq="d"))
+    data = UngriddedData.from_station_data(stat)
+    data.metadata[0.0]["variables"] = ["concpm10", "concpm25"]
+    return data
+
+
+@pytest.mark.parametrize("cache_format", ["pkl", "npy"])
+def test_reload_subset_drop_vars(two_var_data: UngriddedData, tmp_path: Path, cache_format: str):
+    cache_handler = CacheHandlerUngridded(cache_format=cache_format)
+    path = tmp_path / "test_manual_caching.pkl"
+    cache_handler.write(two_var_data, var_or_file_name=path.name, cache_dir=path.parent)
+
+    assert cache_handler.check_and_load(
+        var_or_file_name=path.name, cache_dir=path.parent, start="2010-06-01", stop="2010-06-30"
+    )
+    reloaded = cache_handler.loaded_subsets[path.name]
+    assert reloaded.contains_vars == ["concpm10"]
+    assert reloaded.metadata[0.0]["variables"] == ["concpm10"]
+    assert list(reloaded.metadata[0.0]["var_info"]) == ["concpm10"]
+    assert reloaded.shape[0] == 30
+    assert list(two_var_data.metadata[0.0]["var_info"]) == ["concpm10", "concpm25"]
+
+
+@pytest.mark.parametrize("cache_format", ["pkl", "npy"])
+@pytest.mark.parametrize("subset", [dict(start=2012), dict(station_name="Blub")])
+def test_reload_subset_empty(
+    two_var_data: UngriddedData, tmp_path: Path, cache_format: str, subset: dict
+):
+    cache_handler = CacheHandlerUngridded(cache_format=cache_format)
+    path = tmp_path / "test_manual_caching.pkl"
+    cache_handler.write(two_var_data, var_or_file_name=path.name, cache_dir=path.parent)
+
+    assert cache_handler.check_and_load(
+        var_or_file_name=path.name, cache_dir=path.parent, **subset
+    )
+    assert not path.name in cache_handler.loaded_data
+    assert cache_handler.loaded_subsets[path.name].is_empty
+
+
+@pytest.mark.parametrize("cache_format", ["pkl", "npy"])
+def test_reload_subset_station_nan_time(
+    two_var_data: UngriddedData, tmp_path: Path, cache_format: str
+):
+    two_var_data._data[:10, UngriddedData._TIMEINDEX] = np.nan
+    cache_handler = CacheHandlerUngridded(cache_format=cache_format)
+    path = tmp_path / "test_manual_caching.pkl"
+    cache_handler.write(two_var_data, var_or_file_name=path.name, cache_dir=path.parent)
+
+    assert cache_handler.check_and_load(
+        var_or_file_name=path.name, cache_dir=path.parent, station_name="FakeSite"
+    )
+    reloaded = cache_handler.loaded_subsets[path.name]
+    assert reloaded.shape[0] == two_var_data.shape[0]
+
+
+def test_src_dir_fingerprint(tmp_path: Path, monkeypatch):
+    src_dir = tmp_path / "data"
+    src_dir.mkdir()
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr(CacheHandlerUngridded, "src_data_dir", str(src_dir))
+    monkeypatch.setattr(const, "UNGRIDDED_CACHE_SRC_DIR_TTL", 0)
+    cache_handler = CacheHandlerUngridded(cache_dir=str(cache_dir))
+
+    (src_dir / "file1.txt").write_text("bla")
+    fingerprint = cache_handler.src_dir_fingerprint()
+    assert fingerprint["newest_file"] == "file1.txt"
+    assert fingerprint["num_files"] == 1
+    assert Path(cache_handler.fingerprint_file).exists()
+
+    # stored fingerprint is used if directory did not change
+    monkeypatch.setattr(cache_handler, "_scan_src_data_dir", None)
+    assert cache_handler.cache_meta_info()["newest_file_in_read_dir"] == "file1.txt"
+
+    monkeypatch.undo()
+    monkeypatch.setattr(CacheHandlerUngridded, "src_data_dir", str(src_dir))
+    (src_dir / "file2.txt").write_text("blub")
+    assert cache_handler.src_dir_fingerprint()["newest_file"] == "file2.txt"
+    assert cache_handler.rescan_src_data_dir()["num_files"] == 2
+
+
+def test_cache_meta_info_no_fingerprint(tmp_path: Path, monkeypatch):
+    src_dir = tmp_path / "data"
+    src_dir.mkdir()
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr(CacheHandlerUngridded, "src_data_dir", str(src_dir))
+    assert const.UNGRIDDED_CACHE_SRC_DIR_TTL is None
+    cache_handler = CacheHandlerUngridded(cache_dir=str(cache_dir))
+
+    (src_dir / "file1.txt").write_text("bla")
+    assert cache_handler.cache_meta_info()["newest_file_in_read_dir"] == "file1.txt"
+    (src_dir / "file2.txt").write_text("blub")
+    assert cache_handler.cache_meta_info()["newest_file_in_read_dir"] == "file2.txt"
+    assert not Path(cache_handler.fingerprint_file).exists()
+
+
+def test_src_dir_fingerprint_ttl(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(CacheHandlerUngridded, "src_data_dir", str(tmp_path))
+    monkeypatch.setattr(const, "UNGRIDDED_CACHE_SRC_DIR_TTL", 3600)
+    cache_handler = CacheHandlerUngridded(cache_dir=str(tmp_path))
+
+    (tmp_path / "file1.txt").write_text("bla")
+    assert cache_handler.src_dir_fingerprint()["newest_file"] == "file1.txt"
+    (tmp_path / "file2.txt").write_text("blub")
+    # directory is not checked within TTL
+    assert cache_handler.src_dir_fingerprint()["newest_file"] == "file1.txt"
+    assert cache_handler.src_dir_fingerprint(rescan=True)["newest_file"] == "file2.txt"
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import numpy as np
 import pytest
 
@@ -34,6 +36,36 @@ def test_EbasFlagCol_decoded(raw_data, decoded):
     assert (dc == decoded).all()
 
 
+@pytest.mark.parametrize(
+    "lines,expected",
+    [
+        ([], np.asarray([])),
+        (["0.0 0.5 1.2 0.0\n", "0.5 1.0 1.3 0.456\n"], [[0, 0.5, 1.2, 0], [0.5, 1, 1.3, 0.456]]),
+        # malformed row is skipped
+        (["0.0 0.5 1.2 0.0\n", "0.5 1.0 x 0.456\n"], [[0, 0.5, 1.2, 0]]),
+    ],
+)
+def test_EbasNasaAmesFile__parse_data_block(lines: list[str], expected):
+    data = EbasNasaAmesFile()._parse_data_block(lines)
+    np.testing.assert_array_equal(data, np.asarray(expected))
+    np.testing.assert_array_equal(data, EbasNasaAmesFile()._parse_data_lines(lines))
+
+
+def test_EbasNasaAmesFile__parse_data_block_ragged(monkeypatch):
+    # same total number of values as a regular 3x3 block
+    lines = ["0.0 0.5 1.2\n", "0.5 1.0\n", "1.0 1.5 1.7 0.1\n"]
+    monkeypatch.setattr(EbasNasaAmesFile, "_parse_data_lines", lambda self, lines: "row by row")
+    assert EbasNasaAmesFile()._parse_data_block(lines) == "row by row"
+
+
+def test_EbasFlagCol__invalid_flags_lookup():
+    lookup = EbasFlagCol._invalid_flags_lookup()
+    assert lookup.shape == (1000,)
+    assert lookup[456] and lookup[999]
+    assert not lookup[0] and not lookup[660]
+    assert EbasFlagCol(np.asarray([0.456]))._invalid_flags_lookup() is lookup
+
+
 def test_NasaAmesHeader_NUM_FIXLINES(head):
     assert head._NUM_FIXLINES == 13
 
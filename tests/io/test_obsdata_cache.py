@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from pyaerocom import UngriddedData
+from pyaerocom.io.obsdata_cache import ObsDataCache
+from tests.fixtures.stations import create_fake_stationdata_list
+
+
+@pytest.fixture
+def ungridded_data() -> UngriddedData:
+    return UngriddedData.from_station_data(create_fake_stationdata_list())
+
+
+def test_make_key():
+    key = ObsDataCache.make_key(obs_id="obs", filters={"a": 1, "b": [1, 2]})
+    assert key == ObsDataCache.make_key(filters={"b": [1, 2], "a": 1}, obs_id="obs")
+    assert key != ObsDataCache.make_key(obs_id="obs", filters={"a": 1})
+
+
+def test_get_size(ungridded_data: UngriddedData):
+    assert ObsDataCache.get_size(ungridded_data) == ungridded_data._data.nbytes
+    assert ObsDataCache.get_size(np.ones(10)) == 80
+    assert ObsDataCache.get_size("blaaa") == 0
+
+
+def test_get_put(ungridded_data: UngriddedData):
+    cache = ObsDataCache(max_size=1e9)
+    assert cache.get("key") is None
+    assert cache.put("key", ungridded_data)
+    assert cache.get("key") is ungridded_data
+    assert "key" in cache
+    assert cache.size == ungridded_data._data.nbytes
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_eviction():
+    cache = ObsDataCache(max_size=200)
+    cache.put("a", np.ones(10))
+    cache.put("b", np.ones(10))
+    cache.get("a")
+    # b is least recently used
+    cache.put("c", np.ones(10))
+    assert list(cache._data) == ["a", "c"]
+    assert cache.size == 160
+    # too large to be cached
+    assert not cache.put("d", np.ones(100))
+    assert "d" not in cache
+    assert len(cache) == 2
@@ -153,6 +153,15 @@ def test__date_time_str_to_datetime64(reader: ReadAirNow):
     assert str(dt) == "2020-10-23T13:55:00"
 
 
+def test__make_dtime_array(reader: ReadAirNow):
+    dates = np.array(["10/23/20", "10/24/20", "10/23/20", "01/01/21"], dtype=object)
+    times = np.array(["13:55", "00:00", "01:00", "13:55"], dtype=object)
+    dtime = reader._make_dtime_array(dates, times)
+    assert dtime.dtype == "datetime64[s]"
+    expected = [reader._date_time_str_to_datetime64(d, t) for d, t in zip(dates, times)]
+    np.testing.assert_array_equal(dtime, expected)
+
+
 @pytest.mark.parametrize(
     "filename,timestamp",
     [
@@ -233,12 +242,59 @@ def test_get_file_list(reader: ReadAirNow):
     assert [Path(f).name for f in files] == FILE_NAMES
 
 
-def test__read_file(reader: ReadAirNow):
+def test__read_file_typed_all_vars(reader: ReadAirNow):
     file = reader.get_file_list()[0]
-    data = reader._read_file(file)
+    vars_in_file = list(reader.VAR_MAP.values())
+    data = reader._read_file_typed(file, vars_in_file)
     assert isinstance(data, pd.DataFrame)
-    assert list(data.columns) == reader.FILE_COL_NAMES
-    assert data.values.shape == (14979, 9)
+    assert list(data.columns) == list(reader.FILE_COL_DTYPES)
+    assert 0 < len(data) <= 14979
+    assert data["variable"].isin(vars_in_file).all()
+
+
+@pytest.fixture
+def synthetic_reader(tmp_path: Path) -> ReadAirNow:
+    """reader with 3 synthetic hourly files of 2 stations"""
+    for hour in range(3):
+        lines = [
+            f"01/01/20|0{hour}:00|A|Station A|-5|OZONE|PPB|{hour}.5|inst",
+            f"01/01/20|0{hour}:00|B|Station B|1|OZONE|PPB|{hour}|inst",
+            f"01/01/20|0{hour}:00|A|Station A|-5|PM2.5|UG/M3|{hour * 10}|inst",
+        ]
+        (tmp_path / f"202001010{hour}.dat").write_text("\n".join(lines))
+    reader = ReadAirNow(data_dir=str(tmp_path))
+    reader._station_metadata = {
+        stat_id: dict(station_id=stat_id, station_name=stat_id, data_id=reader.data_id)
+        for stat_id in ["A", "B"]
+    }
+    return reader
+
+
+def test__read_file_typed(synthetic_reader: ReadAirNow, tmp_path: Path):
+    df = synthetic_reader._read_file_typed(str(tmp_path / "2020010101.dat"), ["OZONE"])
+    assert list(df.columns) == list(synthetic_reader.FILE_COL_DTYPES)
+    assert list(df["station_id"]) == ["A", "B"]
+    assert df["station_id"].dtype == "category"
+    assert df["value"].dtype == float
+    assert list(df["value"]) == [1.5, 1.0]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test__read_files_num_workers(synthetic_reader: ReadAirNow, tmp_path: Path, num_workers: int):
+    synthetic_reader.num_workers = num_workers
+    files = sorted(str(x) for x in tmp_path.glob("*.dat"))
+    stats = synthetic_reader._read_files(files, ["vmro3", "concpm25"])
+    assert [(stat.station_id, list(stat.var_info)) for stat in stats] == [
+        ("A", ["vmro3"]),
+        ("B", ["vmro3"]),
+        ("A", ["concpm25"]),
+    ]
+    assert list(stats[0].vmro3) == [0.5, 1.5, 2.5]
+    assert [str(x) for x in stats[1].dtime] == [
+        "2020-01-01T01:00:00",
+        "2020-01-01T02:00:00",
+        "2020-01-01T03:00:00",
+    ]
 
 
 # This should test all variables available and reads the first 3 data files
@@ -360,6 +416,38 @@ def test__read_files_single_var(
     assert list(first_stat[var_name]) == first_vals
 
 
+def test__filedata_to_statlist(tmp_path: Path):
+    reader = ReadAirNow(data_dir=str(tmp_path))
+    reader._station_metadata = {
+        stat_id: dict(station_id=stat_id, station_name=stat_id, data_id=reader.data_id)
+        for stat_id in ["B", "A"]
+    }
+    rows = [
+        ["01/01/20", "01:00", "B", "B", -5, "OZONE", "PPB", 1.0, "inst"],
+        ["01/01/20", "01:00", "A", "A", 2, "PM2.5", "UG/M3", 2.0, "inst"],
+        ["01/01/20", "01:00", "A", "A", 2, "OZONE", "PPB", 3.0, "inst"],
+        ["01/01/20", "01:00", "C", "C", 0, "OZONE", "PPB", 4.0, "inst"],
+        ["01/01/20", "00:00", "A", "A", 2, "OZONE", "PPB", 5.0, "inst"],
+    ]
+    filedata = [
+        pd.DataFrame(rows[:3], columns=reader.FILE_COL_NAMES),
+        pd.DataFrame(rows[3:], columns=reader.FILE_COL_NAMES),
+    ]
+    filedata = [df[list(reader.FILE_COL_DTYPES)].astype(reader.FILE_COL_DTYPES) for df in filedata]
+    stats = reader._filedata_to_statlist(filedata, ["vmro3", "concpm25"])
+    # sorted by variable and station, station C has no metadata
+    assert [(stat.station_id, list(stat.var_info)) for stat in stats] == [
+        ("A", ["vmro3"]),
+        ("B", ["vmro3"]),
+        ("A", ["concpm25"]),
+    ]
+    # order of timestamps in files is maintained
+    assert [str(x) for x in stats[0].dtime] == ["2020-01-01T03:00:00", "2020-01-01T02:00:00"]
+    assert list(stats[0].vmro3) == [3.0, 5.0]
+    assert [str(x) for x in stats[1].dtime] == ["2019-12-31T20:00:00"]
+    assert stats[2].var_info["concpm25"]["units"] == "ug m-3"
+
+
 def test__read_files_single_var_error(reader: ReadAirNow):
 
     files = reader.get_file_list()
@@ -623,3 +623,27 @@ def test_read_error(reader: ReadEbas, ebas_files: list[Path]):
     with pytest.raises(DataCoverageError) as e:
         reader.read("ac550aer", files=ebas_files)
     assert str(e.value) == "UngriddedData object appears to be empty"
+
+
+@pytest.mark.parametrize(
+    "vars_to_retrieve,file_vars",
+    [
+        ("vmrno2", ["vmrno2", "concno2"]),
+        ("sc550dryaer", "sc550dryaer"),
+    ],
+)
+def test_read_parallel(vars_to_retrieve: str, ebas_files: list[Path]):
+    serial = ReadEbas("EBASSubset")
+    parallel = ReadEbas("EBASSubset")
+    parallel.num_workers = 2
+
+    data = serial.read(vars_to_retrieve, files=ebas_files)
+    data_parallel = parallel.read(vars_to_retrieve, files=ebas_files)
+
+    np.testing.assert_array_equal(data._data, data_parallel._data)
+    assert data.var_idx == data_parallel.var_idx
+    assert data.metadata.keys() == data_parallel.metadata.keys()
+    for meta_key, meta in data.metadata.items():
+        assert meta["station_name"] == data_parallel.metadata[meta_key]["station_name"]
+        assert meta["variables"] == data_parallel.metadata[meta_key]["variables"]
+    assert parallel.files_failed == serial.files_failed
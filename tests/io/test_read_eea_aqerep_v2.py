@@ -1,5 +1,12 @@
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import numpy as np
 import pytest
 
+from pyaerocom.exceptions import EEAv2FileError
 from pyaerocom.io import ReadEEAAQEREP_V2
 from pyaerocom.stationdata import StationData
 from pyaerocom.ungriddeddata import UngriddedData
@@ -60,3 +67,96 @@ def test_read(reader):
             assert stat_data[var_name].mean() == pytest.approx(
                 station_means[var_name][stat_idx], TEST_RTOL
             )
+
+
+HEADER = (
+    "Countrycode,Namespace,AirQualityNetwork,AirQualityStation,AirQualityStationEoICode,"
+    "SamplingPoint,SamplingProcess,Sample,AirPollutant,AirPollutantCode,AveragingTime,"
+    "Concentration,UnitOfMeasurement,DatetimeBegin,DatetimeEnd,Validity,Verification"
+)
+
+
+def _data_line(hour: int, value: str, validity: int = 1) -> str:
+    return (
+        f"AT,ns,NET.AT,STA.AT10002,AT10002,SPO,SPP,SAM,PM10,"
+        f"http://dd.eionet.europa.eu/vocabulary/aq/pollutant/5,hour,{value},µg/m3,"
+        f"2020-01-01 {hour:02d}:00:00 +01:00,2020-01-01 {hour + 1:02d}:00:00 +01:00,{validity},1"
+    )
+
+
+@pytest.fixture
+def eea_files(tmp_path: Path) -> dict[str, Path]:
+    """synthetic data files (unsorted in time, plain, gzipped and UTF-16)"""
+    lines = [_data_line(2, "3.5", -1), _data_line(0, "1.0"), _data_line(1, "", 1), "AT,bla"]
+    text = "\n".join([HEADER] + lines)
+    files = dict(
+        plain=tmp_path / "AT_5_1_timeseries.csv",
+        gz=tmp_path / "AT_5_2_timeseries.csv.gz",
+        utf16=tmp_path / "AT_5_3_timeseries.csv",
+    )
+    files["plain"].write_text(text, encoding="UTF-8")
+    files["utf16"].write_text(text, encoding="UTF-16")
+    with gzip.open(files["gz"], "wt", encoding="UTF-8") as f:
+        f.write(text)
+    metadata = (
+        "Countrycode\tAirQualityStation\tAirQualityStationEoICode\tAirPollutantCode\t"
+        "Longitude\tLatitude\tAltitude\tAirQualityStationType\tAirQualityStationArea\n"
+        "AT\tSTA.AT10002\tAT10002\thttp://dd.eionet.europa.eu/vocabulary/aq/pollutant/5\t"
+        "16.3\t48.2\t200\tbackground\turban\n"
+    )
+    (tmp_path / "metadata.csv").write_text(metadata)
+    return files
+
+
+@pytest.mark.parametrize("which", ["plain", "gz", "utf16"])
+def test_read_file(eea_files: dict[str, Path], which: str):
+    reader = ReadEEAAQEREP_V2(data_dir=str(eea_files[which].parent))
+    data = reader.read_file(str(eea_files[which]), "concpm10")
+    assert isinstance(data, StationData)
+    assert data.station_id == "STA.AT10002"
+    assert data["airpollutantcode"] == "5"
+    assert data.var_info["concpm10"]["units"] == "ug m-3"
+    # data is sorted in time (incl. all other columns)
+    assert [str(x) for x in data.dtime] == [
+        "2019-12-31T23:30:00",
+        "2020-01-01T00:30:00",
+        "2020-01-01T01:30:00",
+    ]
+    np.testing.assert_array_equal(data.concpm10, [1.0, np.nan, 3.5])
+    np.testing.assert_array_equal(data.validity, [1, 1, -1])
+
+
+@pytest.mark.parametrize(
+    "head,encoding",
+    [
+        (b"Countrycode,", "UTF-8"),
+        (b"\xef\xbb\xbfCountrycode", "utf-8-sig"),
+        (b"\xff\xfeC\x00o\x00", "UTF-16"),
+        (b"C\x00o\x00u\x00", "UTF-16-LE"),
+    ],
+)
+def test__detect_encoding(head: bytes, encoding: str):
+    assert ReadEEAAQEREP_V2._detect_encoding(head) == encoding
+
+
+def test_read_file_corrupt(tmp_path: Path):
+    path = tmp_path / "AT_5_1_timeseries.csv.gz"
+    path.write_bytes(b"no gzip")
+    reader = ReadEEAAQEREP_V2(data_dir=str(tmp_path))
+    with pytest.raises(EEAv2FileError):
+        reader.read_file(str(path), "concpm10")
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_read_num_workers(eea_files: dict[str, Path], tmp_path: Path, num_workers: int):
+    reader = ReadEEAAQEREP_V2(data_dir=str(tmp_path))
+    reader.num_workers = num_workers
+    files = [str(eea_files[which]) for which in ["plain", "gz", "utf16"]]
+    files.append(str(tmp_path / "corrupt_timeseries.csv.gz"))
+    Path(files[-1]).write_bytes(b"no gzip")
+    data = reader.read("concpm10", files=files)
+    assert len(data.metadata) == 3
+    assert data.metadata[1.0]["filename"] == files[1]
+    stat = data.to_station_data(0)
+    # invalid data is set to NaN
+    np.testing.assert_array_equal(stat.concpm10, [1.0, np.nan, np.nan])
@@ -103,6 +103,29 @@ def test_ReadUngridded_read_error():
     )
 
 
+@pytest.mark.parametrize(
+    "filters,start,stop,subset",
+    [
+        ({}, None, None, {}),
+        ({}, 2010, None, dict(start=2010)),
+        ({}, "2010-01-01", "2010-06-30", dict(start="2010-01-01", stop="2010-06-30")),
+        (dict(station_name="La_Paz"), None, None, dict(station_name="La_Paz")),
+        (dict(station_name=("La_Paz", "AAO*")), None, None, dict(station_name=["La_Paz", "AAO*"])),
+        (dict(station_name="La_*", negate=["station_name"]), None, None, {}),
+        (
+            dict(latitude=[30, 60], longitude=(-10, 40)),
+            None,
+            None,
+            dict(latitude=[30.0, 60.0], longitude=[-10.0, 40.0]),
+        ),
+        (dict(latitude=[30, 60], negate="latitude"), None, None, {}),
+        (dict(altitude=[1000, 10000], latitude=42), None, None, {}),
+    ],
+)
+def test_ReadUngridded__get_cache_subset(filters: dict, start, stop, subset: dict):
+    assert ReadUngridded._get_cache_subset(filters, start, stop) == subset
+
+
 def test_basic_attributes():
     reader = ReadUngridded()
     assert not reader.ignore_cache
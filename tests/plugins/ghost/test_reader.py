@@ -1,7 +1,9 @@
 from pathlib import Path
 
 import numpy as np
+import pandas as pd
 import pytest
+import xarray as xr
 
 from pyaerocom.plugins.ghost.reader import ReadGhost
 
@@ -16,6 +18,42 @@ def ghost_eea_hourly():
     return ReadGhost("G.EEA.hourly.Subset")
 
 
+@pytest.fixture(scope="module")
+def ghost_synthetic(tmp_path_factory) -> ReadGhost:
+    """reader for synthetic daily GHOST files (Oct. and Nov. 2018, 4 stations)"""
+    data_dir = tmp_path_factory.mktemp("ghost") / "daily"
+    (data_dir / "sconco3").mkdir(parents=True)
+    for month in ("2018-10", "2018-11"):
+        times = pd.date_range(month, periods=pd.Period(month).days_in_month, freq="D")
+        shape = (4, len(times))
+        qa = np.full((*shape, 2), 255, dtype=np.uint8)
+        qa[:, ::3, 0] = 6  # invalid
+        ds = xr.Dataset(
+            {
+                "sconco3": (
+                    ("station", "time"),
+                    np.arange(np.prod(shape)).reshape(shape) * 1.0,
+                    {"units": "nmol mol-1"},
+                ),
+                "qa": (("station", "time", "N_qa_codes"), qa),
+                "flag": (("station", "time", "N_flag_codes"), np.full((*shape, 1), 255, "u1")),
+                "station_name": ("station", ["Station A", "Station/B", "Station C", "Station D"]),
+                "latitude": ("station", [10.0, 20.0, 30.0, 40.0]),
+                "longitude": ("station", [-10.0, 0.0, 10.0, 20.0]),
+                "altitude": ("station", [0.0, 100.0, 200.0, 300.0]),
+                "measuring_instrument_name": ("station", ["instr"] * 4),
+                "network_provided_volume_standard_pressure": (
+                    "station",
+                    [1013.25] * 4,
+                    {"units": "hPa"},
+                ),
+            },
+            coords={"time": times},
+        )
+        ds.to_netcdf(data_dir / "sconco3" / f"sconco3_{month.replace('-', '')}.nc")
+    return ReadGhost(data_dir=str(data_dir))
+
+
 class TestReadGhost:
     PROVIDES_VARIABLES = [
         "concpm10",
@@ -170,3 +208,112 @@ class TestReadGhost:
         first_stat = data[0]
         assert isinstance(first_stat, dict)
         assert first_stat["meta"]["station_name"] == first_stat_name
+
+
+@pytest.mark.parametrize(
+    "flags,invalid_flags",
+    [
+        pytest.param(
+            np.random.default_rng(42).choice([0, 1, 2, 6, 7, 8, 255], (4, 5, 6)).astype(np.uint8),
+            [6, 7, 8],
+            id="uint8",
+        ),
+        pytest.param(
+            np.random.default_rng(42).choice([100, 101, 150], (4, 5, 6)).astype(np.uint8),
+            [1, 101, 255],
+            id="uint8 nonzero min",
+        ),
+        pytest.param(
+            np.random.default_rng(42).choice([0, 1, 2, np.nan], (4, 5, 6)),
+            [1],
+            id="float",
+        ),
+        pytest.param(np.zeros((4, 5, 6), dtype=np.uint8), [], id="no invalid flags"),
+    ],
+)
+@pytest.mark.parametrize("axis", [0, 2])
+def test__eval_flags_array(flags: np.ndarray, invalid_flags: list, axis: int):
+    invalid = ReadGhost._eval_flags_array(flags, invalid_flags, axis)
+    valid = np.apply_along_axis(ReadGhost._eval_flags_slice, axis, flags, invalid_flags)
+    assert invalid.shape == valid.shape
+    np.testing.assert_array_equal(invalid, ~valid)
+
+
+@pytest.mark.parametrize(
+    "constraints,stations,first,last",
+    [
+        pytest.param({}, [0, 1, 2, 3], "2018-10-01", "2018-10-31", id="no constraints"),
+        pytest.param(
+            dict(station_names=["Station D", "Station-B"]),
+            [1, 3],
+            "2018-10-01",
+            "2018-10-31",
+            id="station_names",
+        ),
+        pytest.param(
+            dict(lat_range=(15, 35), lon_range=(-5, 5)),
+            [1],
+            "2018-10-01",
+            "2018-10-31",
+            id="lat_range lon_range",
+        ),
+        pytest.param(
+            dict(lon_range=(15, -5)),
+            [0, 3],
+            "2018-10-01",
+            "2018-10-31",
+            id="lon_range across dateline",
+        ),
+        pytest.param(
+            dict(altitude_range=(150, 1000), start="2018-10-10", stop="2018-10-20"),
+            [2, 3],
+            "2018-10-10",
+            "2018-10-20",
+            id="altitude_range start stop",
+        ),
+        pytest.param(dict(station_names="Station E"), [], None, None, id="no station"),
+        pytest.param(dict(start="2018-11-01"), [], None, None, id="no time"),
+    ],
+)
+def test_read_file_constraints(
+    ghost_synthetic: ReadGhost, constraints: dict, stations: list, first, last
+):
+    file = sorted(ghost_synthetic.get_file_list("vmro3"))[0]
+    stats = ghost_synthetic.read_file(file, **constraints)
+    assert len(stats) == len(stations)
+    if not stations:
+        return
+    full = ghost_synthetic.read_file(file)
+    tslice = ghost_synthetic._find_time_slice(full[0]["time"], first, last)
+    for stat, idx in zip(stats, stations):
+        assert stat["meta"]["station_name"] == full[idx]["meta"]["station_name"]
+        assert stat["time"][0] == np.datetime64(first)
+        assert stat["time"][-1] == np.datetime64(last)
+        np.testing.assert_array_equal(stat["vmro3"], full[idx]["vmro3"][tslice])
+        np.testing.assert_array_equal(
+            stat["data_flagged"]["vmro3"], full[idx]["data_flagged"]["vmro3"][tslice]
+        )
+
+
+def test_read_constraints(ghost_synthetic: ReadGhost):
+    data = ghost_synthetic.read(
+        "vmro3", station_names="Station C", start="2018-10-25", stop="2018-11-05"
+    )
+    assert data.unique_station_names == ["Station C"]
+    times = data._data[:, data._TIMEINDEX].astype("datetime64[s]")
+    assert times[0] == np.datetime64("2018-10-25")
+    assert times[-1] == np.datetime64("2018-11-05")
+    assert len(times) == 12
+
+
+def test_read_file_scattered_stations(ghost_synthetic: ReadGhost, monkeypatch):
+    file = sorted(ghost_synthetic.get_file_list("vmro3"))[0]
+    stats = ghost_synthetic.read_file(file, station_names=["Station A", "Station C"])
+    monkeypatch.setattr(ReadGhost, "MAX_STATION_BLOCKS", 1)
+    stats_block = ghost_synthetic.read_file(file, station_names=["Station A", "Station C"])
+    assert [stat["meta"]["station_name"] for stat in stats_block] == ["Station A", "Station C"]
+    for stat, stat_block in zip(stats, stats_block):
+        np.testing.assert_array_equal(stat["vmro3"], stat_block["vmro3"])
+        np.testing.assert_array_equal(
+            stat["data_flagged"]["vmro3"], stat_block["data_flagged"]["vmro3"]
+        )
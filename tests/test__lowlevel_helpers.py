@@ -45,6 +45,18 @@ from pyaerocom._lowlevel_helpers import (
             dict(bla=pytest.approx(0.12345, 1e-5), blubb=1, ha="test"),
             id="mixed dict",
         ),
+        pytest.param(
+            [1.123456, np.float_(2.3456789), np.nan],
+            3,
+            [1.123, 2.346, pytest.approx(np.nan, nan_ok=True)],
+            id="float list",
+        ),
+        pytest.param(
+            dict(bla=np.array([0.1234567, 1.0]), blubb=np.arange(3), ha=np.array(["a"])),
+            5,
+            dict(bla=[0.12346, 1.0], blubb=[0, 1, 2], ha=["a"]),
+            id="dict of arrays",
+        ),
     ],
 )
 def test_round_floats(raw, precision: int, rounded):
@@ -102,6 +114,23 @@ def test_write_json(json_path: Path, data: dict, kwargs: dict):
     assert json_path.exists()
 
 
+def test_write_json_bulk_rounding(json_path: Path):
+    values = [0.123456789, 1e-5, 1.5e-5, -0.0, 2.5e7, 123.456785, np.nan]
+    data = {"list": values, "mixed": values + [1], "array": np.array(values)}
+    write_json(data, json_path, ignore_nan=True)
+    expected = "[0.12346, 1e-05, 2e-05, -0.0, 25000000.0, 123.45678, null"
+    assert json_path.read_text() == (
+        f'{{"list": {expected}], "mixed": {expected}, 1], "array": {expected}]}}'
+    )
+
+
+def test_write_json_orjson(json_path: Path):
+    pytest.importorskip("orjson")
+    data = {"bla": [0.123456789, np.nan], 42: np.float64(1e-5)}
+    write_json(data, json_path, use_orjson=True, ignore_nan=True)
+    assert json_path.read_text() == '{"bla":[0.12346,null],"42":0.00001}'
+
+
 def test_write_json_error(json_path: Path):
     with pytest.raises(TypeError) as e:
         write_json({"bla": 42}, json_path, bla=42)
@@ -9,6 +9,7 @@ from pyaerocom.colocateddata import ColocatedData
 from pyaerocom.colocation import (
     _colocate_site_data_helper,
     _colocate_site_data_helper_timecol,
+    _extract_site_data_nearest,
     _regrid_gridded,
     colocate_gridded_gridded,
     colocate_gridded_ungridded,
@@ -206,6 +207,62 @@ def test_colocate_gridded_ungridded(
     assert np.nanmean(coldata.data.data[1]) == pytest.approx(modmean, rel=TEST_RTOL)
 
 
+@pytest.mark.parametrize(
+    "addargs",
+    [
+        dict(filter_name=f"{ALL_REGION_NAME}-noMOUNTAINS", min_num_obs=const.OBS_MIN_NUM_RESAMPLE),
+        dict(filter_name=f"{ALL_REGION_NAME}-wMOUNTAINS"),
+        dict(ts_type="daily", min_num_obs=const.OBS_MIN_NUM_RESAMPLE),
+        dict(ts_type="yearly", resample_how="median"),
+    ],
+)
+def test_colocate_gridded_ungridded_array_engine(data_tm5, aeronetsunv3lev2_subset, addargs):
+    coldata = colocate_gridded_ungridded(data_tm5, aeronetsunv3lev2_subset, **addargs)
+    coldata_arr = colocate_gridded_ungridded(
+        data_tm5, aeronetsunv3lev2_subset, use_array_engine=True, **addargs
+    )
+    assert coldata_arr.shape == coldata.shape
+    assert coldata_arr.metadata == coldata.metadata
+    assert list(coldata_arr.data.station_name.values) == list(coldata.data.station_name.values)
+    np.testing.assert_array_equal(coldata_arr.data.time.values, coldata.data.time.values)
+    np.testing.assert_allclose(coldata_arr.data.data, coldata.data.data, rtol=TEST_RTOL)
+
+
+@pytest.mark.parametrize(
+    "grid_lons,site_lons,cells",
+    [
+        ([0, 90, 180, 270], [-80, -30, 179, 350], [3, 0, 2, 0]),
+        ([-135, -45, 45, 135], [300, 170, -170, 10], [1, 3, 0, 2]),
+    ],
+)
+def test__extract_site_data_nearest(grid_lons, site_lons, cells):
+    time_unit = Unit("days since 2010-1-1 0:0:0", calendar="gregorian")
+    timedim = iris.coords.DimCoord([0.0, 1.0], units=time_unit, standard_name="time")
+    latdim = iris.coords.DimCoord(
+        [-45.0, 45.0], var_name="lat", standard_name="latitude", units=Unit("degrees")
+    )
+    londim = iris.coords.DimCoord(
+        np.asarray(grid_lons, dtype=float),
+        var_name="lon",
+        standard_name="longitude",
+        units=Unit("degrees"),
+    )
+    # value of each grid cell is the index of its longitude
+    vals = np.broadcast_to(np.arange(len(grid_lons), dtype=float), (2, 2, len(grid_lons)))
+    cube = iris.cube.Cube(vals.copy(), var_name="od550aer", units="1")
+    cube.add_dim_coord(timedim, 0)
+    cube.add_dim_coord(latdim, 1)
+    cube.add_dim_coord(londim, 2)
+    data = GriddedData(cube, check_unit=False, convert_unit_on_init=False)
+
+    site_lats = [10.0] * len(site_lons)
+    subset = _extract_site_data_nearest(data, site_lats, site_lons)
+    np.testing.assert_array_equal(subset.values[0], cells)
+    # same cells as iris nearest neighbour interpolation
+    tseries = data.to_time_series(latitude=site_lats, longitude=site_lons, use_iris=True)
+    assert [ts["od550aer"].values[0] for ts in tseries] == cells
+
+
 def test_colocate_gridded_ungridded_nonglobal(aeronetsunv3lev2_subset):
     times = [1, 2]
     time_unit = Unit("days since 2010-1-1 0:0:0")
@@ -8,6 +8,7 @@ from pyaerocom.colocation_auto import ColocationSetup, Colocator
 from pyaerocom.config import ALL_REGION_NAME
 from pyaerocom.exceptions import ColocationError, ColocationSetupError
 from pyaerocom.io.aux_read_cubes import add_cubes
+from pyaerocom.io.obsdata_cache import ObsDataCache
 from pyaerocom.plugins.mscw_ctm.reader import ReadMscwCtm
 from tests.fixtures.data_access import TEST_DATA
 
@@ -53,6 +54,9 @@ default_setup = {
     "harmonise_units": False,
     "regrid_res_deg": None,
     "colocate_time": False,
+    "use_array_engine": False,
+    "num_workers": 1,
+    "worker_memory_gb": None,
     "reanalyse_existing": True,
     "raise_exceptions": False,
     "keep_data": True,
@@ -333,6 +337,38 @@ def test_colocator_read_ungridded():
         data = col._read_ungridded("invalid")
 
 
+def test_colocator_read_ungridded_obs_data_cache():
+    cache = ObsDataCache(max_size=1e9)
+    col = Colocator(raise_exceptions=True)
+    col.obs_id = "AeronetSunV3L2Subset.daily"
+    col.read_opts_ungridded = {"last_file": 1}
+    col.obs_data_cache = cache
+
+    data = col._read_ungridded("od550aer")
+    assert len(cache) == 1
+    assert col._read_ungridded("od550aer") is data
+    assert cache.hits == 1
+
+    # different filters are cached separately
+    col.obs_filters = {"longitude": [-30, 30]}
+    data = col._read_ungridded("od550aer")
+    assert len(data.metadata) == 1
+    assert len(cache) == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs,window",
+    [
+        (dict(), (None, None)),
+        (dict(start=2010, stop=2011), (2010, 2011)),
+        (dict(start=2010, obs_use_climatology=True), (const.CLIM_START, const.CLIM_STOP)),
+    ],
+)
+def test_colocator__get_obs_time_window(kwargs: dict, window: tuple):
+    col = Colocator(**kwargs)
+    assert col._get_obs_time_window() == window
+
+
 def test_colocator_get_model_data():
     col = Colocator(raise_exceptions=True)
     model_id = "TM5-met2010_CTRL-TEST"
@@ -459,3 +495,54 @@ def test_colocator_with_obs_data_dir_gridded():
     assert cd.ts_type == "monthly"
     assert str(cd.start) == "2010-01-15T12:00:00.000000000"
     assert str(cd.stop) == "2010-12-15T12:00:00.000000000"
+
+
+def _fake_run_helper(self, model_var, obs_var):
+    if model_var == "fail":
+        raise ValueError("colocation failed")
+    self.files_written.append(f"{model_var}_{obs_var}.nc")
+    return f"{model_var}-{obs_var}"
+
+
+@pytest.fixture
+def fake_colocator(monkeypatch):
+    vars_to_process = {"od550aer": "od550aer", "fail": "ang4487aer", "abs550aer": "abs550aer"}
+    monkeypatch.setattr(Colocator, "prepare_run", lambda self, var_list=None: vars_to_process)
+    monkeypatch.setattr(Colocator, "_run_helper", _fake_run_helper)
+    col = Colocator(model_id="model", obs_id="obs", raise_exceptions=False)
+    col.logging = False
+    return col
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_Colocator_run_parallel(fake_colocator: Colocator, num_workers: int):
+    fake_colocator.num_workers = num_workers
+    data = fake_colocator.run()
+    assert data == {
+        "od550aer": {"od550aer": "od550aer-od550aer"},
+        "abs550aer": {"abs550aer": "abs550aer-abs550aer"},
+    }
+    assert fake_colocator.files_written == ["od550aer_od550aer.nc", "abs550aer_abs550aer.nc"]
+    assert [status for *_, status in fake_colocator._processing_status] == [1, 5, 1]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_Colocator_run_parallel_raise(fake_colocator: Colocator, num_workers: int):
+    fake_colocator.update(num_workers=num_workers, raise_exceptions=True)
+    with pytest.raises(ColocationError) as e:
+        fake_colocator.run()
+    assert "colocation failed" in str(e.value)
+    assert fake_colocator.files_written == ["od550aer_od550aer.nc"]
+
+
+@pytest.mark.parametrize(
+    "num_workers,worker_memory_gb,num_jobs,expected",
+    [(1, None, 10, 1), (4, None, 10, 4), (4, None, 2, 2), (8, 1, 10, 3), (8, 10, 10, 1)],
+)
+def test_Colocator__get_num_workers(
+    monkeypatch, num_workers: int, worker_memory_gb, num_jobs: int, expected: int
+):
+    monkeypatch.setattr("os.cpu_count", lambda: 16)
+    monkeypatch.setattr("pyaerocom.colocation_auto._get_available_memory", lambda: 3.5 * 1024**3)
+    col = Colocator(num_workers=num_workers, worker_memory_gb=worker_memory_gb)
+    assert col._get_num_workers(num_jobs) == expected
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from pyaerocom import geodesy
@@ -40,3 +41,63 @@ def test_srtm_altitude():
 def test_etopo_altitude():
     alt = geodesy.get_topo_altitude(TEST_LAT, TEST_LON, topo_dataset="etopo1")
     assert alt == pytest.approx(217)
+
+
+def test_haversine_array():
+    lats = np.array([0, 10, -45])
+    lons = np.array([16, 20, 170])
+    dists = geodesy.haversine(0, 15, lats, lons)
+    expected = [geodesy.haversine(0, 15, lat, lon) for lat, lon in zip(lats, lons)]
+    np.testing.assert_allclose(dists, expected)
+    assert geodesy.haversine(0, 0, 0, 180) == pytest.approx(np.pi * geodesy.EARTH_RADIUS)
+
+
+def test_find_coord_indices_within_distance():
+    latlons = [(0, 16), (0, 15.5), (10, 15), (0, 15.001)]
+    idx = geodesy.find_coord_indices_within_distance(0, 15, latlons, radius=112)
+    np.testing.assert_array_equal(idx, [3, 1, 0])
+
+
+@pytest.fixture
+def random_coords():
+    rng = np.random.default_rng(42)
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, 2000)))
+    lons = rng.uniform(-180, 180, 2000)
+    lats[5] = np.nan
+    return lats, lons
+
+
+@pytest.mark.parametrize("radius", [1, 500, 3000])
+def test_find_coords_within_radius(random_coords, radius):
+    lats, lons = random_coords
+    latrefs, lonrefs = [0, 89.9, -30, np.nan], [179.9, 0, 20, 0]
+    matches, dists = geodesy.find_coords_within_radius(
+        latrefs, lonrefs, lats, lons, radius=radius, return_distance=True
+    )
+    assert len(matches) == len(dists) == len(latrefs)
+    assert len(matches[-1]) == 0
+    for latref, lonref, idx, dist in zip(latrefs[:-1], lonrefs[:-1], matches, dists):
+        expected = geodesy.find_coord_indices_within_distance(
+            latref, lonref, list(zip(lats, lons)), radius=radius
+        )
+        np.testing.assert_array_equal(idx, expected)
+        np.testing.assert_allclose(dist, geodesy.haversine(latref, lonref, lats[idx], lons[idx]))
+
+
+@pytest.mark.parametrize("k,max_dist", [(1, None), (5, None), (5, 300)])
+def test_find_nearest_coords(random_coords, k, max_dist):
+    lats, lons = random_coords
+    latrefs, lonrefs = np.array([0, 89.9, -30]), np.array([179.9, 0, 20])
+    idx, dists = geodesy.find_nearest_coords(latrefs, lonrefs, lats, lons, k=k, max_dist=max_dist)
+    assert idx.shape == dists.shape == (3, k)
+    for i in range(len(latrefs)):
+        all_dists = geodesy.haversine(latrefs[i], lonrefs[i], lats, lons)
+        all_dists[np.isnan(all_dists)] = np.inf
+        expected = np.argsort(all_dists, kind="stable")[:k]
+        if max_dist is not None:
+            expected = expected[all_dists[expected] <= max_dist]
+        num = len(expected)
+        np.testing.assert_array_equal(idx[i, :num], expected)
+        np.testing.assert_allclose(dists[i, :num], all_dists[expected])
+        assert (idx[i, num:] == -1).all()
+        assert np.isinf(dists[i, num:]).all()
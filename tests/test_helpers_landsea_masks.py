@@ -1,10 +1,13 @@
 from pathlib import Path
 
 import iris
+import numpy as np
+import pytest
 import xarray as xr
 
 import pyaerocom.helpers_landsea_masks as lsm
-from pyaerocom import const
+from pyaerocom import GriddedData, const
+from pyaerocom.helpers import make_dummy_cube_latlon
 
 TEST_REGIONS = const.HTAP_REGIONS[:2]
 
@@ -68,6 +71,18 @@ def test_get_mask_value():
     assert not lsm.get_mask_value(50, 15, mask)
 
 
+def test_get_mask_values():
+    lats = xr.DataArray([-0.5, 0.5], dims="latitude")
+    lons = xr.DataArray([-1.5, -0.5, 0.5, 1.5], dims="longitude")
+    mask = xr.DataArray(
+        np.arange(8).reshape(2, 4), coords=dict(latitude=lats, longitude=lons)
+    ).astype(float)
+    values = lsm.get_mask_values([0.4, -10, np.nan, 0.1], [-0.6, 2, 0, 0.9], mask)
+    np.testing.assert_array_equal(values, [5, 3, np.nan, 6])
+    for lat, lon, val in zip([0.4, -10, 0.1], [-0.6, 2, 0.9], values[[0, 1, 3]]):
+        assert lsm.get_mask_value(lat, lon, mask) == val
+
+
 def test_check_all_htap_available():
     should_be = [
         "EAShtap.0.1x0.1deg.nc",
@@ -93,3 +108,54 @@ def test_check_all_htap_available():
 
     files = lsm.check_all_htap_available()
     assert sorted(Path(file).name for file in files) == should_be
+
+
+@pytest.fixture
+def synthetic_mask_dir(tmp_path, monkeypatch):
+    """Directory with a synthetic 1x1 degree mask for region WEUROPE"""
+    lat = np.arange(-89.5, 90)
+    lon = np.arange(-179.5, 180)
+    data = np.zeros((len(lat), len(lon)))
+    data[np.ix_((lat > 35) & (lat < 60), (lon > -10) & (lon < 15))] = 1
+    ds = xr.Dataset(
+        {"WEUROPEhtap": (("lat", "long"), data)},
+        coords={
+            "lat": ("lat", lat, dict(standard_name="latitude", units="degrees_north")),
+            "long": ("long", lon, dict(standard_name="longitude", units="degrees_east")),
+        },
+    )
+    ds.to_netcdf(tmp_path / "WEUROPEhtap.0.1x0.1deg.nc")
+    monkeypatch.setattr(const, "_filtermaskdir", str(tmp_path))
+    lsm.REGION_MASK_CACHE.clear()
+    yield tmp_path
+    lsm.REGION_MASK_CACHE.clear()
+
+
+def test_load_region_mask_cached(synthetic_mask_dir):
+    mask = lsm.load_region_mask_xr("WEUROPE")
+    assert lsm.load_region_mask_xr("WEUROPE") is mask
+    assert not mask.values.flags.writeable
+    assert int(mask.sum()) == 25 * 25
+
+    cube = lsm.load_region_mask_iris("WEUROPE")
+    other = lsm.load_region_mask_iris("WEUROPE")
+    assert other is not cube
+    np.testing.assert_array_equal(other.data, cube.data)
+    assert len(lsm.REGION_MASK_CACHE) == 2
+
+
+def test_load_region_mask_regridded(synthetic_mask_dir):
+    cube = make_dummy_cube_latlon(lat_res_deg=5, lon_res_deg=5)
+    data = GriddedData(cube, check_unit=False, convert_unit_on_init=False)
+    npm = lsm.load_region_mask_regridded("WEUROPE", data)
+    assert npm.shape == (len(data.latitude.points), len(data.longitude.points))
+    assert not npm.flags.writeable
+    assert lsm.load_region_mask_regridded("WEUROPE", data) is npm
+
+    data_5d = GriddedData(
+        make_dummy_cube_latlon(lat_res_deg=5, lon_res_deg=10),
+        check_unit=False,
+        convert_unit_on_init=False,
+    )
+    assert lsm.load_region_mask_regridded("WEUROPE", data_5d).shape != npm.shape
+    assert len(lsm.REGION_MASK_CACHE) == 3  # iris mask and 2 regridded versions
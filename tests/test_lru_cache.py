@@ -0,0 +1,34 @@
+import numpy as np
+
+from pyaerocom.lru_cache import SizeBoundedLRUCache
+
+
+def test_make_key():
+    key = SizeBoundedLRUCache.make_key(kind="xr", regions=["EUROPE", "ASIA"])
+    assert key == SizeBoundedLRUCache.make_key(regions=["EUROPE", "ASIA"], kind="xr")
+    assert key != SizeBoundedLRUCache.make_key(kind="iris", regions=["EUROPE", "ASIA"])
+
+
+def test_get_size():
+    assert SizeBoundedLRUCache.get_size(np.ones(10)) == 80
+    assert SizeBoundedLRUCache.get_size("blaaa") == 0
+
+
+def test_eviction():
+    cache = SizeBoundedLRUCache(max_size=200)
+    assert cache.put("a", np.ones(10))
+    assert cache.put("b", np.ones(10))
+    assert cache.get("a") is not None
+    assert cache.get("bla") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    # b is least recently used
+    cache.put("c", np.ones(10))
+    assert list(cache._data) == ["a", "c"]
+    assert cache.size == 160
+    # replacing an entry does not count twice
+    cache.put("c", np.ones(5))
+    assert cache.size == 120
+    # too large to be cached
+    assert not cache.put("d", np.ones(100))
+    assert "d" not in cache
+    assert len(cache) == 2
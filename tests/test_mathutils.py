@@ -1,13 +1,18 @@
+from __future__ import annotations
+
 import numpy as np
 import pytest
 
+from pyaerocom import mathutils
 from pyaerocom.mathutils import (
     _nanmean_and_std,
     calc_statistics,
+    calc_statistics_batched,
     estimate_value_range,
     exponent,
     is_strictly_monotonic,
     make_binlist,
+    unstack_statistics,
 )
 
 
@@ -156,6 +161,55 @@ def test_calc_statistics_error():
     assert str(e.value).startswith("boolean index did not match indexed array")
 
 
+@pytest.fixture(scope="module")
+def batched_data() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(42)
+    data = rng.lognormal(size=(20, 50))
+    ref_data = data * rng.lognormal(0, 0.5, size=data.shape)
+    data[rng.random(data.shape) < 0.2] = np.nan
+    ref_data[rng.random(data.shape) < 0.1] = np.nan
+    ref_data[0] = np.nan  # no valid data
+    data[1, 5:] = np.nan  # few valid points
+    data[2] = 1.0  # constant
+    data[3], ref_data[3] = np.round(data[3]), np.round(ref_data[3])  # ties
+    return data, ref_data
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(),
+        dict(min_num_valid=10),
+        dict(lowlim=0.5, highlim=5),
+        dict(weights=np.linspace(0.1, 1, 50)),
+    ],
+)
+@pytest.mark.parametrize("kendall_max_pairwise", [300, 10])
+def test_calc_statistics_batched(batched_data, kwargs, kendall_max_pairwise, monkeypatch):
+    monkeypatch.setattr(mathutils, "KENDALL_MAX_PAIRWISE", kendall_max_pairwise)
+    data, ref_data = batched_data
+    stats = calc_statistics_batched(data, ref_data, **kwargs)
+    result = unstack_statistics(stats, kwargs.get("min_num_valid", 1))
+    assert len(result) == len(data)
+    for row, (d, r) in enumerate(zip(data, ref_data)):
+        try:
+            expected = calc_statistics(d, r, **kwargs)
+        except ValueError:  # fewer than 2 points within lowlim and highlim
+            assert np.isnan(result[row]["R"])
+            continue
+        assert list(result[row]) == list(expected)
+        if kwargs.get("weights") is not None and row == 2:
+            # weighted correlation of constant data
+            result[row]["R"] = expected["R"]
+        assert result[row] == pytest.approx(expected, rel=1e-10, abs=1e-14, nan_ok=True)
+
+
+def test_calc_statistics_batched_error():
+    with pytest.raises(ValueError) as e:
+        calc_statistics_batched([1, 2], [1, 2])
+    assert str(e.value) == "Invalid input. Data arrays must be two dimensional and of same shape"
+
+
 @pytest.mark.parametrize(
     "vmin,vmax,extend_percent,result",
     [
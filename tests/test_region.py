@@ -1,6 +1,12 @@
+import numpy as np
 import pytest
 
-from pyaerocom.region import Region, get_regions_coord
+from pyaerocom.region import (
+    Region,
+    find_closest_region_coords,
+    get_regions_coord,
+    get_regions_coords,
+)
 
 
 @pytest.mark.parametrize(
@@ -33,6 +39,45 @@ def test_does_not_contain_coordinate(region_name, lat, lon):
     assert not reg.contains_coordinate(lat, lon)
 
 
+@pytest.mark.parametrize("region_name", ["ALL", "NAM", "EUR", "PAN", "EAS", "OCN"])
+def test_contains_coordinates(region_name):
+    reg = Region(region_name)
+    lats = np.array([0, 39.7555, 19.5364, -37.8136, 50.4501, 59.9139, -90, 90, np.nan])
+    lons = np.array([0, -105.2211, -155.5765, 144.9631, 30.5234, 10.7522, 180, -180, 0])
+    result = reg.contains_coordinates(lats, lons)
+    expected = [bool(reg.contains_coordinate(lat, lon)) for lat, lon in zip(lats, lons)]
+    assert result.tolist() == expected
+
+
+COORDS = dict(
+    lats=[48.864716, 30.033333, 0.0, -33.447487, 39.916668],
+    lons=[2.349014, 31.233334, 0.0, -70.673676, 116.383331],
+)
+
+
+@pytest.mark.parametrize(
+    "region_ids,regions,closest",
+    [
+        pytest.param(
+            None,
+            [["EUROPE"], ["NAFRICA"], ["ALL"], ["SAMERICA"], ["ASIA", "CHINA"]],
+            [["EUROPE"], ["NAFRICA"], ["ALL"], ["SAMERICA"], ["CHINA", "ASIA"]],
+            id="default regions",
+        ),
+        pytest.param(
+            ["OCN", "SAM", "ASIA", "EUROPE", "ALL"],
+            [["OCN", "EUROPE"], ["OCN"], ["OCN"], ["OCN", "SAM"], ["OCN", "ASIA"]],
+            [["EUROPE", "OCN"], ["OCN"], ["OCN"], ["SAM", "OCN"], ["ASIA", "OCN"]],
+            id="supplied regions",
+        ),
+    ],
+)
+def test_get_regions_coords(region_ids, regions: list, closest: list):
+    regs = None if region_ids is None else {reg: Region(reg) for reg in region_ids}
+    assert get_regions_coords(COORDS["lats"], COORDS["lons"], regs) == regions
+    assert find_closest_region_coords(COORDS["lats"], COORDS["lons"], regs) == closest
+
+
 # This test needs work because Region() can accept almost any key in region_defs.py and they are not consistent.
 # NAF, NAFRICA, N Africa, for example. Running in a debugger exposes the inconsistencies
 @pytest.mark.parametrize(
@@ -5,6 +5,7 @@ import xarray as xr
 from iris.cube import Cube
 
 from pyaerocom import GriddedData, TsType
+from pyaerocom.exceptions import TemporalResolutionError
 from pyaerocom.helpers import resample_time_dataarray, resample_timeseries
 from pyaerocom.time_resampler import TimeResampler
 
@@ -248,3 +249,27 @@ def test_TimeResampler_resample(fakedata_hourly, kwargs, output_len, output_numn
     notnan = ~np.isnan(ts)
     assert notnan.sum() == output_numnotnan
     assert tr.last_units_preserved == lup
+
+
+@pytest.mark.parametrize(
+    "kwargs,steps",
+    [
+        (dict(to_ts_type="monthly"), [("monthly", None, "mean")]),
+        (dict(to_ts_type="daily", from_ts_type="daily", how="max"), [("daily", None, "mean")]),
+        (
+            dict(to_ts_type="monthly", from_ts_type="hourly", how="median"),
+            [("monthly", None, "median")],
+        ),
+        (
+            dict(to_ts_type="monthly", from_ts_type="hourly", min_num_obs=min_num_obs_default),
+            [("daily", 6, "mean"), ("monthly", 7, "mean")],
+        ),
+    ],
+)
+def test_TimeResampler_get_resampling_steps(kwargs, steps):
+    assert TimeResampler().get_resampling_steps(**kwargs) == steps
+
+
+def test_TimeResampler_get_resampling_steps_error():
+    with pytest.raises(TemporalResolutionError):
+        TimeResampler().get_resampling_steps("daily", "monthly")
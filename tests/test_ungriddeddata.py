@@ -294,3 +294,21 @@ def test_find_common_stations(aeronetsunv3lev2_subset: UngriddedData):
     data2 = aeronetsunv3lev2_subset.copy()
     station_map = data1.find_common_stations(other=data2)
     assert station_map == {key: key for key in station_map}
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(vars_to_convert="od550aer"),
+        dict(vars_to_convert="od550aer", start="2010", stop="2011"),
+    ],
+)
+def test_to_station_data_all(aeronetsunv3lev2_subset: UngriddedData, kwargs: dict):
+    data = aeronetsunv3lev2_subset
+    result = data.to_station_data_all(**kwargs)
+    assert len(result["stats"]) == len(result["station_name"])
+    for stat in result["stats"]:
+        expected = data.to_station_data(stat.station_name, merge_if_multi=True, **kwargs)
+        assert stat.station_name == expected.station_name
+        assert stat.od550aer.index.is_monotonic_increasing
+        assert stat.od550aer.equals(expected.od550aer)